@@ -20,6 +20,7 @@ else:
 
 from __future__ import annotations
 
+import logging
 import sys
 from typing import TYPE_CHECKING
 
@@ -27,6 +28,7 @@ from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import QApplication
 
 from harrix_swiss_knife.apps.common import message_box
+from harrix_swiss_knife.apps.common.qt_sql_profiler import disable_sql_profiling, enable_sql_profiling_from_env
 from harrix_swiss_knife.apps.common.uic_compile import install_safe_qt_translate
 
 if TYPE_CHECKING:
@@ -35,6 +37,9 @@ if TYPE_CHECKING:
     from PySide6.QtWidgets import QMainWindow
 
 
+logger = logging.getLogger(__name__)
+
+
 def run_app_main(
     main_window_factory: Callable[[], QMainWindow],
     *,
@@ -54,7 +59,11 @@ def run_app_main(
 
     Defaults to `True`.
 
+    Setting the `HSK_SQL_PROFILE` environment variable enables the SQL profiler
+    (see `qt_sql_profiler`); its top statements are logged when the app exits.
+
     """
+    enable_sql_profiling_from_env()
     app = QApplication(sys.argv)
     app.setWindowIcon(QIcon(icon_path))
     install_safe_qt_translate()
@@ -67,4 +76,8 @@ def run_app_main(
         tab_widget = getattr(win, "tabWidget", None)
         if tab_widget is not None:
             tab_widget.setCurrentIndex(0)
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    profiler = disable_sql_profiling()
+    if profiler is not None:
+        logger.info("SQL profile (top statements by total time):\n%s", profiler.report(top=20))
+    sys.exit(exit_code)
@@ -0,0 +1,409 @@
+"""Ranked, EN/RU layout tolerant autocomplete index shared by the finance and food apps.
+
+`AutocompleteIndex.search` ranks a whole candidate list the way `autocomplete_match_tier`
+ranks one text: tier `0` for an exact match, `1` for starts-with, `2` for contains,
+case-insensitive, where either the query or its keyboard-layout swap may match. Every
+entry's casefolded keys (its text and an optional alternate, such as a food's English
+name) are computed once, when the entry is added, and kept in:
+
+- a dict from key to entries, for exact matches;
+- one string of all keys in ranking order, each after a separator, with the sorted
+  offsets where each key starts (`bisect` maps a hit back to its entry). `str.find`
+  scans it for separator + query (starts-with) and then for the query (contains), in
+  ranking order, so a top-K query stops as soon as it has `K` results.
+
+`set_entries` keeps the keys of entries it already indexed, so reloading a candidate list
+after one more transaction or food log entry indexes only the new text.
+`AutocompleteProxyModel` keeps an index in sync with its source model and answers
+`filterAcceptsRow` / `lessThan` from the ranks of the current filter text.
+
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import QModelIndex, QPersistentModelIndex, QSortFilterProxyModel, Qt
+
+from harrix_swiss_knife.keyboard_layout_search import swap_keyboard_layout
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from PySide6.QtCore import QAbstractItemModel
+    from PySide6.QtWidgets import QWidget
+
+# Most suggestions a proxy shows for one filter text
+AUTOCOMPLETE_RESULT_LIMIT = 200
+
+# Rebuild from scratch once removed entries outnumber live ones by this factor
+_COMPACT_FACTOR = 2
+_KEY_SEPARATOR = "\x00"
+_MAX_CHAR = "\U0010ffff"
+
+
+@dataclass(frozen=True, slots=True)
+class AutocompleteMatch:
+    """One ranked suggestion: entry text, its alternate text (empty when absent) and match tier."""
+
+    text: str
+    alternate: str
+    tier: int
+
+    @property
+    def key(self) -> tuple[str, str]:
+        """Return the `(text, alternate)` pair identifying the entry."""
+        return (self.text, self.alternate)
+
+
+class AutocompleteIndex:
+    """Exact, starts-with and contains lookups over precomputed casefolded keys.
+
+    Entries are `(text, alternate)` pairs (a plain string has no alternate) and are
+    ranked within a tier by insertion position, or by lowercase text and then position
+    when `sort_by_text` is set.
+
+    """
+
+    def __init__(self, entries: Iterable[str | tuple[str, str | None]] = (), *, sort_by_text: bool = False) -> None:
+        """Index `entries` in ranking order."""
+        self.sort_by_text = sort_by_text
+        self._ids: dict[tuple[str, str], int] = {}
+        # Entry ID -> key, casefolded keys and ranking key; removed IDs keep `None` / `()`
+        self._entries: list[tuple[str, str] | None] = []
+        self._folded: list[tuple[str, ...]] = []
+        self._rank_keys: list[tuple] = []
+        self._exact: dict[str, set[int]] = {}
+        self._sorted_keys: list[tuple[str, int]] = []
+        self._next_position = 0
+        # Separator-prefixed keys in ranking order; segment `i` starts at `_segment_starts[i]`
+        self._haystack = ""
+        self._segment_starts: list[int] = []
+        self._segment_ids: list[int] = []
+        self._haystack_stale = True
+        self.set_entries(entries)
+
+    def __contains__(self, entry: str | tuple[str, str | None]) -> bool:
+        """Return `True` if `entry` is indexed."""
+        return _entry_key(entry) in self._ids
+
+    def __len__(self) -> int:
+        """Return the number of distinct entries."""
+        return len(self._ids)
+
+    def add(self, text: str, alternate: str | None = None) -> None:
+        """Index one more entry, ranked after the current ones; already indexed entries are left as is."""
+        key = _entry_key((text, alternate))
+        if key in self._ids:
+            return
+        entry_id = self._insert(key, self._next_position, keep_sorted=True)
+        self._next_position += 1
+        if self.sort_by_text:
+            self._haystack_stale = True
+        elif not self._haystack_stale:
+            self._append_segments(entry_id)
+
+    def search(self, query: str, limit: int | None = None) -> list[AutocompleteMatch]:
+        """Return entries matching `query`, best first.
+
+        Args:
+
+        - `query` (`str`): Typed text; its EN/RU keyboard-layout swap matches too.
+        - `limit` (`int | None`): Maximum number of matches. Defaults to `None` (all).
+
+        Returns:
+
+        - `list[AutocompleteMatch]`: Matches ordered by tier, then by entry rank. An empty
+          query matches nothing.
+
+        """
+        if not query or (limit is not None and limit <= 0):
+            return []
+        variants = list(dict.fromkeys((query.casefold(), swap_keyboard_layout(query).casefold())))
+        tiers: dict[int, int] = {}
+        for variant in variants:
+            for entry_id in self._exact.get(variant, ()):
+                tiers[entry_id] = 0
+        ranked = sorted(tiers, key=self._rank_keys.__getitem__)
+        for tier, find in ((1, self._starting_with), (2, self._scan)):
+            needed = None if limit is None else limit - len(ranked)
+            if needed is not None and needed <= 0:
+                break
+            found = find(variants, tiers, needed)
+            tiers.update(dict.fromkeys(found, tier))
+            ranked.extend(found)
+        matches: list[AutocompleteMatch] = []
+        for entry_id in ranked:
+            text, alternate = self._entry_at(entry_id)
+            matches.append(AutocompleteMatch(text, alternate, tiers[entry_id]))
+        return matches
+
+    def set_entries(self, entries: Iterable[str | tuple[str, str | None]]) -> None:
+        """Replace the indexed entries with `entries` in ranking order (first occurrence wins).
+
+        Entries that were already indexed keep their casefolded keys; only new ones are indexed.
+
+        """
+        positions: dict[tuple[str, str], int] = {}
+        for entry in entries:
+            positions.setdefault(_entry_key(entry), len(positions))
+        if len(self._entries) > _COMPACT_FACTOR * len(positions) + 64:
+            self._clear()
+        for key in [key for key in self._ids if key not in positions]:
+            self._remove(key)
+        added = False
+        for key, position in positions.items():
+            entry_id = self._ids.get(key)
+            if entry_id is None:
+                self._insert(key, position, keep_sorted=False)
+                added = True
+            else:
+                self._rank_keys[entry_id] = self._rank_key(key, position)
+        if added:
+            self._sorted_keys.sort()
+        self._next_position = len(positions)
+        self._haystack_stale = True
+
+    def _append_segments(self, entry_id: int) -> None:
+        parts = []
+        offset = len(self._haystack)
+        for folded in self._folded[entry_id]:
+            self._segment_starts.append(offset)
+            self._segment_ids.append(entry_id)
+            parts.append(_KEY_SEPARATOR + folded)
+            offset += len(_KEY_SEPARATOR) + len(folded)
+        self._haystack += "".join(parts)
+
+    def _build_haystack(self) -> None:
+        self._segment_starts = []
+        self._segment_ids = []
+        parts = []
+        offset = 0
+        for entry_id in sorted(self._ids.values(), key=self._rank_keys.__getitem__):
+            for folded in self._folded[entry_id]:
+                self._segment_starts.append(offset)
+                self._segment_ids.append(entry_id)
+                parts.append(_KEY_SEPARATOR + folded)
+                offset += len(_KEY_SEPARATOR) + len(folded)
+        self._haystack = "".join(parts)
+        self._haystack_stale = False
+
+    def _clear(self) -> None:
+        self._ids.clear()
+        self._entries.clear()
+        self._folded.clear()
+        self._rank_keys.clear()
+        self._exact.clear()
+        self._sorted_keys.clear()
+        self._haystack_stale = True
+
+    def _entry_at(self, entry_id: int) -> tuple[str, str]:
+        key = self._entries[entry_id]
+        return key if key is not None else ("", "")
+
+    def _insert(self, key: tuple[str, str], position: int, *, keep_sorted: bool) -> int:
+        entry_id = len(self._entries)
+        folded_keys = tuple(dict.fromkeys(part.casefold() for part in key if part))
+        self._ids[key] = entry_id
+        self._entries.append(key)
+        self._folded.append(folded_keys)
+        self._rank_keys.append(self._rank_key(key, position))
+        for folded in folded_keys:
+            self._exact.setdefault(folded, set()).add(entry_id)
+            if keep_sorted:
+                insort(self._sorted_keys, (folded, entry_id))
+            else:
+                self._sorted_keys.append((folded, entry_id))
+        self._haystack_stale = True
+        return entry_id
+
+    def _rank_key(self, key: tuple[str, str], position: int) -> tuple:
+        return (key[0].lower(), position) if self.sort_by_text else (position,)
+
+    def _remove(self, key: tuple[str, str]) -> None:
+        entry_id = self._ids.pop(key)
+        for folded in self._folded[entry_id]:
+            ids = self._exact[folded]
+            ids.discard(entry_id)
+            if not ids:
+                del self._exact[folded]
+            del self._sorted_keys[bisect_left(self._sorted_keys, (folded, entry_id))]
+        self._entries[entry_id] = None
+        self._folded[entry_id] = ()
+        self._haystack_stale = True
+
+    def _scan(self, patterns: list[str], skip: dict[int, int], needed: int | None) -> list[int]:
+        """Return IDs of entries not in `skip` with a key containing one of `patterns`, in rank order."""
+        if self._haystack_stale:
+            self._build_haystack()
+        found: dict[int, None] = {}
+        for pattern in patterns:
+            hits = 0
+            position = self._haystack.find(pattern)
+            while position >= 0 and (needed is None or hits < needed):
+                segment = bisect_right(self._segment_starts, position) - 1
+                entry_id = self._segment_ids[segment]
+                if entry_id not in skip and entry_id not in found:
+                    found[entry_id] = None
+                    hits += 1
+                # Resume after the entry's last key: its alternate needs no second hit
+                while segment + 1 < len(self._segment_ids) and self._segment_ids[segment + 1] == entry_id:
+                    segment += 1
+                if segment + 1 >= len(self._segment_starts):
+                    break
+                position = self._haystack.find(pattern, self._segment_starts[segment + 1])
+        ranked = sorted(found, key=self._rank_keys.__getitem__) if len(patterns) > 1 else list(found)
+        return ranked if needed is None else ranked[:needed]
+
+    def _starting_with(self, variants: list[str], skip: dict[int, int], needed: int | None) -> list[int]:
+        """Return IDs of entries not in `skip` with a key starting with a variant, in rank order."""
+        ranges = []
+        for variant in variants:
+            start = bisect_left(self._sorted_keys, (variant,))
+            end = bisect_left(self._sorted_keys, (variant + _MAX_CHAR,), start)
+            if end > start:
+                ranges.append((variant, start, end))
+        if needed is not None and sum(end - start for _variant, start, end in ranges) > needed:
+            # Every key follows a separator, so a hit on separator + variant is a starts-with match
+            return self._scan([_KEY_SEPARATOR + variant for variant, _start, _end in ranges], skip, needed)
+        found = {
+            entry_id
+            for _variant, start, end in ranges
+            for _folded, entry_id in self._sorted_keys[start:end]
+            if entry_id not in skip
+        }
+        return sorted(found, key=self._rank_keys.__getitem__)
+
+
+class AutocompleteProxyModel(QSortFilterProxyModel):
+    """Completer proxy whose filtering and tier ordering come from an `AutocompleteIndex`.
+
+    The index follows the source model: appended rows are indexed as they arrive, and
+    any other change re-reads the rows on the next lookup. Rows are keyed by
+    `_row_entry`; without a filter text every row is shown in `_unfiltered_less_than`
+    order. Subclasses set `sort_by_text` and override `_row_entry` as needed.
+
+    """
+
+    sort_by_text = False
+
+    def __init__(self, parent: QWidget | None = None, *, limit: int | None = AUTOCOMPLETE_RESULT_LIMIT) -> None:
+        """Initialize the proxy model; `limit` caps the suggestions shown for one filter text."""
+        super().__init__(parent)
+        self.filter_text = ""
+        self.limit = limit
+        self.autocomplete_index = AutocompleteIndex(sort_by_text=self.sort_by_text)
+        self._row_keys: list[tuple[str, str]] = []
+        self._ranks: dict[tuple[str, str], int] = {}
+        self._index_stale = True
+        self.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.setSortCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex | QPersistentModelIndex) -> bool:  # noqa: ARG002, N802
+        """Accept rows whose entry is among the ranked matches of the filter text."""
+        if not self.filter_text:
+            return True
+        self._ensure_index()
+        return source_row < len(self._row_keys) and self._row_keys[source_row] in self._ranks
+
+    def lessThan(  # noqa: N802
+        self,
+        source_left: QModelIndex | QPersistentModelIndex,
+        source_right: QModelIndex | QPersistentModelIndex,
+    ) -> bool:
+        """Sort by match rank (tier, then entry rank), then by source row."""
+        if not self.filter_text:
+            return self._unfiltered_less_than(source_left, source_right)
+        self._ensure_index()
+        unranked = len(self._ranks)
+        left_rank = self._ranks.get(self._row_key(source_left.row()), unranked)
+        right_rank = self._ranks.get(self._row_key(source_right.row()), unranked)
+        if left_rank != right_rank:
+            return left_rank < right_rank
+        return source_left.row() < source_right.row()
+
+    def set_filter_text(self, text: str) -> None:
+        """Set the filter text and trigger re-filtering and sorting."""
+        self.filter_text = text
+        self._ensure_index()
+        self._update_ranks()
+        self.invalidateFilter()
+        self.sort(0)
+
+    def setSourceModel(self, source_model: QAbstractItemModel) -> None:  # noqa: N802
+        """Set the source model and follow its changes in the index."""
+        previous = self.sourceModel()
+        if previous is not None:
+            for signal in _stale_signals(previous):
+                signal.disconnect(self._mark_index_stale)
+            previous.rowsInserted.disconnect(self._on_rows_inserted)
+        # Connected before the base class so the index is current when the proxy re-filters
+        if source_model is not None:
+            for signal in _stale_signals(source_model):
+                signal.connect(self._mark_index_stale)
+            source_model.rowsInserted.connect(self._on_rows_inserted)
+        self._index_stale = True
+        super().setSourceModel(source_model)
+
+    def _ensure_index(self) -> None:
+        if not self._index_stale:
+            return
+        self._index_stale = False
+        source_model = self.sourceModel()
+        row_count = source_model.rowCount() if source_model is not None else 0
+        self._row_keys = [self._row_entry(source_model, row) for row in range(row_count)]
+        self.autocomplete_index.set_entries(self._row_keys)
+        self._update_ranks()
+
+    def _mark_index_stale(self) -> None:
+        self._index_stale = True
+
+    def _on_rows_inserted(self, parent: QModelIndex, first: int, last: int) -> None:
+        if self._index_stale or parent.isValid() or first != len(self._row_keys):
+            self._index_stale = True
+            return
+        source_model = self.sourceModel()
+        for row in range(first, last + 1):
+            key = self._row_entry(source_model, row)
+            self._row_keys.append(key)
+            self.autocomplete_index.add(*key)
+        if self.filter_text:
+            self._update_ranks()
+
+    def _row_entry(self, source_model: QAbstractItemModel, row: int) -> tuple[str, str]:
+        """Return the `(text, alternate)` entry of a source row; the default uses `DisplayRole` only."""
+        data = source_model.data(source_model.index(row, 0), Qt.ItemDataRole.DisplayRole)
+        return ("" if data is None else str(data), "")
+
+    def _row_key(self, row: int) -> tuple[str, str] | None:
+        return self._row_keys[row] if row < len(self._row_keys) else None
+
+    def _unfiltered_less_than(
+        self,
+        source_left: QModelIndex | QPersistentModelIndex,
+        source_right: QModelIndex | QPersistentModelIndex,
+    ) -> bool:
+        return source_left.row() < source_right.row()
+
+    def _update_ranks(self) -> None:
+        matches = self.autocomplete_index.search(self.filter_text, self.limit) if self.filter_text else []
+        self._ranks = {match.key: rank for rank, match in enumerate(matches)}
+
+
+def _entry_key(entry: str | tuple[str, str | None]) -> tuple[str, str]:
+    if isinstance(entry, str):
+        return (entry, "")
+    text, alternate = entry
+    return (text, alternate or "")
+
+
+def _stale_signals(source_model: QAbstractItemModel) -> tuple:
+    return (
+        source_model.modelReset,
+        source_model.rowsRemoved,
+        source_model.rowsMoved,
+        source_model.layoutChanged,
+        source_model.dataChanged,
+    )
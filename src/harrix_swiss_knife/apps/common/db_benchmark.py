@@ -0,0 +1,306 @@
+"""Benchmark the read methods of the tracker `DatabaseManager` classes on synthetic data.
+
+Each run generates databases with `synthetic_data.generate_database`, opens them with
+the app's own `DatabaseManager` (schema migrations included) and times every public
+read method: those named `get_*`, `count_*`, `check_*`, `has_*`, `is_*`, `lookup_*`
+or `should_*` and defined on the app class. Required arguments come from the samples
+the generator returns; methods needing anything else are reported as skipped.
+
+Timings are medians over several rounds with the result cache cleared before each
+call, so they measure SQL and row conversion rather than cache hits. Results can be
+saved as a JSON baseline and later runs compared against it with a relative
+tolerance; `hsk dev db-benchmark` exits with a non-zero status on regressions.
+
+Runs headless: `QT_QPA_PLATFORM` defaults to `offscreen` and only a
+`QCoreApplication` is created when no Qt application exists yet.
+
+"""
+
+from __future__ import annotations
+
+import importlib
+import inspect
+import json
+import os
+import statistics
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from harrix_swiss_knife.apps.common.synthetic_data import SYNTHETIC_APPS, SyntheticDatabase, generate_database
+from harrix_swiss_knife.paths import get_project_root
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+    from pathlib import Path
+
+
+DEFAULT_BENCHMARK_ROUNDS = 5
+DEFAULT_MIN_DELTA_MS = 0.5
+DEFAULT_TOLERANCE = 0.25
+READ_METHOD_PREFIXES = ("get_", "count_", "check_", "has_", "is_", "lookup_", "should_")
+
+# Keeps a `QCoreApplication` created here alive for the rest of the process
+_qt_application: list[Any] = []
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkResult:
+    """Timing of one read method on one synthetic database."""
+
+    scale: str
+    app: str
+    method: str
+    median_ms: float
+    min_ms: float
+    rounds: int
+
+    @property
+    def key(self) -> str:
+        """Return the baseline key, e.g. `10y/finance.get_all_transactions`."""
+        return f"{self.scale}/{self.app}.{self.method}"
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkRegression:
+    """A method whose median exceeds its baseline by more than the tolerance."""
+
+    key: str
+    baseline_ms: float
+    current_ms: float
+
+    @property
+    def ratio(self) -> float:
+        """Return `current_ms / baseline_ms`."""
+        return self.current_ms / self.baseline_ms if self.baseline_ms else float("inf")
+
+
+@dataclass(slots=True)
+class BenchmarkRun:
+    """Results of `run_benchmarks`, plus methods that could not be timed."""
+
+    results: list[BenchmarkResult]
+    skipped: dict[str, str]
+
+
+def benchmark_database(
+    database: SyntheticDatabase,
+    *,
+    rounds: int = DEFAULT_BENCHMARK_ROUNDS,
+    methods: Iterable[str] | None = None,
+) -> BenchmarkRun:
+    """Time the read methods of `database.app`'s `DatabaseManager` on a generated file.
+
+    Args:
+
+    - `database` (`SyntheticDatabase`): Result of `generate_database`.
+    - `rounds` (`int`): Timed calls per method (after one warm-up call). Defaults to `5`.
+    - `methods` (`Iterable[str] | None`): Only time these methods. Defaults to every read method.
+
+    Returns:
+
+    - `BenchmarkRun`: One result per timed method; skipped methods with the reason.
+
+    """
+    _ensure_qt_application()
+    manager_class = manager_class_for(database.app)
+    selected = set(methods) if methods is not None else None
+    scale = scale_label(database.years)
+    results: list[BenchmarkResult] = []
+    skipped: dict[str, str] = {}
+
+    db = manager_class(str(database.path))
+    try:
+        db.migrate_schema()
+        for name in discover_read_methods(manager_class):
+            if selected is not None and name not in selected:
+                continue
+            key = f"{scale}/{database.app}.{name}"
+            method = getattr(db, name)
+            kwargs = build_call_arguments(method, database.samples)
+            if kwargs is None:
+                skipped[key] = "required argument without a sample value"
+                continue
+            try:
+                timings = _time_calls(db, method, kwargs, rounds)
+            except Exception as e:
+                skipped[key] = f"{type(e).__name__}: {e}"
+                continue
+            results.append(
+                BenchmarkResult(
+                    scale=scale,
+                    app=database.app,
+                    method=name,
+                    median_ms=round(statistics.median(timings), 4),
+                    min_ms=round(min(timings), 4),
+                    rounds=len(timings),
+                )
+            )
+    finally:
+        db.close()
+    return BenchmarkRun(results=results, skipped=skipped)
+
+
+def build_call_arguments(method: Callable[..., Any], samples: dict[str, Any]) -> dict[str, Any] | None:
+    """Return keyword arguments for every required parameter of `method`, or `None` if one has no sample."""
+    kwargs: dict[str, Any] = {}
+    for parameter in inspect.signature(method).parameters.values():
+        if parameter.kind in {inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD}:
+            continue
+        if parameter.default is not inspect.Parameter.empty:
+            continue
+        if parameter.name not in samples:
+            return None
+        kwargs[parameter.name] = samples[parameter.name]
+    return kwargs
+
+
+def compare_to_baselines(
+    results: Iterable[BenchmarkResult],
+    baselines: dict[str, float],
+    *,
+    tolerance: float = DEFAULT_TOLERANCE,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+) -> list[BenchmarkRegression]:
+    """Return the results slower than their baseline by more than `tolerance`.
+
+    Args:
+
+    - `results` (`Iterable[BenchmarkResult]`): Current timings.
+    - `baselines` (`dict[str, float]`): Baseline medians in milliseconds by `BenchmarkResult.key`.
+    - `tolerance` (`float`): Allowed relative slowdown, `0.25` meaning 25 %. Defaults to `0.25`.
+    - `min_delta_ms` (`float`): Absolute slowdowns below this are treated as noise. Defaults to `0.5`.
+
+    Returns:
+
+    - `list[BenchmarkRegression]`: Regressions, worst ratio first. Methods without a baseline are ignored.
+
+    """
+    regressions = [
+        BenchmarkRegression(key=result.key, baseline_ms=baselines[result.key], current_ms=result.median_ms)
+        for result in results
+        if result.key in baselines
+        and result.median_ms > baselines[result.key] * (1 + tolerance)
+        and result.median_ms - baselines[result.key] >= min_delta_ms
+    ]
+    return sorted(regressions, key=lambda regression: regression.ratio, reverse=True)
+
+
+def default_baseline_path() -> Path:
+    """Return the default baseline file (`data/benchmarks/db_benchmark_baselines.json`)."""
+    return get_project_root() / "data" / "benchmarks" / "db_benchmark_baselines.json"
+
+
+def discover_read_methods(manager_class: type) -> list[str]:
+    """Return the sorted public read methods defined on `manager_class` itself (not inherited)."""
+    return sorted(
+        name
+        for name, member in vars(manager_class).items()
+        if name.startswith(READ_METHOD_PREFIXES) and callable(member)
+    )
+
+
+def format_benchmark_report(
+    results: Sequence[BenchmarkResult],
+    *,
+    baselines: dict[str, float] | None = None,
+    regressions: Sequence[BenchmarkRegression] = (),
+) -> str:
+    """Return a plain-text table of `results`, slowest first, with baseline ratios when given."""
+    regressed = {regression.key for regression in regressions}
+    lines = [f"{'median ms':>10} {'min ms':>9} {'vs base':>8}  method"]
+    for result in sorted(results, key=lambda item: item.median_ms, reverse=True):
+        baseline = (baselines or {}).get(result.key)
+        ratio = f"{result.median_ms / baseline:.2f}x" if baseline else "-"
+        marker = "  REGRESSION" if result.key in regressed else ""
+        lines.append(f"{result.median_ms:>10.3f} {result.min_ms:>9.3f} {ratio:>8}  {result.key}{marker}")
+    return "\n".join(lines)
+
+
+def load_baselines(path: Path) -> dict[str, float]:
+    """Return baseline medians by key from `path`, or an empty dict when the file does not exist."""
+    if not path.is_file():
+        return {}
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {str(key): float(value) for key, value in data.get("median_ms", {}).items()}
+
+
+def manager_class_for(app: str) -> type:
+    """Import and return `harrix_swiss_knife.apps.<app>.database_manager.DatabaseManager`."""
+    if app not in SYNTHETIC_APPS:
+        msg = f"Unknown app {app!r}; expected one of {', '.join(SYNTHETIC_APPS)}"
+        raise ValueError(msg)
+    return importlib.import_module(f"harrix_swiss_knife.apps.{app}.database_manager").DatabaseManager
+
+
+def run_benchmarks(
+    work_dir: Path,
+    *,
+    apps: Iterable[str] = SYNTHETIC_APPS,
+    years: Iterable[float] = (1,),
+    rounds: int = DEFAULT_BENCHMARK_ROUNDS,
+    seed: int = 0,
+) -> BenchmarkRun:
+    """Generate a database per app and scale in `work_dir` and benchmark each one.
+
+    Args:
+
+    - `work_dir` (`Path`): Folder for the generated `.db` files.
+    - `apps` (`Iterable[str]`): Apps to benchmark. Defaults to all of `SYNTHETIC_APPS`.
+    - `years` (`Iterable[float]`): History lengths to generate, e.g. `(1, 10, 50)`. Defaults to `(1,)`.
+    - `rounds` (`int`): Timed calls per method. Defaults to `5`.
+    - `seed` (`int`): Generator seed. Defaults to `0`.
+
+    Returns:
+
+    - `BenchmarkRun`: Combined results and skipped methods of every database.
+
+    """
+    run = BenchmarkRun(results=[], skipped={})
+    for scale_years in years:
+        for app in apps:
+            path = work_dir / f"{app}_{scale_label(scale_years)}.db"
+            database = generate_database(app, path, years=scale_years, seed=seed)
+            app_run = benchmark_database(database, rounds=rounds)
+            run.results.extend(app_run.results)
+            run.skipped.update(app_run.skipped)
+    return run
+
+
+def save_baselines(path: Path, results: Iterable[BenchmarkResult], *, merge: bool = True) -> dict[str, float]:
+    """Write `results` as the baseline in `path` and return the stored medians.
+
+    With `merge`, keys not present in `results` (other apps or scales) are kept.
+
+    """
+    baselines = load_baselines(path) if merge else {}
+    baselines.update({result.key: result.median_ms for result in results})
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"version": 1, "median_ms": dict(sorted(baselines.items()))}
+    path.write_text(json.dumps(payload, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return baselines
+
+
+def scale_label(years: float) -> str:
+    """Return the scale part of a baseline key: `10y` for `10`, `0.5y` for `0.5`."""
+    return f"{years:g}y"
+
+
+def _ensure_qt_application() -> None:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtCore import QCoreApplication  # noqa: PLC0415
+
+    if QCoreApplication.instance() is None:
+        _qt_application.append(QCoreApplication([]))
+
+
+def _time_calls(db: Any, method: Callable[..., Any], kwargs: dict[str, Any], rounds: int) -> list[float]:
+    db.invalidate_result_cache()
+    method(**kwargs)
+    timings: list[float] = []
+    for _ in range(max(1, rounds)):
+        db.invalidate_result_cache()
+        started = time.perf_counter()
+        method(**kwargs)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
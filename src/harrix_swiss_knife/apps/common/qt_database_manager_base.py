@@ -9,25 +9,46 @@ from __future__ import annotations
 
 import logging
 import os
+import sqlite3
+import time
 from contextlib import contextmanager
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, NoReturn
 
 import harrix_pylib as h
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Iterable, Iterator, Mapping, Sequence
 
 from PySide6.QtSql import QSqlDatabase, QSqlQuery
 
 from harrix_swiss_knife.apps.common.common import _safe_identifier
-from harrix_swiss_knife.apps.common.qt_sql_runner import execute_qt_sql_query, execute_qt_sql_simple
+from harrix_swiss_knife.apps.common.qt_sql_profiler import active_sql_profiler
+from harrix_swiss_knife.apps.common.qt_sql_runner import (
+    QtSqlStatementCache,
+    QtSqlStatementCacheStats,
+    execute_qt_sql_many,
+    execute_qt_sql_query,
+    execute_qt_sql_simple,
+)
 from harrix_swiss_knife.apps.common.qt_sqlite_connection import (
+    QSqliteReadOnlyPool,
+    close_shared_read_only_pool,
     open_thread_scoped_qsqlite,
     qsqlite_temp_connection_name,
     reconnect_thread_scoped_qsqlite,
+    shared_read_only_pool,
     try_add_open_qsqlite,
 )
+from harrix_swiss_knife.apps.common.query_result_cache import (
+    ALL_TABLES,
+    QueryResultCache,
+    QueryResultCacheStats,
+    TableGenerations,
+    table_generations,
+    tables_written_by,
+)
+from harrix_swiss_knife.apps.common.schema_migrations import SchemaMigration, apply_schema_migrations
 from harrix_swiss_knife.apps.common.sql_fragments import validate_order_by_fragment, validate_where_fragment
 
 logger = logging.getLogger(__name__)
@@ -50,12 +71,34 @@ class QtSqliteDatabaseManagerBase:
     _db_filename: str
     _connection_prefix: str
     _db_closed: bool
+    _statement_cache: QtSqlStatementCache
+    _transaction_depth: int
+    _read_only_connection: sqlite3.Connection | None
+    _read_only_pool: QSqliteReadOnlyPool | None
+    _result_cache: QueryResultCache
+    _table_generations: TableGenerations
+    _transaction_tables: set[str]
+
+    def __init__(self, *, prefix: str, db_filename: str, read_only: bool = False) -> None:
+        """Create manager bound to `db_filename` for the current thread.
 
-    def __init__(self, *, prefix: str, db_filename: str) -> None:
-        """Create manager bound to `db_filename` for the current thread."""
+        With `read_only`, the connection is borrowed from `shared_read_only_pool` (WAL,
+        `mmap_size`, `cache_size`, `query_only`) and handed back by `close`.
+
+        """
         self._connection_prefix = prefix
         self._db_filename = db_filename
-        self.connection_name, self.db = open_thread_scoped_qsqlite(prefix, db_filename)
+        self._statement_cache = QtSqlStatementCache()
+        self._result_cache = QueryResultCache()
+        self._table_generations = table_generations(db_filename)
+        self._transaction_tables = set()
+        self._transaction_depth = 0
+        self._read_only_connection = None
+        self._read_only_pool = shared_read_only_pool(db_filename) if read_only else None
+        if self._read_only_pool is not None:
+            self.connection_name, self.db = self._read_only_pool.acquire()
+        else:
+            self.connection_name, self.db = open_thread_scoped_qsqlite(prefix, db_filename)
         self._db_closed = False
 
     def close(self) -> None:
@@ -68,11 +111,29 @@ class QtSqliteDatabaseManagerBase:
         if self._db_closed:
             return
         self._db_closed = True
+        self._statement_cache.clear()
+        self._result_cache.clear()
+        if self._read_only_connection is not None:
+            self._read_only_connection.close()
+            self._read_only_connection = None
         db = getattr(self, "db", None)
+        if self._read_only_pool is not None:
+            self.db = None
+            self._read_only_pool.release(self.connection_name)
+            return
         if db is not None and db.isValid():
             db.close()
         self.db = None
 
+    def close_read_only_pool(self) -> None:
+        """Close the pooled read-only worker connections of this database file.
+
+        Call on application shutdown or before switching databases; pooled WAL connections
+        otherwise stay open until the process exits.
+
+        """
+        close_shared_read_only_pool(self._db_filename)
+
     @staticmethod
     def create_database_from_sql(db_filename: str, sql_file_path: str) -> bool:
         """Create a new database from an SQL file."""
@@ -125,22 +186,110 @@ class QtSqliteDatabaseManagerBase:
             if created_new_file and db_path.is_file() and db_path.stat().st_size == 0:
                 db_path.unlink(missing_ok=True)
 
+    def execute_many(self, query_text: str, params_seq: Iterable[Mapping[str, Any] | Sequence[Any]]) -> bool:
+        """Execute one prepared statement for every parameter set inside a single transaction.
+
+        Args:
+
+        - `query_text` (`str`): Parametrised INSERT/UPDATE/DELETE statement.
+        - `params_seq` (`Iterable[Mapping[str, Any] | Sequence[Any]]`): Named (`dict`) or
+          positional (`tuple`) parameter sets.
+
+        Returns:
+
+        - `bool`: `True` if every parameter set was executed; on failure nothing is committed.
+          Inside an outer `sql_transaction` a failure is re-raised instead, so the outer
+          transaction rolls back rather than committing a partial batch.
+
+        """
+        nested = self._transaction_depth > 0
+        try:
+            with self.sql_transaction():
+                executed = execute_qt_sql_many(
+                    ensure_connection=self._ensure_connection,
+                    create_query=self._create_query,
+                    query_text=query_text,
+                    params_seq=params_seq,
+                    statement_cache=self._statement_cache,
+                )
+                if executed is None:
+                    _raise_runtime_error("Batch execution failed")
+                self._note_write(query_text)
+        except Exception:
+            if nested:
+                raise
+            logger.exception("Failed to execute SQL batch")
+            return False
+        else:
+            return True
+
     def execute_query(self, query_text: str, params: dict[str, Any] | None = None) -> QSqlQuery | None:
         """Prepare and execute `query_text` with optional bound `params`."""
-        return execute_qt_sql_query(
+        query = execute_qt_sql_query(
             ensure_connection=self._ensure_connection,
             create_query=self._create_query,
             query_text=query_text,
             params=params,
         )
+        if query is not None:
+            self._note_write(query_text)
+        return query
 
     def execute_simple_query(self, query_text: str, params: dict[str, Any] | None = None) -> bool:
-        """Execute INSERT/UPDATE/DELETE and return success status."""
-        return execute_qt_sql_simple(
+        """Execute INSERT/UPDATE/DELETE and return success status (prepared statement is cached)."""
+        executed = execute_qt_sql_simple(
             ensure_connection=self._ensure_connection,
             create_query=self._create_query,
             query_text=query_text,
             params=params,
+            statement_cache=self._statement_cache,
+        )
+        if executed:
+            self._note_write(query_text)
+        return executed
+
+    def get_columns(
+        self,
+        query_text: str,
+        params: dict[str, Any] | None = None,
+        *,
+        dtypes: Sequence[str | None] | None = None,
+        read_only: bool = False,
+    ) -> tuple[Any, ...]:
+        """Execute `query_text` and return the result column by column.
+
+        Column-oriented results avoid building one Python list per row, which is the
+        bulk of the cost for full-table loads feeding charts and reports.
+
+        Args:
+
+        - `query_text` (`str`): Parametrised `SELECT` statement.
+        - `params` (`dict[str, Any] | None`): Values for named placeholders. Defaults to `None`.
+        - `dtypes` (`Sequence[str | None] | None`): NumPy dtype per column (for example
+          `"int64"`, `"float64"`); a column with `None` stays a list. NULLs in numeric
+          columns must be replaced in SQL (`COALESCE`). Defaults to `None` (all lists).
+        - `read_only` (`bool`): Read through a stdlib `sqlite3` connection opened in
+          `mode=ro` on the same file. Much faster for large results, but it only sees
+          committed data, so do not use it inside `sql_transaction`. Defaults to `False`.
+
+        Returns:
+
+        - `tuple[Any, ...]`: One `list` (or `numpy.ndarray`) per selected column.
+
+        """
+        if read_only:
+            columns = self._fetch_columns_read_only(query_text, params)
+        else:
+            columns = self._fetch_columns_qt(query_text, params)
+        if dtypes is None:
+            return tuple(columns)
+
+        import numpy as np  # noqa: PLC0415
+
+        column_dtypes = [*dtypes, *([None] * (len(columns) - len(dtypes)))]
+        return tuple(
+            column if dtype is None else np.asarray(column, dtype=dtype)
+            for column, dtype in zip(columns, column_dtypes, strict=False)
         )
 
     def get_earliest_date(self, table: str, column: str = "date") -> str | None:
@@ -246,18 +395,45 @@ class QtSqliteDatabaseManagerBase:
         return result
 
     def get_rows(self, query_text: str, params: dict[str, Any] | None = None) -> list[list[Any]]:
-        """Execute `query_text` and fetch the full result set."""
-        query = self.execute_query(query_text, params)
+        """Execute `query_text` and fetch the full result set (prepared statement is cached)."""
+        query = execute_qt_sql_query(
+            ensure_connection=self._ensure_connection,
+            create_query=self._create_query,
+            query_text=query_text,
+            params=params,
+            statement_cache=self._statement_cache,
+        )
         if query:
-            result = self.rows_from_query(query)
-            query.clear()
-            return result
+            try:
+                return self.rows_from_query(query)
+            finally:
+                self._statement_cache.release(query)
         return []
 
+    def get_user_version(self) -> int:
+        """Return the schema version stored in `PRAGMA user_version` (`0` when unavailable)."""
+        rows = self.get_rows("PRAGMA user_version")
+        if rows and rows[0] and rows[0][0] is not None:
+            return int(rows[0][0])
+        return 0
+
+    def invalidate_result_cache(self) -> None:
+        """Expire cached read results of every manager on this file (after writes made outside the manager)."""
+        self._table_generations.bump((ALL_TABLES,))
+
     def is_database_open(self) -> bool:
         """Return whether Qt connection is open and valid."""
         return hasattr(self, "db") and self.db is not None and self.db.isValid() and self.db.isOpen()
 
+    def migrate_schema(self) -> int:
+        """Apply pending `_schema_migrations` and return the resulting schema version.
+
+        Called by app managers while opening the database; an up-to-date file costs
+        only the `PRAGMA user_version` read.
+
+        """
+        return apply_schema_migrations(self, self._schema_migrations())
+
     @staticmethod
     def resolve_db_path_with_fallback(configured_path: Path, app_name: str) -> Path:
         """Return writable DB path, falling back to `<project_root>/data/databases/<app>.db` when needed."""
@@ -274,32 +450,70 @@ class QtSqliteDatabaseManagerBase:
 
     def rows_from_query(self, query: QSqlQuery) -> list[list[Any]]:
         """Convert the full result set in `query` into a list of rows."""
+        profiler = active_sql_profiler()
+        started = time.perf_counter() if profiler is not None else 0.0
+        column_range = range(query.record().count())
+        value = query.value
+        next_row = query.next
         result: list[list[Any]] = []
-        while query.next():
-            row = [query.value(i) for i in range(query.record().count())]
-            result.append(row)
+        while next_row():
+            result.append([value(i) for i in column_range])
+        if profiler is not None:
+            profiler.record_fetch(query, rows=len(result), seconds=time.perf_counter() - started)
         return result
 
+    def set_user_version(self, version: int) -> bool:
+        """Stamp `PRAGMA user_version` (pragmas cannot take bound parameters)."""
+        return self.execute_simple_query(f"PRAGMA user_version = {int(version)}")
+
     @contextmanager
     def sql_transaction(self) -> Iterator[None]:
-        """Run multiple statements in a single SQLite transaction."""
+        """Run multiple statements in a single SQLite transaction.
+
+        Nested use joins the outermost transaction, which alone commits or rolls back.
+        Tables written inside it get their result-cache generation bumped again when it
+        ends, so no manager keeps a result read before the commit or from rolled-back rows.
+
+        """
+        if self._transaction_depth > 0:
+            self._transaction_depth += 1
+            try:
+                yield
+            finally:
+                self._transaction_depth -= 1
+            return
         if not self._ensure_connection() or self.db is None:
             raise DatabaseConnectionUnavailableError
         if not self.db.transaction():
             error_msg = self.db.lastError().text() if self.db.lastError().isValid() else "Unknown error"
             msg = f"Failed to start SQL transaction: {error_msg}"
             raise RuntimeError(msg)
+        self._transaction_depth = 1
         try:
             yield
         except Exception:
+            self._transaction_depth = 0
             self.db.rollback()
             raise
         else:
+            self._transaction_depth = 0
             if not self.db.commit():
                 error_msg = self.db.lastError().text() if self.db.lastError().isValid() else "Unknown error"
                 self.db.rollback()
                 msg = f"Failed to commit SQL transaction: {error_msg}"
                 raise RuntimeError(msg)
+        finally:
+            if self._transaction_tables:
+                self._table_generations.bump(self._transaction_tables)
+                self._transaction_tables.clear()
+
+    def result_cache_stats(self) -> QueryResultCacheStats:
+        """Return hit/miss/stale counters of the `cached_read` result cache."""
+        return self._result_cache.stats()
+
+    def statement_cache_stats(self) -> QtSqlStatementCacheStats:
+        """Return hit/miss/eviction counters of the prepared-statement cache."""
+        return self._statement_cache.stats()
 
     def table_exists(self, table_name: str) -> bool:
         """Check if a table exists in the database."""
@@ -340,7 +554,69 @@ class QtSqliteDatabaseManagerBase:
 
         return True
 
+    def _fetch_columns_qt(self, query_text: str, params: dict[str, Any] | None) -> list[list[Any]]:
+        """Read a Qt query result into per-column lists (column count resolved once)."""
+        query = execute_qt_sql_query(
+            ensure_connection=self._ensure_connection,
+            create_query=self._create_query,
+            query_text=query_text,
+            params=params,
+            statement_cache=self._statement_cache,
+        )
+        if not query:
+            return []
+        profiler = active_sql_profiler()
+        started = time.perf_counter() if profiler is not None else 0.0
+        try:
+            column_count = query.record().count()
+            columns: list[list[Any]] = [[] for _ in range(column_count)]
+            appenders = [(index, column.append) for index, column in enumerate(columns)]
+            value = query.value
+            next_row = query.next
+            while next_row():
+                for index, append in appenders:
+                    append(value(index))
+            if profiler is not None:
+                row_count = len(columns[0]) if columns else 0
+                profiler.record_fetch(query, rows=row_count, seconds=time.perf_counter() - started)
+        finally:
+            self._statement_cache.release(query)
+        return columns
+
+    def _fetch_columns_read_only(self, query_text: str, params: dict[str, Any] | None) -> list[list[Any]]:
+        """Read a result through the stdlib `sqlite3` read-only connection into per-column lists."""
+        if self._read_only_connection is None:
+            uri = f"{Path(self._db_filename).resolve().as_uri()}?mode=ro"
+            self._read_only_connection = sqlite3.connect(uri, uri=True)
+        cursor = self._read_only_connection.execute(query_text, params or {})
+        try:
+            rows = cursor.fetchall()
+            column_count = len(cursor.description or ())
+        finally:
+            cursor.close()
+        if not rows:
+            return [[] for _ in range(column_count)]
+        return [list(column) for column in zip(*rows, strict=True)]
+
+    def _note_write(self, query_text: str) -> None:
+        """Bump result-cache generations of the tables `query_text` may have changed."""
+        tables = tables_written_by(query_text)
+        if tables is not None and not tables:
+            return
+        written = (ALL_TABLES,) if tables is None else tables
+        self._table_generations.bump(written)
+        if self._transaction_depth > 0:
+            self._transaction_tables.update(written)
+
     def _reconnect(self) -> None:
+        self._statement_cache.clear()
+        self._result_cache.clear()
+        if self._read_only_pool is not None:
+            self.db = None
+            self._read_only_pool.release(self.connection_name)
+            self.connection_name, self.db = self._read_only_pool.acquire()
+            self._db_closed = False
+            return
         self.connection_name, self.db = reconnect_thread_scoped_qsqlite(
             connection_name=self.connection_name,
             db=self.db,
@@ -349,6 +625,10 @@ class QtSqliteDatabaseManagerBase:
         )
         self._db_closed = False
 
+    def _schema_migrations(self) -> Sequence[SchemaMigration]:
+        """Return this app's ordered schema migrations (none by default)."""
+        return ()
+
     @staticmethod
     def _strip_sql_line_comments(sql: str) -> str:
         """Remove `--` comments so `;` inside comments cannot break statement splitting.
@@ -387,3 +667,8 @@ class QtSqliteDatabaseManagerBase:
                 i += 1
             lines.append("".join(out))
         return "\n".join(lines)
+
+
+def _raise_runtime_error(message: str) -> NoReturn:
+    """Raise `RuntimeError` (helper for TRY301 inside SQL transactions)."""
+    raise RuntimeError(message)
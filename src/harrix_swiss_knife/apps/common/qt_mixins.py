@@ -19,12 +19,11 @@ from datetime import UTC, datetime
 from functools import partial
 from typing import TYPE_CHECKING, Any
 
-from PySide6.QtCore import QDate, QModelIndex, QSortFilterProxyModel
-from PySide6.QtGui import QStandardItemModel
+from PySide6.QtCore import QAbstractItemModel, QDate, QModelIndex, QSortFilterProxyModel
 from PySide6.QtWidgets import QWidget
 
 from harrix_swiss_knife.apps.common import message_box
-from harrix_swiss_knife.apps.common.table_models import create_colored_table_proxy_model
+from harrix_swiss_knife.apps.common.table_models import create_colored_table_proxy_model, source_row_id
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -39,7 +38,7 @@ class AutoSaveMixin:
     _SAFE_TABLES: set[str]
     _validate_database_connection: Callable[[], bool]
     _auto_save_handlers: dict[str, Callable[..., None]]
-    _auto_save_source_models: dict[str, QStandardItemModel]
+    _auto_save_source_models: dict[str, QAbstractItemModel]
 
     def _after_table_data_changed(
         self,
@@ -49,7 +48,7 @@ class AutoSaveMixin:
     ) -> None:
         """Run after standard row auto-save completes."""
 
-    def _auto_save_row(self, table_name: str, model: QStandardItemModel, row: int, row_id: str) -> None:
+    def _auto_save_row(self, table_name: str, model: QAbstractItemModel, row: int, row_id: str) -> None:
         """Dispatch auto-save for one table row via app-specific handlers."""
         if not self._validate_database_connection():
             return
@@ -122,7 +121,7 @@ class AutoSaveMixin:
         table_name: str,
         top_left: QModelIndex,
         bottom_right: QModelIndex,
-        model: QStandardItemModel,
+        model: QAbstractItemModel,
         _roles: list | None = None,
     ) -> bool:
         """Return `True` when a non-row auto-save handler processed the change."""
@@ -144,7 +143,7 @@ class AutoSaveMixin:
             if proxy_model is None:
                 return
             source_model = proxy_model.sourceModel()
-            if not isinstance(source_model, QStandardItemModel):
+            if source_model is None:
                 return
 
             if self._handle_special_table_data_changed(table_name, top_left, bottom_right, source_model, _roles):
@@ -153,10 +152,9 @@ class AutoSaveMixin:
             for row in range(top_left.row(), bottom_right.row() + 1):
                 if row >= source_model.rowCount():
                     continue
-                vertical_header_item = source_model.verticalHeaderItem(row)
-                if vertical_header_item is None:
+                row_id = source_row_id(source_model, row)
+                if row_id is None:
                     continue
-                row_id = vertical_header_item.text()
                 self._auto_save_row(table_name, source_model, row, row_id)
 
             self._after_table_data_changed(table_name, top_left, bottom_right)
@@ -273,13 +271,20 @@ class TableOperations:
         id_column: int = -2,
         *,
         color_column: int = -1,
+        lazy: bool = False,
     ) -> QSortFilterProxyModel:
-        """Return a proxy model filled with colored table data."""
+        """Return a proxy model filled with colored table data.
+
+        With `lazy=True` the source model is a `LazyTableModel`; use it for large read-mostly
+        tables whose handlers do not rely on `QStandardItemModel`-only APIs.
+
+        """
         return create_colored_table_proxy_model(
             data,
             headers,
             id_column=id_column,
             color_column=color_column,
+            lazy=lazy,
         )
 
     def _get_selected_row_id(self, table_name: str) -> int | None:
@@ -306,15 +311,15 @@ class TableOperations:
                 return None
 
             source_model = model.sourceModel()
-            if not isinstance(source_model, QStandardItemModel):
+            if source_model is None:
                 return None
 
             source_index = model.mapToSource(index)
             if not source_index.isValid():
                 return None
 
-            vertical_header_item = source_model.verticalHeaderItem(source_index.row())
-            return int(vertical_header_item.text()) if vertical_header_item else None
+            row_id = source_row_id(source_model, source_index.row())
+            return int(row_id) if row_id else None
 
         except (KeyError, ValueError, TypeError, AttributeError):
             return None
@@ -344,7 +349,7 @@ class TableOperations:
                 return ids
 
             source_model = proxy_model.sourceModel()
-            if not isinstance(source_model, QStandardItemModel):
+            if source_model is None:
                 return ids
 
             seen_source_rows: set[int] = set()
@@ -356,9 +361,9 @@ class TableOperations:
                 if row in seen_source_rows:
                     continue
                 seen_source_rows.add(row)
-                vertical_header_item = source_model.verticalHeaderItem(row)
-                if vertical_header_item:
-                    ids.append(int(vertical_header_item.text()))
+                row_id = source_row_id(source_model, row)
+                if row_id:
+                    ids.append(int(row_id))
         except (KeyError, ValueError, TypeError, AttributeError):
             return []
         return ids
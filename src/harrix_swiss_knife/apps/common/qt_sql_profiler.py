@@ -0,0 +1,543 @@
+"""Opt-in SQL profiling for `qt_sql_runner`: statement timings, refresh cycles and a slow-query log.
+
+Profiling is off unless `enable_sql_profiling` installed a profiler; the app entry
+point does so when the `HSK_SQL_PROFILE` environment variable is set. While off,
+the runner pays one `active_sql_profiler()` call per statement.
+
+While on, every statement executed through the runner is recorded under its SQL
+fingerprint (literals replaced by `?`, whitespace collapsed) with bind count, row
+count, wall time (execution plus fetch) and the calling app method. Statements slower
+than `slow_threshold_ms` get their `EXPLAIN QUERY PLAN` captured and are appended as
+one JSON object per line to a rotating slow-query log. Bound values are never logged.
+
+Example:
+
+```shell
+set HSK_SQL_PROFILE=1
+uv run python -m harrix_swiss_knife.apps.finance.main
+hsk dev sql-profile-report --top 15
+```
+
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+DEFAULT_SLOW_QUERY_THRESHOLD_MS = 50.0
+DEFAULT_SLOW_LOG_MAX_BYTES = 2_000_000
+DEFAULT_SLOW_LOG_BACKUP_COUNT = 3
+ENV_SQL_PROFILE = "HSK_SQL_PROFILE"
+ENV_SQL_PROFILE_LOG = "HSK_SQL_PROFILE_LOG"
+ENV_SQL_PROFILE_SLOW_MS = "HSK_SQL_PROFILE_SLOW_MS"
+SLOW_QUERY_LOG_NAME = "sql_slow_queries.jsonl"
+
+_EXPLAINABLE_KEYWORDS = frozenset({"SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE"})
+_MAX_PENDING_PER_THREAD = 32
+_PROFILER_MODULES = frozenset(
+    {
+        "harrix_swiss_knife.apps.common.qt_database_manager_base",
+        "harrix_swiss_knife.apps.common.qt_sql_profiler",
+        "harrix_swiss_knife.apps.common.qt_sql_runner",
+        "harrix_swiss_knife.apps.common.schema_migrations",
+        "contextlib",
+    }
+)
+_SQL_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SQL_LINE_COMMENT = re.compile(r"--[^\n]*")
+_SQL_NUMBER_LITERAL = re.compile(r"(?<![\w:.])\d+(?:\.\d+)?\b")
+_SQL_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_SQL_WHITESPACE = re.compile(r"\s+")
+
+_active_profiler: QtSqlProfiler | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class QtSqlCycleSummary:
+    """SQL work done inside one `QtSqlProfiler.cycle` (e.g. one `update_all` refresh)."""
+
+    name: str
+    statements: int
+    sql_ms: float
+    wall_ms: float
+    slowest_fingerprint: str
+    slowest_ms: float
+
+
+@dataclass(slots=True)
+class QtSqlFingerprintStats:
+    """Aggregated timings of every statement sharing one SQL fingerprint."""
+
+    fingerprint: str
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    rows: int = 0
+    binds: int = 0
+    slow_calls: int = 0
+    callers: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def mean_ms(self) -> float:
+        """Return the average wall time per call (`0.0` before the first call)."""
+        return self.total_ms / self.calls if self.calls else 0.0
+
+    def add(self, *, elapsed_ms: float, rows: int, binds: int, caller: str, is_slow: bool) -> None:
+        """Fold one finished statement into the totals."""
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.rows += max(rows, 0)
+        self.binds += binds
+        self.slow_calls += int(is_slow)
+        self.callers[caller] += 1
+
+
+class QtSqlProfiler:
+    """Collect per-fingerprint SQL statistics, refresh-cycle summaries and slow-query log entries.
+
+    Safe to share between the GUI thread and worker threads: aggregation is guarded by
+    a lock, while pending statements and the current cycle are tracked per thread.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        slow_threshold_ms: float = DEFAULT_SLOW_QUERY_THRESHOLD_MS,
+        slow_log_path: Path | None = None,
+        max_log_bytes: int = DEFAULT_SLOW_LOG_MAX_BYTES,
+        backup_count: int = DEFAULT_SLOW_LOG_BACKUP_COUNT,
+        max_cycles: int = 100,
+    ) -> None:
+        """Create a profiler; `slow_log_path=None` keeps slow statements in memory only.
+
+        Args:
+
+        - `slow_threshold_ms` (`float`): Statements at or above this wall time are slow.
+          Defaults to `DEFAULT_SLOW_QUERY_THRESHOLD_MS`.
+        - `slow_log_path` (`Path | None`): JSON-lines slow-query log. Defaults to `None`.
+        - `max_log_bytes` (`int`): Size at which the log rotates. Defaults to `DEFAULT_SLOW_LOG_MAX_BYTES`.
+        - `backup_count` (`int`): Rotated files to keep. Defaults to `DEFAULT_SLOW_LOG_BACKUP_COUNT`.
+        - `max_cycles` (`int`): Cycle summaries to keep. Defaults to `100`.
+
+        """
+        self.slow_threshold_ms = slow_threshold_ms
+        self.slow_log_path = slow_log_path
+        self.cycles: deque[QtSqlCycleSummary] = deque(maxlen=max_cycles)
+        self.slow_entries: deque[dict[str, Any]] = deque(maxlen=200)
+        self._fingerprints: dict[str, QtSqlFingerprintStats] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._log_handler: RotatingFileHandler | None = None
+        if slow_log_path is not None:
+            slow_log_path.parent.mkdir(parents=True, exist_ok=True)
+            self._log_handler = RotatingFileHandler(
+                slow_log_path, maxBytes=max_log_bytes, backupCount=backup_count, encoding="utf-8", delay=True
+            )
+            self._log_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    def close(self) -> None:
+        """Finish pending statements of the calling thread and close the slow-query log."""
+        self.flush()
+        if self._log_handler is not None:
+            self._log_handler.close()
+            self._log_handler = None
+
+    @contextmanager
+    def cycle(self, name: str) -> Iterator[None]:
+        """Group the statements run inside the block into one `QtSqlCycleSummary`."""
+        previous = getattr(self._local, "cycle", None)
+        current = _CycleTotals(name)
+        self._local.cycle = current
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.flush()
+            self._local.cycle = previous
+            summary = QtSqlCycleSummary(
+                name=name,
+                statements=current.statements,
+                sql_ms=current.sql_ms,
+                wall_ms=(time.perf_counter() - started) * 1000,
+                slowest_fingerprint=current.slowest_fingerprint,
+                slowest_ms=current.slowest_ms,
+            )
+            with self._lock:
+                self.cycles.append(summary)
+            logger.info(
+                "SQL cycle %s: %s statements, %.1f ms in SQL of %.1f ms (slowest %.1f ms: %s)",
+                name,
+                summary.statements,
+                summary.sql_ms,
+                summary.wall_ms,
+                summary.slowest_ms,
+                summary.slowest_fingerprint,
+            )
+
+    def fingerprint_stats(self) -> list[QtSqlFingerprintStats]:
+        """Return a snapshot of per-fingerprint totals."""
+        with self._lock:
+            return list(self._fingerprints.values())
+
+    def flush(self) -> None:
+        """Finish every statement of the calling thread whose result was never fetched."""
+        pending = self._pending()
+        while pending:
+            _, record = pending.popitem()
+            self._finish(record)
+
+    def record_fetch(self, query: object, *, rows: int, seconds: float) -> None:
+        """Add the time and row count of reading `query`'s result, then finish its statement."""
+        record = self._pending().pop(id(query), None)
+        if record is None:
+            return
+        record.rows = rows
+        record.elapsed_ms += seconds * 1000
+        self._finish(record)
+
+    def record_statement(
+        self,
+        query: object,
+        query_text: str,
+        *,
+        binds: int,
+        seconds: float,
+        rows: int | None,
+        explain: Callable[[], list[str]],
+    ) -> None:
+        """Record one executed statement.
+
+        Statements that return rows (`rows=None`) stay pending until `record_fetch`
+        adds the fetch time; everything else is finished immediately.
+
+        Args:
+
+        - `query` (`object`): The executed `QSqlQuery`, used to match `record_fetch`.
+        - `query_text` (`str`): SQL as executed.
+        - `binds` (`int`): Number of bound values.
+        - `seconds` (`float`): Execution wall time.
+        - `rows` (`int | None`): Affected rows, or `None` when the result is fetched later.
+        - `explain` (`Callable[[], list[str]]`): Return the `EXPLAIN QUERY PLAN` details.
+
+        """
+        record = _StatementRecord(
+            fingerprint=sql_fingerprint(query_text),
+            query_text=query_text,
+            binds=binds,
+            rows=-1 if rows is None else rows,
+            elapsed_ms=seconds * 1000,
+            caller=_calling_method(),
+            explain=explain,
+            cycle=getattr(self._local, "cycle", None),
+        )
+        if rows is not None:
+            self._finish(record)
+            return
+        pending = self._pending()
+        previous = pending.pop(id(query), None)
+        if previous is not None:
+            self._finish(previous)
+        pending[id(query)] = record
+        if len(pending) > _MAX_PENDING_PER_THREAD:
+            self._finish(pending.pop(next(iter(pending))))
+
+    def report(self, top: int = 10, order_by: str = "total_ms") -> str:
+        """Return the top-`top` fingerprints by `order_by` as a text table."""
+        self.flush()
+        return format_sql_profile_report(self.fingerprint_stats(), top=top, order_by=order_by)
+
+    def reset(self) -> None:
+        """Drop collected statistics, cycles and in-memory slow entries."""
+        self._pending().clear()
+        with self._lock:
+            self._fingerprints.clear()
+            self.cycles.clear()
+            self.slow_entries.clear()
+
+    def _finish(self, record: _StatementRecord) -> None:
+        is_slow = record.elapsed_ms >= self.slow_threshold_ms
+        with self._lock:
+            stats = self._fingerprints.get(record.fingerprint)
+            if stats is None:
+                stats = self._fingerprints[record.fingerprint] = QtSqlFingerprintStats(record.fingerprint)
+            stats.add(
+                elapsed_ms=record.elapsed_ms,
+                rows=record.rows,
+                binds=record.binds,
+                caller=record.caller,
+                is_slow=is_slow,
+            )
+        if record.cycle is not None:
+            record.cycle.add(record.fingerprint, record.elapsed_ms)
+        if is_slow:
+            self._log_slow(record)
+
+    def _log_slow(self, record: _StatementRecord) -> None:
+        entry = {
+            "time": datetime.now(UTC).isoformat(timespec="milliseconds"),
+            "cycle": record.cycle.name if record.cycle is not None else None,
+            "fingerprint": record.fingerprint,
+            "sql": record.query_text,
+            "binds": record.binds,
+            "rows": record.rows,
+            "elapsed_ms": round(record.elapsed_ms, 3),
+            "caller": record.caller,
+            "thread": threading.current_thread().name,
+            "plan": _explain_safely(record),
+        }
+        with self._lock:
+            self.slow_entries.append(entry)
+            if self._log_handler is not None:
+                self._log_handler.handle(logging.makeLogRecord({"msg": json.dumps(entry, ensure_ascii=False)}))
+
+    def _pending(self) -> dict[int, _StatementRecord]:
+        pending = getattr(self._local, "pending", None)
+        if pending is None:
+            pending = self._local.pending = {}
+        return pending
+
+
+def active_sql_profiler() -> QtSqlProfiler | None:
+    """Return the installed profiler, or `None` when profiling is off."""
+    return _active_profiler
+
+
+def default_slow_query_log_path() -> Path:
+    """Return the slow-query log path (`HSK_SQL_PROFILE_LOG` or the action output directory)."""
+    override = os.environ.get(ENV_SQL_PROFILE_LOG, "").strip()
+    if override:
+        return Path(override).expanduser()
+    from harrix_swiss_knife.paths import get_action_output_dir  # noqa: PLC0415
+
+    return get_action_output_dir() / SLOW_QUERY_LOG_NAME
+
+
+def disable_sql_profiling() -> QtSqlProfiler | None:
+    """Uninstall and close the active profiler; return it so its statistics can still be read."""
+    global _active_profiler
+    profiler, _active_profiler = _active_profiler, None
+    if profiler is not None:
+        profiler.close()
+    return profiler
+
+
+def enable_sql_profiling(profiler: QtSqlProfiler | None = None) -> QtSqlProfiler:
+    """Install `profiler` (or a new in-memory one) for every runner call in the process."""
+    global _active_profiler  # noqa: PLW0603
+    if _active_profiler is not None and _active_profiler is not profiler:
+        _active_profiler.close()
+    _active_profiler = profiler or QtSqlProfiler()
+    return _active_profiler
+
+
+def enable_sql_profiling_from_env() -> QtSqlProfiler | None:
+    """Enable profiling with a file slow-query log when `HSK_SQL_PROFILE` is set to a true value."""
+    if os.environ.get(ENV_SQL_PROFILE, "").strip().lower() in {"", "0", "false", "no", "off"}:
+        return None
+    threshold = DEFAULT_SLOW_QUERY_THRESHOLD_MS
+    raw_threshold = os.environ.get(ENV_SQL_PROFILE_SLOW_MS, "").strip()
+    if raw_threshold:
+        try:
+            threshold = float(raw_threshold)
+        except ValueError:
+            logger.warning("Ignoring invalid %s=%r", ENV_SQL_PROFILE_SLOW_MS, raw_threshold)
+    log_path = default_slow_query_log_path()
+    logger.info("SQL profiling enabled (slow threshold %.1f ms, log %s)", threshold, log_path)
+    return enable_sql_profiling(QtSqlProfiler(slow_threshold_ms=threshold, slow_log_path=log_path))
+
+
+def format_sql_profile_report(
+    stats: Iterable[QtSqlFingerprintStats], *, top: int = 10, order_by: str = "total_ms"
+) -> str:
+    """Format the top-`top` fingerprints as a plain-text table.
+
+    Args:
+
+    - `stats` (`Iterable[QtSqlFingerprintStats]`): Per-fingerprint totals.
+    - `top` (`int`): Number of rows to show. Defaults to `10`.
+    - `order_by` (`str`): `total_ms`, `max_ms`, `mean_ms`, `calls` or `rows`. Defaults to `total_ms`.
+
+    Returns:
+
+    - `str`: Report text (one header line when there is nothing to report).
+
+    Raises:
+
+    - `ValueError`: If `order_by` is not a supported column.
+
+    """
+    columns = ("total_ms", "max_ms", "mean_ms", "calls", "rows")
+    if order_by not in columns:
+        msg = f"order_by must be one of {', '.join(columns)}: {order_by!r}"
+        raise ValueError(msg)
+    ranked = sorted(stats, key=lambda item: getattr(item, order_by), reverse=True)[: max(top, 0)]
+    lines = [f"{'total ms':>10} {'calls':>7} {'mean ms':>9} {'max ms':>9} {'rows':>9} {'slow':>5}  caller / SQL"]
+    for item in ranked:
+        caller = item.callers.most_common(1)[0][0] if item.callers else "?"
+        lines.append(
+            f"{item.total_ms:10.1f} {item.calls:7d} {item.mean_ms:9.2f} {item.max_ms:9.2f} "
+            f"{item.rows:9d} {item.slow_calls:5d}  {caller}"
+        )
+        lines.append(f"{'':>54}{_shorten(item.fingerprint, 160)}")
+    return "\n".join(lines)
+
+
+def load_slow_query_log(path: Path, *, include_rotated: bool = True) -> list[dict[str, Any]]:
+    """Read slow-query log entries (oldest rotated file first), skipping malformed lines."""
+    paths = [path]
+    if include_rotated:
+        rotated = sorted(
+            path.parent.glob(f"{path.name}.*"),
+            key=lambda item: int(item.suffix[1:]) if item.suffix[1:].isdigit() else 0,
+            reverse=True,
+        )
+        paths = [*rotated, path]
+    entries: list[dict[str, Any]] = []
+    for log_path in paths:
+        if not log_path.is_file():
+            continue
+        for line in log_path.read_text(encoding="utf-8").splitlines():
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(entry, dict) and "fingerprint" in entry:
+                entries.append(entry)
+    return entries
+
+
+def slow_query_log_stats(entries: Iterable[dict[str, Any]]) -> list[QtSqlFingerprintStats]:
+    """Aggregate slow-query log entries per fingerprint for `format_sql_profile_report`."""
+    stats: dict[str, QtSqlFingerprintStats] = {}
+    for entry in entries:
+        fingerprint = str(entry["fingerprint"])
+        item = stats.get(fingerprint)
+        if item is None:
+            item = stats[fingerprint] = QtSqlFingerprintStats(fingerprint)
+        item.add(
+            elapsed_ms=float(entry.get("elapsed_ms", 0.0)),
+            rows=int(entry.get("rows", -1)),
+            binds=int(entry.get("binds", 0)),
+            caller=str(entry.get("caller", "?")),
+            is_slow=True,
+        )
+    return list(stats.values())
+
+
+@functools.lru_cache(maxsize=1024)
+def sql_fingerprint(query_text: str) -> str:
+    """Return `query_text` with comments removed, literals replaced by `?` and whitespace collapsed."""
+    text = _SQL_LINE_COMMENT.sub(" ", query_text)
+    text = _SQL_STRING_LITERAL.sub("?", text)
+    text = _SQL_NUMBER_LITERAL.sub("?", text)
+    text = _SQL_IN_LIST.sub("(?, ...)", text)
+    return _SQL_WHITESPACE.sub(" ", text).strip()
+
+
+def sql_profile_cycle(name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Decorate a refresh method so its SQL is summarised as one profiler cycle named `name`.
+
+    Without an active profiler the wrapped method is called directly.
+
+    """
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            profiler = _active_profiler
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.cycle(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def statement_is_explainable(query_text: str) -> bool:
+    """Return whether `EXPLAIN QUERY PLAN` makes sense for `query_text`."""
+    words = query_text.lstrip().split(maxsplit=1)
+    return bool(words) and words[0].upper() in _EXPLAINABLE_KEYWORDS
+
+
+class _CycleTotals:
+    """Mutable per-thread totals of the cycle currently open on that thread."""
+
+    __slots__ = ("name", "slowest_fingerprint", "slowest_ms", "sql_ms", "statements")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.statements = 0
+        self.sql_ms = 0.0
+        self.slowest_fingerprint = ""
+        self.slowest_ms = 0.0
+
+    def add(self, fingerprint: str, elapsed_ms: float) -> None:
+        self.statements += 1
+        self.sql_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_fingerprint = fingerprint
+
+
+@dataclass(slots=True)
+class _StatementRecord:
+    fingerprint: str
+    query_text: str
+    binds: int
+    rows: int
+    elapsed_ms: float
+    caller: str
+    explain: Callable[[], list[str]]
+    cycle: _CycleTotals | None
+
+
+def _calling_method() -> str:
+    """Return `module:qualname` of the nearest frame outside the database plumbing."""
+    frame = sys._getframe(2)  # noqa: SLF001
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module not in _PROFILER_MODULES:
+            return f"{module.removeprefix('harrix_swiss_knife.apps.')}:{frame.f_code.co_qualname}"
+        frame = frame.f_back
+    return "?"
+
+
+def _explain_safely(record: _StatementRecord) -> list[str]:
+    if not statement_is_explainable(record.query_text):
+        return []
+    try:
+        return record.explain()
+    except Exception:
+        logger.exception("Failed to capture EXPLAIN QUERY PLAN for slow statement")
+        return []
+
+
+def _shorten(text: str, limit: int) -> str:
+    return text if len(text) <= limit else f"{text[: limit - 3]}..."
@@ -3,16 +3,207 @@
 from __future__ import annotations
 
 import logging
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
+from harrix_swiss_knife.apps.common.qt_sql_profiler import active_sql_profiler
+
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterable, Sequence
 
     from PySide6.QtSql import QSqlQuery
 
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_STATEMENT_CACHE_SIZE = 64
+
+
+class QtSqlStatementCache:
+    """Bounded LRU cache of prepared `QSqlQuery` objects keyed by SQL text.
+
+    One cache belongs to one Qt connection: cached queries are bound to it and must
+    be dropped with `clear` before that connection is closed or replaced.
+
+    A cached query is reused only by callers that consume its result before the
+    next execution (see `execute_qt_sql_simple` and `get_rows` in
+    `QtSqliteDatabaseManagerBase`), so nested use of the same SQL is safe.
+
+    """
+
+    def __init__(self, max_size: int = DEFAULT_STATEMENT_CACHE_SIZE) -> None:
+        """Create an empty cache holding at most `max_size` prepared statements."""
+        self.max_size = max(1, max_size)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._queries: OrderedDict[str, QSqlQuery] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of prepared statements currently cached."""
+        return len(self._queries)
+
+    def acquire(self, query_text: str, create_query: Callable[[], QSqlQuery]) -> QSqlQuery | None:
+        """Return a prepared query for `query_text`, preparing and caching it on a miss.
+
+        Returns:
+
+        - `QSqlQuery | None`: Prepared query, or `None` when preparation failed.
+
+        """
+        query = self._queries.get(query_text)
+        if query is not None:
+            self._queries.move_to_end(query_text)
+            self.hits += 1
+            return query
+
+        self.misses += 1
+        query = create_query()
+        if not _prepare_query(query, query_text):
+            return None
+        self._queries[query_text] = query
+        while len(self._queries) > self.max_size:
+            _, evicted = self._queries.popitem(last=False)
+            evicted.finish()
+            evicted.clear()
+            self.evictions += 1
+        return query
+
+    def clear(self) -> None:
+        """Release every cached statement (required before the connection closes)."""
+        for query in self._queries.values():
+            query.finish()
+            query.clear()
+        self._queries.clear()
+
+    def discard(self, query_text: str) -> None:
+        """Drop the cached statement for `query_text`, e.g. after an execution error."""
+        query = self._queries.pop(query_text, None)
+        if query is not None:
+            query.finish()
+            query.clear()
+
+    def release(self, query: QSqlQuery) -> None:
+        """Reset `query` after its result was consumed; the prepared statement is kept."""
+        query.finish()
+
+    def reset_stats(self) -> None:
+        """Zero the hit/miss/eviction counters."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> QtSqlStatementCacheStats:
+        """Return a snapshot of cache counters."""
+        return QtSqlStatementCacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            size=len(self._queries),
+            max_size=self.max_size,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class QtSqlStatementCacheStats:
+    """Counters of a `QtSqlStatementCache` at one point in time."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Return hits divided by lookups (`0.0` before the first lookup)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def execute_qt_sql_many(
+    *,
+    ensure_connection: Callable[[], bool],
+    create_query: Callable[[], QSqlQuery],
+    query_text: str,
+    params_seq: Iterable[Mapping[str, Any] | Sequence[Any]],
+    statement_cache: QtSqlStatementCache | None = None,
+) -> int | None:
+    """Prepare `query_text` once and execute it for every parameter set in `params_seq`.
+
+    QSQLITE has no native batch binding (`execBatch` is emulated by repeated
+    execution), so the statement is re-executed with fresh bindings. The caller owns
+    the surrounding transaction.
+
+    Args:
+
+    - `ensure_connection`: Return whether the database connection is usable.
+    - `create_query`: Build a `QSqlQuery` bound to the open connection.
+    - `query_text`: Parametrised SQL statement.
+    - `params_seq`: Parameter sets; a mapping binds named placeholders, a sequence binds
+      positional `?` placeholders in order.
+    - `statement_cache`: Optional cache to take the prepared statement from. Defaults to `None`.
+
+    Returns:
+
+    - `int | None`: Number of executed parameter sets, or `None` on the first failure.
+
+    """
+    if not ensure_connection():
+        logger.error("Database connection is not available for query execution")
+        return None
+
+    query: QSqlQuery | None = None
+    executed = 0
+    bound = 0
+    profiler = active_sql_profiler()
+    started = time.perf_counter() if profiler is not None else 0.0
+    try:
+        if statement_cache is not None:
+            query = statement_cache.acquire(query_text, create_query)
+            if query is None:
+                return None
+        else:
+            query = create_query()
+            if not _prepare_query(query, query_text):
+                return None
+
+        for params in params_seq:
+            _bind_params(query, params)
+            if not query.exec():
+                error_msg = query.lastError().text() if query.lastError().isValid() else "Unknown execution error"
+                logger.error("Failed to execute Qt SQL batch item %s: %s", executed, error_msg)
+                if statement_cache is not None:
+                    statement_cache.discard(query_text)
+                return None
+            executed += 1
+            bound += len(params)
+
+    except Exception:
+        logger.exception("Exception during Qt SQL batch execution")
+        if statement_cache is not None:
+            statement_cache.discard(query_text)
+        return None
+
+    else:
+        if profiler is not None:
+            profiler.record_statement(
+                query,
+                query_text,
+                binds=bound,
+                seconds=time.perf_counter() - started,
+                rows=executed,
+                explain=lambda: _explain_query_plan(create_query, query_text, None),
+            )
+        if statement_cache is not None:
+            statement_cache.release(query)
+        else:
+            query.clear()
+        return executed
+
 
 def execute_qt_sql_query(
     *,
@@ -20,15 +211,21 @@ def execute_qt_sql_query(
     create_query: Callable[[], QSqlQuery],
     query_text: str,
     params: dict[str, Any] | None = None,
+    statement_cache: QtSqlStatementCache | None = None,
 ) -> QSqlQuery | None:
     """Prepare and execute `query_text` with optional bound `params`.
 
+    With a `statement_cache`, the returned query is shared: the caller must read the
+    whole result and hand it back through `QtSqlStatementCache.release` before running
+    the same SQL again.
+
     Args:
 
     - `ensure_connection`: Return whether the database connection is usable.
     - `create_query`: Build a `QSqlQuery` bound to the open connection.
     - `query_text`: Parametrised SQL statement.
     - `params`: Values for named placeholders. Defaults to `None`.
+    - `statement_cache`: Optional cache to take the prepared statement from. Defaults to `None`.
 
     Returns:
 
@@ -40,23 +237,29 @@ def execute_qt_sql_query(
         return None
 
     try:
-        query = create_query()
-        if not query.prepare(query_text):
-            error_msg = query.lastError().text() if query.lastError().isValid() else "Unknown prepare error"
-            logger.error("Failed to prepare Qt SQL query: %s", error_msg)
-            return None
+        if statement_cache is not None:
+            query = statement_cache.acquire(query_text, create_query)
+            if query is None:
+                return None
+        else:
+            query = create_query()
+            if not _prepare_query(query, query_text):
+                return None
 
         if params:
-            for key, value in params.items():
-                query.bindValue(f":{key}", value)
+            _bind_params(query, params)
 
-        if not query.exec():
+        if not _exec_query(query, query_text, params, create_query):
             error_msg = query.lastError().text() if query.lastError().isValid() else "Unknown execution error"
             logger.error("Failed to execute Qt SQL query: %s", error_msg)
+            if statement_cache is not None:
+                statement_cache.discard(query_text)
             return None
 
     except Exception:
         logger.exception("Exception during Qt SQL query execution")
+        if statement_cache is not None:
+            statement_cache.discard(query_text)
         return None
 
     else:
@@ -69,6 +272,7 @@ def execute_qt_sql_simple(
     create_query: Callable[[], QSqlQuery],
     query_text: str,
     params: dict[str, Any] | None = None,
+    statement_cache: QtSqlStatementCache | None = None,
 ) -> bool:
     """Execute INSERT/UPDATE/DELETE and return success; clear query on success.
 
@@ -78,37 +282,87 @@ def execute_qt_sql_simple(
     - `create_query`: Build a `QSqlQuery` bound to the open connection.
     - `query_text`: Parametrised SQL statement.
     - `params`: Values for named placeholders. Defaults to `None`.
+    - `statement_cache`: Optional cache to take the prepared statement from; the cached
+      statement is reset instead of cleared. Defaults to `None`.
 
     Returns:
 
     - `bool`: `True` if successful, `False` otherwise.
 
     """
-    if not ensure_connection():
-        logger.error("Database connection is not available for query execution")
+    query = execute_qt_sql_query(
+        ensure_connection=ensure_connection,
+        create_query=create_query,
+        query_text=query_text,
+        params=params,
+        statement_cache=statement_cache,
+    )
+    if query is None:
         return False
+    if statement_cache is not None:
+        statement_cache.release(query)
+    else:
+        query.clear()
+    return True
 
-    try:
-        query = create_query()
-        if not query.prepare(query_text):
-            error_msg = query.lastError().text() if query.lastError().isValid() else "Unknown prepare error"
-            logger.error("Failed to prepare Qt SQL query: %s", error_msg)
-            return False
 
-        if params:
-            for key, value in params.items():
-                query.bindValue(f":{key}", value)
+def _bind_params(query: QSqlQuery, params: Mapping[str, Any] | Sequence[Any]) -> None:
+    """Bind named (`Mapping`) or positional (sequence) values onto a prepared query."""
+    if isinstance(params, Mapping):
+        for key, value in params.items():
+            query.bindValue(f":{key}", value)
+        return
+    for position, value in enumerate(params):
+        query.bindValue(position, value)
 
-        success = query.exec()
-        if not success:
-            error_msg = query.lastError().text() if query.lastError().isValid() else "Unknown execution error"
-            logger.error("Failed to execute Qt SQL query: %s", error_msg)
-            return False
 
-    except Exception:
-        logger.exception("Exception during Qt SQL query execution")
+def _exec_query(
+    query: QSqlQuery, query_text: str, params: dict[str, Any] | None, create_query: Callable[[], QSqlQuery]
+) -> bool:
+    """Execute a prepared query, reporting it to the active SQL profiler when there is one."""
+    profiler = active_sql_profiler()
+    if profiler is None:
+        return query.exec()
+
+    started = time.perf_counter()
+    if not query.exec():
         return False
+    profiler.record_statement(
+        query,
+        query_text,
+        binds=len(params) if params else 0,
+        seconds=time.perf_counter() - started,
+        rows=None if query.isSelect() else query.numRowsAffected(),
+        explain=lambda: _explain_query_plan(create_query, query_text, params),
+    )
+    return True
 
-    else:
+
+def _explain_query_plan(
+    create_query: Callable[[], QSqlQuery], query_text: str, params: dict[str, Any] | None
+) -> list[str]:
+    """Return the `detail` column of `EXPLAIN QUERY PLAN` for `query_text` on a separate query."""
+    query = create_query()
+    try:
+        if not query.prepare(f"EXPLAIN QUERY PLAN {query_text}"):
+            return []
+        if params:
+            _bind_params(query, params)
+        if not query.exec():
+            return []
+        details: list[str] = []
+        while query.next():
+            details.append(str(query.value(3)))
+        return details
+    finally:
+        query.finish()
         query.clear()
+
+
+def _prepare_query(query: QSqlQuery, query_text: str) -> bool:
+    """Prepare `query_text` on `query`, logging the driver error on failure."""
+    if query.prepare(query_text):
         return True
+    error_msg = query.lastError().text() if query.lastError().isValid() else "Unknown prepare error"
+    logger.error("Failed to prepare Qt SQL query: %s", error_msg)
+    return False
@@ -1,11 +1,142 @@
-"""Shared Qt SQLite helpers: QSQLITE driver, connection naming, and open."""
+"""Shared Qt SQLite helpers: QSQLITE driver, connection naming, open, and the read-only worker pool."""
 
 from __future__ import annotations
 
+import logging
 import threading
 import uuid
+from dataclasses import dataclass
+from pathlib import Path
 
-from PySide6.QtSql import QSqlDatabase
+from PySide6.QtCore import QThread
+from PySide6.QtSql import QSqlDatabase, QSqlQuery
+
+logger = logging.getLogger(__name__)
+
+# WAL lets pooled readers run while the primary connection writes; `query_only` must come last
+READ_ONLY_PRAGMAS: tuple[str, ...] = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA cache_size = -16384",
+    "PRAGMA query_only = ON",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class QSqlitePoolStats:
+    """Snapshot of `QSqliteReadOnlyPool` usage."""
+
+    created: int
+    reused: int
+    idle: int
+    in_use: int
+
+
+class QSqliteReadOnlyPool:
+    """Long-lived read-only QSQLITE connections handed out to worker threads.
+
+    A Qt connection belongs to one thread at a time: `acquire` pulls an idle connection
+    into the calling thread with `QSqlDatabase.moveToThread` and `release` (called from
+    the same thread, with no live `QSqlQuery` on it) detaches it again so the next worker
+    skips the open and pragma setup. Connections that cannot be handed over are closed.
+
+    """
+
+    db_filename: str
+    max_idle: int
+
+    def __init__(self, db_filename: str, *, prefix: str = "ro_pool", max_idle: int = 4) -> None:
+        """Create an empty pool for `db_filename`; connections are opened lazily."""
+        self.db_filename = db_filename
+        self.max_idle = max_idle
+        self._prefix = prefix
+        self._idle: list[tuple[str, QSqlDatabase]] = []
+        self._in_use: dict[str, QSqlDatabase] = {}
+        self._close_on_release: set[str] = set()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._reused = 0
+
+    def acquire(self) -> tuple[str, QSqlDatabase]:
+        """Return `(connection_name, db)` bound to the calling thread.
+
+        Raises:
+
+        - `ConnectionError`: If a new connection cannot be opened or made read-only.
+
+        """
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                connection_name, db = self._idle.pop()
+            if db.moveToThread(QThread.currentThread()) and db.isOpen():
+                with self._lock:
+                    self._in_use[connection_name] = db
+                    self._reused += 1
+                return connection_name, db
+            db.close()
+            del db
+            QSqlDatabase.removeDatabase(connection_name)
+
+        connection_name = qsqlite_thread_scoped_connection_name(self._prefix)
+        db = add_open_qsqlite(connection_name, self.db_filename, failure_label="Failed to open read-only connection")
+        if not configure_read_only_qsqlite(db):
+            close_and_remove_qsqlite(connection_name, db)
+            msg = f"❌ Failed to configure read-only connection: {self.db_filename}"
+            raise ConnectionError(msg)
+        with self._lock:
+            self._in_use[connection_name] = db
+            self._created += 1
+        return connection_name, db
+
+    def close_all(self) -> None:
+        """Close idle connections; connections in use now are closed when released.
+
+        The pool stays usable: later `acquire` calls open new connections and keep them idle again.
+
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._close_on_release.update(self._in_use)
+        connection_names = []
+        while idle:
+            connection_name, db = idle.pop()
+            db.moveToThread(QThread.currentThread())
+            db.close()
+            del db
+            connection_names.append(connection_name)
+        # Drop our references first so Qt does not warn that the connection is still in use
+        for connection_name in connection_names:
+            QSqlDatabase.removeDatabase(connection_name)
+
+    def release(self, connection_name: str) -> None:
+        """Return a connection from `acquire`; must run in the thread that acquired it."""
+        with self._lock:
+            db = self._in_use.pop(connection_name, None)
+            closing = connection_name in self._close_on_release
+            self._close_on_release.discard(connection_name)
+            keep = db is not None and not closing and len(self._idle) < self.max_idle
+        if db is None:
+            return
+        if keep and db.isOpen() and db.moveToThread(None):
+            with self._lock:
+                self._idle.append((connection_name, db))
+            return
+        db.close()
+        del db
+        QSqlDatabase.removeDatabase(connection_name)
+
+    def stats(self) -> QSqlitePoolStats:
+        """Return connection counters for diagnostics and tests."""
+        with self._lock:
+            return QSqlitePoolStats(
+                created=self._created, reused=self._reused, idle=len(self._idle), in_use=len(self._in_use)
+            )
+
+
+_read_only_pools: dict[str, QSqliteReadOnlyPool] = {}
+_read_only_pools_lock = threading.Lock()
 
 
 def add_open_qsqlite(
@@ -40,6 +171,36 @@ def close_and_remove_qsqlite(connection_name: str | None, db: QSqlDatabase | Non
         QSqlDatabase.removeDatabase(connection_name)
 
 
+def close_shared_read_only_pool(db_filename: str) -> None:
+    """Close the `shared_read_only_pool` of `db_filename` and drop it from the registry.
+
+    Meant for application shutdown or a database switch; a later `shared_read_only_pool`
+    call creates a fresh pool.
+
+    """
+    with _read_only_pools_lock:
+        pool = _read_only_pools.pop(str(Path(db_filename).resolve()), None)
+    if pool is not None:
+        pool.close_all()
+
+
+def configure_read_only_qsqlite(db: QSqlDatabase) -> bool:
+    """Apply `READ_ONLY_PRAGMAS` to `db` and return whether `query_only` is in effect.
+
+    Switching to WAL needs a moment without other writers; if that fails the file keeps
+    its journal mode and the connection is still usable.
+
+    """
+    query = QSqlQuery(db)
+    try:
+        for pragma in READ_ONLY_PRAGMAS:
+            if not query.exec(pragma):
+                logger.warning("%s failed: %s", pragma, query.lastError().text())
+        return query.exec("PRAGMA query_only") and query.next() and query.value(0) == 1
+    finally:
+        query.finish()
+
+
 def open_thread_scoped_qsqlite(
     prefix: str,
     db_filename: str,
@@ -76,6 +237,17 @@ def reconnect_thread_scoped_qsqlite(
     return open_thread_scoped_qsqlite(prefix, db_filename, failure_label=failure_label)
 
 
+def shared_read_only_pool(db_filename: str) -> QSqliteReadOnlyPool:
+    """Return the process-wide `QSqliteReadOnlyPool` for `db_filename` (created on first use)."""
+    key = str(Path(db_filename).resolve())
+    with _read_only_pools_lock:
+        pool = _read_only_pools.get(key)
+        if pool is None:
+            pool = QSqliteReadOnlyPool(db_filename)
+            _read_only_pools[key] = pool
+        return pool
+
+
 def try_add_open_qsqlite(connection_name: str, db_filename: str) -> tuple[QSqlDatabase | None, str | None]:
     """Like `add_open_qsqlite` but return `(None, error_detail)` instead of raising.
 
@@ -0,0 +1,263 @@
+"""Table-generation result cache for `QtSqliteDatabaseManagerBase` read methods.
+
+A read method decorated with `cached_read("currencies", ...)` keeps its result per
+argument tuple. Every write that goes through the manager bumps a generation counter
+for each table the SQL names, and a cached result is reused only while all of its
+tables still have the generations it was computed under.
+
+Generations are shared by every manager opened on the same database file, so a
+commit on the GUI connection invalidates results cached by worker-thread managers.
+The cached results themselves stay per manager: a result read inside an uncommitted
+transaction is never served to another connection, and the tables written by a
+transaction are bumped once more when it commits or rolls back.
+
+Writes made outside the manager (stdlib `sqlite3`, another process) are not seen;
+call `QtSqliteDatabaseManagerBase.invalidate_result_cache` after them.
+
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Concatenate, ParamSpec, Protocol, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+ALL_TABLES = "*"
+DEFAULT_RESULT_CACHE_SIZE = 256
+
+_READ_KEYWORDS = frozenset(
+    {"ANALYZE", "BEGIN", "COMMIT", "END", "EXPLAIN", "PRAGMA", "RELEASE", "ROLLBACK", "SAVEPOINT", "SELECT", "VACUUM"}
+)
+_WRITE_TARGET = re.compile(
+    r"\b(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+[\"`\[]?(\w+)",
+    re.IGNORECASE,
+)
+_INDEX_DDL = re.compile(r"^(?:CREATE\s+(?:UNIQUE\s+)?INDEX|DROP\s+INDEX|REINDEX)\b", re.IGNORECASE)
+
+_generations: dict[str, TableGenerations] = {}
+_generations_lock = threading.Lock()
+
+
+class ResultCacheOwner(Protocol):
+    """Attributes `cached_read` needs from the manager it decorates."""
+
+    _result_cache: QueryResultCache
+    _table_generations: TableGenerations
+
+    def is_database_open(self) -> bool:
+        """Return whether the connection is usable (failed reads are not cached)."""
+        ...
+
+
+class QueryResultCache:
+    """Bounded LRU of read-method results, each tagged with the table generations it saw."""
+
+    def __init__(self, max_size: int = DEFAULT_RESULT_CACHE_SIZE) -> None:
+        """Create an empty cache holding at most `max_size` results."""
+        self.max_size = max(1, max_size)
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.uncacheable = 0
+        self._entries: OrderedDict[tuple[Any, ...], tuple[tuple[int, ...], Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of cached results."""
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop every cached result (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def lookup(self, key: tuple[Any, ...], generations: tuple[int, ...]) -> tuple[bool, Any]:
+        """Return `(True, result)` when `key` was cached under `generations`, else `(False, None)`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == generations:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+                self.stale += 1
+            self.misses += 1
+            return False, None
+
+    def reset_stats(self) -> None:
+        """Zero the hit/miss/stale/uncacheable counters."""
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.uncacheable = 0
+
+    def stats(self) -> QueryResultCacheStats:
+        """Return a snapshot of cache counters."""
+        return QueryResultCacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            stale=self.stale,
+            uncacheable=self.uncacheable,
+            size=len(self._entries),
+            max_size=self.max_size,
+        )
+
+    def store(self, key: tuple[Any, ...], generations: tuple[int, ...], result: object) -> None:
+        """Cache `result` for `key` as computed under `generations`."""
+        with self._lock:
+            self._entries[key] = (generations, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+@dataclass(frozen=True, slots=True)
+class QueryResultCacheStats:
+    """Counters of a `QueryResultCache` at one point in time."""
+
+    hits: int
+    misses: int
+    stale: int
+    uncacheable: int
+    size: int
+    max_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Return hits divided by lookups (`0.0` before the first lookup)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TableGenerations:
+    """Per-table write counters for one database file, shared across threads."""
+
+    def __init__(self) -> None:
+        """Start every table at generation `0`."""
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def bump(self, tables: Iterable[str]) -> None:
+        """Advance the generation of `tables` (`ALL_TABLES` invalidates every table)."""
+        with self._lock:
+            for table in tables:
+                key = table.lower()
+                self._counters[key] = self._counters.get(key, 0) + 1
+
+    def snapshot(self, tables: Iterable[str]) -> tuple[int, ...]:
+        """Return the current generations of `tables` followed by the `ALL_TABLES` generation."""
+        counters = self._counters
+        return (*(counters.get(table, 0) for table in tables), counters.get(ALL_TABLES, 0))
+
+
+def cached_read(
+    *tables: str,
+) -> Callable[[Callable[Concatenate[Any, P], R]], Callable[Concatenate[Any, P], R]]:
+    """Cache a manager read method until one of `tables` is written.
+
+    Arguments must be hashable; calls with unhashable arguments bypass the cache.
+    Containers in the result are copied on every return, so callers may modify them.
+
+    Args:
+
+    - `*tables` (`str`): Every table the method reads, including joined ones.
+
+    Returns:
+
+    - `Callable`: Decorator for methods of a `QtSqliteDatabaseManagerBase` subclass.
+
+    """
+    table_keys = tuple(table.lower() for table in tables)
+
+    def decorator(method: Callable[Concatenate[Any, P], R]) -> Callable[Concatenate[Any, P], R]:
+        name = method.__qualname__
+
+        @functools.wraps(method)
+        def wrapper(self: ResultCacheOwner, *args: P.args, **kwargs: P.kwargs) -> R:
+            cache = self._result_cache
+            key = (name, args, tuple(sorted(kwargs.items()))) if kwargs else (name, args)
+            try:
+                hash(key)
+            except TypeError:
+                cache.uncacheable += 1
+                return method(self, *args, **kwargs)
+            # Snapshot before reading so a concurrent commit makes this result stale, not wrong
+            generations = self._table_generations.snapshot(table_keys)
+            found, result = cache.lookup(key, generations)
+            if not found:
+                result = method(self, *args, **kwargs)
+                if not self.is_database_open():
+                    return result
+                cache.store(key, generations, result)
+            return _copy_result(result)
+
+        wrapper.cached_tables = frozenset(table_keys)
+        return wrapper
+
+    return decorator
+
+
+def table_generations(db_filename: str) -> TableGenerations:
+    """Return the generation counters shared by every manager of `db_filename`."""
+    key = str(Path(db_filename).resolve())
+    with _generations_lock:
+        generations = _generations.get(key)
+        if generations is None:
+            generations = _generations[key] = TableGenerations()
+        return generations
+
+
+@functools.lru_cache(maxsize=512)
+def tables_written_by(query_text: str) -> frozenset[str] | None:
+    """Return the tables whose rows `query_text` may change.
+
+    Returns:
+
+    - `frozenset[str] | None`: Lower-case table names; empty for reads and index DDL;
+      `None` when the statement changes data or schema in a way not parsed here.
+
+    """
+    text = query_text.lstrip()
+    words = text.split(maxsplit=1)
+    if not words:
+        return frozenset()
+    keyword = words[0].upper()
+    if keyword in _READ_KEYWORDS or _INDEX_DDL.match(text):
+        return frozenset()
+    tables = frozenset(match.group(1).lower() for match in _WRITE_TARGET.finditer(text))
+    if keyword == "WITH" and not tables:
+        return frozenset()
+    if keyword in {"INSERT", "REPLACE", "UPDATE", "DELETE", "WITH"} and tables:
+        return tables
+    return None
+
+
+def _copy_result(result: Any) -> Any:
+    """Copy list/dict/tuple containers two levels deep (rows of scalars are fully copied)."""
+    if isinstance(result, list):
+        return [_copy_row(item) for item in result]
+    if isinstance(result, tuple):
+        return tuple(_copy_row(item) for item in result)
+    if isinstance(result, dict):
+        return {key: _copy_row(value) for key, value in result.items()}
+    return result
+
+
+def _copy_row(item: object) -> object:
+    if isinstance(item, list):
+        return list(item)
+    if isinstance(item, dict):
+        return dict(item)
+    return item
@@ -0,0 +1,96 @@
+"""Versioned schema migrations for tracker databases, keyed on `PRAGMA user_version`.
+
+Each app lists its migrations in ascending `version` order. Opening a database
+reads `PRAGMA user_version` once; only migrations with a higher version run, each
+in its own transaction that also stamps the new version. A database that is
+already up to date therefore costs a single pragma read instead of re-running
+`PRAGMA table_info` / `CREATE ... IF NOT EXISTS` checks on every open.
+
+Migration steps must be idempotent: databases created before versioning start at
+version `0` and may already contain some of the changes.
+
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, NoReturn
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from harrix_swiss_knife.apps.common.qt_database_manager_base import QtSqliteDatabaseManagerBase
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class SchemaMigration:
+    """One ordered schema step; `apply` returns `False` (or raises) on failure."""
+
+    version: int
+    description: str
+    apply: Callable[[], bool]
+
+
+def apply_schema_migrations(db: QtSqliteDatabaseManagerBase, migrations: Sequence[SchemaMigration]) -> int:
+    """Apply migrations newer than the database `user_version` and return the resulting version.
+
+    A failed migration is rolled back and logged; later migrations are skipped so the
+    next open retries from the same version.
+
+    Args:
+
+    - `db` (`QtSqliteDatabaseManagerBase`): Open database manager.
+    - `migrations` (`Sequence[SchemaMigration]`): Migrations in strictly ascending `version` order.
+
+    Returns:
+
+    - `int`: `PRAGMA user_version` after the run.
+
+    Raises:
+
+    - `ValueError`: If versions are not positive and strictly ascending.
+
+    """
+    current = db.get_user_version()
+    if not migrations or current >= migrations[-1].version:
+        return current
+
+    _validate_migration_order(migrations)
+    for migration in migrations:
+        if migration.version <= current:
+            continue
+        try:
+            with db.sql_transaction():
+                if not migration.apply():
+                    _raise_runtime_error(f"Migration step reported failure: {migration.description}")
+                if not db.set_user_version(migration.version):
+                    _raise_runtime_error(f"Failed to stamp user_version {migration.version}")
+        except Exception:
+            logger.exception("Schema migration %s (%s) failed", migration.version, migration.description)
+            return current
+        logger.info("Applied schema migration %s: %s", migration.version, migration.description)
+        current = migration.version
+    return current
+
+
+def latest_schema_version(migrations: Sequence[SchemaMigration]) -> int:
+    """Return the version a fully migrated database reports (`0` when there are no migrations)."""
+    return migrations[-1].version if migrations else 0
+
+
+def _raise_runtime_error(message: str) -> NoReturn:
+    """Raise `RuntimeError` (helper for TRY301 inside SQL transactions)."""
+    raise RuntimeError(message)
+
+
+def _validate_migration_order(migrations: Sequence[SchemaMigration]) -> None:
+    previous = 0
+    for migration in migrations:
+        if migration.version <= previous:
+            msg = f"Schema migration versions must be positive and strictly ascending: {migration.version}"
+            raise ValueError(msg)
+        previous = migration.version
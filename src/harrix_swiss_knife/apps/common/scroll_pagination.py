@@ -1,25 +1,58 @@
-"""Shared scroll-triggered table pagination helpers."""
+"""Shared scroll-triggered table pagination helpers.
+
+Two modes are supported:
+
+- limit/offset (`ScrollPagination.load_more`): simple, but every deeper page makes
+  SQLite skip all earlier rows;
+- keyset/seek (`ScrollPagination.load_more_after`): remembers a `KeysetCursor` with the
+  `(date, _id)` of the last loaded row and fetches the next page with
+  `WHERE (date, _id) < (:cursor_date, :cursor_id)`, so each page costs the same
+  regardless of depth. It requires the query to be ordered by `date DESC, _id DESC`.
+
+"""
 
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Generic, TypeVar
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Sequence
 
 T = TypeVar("T")
 
 DEFAULT_SCROLL_THRESHOLD = 5
 
 
+@dataclass(frozen=True, slots=True)
+class KeysetCursor:
+    """Seek position after the last row of a page ordered by `date DESC, _id DESC`."""
+
+    date: str
+    row_id: int
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any], *, date_index: int, id_index: int = 0) -> KeysetCursor:
+        """Build a cursor from a fetched row given the positions of its date and ID."""
+        return cls(date=str(row[date_index]), row_id=int(row[id_index]))
+
+    def params(self) -> dict[str, Any]:
+        """Return bind values for the placeholders used by `where_clause`."""
+        return {"cursor_date": self.date, "cursor_id": self.row_id}
+
+    def where_clause(self, date_column: str = "date", id_column: str = "_id") -> str:
+        """Return the SQL condition selecting rows after this cursor (row-value comparison)."""
+        return f"({date_column}, {id_column}) < (:cursor_date, :cursor_id)"
+
+
 @dataclass
 class ScrollPagination(Generic[T]):
-    """Pagination state and helpers for limit/offset scroll loading."""
+    """Pagination state and helpers for limit/offset or keyset scroll loading."""
 
     loaded_count: int = 0
     has_more: bool = False
     loading: bool = False
+    cursor: KeysetCursor | None = None
 
     def load_more(
         self,
@@ -45,22 +78,66 @@ class ScrollPagination(Generic[T]):
         finally:
             self.loading = False
 
+    def load_more_after(
+        self,
+        *,
+        load_more_count: int,
+        fetch_rows: Callable[[int, KeysetCursor | None], list[T]],
+        append_rows: Callable[[list[T]], None],
+        cursor_of: Callable[[T], KeysetCursor],
+    ) -> None:
+        """Fetch and append the next page by seeking past the stored `cursor`.
+
+        Args:
+
+        - `load_more_count` (`int`): Page size.
+        - `fetch_rows` (`Callable[[int, KeysetCursor | None], list[T]]`): Loader called as
+          `(limit, after)`; it must return rows after `after` in `date DESC, _id DESC` order.
+        - `append_rows` (`Callable[[list[T]], None]`): Adds fetched rows to the view.
+        - `cursor_of` (`Callable[[T], KeysetCursor]`): Extracts the cursor from a fetched row.
+
+        """
+        if not self.has_more or self.loading:
+            return
+
+        self.loading = True
+        try:
+            rows = fetch_rows(load_more_count, self.cursor)
+            if not rows:
+                self.has_more = False
+                return
+
+            # Read the cursor before `append_rows`, which may transform rows in place
+            self.cursor = cursor_of(rows[-1])
+            append_rows(rows)
+            self.loaded_count += len(rows)
+            self.has_more = len(rows) == load_more_count
+        finally:
+            self.loading = False
+
     def record_first_page(
         self,
         row_count: int,
         limit: int | None,
         *,
         pagination_enabled: bool = True,
+        cursor: KeysetCursor | None = None,
     ) -> None:
-        """Update state after the first page is loaded into the table."""
+        """Update state after the first page is loaded into the table.
+
+        Pass the `cursor` of the page's last row to continue with `load_more_after`.
+
+        """
         self.loaded_count = row_count
         self.has_more = pagination_enabled and limit is not None and row_count == limit
+        self.cursor = cursor
 
     def reset(self) -> None:
         """Reset counters before loading a fresh first page."""
         self.loaded_count = 0
         self.has_more = False
         self.loading = False
+        self.cursor = None
 
 
 def is_scroll_near_bottom(scroll_value: int, maximum: int, *, threshold: int = DEFAULT_SCROLL_THRESHOLD) -> bool:
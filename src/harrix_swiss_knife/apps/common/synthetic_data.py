@@ -0,0 +1,355 @@
+"""Deterministic synthetic tracker databases for benchmarks.
+
+Each generator starts from the app's `recover.sql` (schema plus catalog seed) and
+fills the activity tables with `years` of plausible data ending on `END_DATE`. The
+same `seed` and `years` always produce the same file contents, so timings of
+different commits are measured on identical data.
+
+Volumes per year are roughly what an active user produces: ~2,000 finance
+transactions plus daily exchange rates for every non-USD currency (weekend
+rows repeat Friday's rate, as forward-filled storage does), ~4,000 fitness
+sets, ~2,500 food log rows and ~3,000 habit check-ins.
+
+Rows are written with stdlib `sqlite3` (no Qt needed). The app's own schema
+migrations run the first time a `DatabaseManager` opens the file, as with a real
+database.
+
+"""
+
+from __future__ import annotations
+
+import random
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+APPS_DIR = Path(__file__).resolve().parents[1]
+END_DATE = date(2025, 12, 31)
+SYNTHETIC_APPS = ("finance", "fitness", "food", "habits")
+
+# `food/recover.sql` still describes the pre-`_id` layout; the manager reads this one
+_FOOD_MANAGER_SCHEMA_SQL = """
+DROP TABLE IF EXISTS food_log;
+DROP TABLE IF EXISTS food_items;
+CREATE TABLE food_items (
+    _id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    name_en TEXT,
+    is_drink INTEGER NOT NULL DEFAULT 0,
+    calories_per_100g REAL,
+    default_portion_weight REAL,
+    default_portion_calories REAL
+);
+CREATE TABLE food_log (
+    _id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    weight REAL,
+    portion_calories REAL,
+    calories_per_100g REAL,
+    name TEXT NOT NULL,
+    name_en TEXT,
+    is_drink INTEGER NOT NULL DEFAULT 0
+);
+"""
+_HABITS = (
+    ("Read", 1, "📖"),
+    ("Meditate", 1, "🧘"),
+    ("No sugar", 1, "🍬"),
+    ("Walk 10k steps", 1, "🚶"),
+    ("Drink water", 0, "💧"),
+    ("Push-ups", 0, "💪"),
+    ("Journal", 1, "📝"),
+    ("Learn words", 0, "🔤"),
+    ("Sleep before 23:00", 1, "🛌"),
+    ("Stretch", 1, "🤸"),
+    ("Cold shower", 1, "🚿"),
+    ("Practice guitar", 0, "🎸"),
+)
+_PURCHASE_WORDS = (
+    "Bread", "Milk", "Coffee", "Taxi", "Metro", "Lunch", "Dinner", "Groceries", "Books", "Cinema", "Gym",
+    "Pharmacy", "Fuel", "Phone", "Internet", "Rent", "Electricity", "Gift", "Shoes", "Haircut",
+)  # fmt: skip
+_TAGS = ("vacation", "renovation", "birthday", "business trip", "moving")
+
+
+@dataclass(slots=True)
+class SyntheticDatabase:
+    """A generated database and the sample arguments benchmarks call read methods with."""
+
+    app: str
+    path: Path
+    years: float
+    seed: int
+    row_counts: dict[str, int] = field(default_factory=dict)
+    samples: dict[str, Any] = field(default_factory=dict)
+
+
+def generate_database(app: str, path: Path, *, years: float = 1, seed: int = 0) -> SyntheticDatabase:
+    """Create `path` with `years` of synthetic activity for `app` (overwriting an existing file).
+
+    Args:
+
+    - `app` (`str`): One of `SYNTHETIC_APPS`.
+    - `path` (`Path`): Target SQLite file.
+    - `years` (`float`): Length of the activity history ending on `END_DATE`. Defaults to `1`.
+    - `seed` (`int`): Random seed; equal seeds give identical databases. Defaults to `0`.
+
+    Returns:
+
+    - `SyntheticDatabase`: Path, per-table row counts and benchmark sample arguments.
+
+    Raises:
+
+    - `ValueError`: If `app` is unknown or `years` is not positive.
+
+    """
+    generators: dict[str, Callable[[sqlite3.Connection, random.Random, list[date]], dict[str, Any]]] = {
+        "finance": _fill_finance,
+        "fitness": _fill_fitness,
+        "food": _fill_food,
+        "habits": _fill_habits,
+    }
+    if app not in generators:
+        msg = f"Unknown app {app!r}; expected one of {', '.join(SYNTHETIC_APPS)}"
+        raise ValueError(msg)
+    if years <= 0:
+        msg = f"years must be positive: {years}"
+        raise ValueError(msg)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+    rng = random.Random(f"{app}:{seed}")  # noqa: S311
+    day_count = max(1, round(years * 365))
+    days = [END_DATE - timedelta(days=offset) for offset in range(day_count - 1, -1, -1)]
+
+    connection = sqlite3.connect(path)
+    try:
+        connection.executescript((APPS_DIR / app / "recover.sql").read_text(encoding="utf-8"))
+        with connection:
+            samples = generators[app](connection, rng, days)
+        row_counts = {
+            str(name): int(connection.execute(f'SELECT COUNT(*) FROM "{name}"').fetchone()[0])
+            for (name,) in connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+            ).fetchall()
+        }
+    finally:
+        connection.close()
+
+    samples.setdefault("date_from", days[-min(len(days), 365)].isoformat())
+    samples.setdefault("date_to", days[-1].isoformat())
+    return SyntheticDatabase(app=app, path=path, years=years, seed=seed, row_counts=row_counts, samples=samples)
+
+
+def _fill_finance(connection: sqlite3.Connection, rng: random.Random, days: list[date]) -> dict[str, Any]:
+    currencies = dict(connection.execute("SELECT code, _id FROM currencies").fetchall())
+    default_currency_id = int(
+        connection.execute("SELECT value FROM settings WHERE key = 'default_currency'").fetchone()[0]
+    )
+    expense_ids = [row[0] for row in connection.execute("SELECT _id FROM categories WHERE type = 0 ORDER BY _id")]
+    income_ids = [row[0] for row in connection.execute("SELECT _id FROM categories WHERE type = 1 ORDER BY _id")]
+    other_currency_ids = [currency_id for currency_id in currencies.values() if currency_id != default_currency_id]
+    descriptions = [f"{word} {index}" for word in _PURCHASE_WORDS for index in range(15)]
+
+    transactions: list[tuple[Any, ...]] = []
+    rates: list[tuple[Any, ...]] = []
+    exchanges: list[tuple[Any, ...]] = []
+    rate_by_currency = {currency_id: rng.uniform(0.5, 100.0) for currency_id in currencies.values()}
+    for day in days:
+        day_text = day.isoformat()
+        for _ in range(rng.randint(2, 8)):
+            description = rng.choice(descriptions)
+            transactions.append(
+                (
+                    rng.randint(100, 500_000),
+                    description,
+                    description if _chance(rng, 0.5) else None,
+                    rng.choice(expense_ids),
+                    default_currency_id if _chance(rng, 0.85) else rng.choice(other_currency_ids),
+                    day_text,
+                    rng.choice(_TAGS) if _chance(rng, 0.04) else None,
+                )
+            )
+        if day.day == 1 and income_ids:
+            transactions.append(
+                (
+                    rng.randint(5_000_000, 9_000_000),
+                    "Salary",
+                    "Salary",
+                    income_ids[0],
+                    default_currency_id,
+                    day_text,
+                    None,
+                )
+            )
+        for code, currency_id in currencies.items():
+            if code == "USD":
+                continue
+            # Markets quote on weekdays; weekend rows repeat Friday's rate as the daily forward-fill stores them
+            if day.weekday() < 5:  # noqa: PLR2004
+                rate_by_currency[currency_id] *= rng.uniform(0.99, 1.01)
+            rates.append((currency_id, round(rate_by_currency[currency_id], 6), day_text))
+        if _chance(rng, 1 / 7):
+            amount_from = rng.randint(10_000, 1_000_000)
+            rate = rng.uniform(0.01, 100.0)
+            exchanges.append(
+                (
+                    default_currency_id,
+                    rng.choice(other_currency_ids),
+                    amount_from,
+                    round(amount_from * rate),
+                    rate,
+                    rng.randint(0, 500),
+                    day_text,
+                    "Exchange",
+                )
+            )
+
+    connection.executemany(
+        """INSERT INTO transactions (amount, description, description_en, _id_categories, _id_currencies, date, tag)
+           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        transactions,
+    )
+    connection.executemany("INSERT INTO exchange_rates (_id_currency, rate, date) VALUES (?, ?, ?)", rates)
+    connection.executemany(
+        """INSERT INTO currency_exchanges
+           (_id_currency_from, _id_currency_to, amount_from, amount_to, exchange_rate, fee, date, description)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+        exchanges,
+    )
+    account_currency_ids = [default_currency_id, *other_currency_ids][:4]
+    connection.executemany(
+        "INSERT INTO accounts (name, balance, _id_currencies, is_liquid, is_cash) VALUES (?, ?, ?, ?, ?)",
+        [
+            # The first account is cash, the last one a non-liquid deposit
+            (
+                f"Account {index}",
+                rng.randint(0, 10_000_000),
+                currency_id,
+                int(index < len(account_currency_ids) - 1),
+                int(index == 0),
+            )
+            for index, currency_id in enumerate(account_currency_ids)
+        ],
+    )
+
+    standard_item = connection.execute("SELECT name FROM standard_items ORDER BY _id LIMIT 1").fetchone()
+    middle_transaction = connection.execute(
+        "SELECT _id FROM transactions ORDER BY _id LIMIT 1 OFFSET ?", (len(transactions) // 2,)
+    ).fetchone()
+    mid_day = days[len(days) // 2].isoformat()
+    return {
+        "account_id": 1,
+        "category_id": expense_ids[0],
+        "category_type": 0,
+        "code": "EUR",
+        "currency_code": "EUR",
+        "currency_id": default_currency_id,
+        "date": mid_day,
+        "descriptions": descriptions[:20],
+        "from_currency_id": currencies["USD"],
+        "name": standard_item[0] if standard_item else "Bread",
+        "tag": _TAGS[0],
+        "to_currency_id": default_currency_id,
+        "transaction_id": middle_transaction[0] if middle_transaction else 1,
+    }
+
+
+def _fill_fitness(connection: sqlite3.Connection, rng: random.Random, days: list[date]) -> dict[str, Any]:
+    exercises = connection.execute("SELECT _id, name, is_type_required FROM exercises ORDER BY _id").fetchall()
+    types_by_exercise: dict[int, list[int]] = {}
+    for type_id, exercise_id in connection.execute("SELECT _id, _id_exercises FROM types ORDER BY _id"):
+        types_by_exercise.setdefault(exercise_id, []).append(type_id)
+    favorites = exercises[:15]
+
+    process: list[tuple[Any, ...]] = []
+    weights: list[tuple[Any, ...]] = []
+    weight = 80.0
+    for day in days:
+        day_text = day.isoformat()
+        if _chance(rng, 0.75):
+            for _ in range(rng.randint(3, 25)):
+                exercise_id, _name, is_type_required = rng.choice(favorites)
+                exercise_types = types_by_exercise.get(exercise_id, [])
+                if exercise_types and (is_type_required or _chance(rng, 0.5)):
+                    type_id = rng.choice(exercise_types)
+                else:
+                    type_id = -1
+                process.append((exercise_id, type_id, str(rng.randint(5, 60)), day_text))
+        if _chance(rng, 0.7):
+            weight = min(max(weight + rng.uniform(-0.4, 0.4), 60.0), 100.0)
+            weights.append((round(weight, 1), day_text))
+
+    connection.executemany(
+        "INSERT INTO process (_id_exercises, _id_types, value, date) VALUES (?, ?, ?, ?)",
+        process,
+    )
+    connection.executemany("INSERT INTO weight (value, date) VALUES (?, ?)", weights)
+    first_exercise_id, first_exercise_name, _ = favorites[0]
+    return {
+        "exercise_id": first_exercise_id,
+        "exercise_name": first_exercise_name,
+        "type_id": (types_by_exercise.get(first_exercise_id) or [-1])[0],
+    }
+
+
+def _fill_food(connection: sqlite3.Connection, rng: random.Random, days: list[date]) -> dict[str, Any]:
+    catalog = connection.execute(
+        """SELECT name, name_en, is_drink, calories_per_100g, default_portion_weight, default_portion_calories
+           FROM food_items ORDER BY name"""
+    ).fetchall()
+    connection.executescript(_FOOD_MANAGER_SCHEMA_SQL)
+    connection.executemany(
+        """INSERT INTO food_items
+           (name, name_en, is_drink, calories_per_100g, default_portion_weight, default_portion_calories)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        catalog,
+    )
+    favorites = rng.sample(catalog, min(len(catalog), 120))
+
+    log: list[tuple[Any, ...]] = []
+    for day in days:
+        day_text = day.isoformat()
+        for _ in range(rng.randint(3, 11)):
+            name, name_en, is_drink, calories_per_100g, portion_weight, portion_calories = rng.choice(favorites)
+            if portion_calories is not None and _chance(rng, 0.3):
+                log.append((day_text, None, portion_calories, None, name, name_en, is_drink))
+                continue
+            weight = portion_weight or rng.randint(30, 400)
+            log.append((day_text, weight, None, calories_per_100g, name, name_en, is_drink))
+
+    connection.executemany(
+        """INSERT INTO food_log (date, weight, portion_calories, calories_per_100g, name, name_en, is_drink)
+           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        log,
+    )
+    return {"name": favorites[0][0], "names": [row[0] for row in favorites[:20]]}
+
+
+def _fill_habits(connection: sqlite3.Connection, rng: random.Random, days: list[date]) -> dict[str, Any]:
+    connection.executemany(
+        "INSERT INTO habits (name, is_bool, emoji, sort_order) VALUES (?, ?, ?, ?)",
+        [(name, is_bool, emoji, index) for index, (name, is_bool, emoji) in enumerate(_HABITS)],
+    )
+    habits = connection.execute("SELECT _id, is_bool FROM habits ORDER BY _id").fetchall()
+    habit_probability = {habit_id: rng.uniform(0.3, 0.95) for habit_id, _ in habits}
+
+    records: list[tuple[Any, ...]] = []
+    for day in days:
+        day_text = day.isoformat()
+        for habit_id, is_bool in habits:
+            if rng.random() < habit_probability[habit_id]:
+                records.append((habit_id, 1 if is_bool else rng.randint(1, 50), day_text))
+
+    connection.executemany("INSERT INTO process_habits (_id_habit, value, date) VALUES (?, ?, ?)", records)
+    return {"date_str": days[len(days) // 2].isoformat(), "habit_id": habits[0][0], "habit_name": _HABITS[0][0]}
+
+
+def _chance(rng: random.Random, probability: float) -> bool:
+    return rng.random() < probability
@@ -2,30 +2,232 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from PySide6.QtCore import QSortFilterProxyModel, Qt
-from PySide6.QtGui import QBrush, QIcon, QStandardItem, QStandardItemModel
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QPersistentModelIndex, QSortFilterProxyModel, Qt
+from PySide6.QtGui import QBrush, QColor, QIcon, QStandardItem, QStandardItemModel
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Callable, Iterable, Mapping, Sequence
 
+    from PySide6.QtCore import QAbstractItemModel, QObject
     from PySide6.QtWidgets import QTableView
 
 
+class LazyTableModel(QAbstractTableModel):
+    """Table model that stores compact row tuples and formats cells only when asked.
+
+    Unlike `QStandardItemModel` it creates no per-cell objects: display text,
+    background brushes and extra roles are computed in `data()` for the cells a
+    view actually paints. Rows use the same layout as the `create_*_proxy_model`
+    helpers (an ID column and an optional color column mixed into each row), and
+    the row ID is exposed as vertical header text, so `source_row_id` and the
+    shared auto-save code work unchanged. Further pages come from the caller's
+    `ScrollPagination.load_more_after` through `append_rows`.
+
+    """
+
+    def __init__(
+        self,
+        headers: list[str],
+        *,
+        id_column: int = 0,
+        color_column: int | None = None,
+        read_only_columns: Iterable[int] = (),
+        user_role_columns: Mapping[int, Callable[[object], object]] | None = None,
+        parent: QObject | None = None,
+    ) -> None:
+        """Create an empty model; fill it with `append_rows`.
+
+        Args:
+
+        - `headers` (`list[str]`): Horizontal header labels of the displayed columns.
+        - `id_column` (`int`): Index of the row ID inside source rows. Defaults to `0`.
+        - `color_column` (`int | None`): Index of the row background color inside source
+          rows, or `None` for uncolored rows. Defaults to `None`.
+        - `read_only_columns` (`Iterable[int]`): Displayed columns that cannot be edited.
+          Defaults to `()`.
+        - `user_role_columns` (`Mapping[int, Callable[[object], object]] | None`): Per displayed
+          column, a function that derives `Qt.ItemDataRole.UserRole` data from the cell value.
+          Defaults to `None`.
+        - `parent` (`QObject | None`): Qt parent. Defaults to `None`.
+
+        """
+        super().__init__(parent)
+        self._headers = list(headers)
+        self._id_column = id_column
+        self._color_column = color_column
+        self._read_only_columns = frozenset(read_only_columns)
+        self._user_role_columns = dict(user_role_columns or {})
+        self._rows: list[tuple[object, ...]] = []
+        self._row_ids: list[object] = []
+        self._row_palette_indices: list[int] = []
+        self._palette_colors: list[object] = []
+        self._palette_keys: dict[int, int] = {}
+        self._palette_brushes: dict[int, QBrush] = {}
+        self._display_width = 0
+
+    def append_rows(self, rows: Iterable[Sequence[object]]) -> int:
+        """Append source rows (with ID and optional color columns) and return how many were added."""
+        new_rows: list[tuple[object, ...]] = []
+        new_ids: list[object] = []
+        new_palette: list[int] = []
+        for row in rows:
+            row_len = len(row)
+            id_idx = _normalize_column_index(self._id_column, row_len)
+            color_idx = -1 if self._color_column is None else _normalize_column_index(self._color_column, row_len)
+            new_ids.append(row[id_idx])
+            new_rows.append(tuple(value for col_idx, value in enumerate(row) if col_idx not in {id_idx, color_idx}))
+            new_palette.append(-1 if color_idx < 0 else self._palette_index(row[color_idx]))
+        if not new_rows:
+            return 0
+
+        width = max(self._display_width, *(len(row) for row in new_rows))
+        if width > self.columnCount():
+            self.beginInsertColumns(QModelIndex(), self.columnCount(), width - 1)
+            self._display_width = width
+            self.endInsertColumns()
+        else:
+            self._display_width = width
+
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+        self._rows.extend(new_rows)
+        self._row_ids.extend(new_ids)
+        self._row_palette_indices.extend(new_palette)
+        self.endInsertRows()
+        return len(new_rows)
+
+    def columnCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:  # noqa: B008, N802
+        """Return the number of displayed columns."""
+        if parent.isValid():
+            return 0
+        return max(len(self._headers), self._display_width)
+
+    def data(self, index: QModelIndex | QPersistentModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        """Return cell data for `role`, formatting it on demand."""
+        if not index.isValid():
+            return None
+        row = index.row()
+        column = index.column()
+        values = self._rows[row]
+        value = values[column] if column < len(values) else None
+
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if value is None or isinstance(value, QIcon):
+                return None if role == Qt.ItemDataRole.EditRole else ""
+            return str(value)
+        if role == Qt.ItemDataRole.DecorationRole:
+            return value if isinstance(value, QIcon) else None
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return self._row_brush(row)
+        if role == Qt.ItemDataRole.UserRole:
+            derive = self._user_role_columns.get(column)
+            return derive(value) if derive is not None else None
+        return None
+
+    def flags(self, index: QModelIndex | QPersistentModelIndex) -> Qt.ItemFlag:
+        """Return selectable/enabled flags, plus editable for non read-only text cells."""
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.column() in self._read_only_columns:
+            return flags
+        values = self._rows[index.row()]
+        if index.column() < len(values) and isinstance(values[index.column()], QIcon):
+            return flags
+        return flags | Qt.ItemFlag.ItemIsEditable
+
+    def headerData(  # noqa: N802
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        """Return column labels horizontally and row IDs vertically."""
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self._headers[section] if 0 <= section < len(self._headers) else None
+        if 0 <= section < len(self._row_ids):
+            return str(self._row_ids[section])
+        return None
+
+    def row_id(self, row: int) -> object:
+        """Return the ID stored for source `row`."""
+        return self._row_ids[row]
+
+    def rowCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:  # noqa: B008, N802
+        """Return the number of loaded rows."""
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def setData(  # noqa: N802
+        self,
+        index: QModelIndex | QPersistentModelIndex,
+        value: Any,
+        role: int = Qt.ItemDataRole.EditRole,
+    ) -> bool:
+        """Store an edited value and emit `dataChanged` (drives the shared auto-save)."""
+        if not index.isValid() or role not in (Qt.ItemDataRole.EditRole, Qt.ItemDataRole.DisplayRole):
+            return False
+        row = index.row()
+        column = index.column()
+        values = list(self._rows[row])
+        if column >= len(values):
+            values.extend([None] * (column + 1 - len(values)))
+        values[column] = value
+        self._rows[row] = tuple(values)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+        return True
+
+    def _palette_index(self, color: object) -> int:
+        """Return the shared palette slot for `color`, registering it on first use."""
+        key = QColor(color).rgba() if color is not None else -1
+        slot = self._palette_keys.get(key)
+        if slot is None:
+            slot = len(self._palette_colors)
+            self._palette_keys[key] = slot
+            self._palette_colors.append(color)
+        return slot
+
+    def _row_brush(self, row: int) -> QBrush | None:
+        """Return the background brush for `row`, creating each palette brush once."""
+        slot = self._row_palette_indices[row]
+        if slot < 0:
+            return None
+        brush = self._palette_brushes.get(slot)
+        if brush is None:
+            color = self._palette_colors[slot]
+            if color is None:
+                return None
+            brush = QBrush(color)
+            self._palette_brushes[slot] = brush
+        return brush
+
+
 def create_colored_table_proxy_model(
     data: Sequence[Sequence[object]],
     headers: list[str],
     *,
     id_column: int = -2,
     color_column: int = -1,
+    lazy: bool = False,
 ) -> QSortFilterProxyModel:
     """Create a colored proxy model with ID and color columns excluded from display.
 
     By default the ID is at index `-2` and the color at `-1` (last column).
     A `QIcon` cell value is shown as decoration without display text.
+    With `lazy=True` the source model is a `LazyTableModel` instead of a
+    `QStandardItemModel`.
 
     """
+    if lazy:
+        lazy_model = LazyTableModel(headers, id_column=id_column, color_column=color_column)
+        lazy_model.append_rows(data)
+        return _proxy_for(lazy_model)
+
     model = QStandardItemModel()
     model.setHorizontalHeaderLabels(headers)
 
@@ -53,12 +255,19 @@ def create_table_proxy_model(
     headers: list[str],
     *,
     id_column: int = 0,
+    lazy: bool = False,
 ) -> QSortFilterProxyModel:
     """Create a proxy model with row IDs stored in the vertical header.
 
     The `id_column` is excluded from displayed columns and is stored as vertical header text.
+    With `lazy=True` the source model is a `LazyTableModel` instead of a `QStandardItemModel`.
 
     """
+    if lazy:
+        lazy_model = LazyTableModel(headers, id_column=id_column)
+        lazy_model.append_rows(data)
+        return _proxy_for(lazy_model)
+
     model = QStandardItemModel()
     model.setHorizontalHeaderLabels(headers)
 
@@ -145,6 +354,24 @@ def sort_table_by_header_click(
     return section, order
 
 
+def source_row_id(model: QAbstractItemModel, row: int) -> str | None:
+    """Return the row ID text stored in the vertical header of a source table model.
+
+    Works for `QStandardItemModel` tables built by the helpers in this module and for
+    `LazyTableModel`.
+
+    """
+    if isinstance(model, QStandardItemModel):
+        item = model.verticalHeaderItem(row)
+        return item.text() if item is not None else None
+    if isinstance(model, LazyTableModel):
+        if not 0 <= row < model.rowCount():
+            return None
+        return str(model.row_id(row))
+    value = model.headerData(row, Qt.Orientation.Vertical, Qt.ItemDataRole.DisplayRole)
+    return None if value is None else str(value)
+
+
 def _colored_standard_item(value: object, row_color: object) -> QStandardItem:
     """Create a table item, using `QIcon` as decoration when given."""
     if isinstance(value, QIcon):
@@ -162,3 +389,11 @@ def _normalize_column_index(index: int, row_length: int) -> int:
     if index < 0:
         return row_length + index
     return index
+
+
+def _proxy_for(model: QAbstractItemModel) -> QSortFilterProxyModel:
+    """Wrap `model` in a sortable/filterable proxy that owns it."""
+    proxy = QSortFilterProxyModel()
+    model.setParent(proxy)
+    proxy.setSourceModel(model)
+    return proxy
@@ -8,6 +8,11 @@ from typing import Any
 from PySide6.QtCore import QThread, Signal
 
 from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager
+from harrix_swiss_knife.apps.finance.services.balance_checkpoints import (
+    BalanceCheckpointService,
+    BalanceCheckpointStore,
+    default_checkpoint_dir,
+)
 from harrix_swiss_knife.apps.finance.transaction_helpers import compute_fast_balance_check
 
 
@@ -30,24 +35,28 @@ class BalanceCheckWorker(QThread):
     check_completed: Signal = Signal(object)  # BalanceCheckResult
     check_failed: Signal = Signal(str)
 
-    def __init__(self, db_filename: str) -> None:
+    def __init__(self, db_filename: str, checkpoint_store: BalanceCheckpointStore | None = None) -> None:
         """Initialize the worker with the SQLite database path.
 
         Args:
 
         - `db_filename` (`str`): Path to the finance SQLite database file.
+        - `checkpoint_store` (`BalanceCheckpointStore | None`): Month-end journal checkpoints;
+          the store in `data/cache/balance_checkpoints` when `None`. Defaults to `None`.
 
         """
         super().__init__()
         self.db_filename = db_filename
+        self.checkpoint_store = checkpoint_store or BalanceCheckpointStore(default_checkpoint_dir())
 
     def run(self) -> None:
-        """Load transactions and compute balance reconciliation."""
+        """Load exchanges and accounts, resume the journal from checkpoints and compute reconciliation."""
+        db_manager: DatabaseManager | None = None
         try:
-            db_manager = DatabaseManager(self.db_filename)
+            db_manager = DatabaseManager(self.db_filename, read_only=True)
             rates = db_manager.exchange_rates.preload_all_rates()
             currencies_by_code, currencies_by_id = db_manager.get_all_currencies_map()
-            transaction_rows: list = db_manager.get_all_transactions()
+            journal = BalanceCheckpointService(db_manager, self.checkpoint_store).journal()
             exchange_rows: list = db_manager.get_all_currency_exchanges()
             accounts_rows: list = db_manager.get_all_accounts()
 
@@ -59,12 +68,13 @@ class BalanceCheckWorker(QThread):
                 natural_rows,
             ) = compute_fast_balance_check(
                 db_manager,
-                transaction_rows,
+                [],
                 exchange_rows,
                 accounts_rows,
                 rates,
                 currencies_by_code,
                 currencies_by_id,
+                journal_minor=journal.journal_minor,
             )
             difference_latest = accounts_balance - accounting_balance_latest
 
@@ -84,3 +94,6 @@ class BalanceCheckWorker(QThread):
             self.check_completed.emit(result)
         except Exception as e:
             self.check_failed.emit(str(e))
+        finally:
+            if db_manager is not None:
+                db_manager.close()
@@ -1,14 +1,33 @@
-"""Category suggestions from description text, history, and category labels."""
+"""Category suggestions from description text, history, and category labels.
+
+`suggest_categories` scores every history pair on each call. `CategorySuggestIndex` gives the
+same suggestions from an in-memory index built once per session: it keeps each distinct past
+description with its per-category usage counts, the descriptions in sorted order, and postings
+from each description token to the descriptions using it. A query only scores the descriptions
+that can reach a positive score:
+
+- descriptions starting with the query (a `bisect` range) or that the query starts with;
+- descriptions sharing a token that equals, prefixes, or is a typo of a query token. Typo
+  candidates come from the tokens of a similar length whose character overlap
+  (`SequenceMatcher.quick_ratio`, an upper bound of `ratio`) is high enough;
+- for whole-string typos, descriptions of a similar length with a token sharing a character
+  trigram with the query, again kept only when their character overlap is high enough.
+
+A whole-string typo whose tokens share no trigram with the query is the one match the index
+does not score.
+
+"""
 
 from __future__ import annotations
 
 import math
 import re
+from bisect import bisect_left, insort
 from difflib import SequenceMatcher
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping, Sequence
+    from collections.abc import Iterable, Mapping, Sequence
 
 _DEFAULT_LIMIT = 3
 _DEFAULT_MIN_SCORE = 0.48
@@ -19,6 +38,248 @@ _TYPO_MIN_RATIO = 0.72
 _TYPO_MIN_LENGTH_RATIO = 0.8
 _FREQUENCY_BONUS = 0.04
 _TOKEN_RE = re.compile(r"[\w]+", re.UNICODE)
+_RELATED_TOKENS_CACHE_SIZE = 512
+_PAIR_SCORE_CACHE_SIZE = 50_000
+
+
+class CategorySuggestIndex:
+    """History pairs indexed for `suggest_categories`-equivalent suggestions on every keystroke."""
+
+    def __init__(self, history_pairs: Iterable[tuple[str, str, int]] = ()) -> None:
+        """Index `(description, category_name, usage_count)` rows."""
+        self._text_ids: dict[str, int] = {}
+        self._texts: list[str] = []
+        self._text_tokens: list[list[str]] = []
+        # Text ID -> category name -> summed usage count
+        self._counts: list[dict[str, int]] = []
+        self._sorted_texts: list[str] = []
+        self._token_texts: dict[str, set[int]] = {}
+        self._sorted_tokens: list[str] = []
+        self._tokens_by_length: dict[int, list[str]] = {}
+        self._text_ids_by_length: dict[int, set[int]] = {}
+        self._trigram_tokens: dict[str, set[str]] = {}
+        self._related_tokens_cache: dict[str, frozenset[str]] = {}
+        self._pair_scores: dict[tuple[str, str], float] = {}
+        self.set_pairs(history_pairs)
+
+    def __len__(self) -> int:
+        """Return the number of distinct past descriptions."""
+        return len(self._texts)
+
+    def add(self, description: str, category_name: str, count: int = 1) -> None:
+        """Record `count` more uses of `description` with `category_name` (e.g. a new transaction)."""
+        self._add(description, category_name, count, keep_sorted=True)
+
+    def set_pairs(self, history_pairs: Iterable[tuple[str, str, int]]) -> None:
+        """Replace the index with `(description, category_name, usage_count)` rows."""
+        self._text_ids.clear()
+        self._texts.clear()
+        self._text_tokens.clear()
+        self._counts.clear()
+        self._sorted_texts.clear()
+        self._token_texts.clear()
+        self._sorted_tokens.clear()
+        self._tokens_by_length.clear()
+        self._text_ids_by_length.clear()
+        self._trigram_tokens.clear()
+        self._related_tokens_cache.clear()
+        self._pair_scores.clear()
+        for row in history_pairs:
+            self._add(str(row[0]), row[1], int(row[2]), keep_sorted=False)
+        self._sorted_texts.sort()
+        self._sorted_tokens.sort()
+
+    def suggest(
+        self,
+        description: str,
+        category_names: Sequence[str],
+        *,
+        category_aliases: Mapping[str, Sequence[str]] | None = None,
+        limit: int = _DEFAULT_LIMIT,
+        min_score: float = _DEFAULT_MIN_SCORE,
+        min_length: int = _DEFAULT_MIN_LENGTH,
+    ) -> list[str]:
+        """Return up to `limit` category names suggested for `description`.
+
+        Same arguments and ranking as `suggest_categories` with the indexed pairs as history;
+        `min_score` must be positive.
+
+        """
+        query = description.strip().lower()
+        if len(query) < min_length:
+            return []
+
+        allowed = {name for name in category_names if name}
+        if not allowed:
+            return []
+
+        scores: dict[str, float] = {}
+        history_counts: dict[str, int] = {}
+        query_tokens = _tokens(query)
+        matcher = SequenceMatcher(None, "", query)
+        for text_id in self._candidates(query):
+            counts = self._counts[text_id]
+            if allowed.isdisjoint(counts):
+                continue
+            score = self._score(query, query_tokens, matcher, text_id)
+            if score < min_score:
+                continue
+            for category_name, count in counts.items():
+                if category_name not in allowed:
+                    continue
+                if score > scores.get(category_name, 0.0):
+                    scores[category_name] = score
+                history_counts[category_name] = history_counts.get(category_name, 0) + count
+
+        _add_alias_scores(query, allowed, category_aliases, min_score, scores)
+        return _rank_categories(scores, history_counts, limit)
+
+    def _add(self, description: str, category_name: str, count: int, *, keep_sorted: bool) -> None:
+        text = description.strip().lower()
+        if not text or not category_name:
+            return
+        text_id = self._text_ids.get(text)
+        if text_id is None:
+            text_id = len(self._texts)
+            self._text_ids[text] = text_id
+            self._texts.append(text)
+            self._text_tokens.append(_tokens(text))
+            self._counts.append({})
+            if keep_sorted:
+                insort(self._sorted_texts, text)
+            else:
+                self._sorted_texts.append(text)
+            self._text_ids_by_length.setdefault(len(text), set()).add(text_id)
+            for token in self._text_tokens[text_id]:
+                postings = self._token_texts.get(token)
+                if postings is None:
+                    postings = self._token_texts[token] = set()
+                    if keep_sorted:
+                        insort(self._sorted_tokens, token)
+                    else:
+                        self._sorted_tokens.append(token)
+                    self._tokens_by_length.setdefault(len(token), []).append(token)
+                    for trigram in _trigrams(token):
+                        self._trigram_tokens.setdefault(trigram, set()).add(token)
+                    self._related_tokens_cache.clear()
+                postings.add(text_id)
+        counts = self._counts[text_id]
+        counts[category_name] = counts.get(category_name, 0) + max(count, 1)
+
+    def _candidates(self, query: str) -> set[int]:
+        """Return IDs of descriptions that can score above zero against `query`."""
+        candidates: set[int] = set()
+        exact = self._text_ids.get(query)
+        if exact is not None:
+            candidates.add(exact)
+        # A prefix score needs the shorter text to have at least `_MIN_TOKEN_LENGTH` characters
+        if len(query) >= _MIN_TOKEN_LENGTH:
+            position = bisect_left(self._sorted_texts, query)
+            while position < len(self._sorted_texts) and self._sorted_texts[position].startswith(query):
+                candidates.add(self._text_ids[self._sorted_texts[position]])
+                position += 1
+            for end in range(_MIN_TOKEN_LENGTH, len(query)):
+                text_id = self._text_ids.get(query[:end])
+                if text_id is not None:
+                    candidates.add(text_id)
+        for token in set(_tokens(query)):
+            for related in self._related_tokens(token):
+                candidates.update(self._token_texts[related])
+        candidates.update(self._similar_texts(query, candidates))
+        return candidates
+
+    def _related_tokens(self, token: str) -> frozenset[str]:
+        """Return indexed tokens with a positive `_token_pair_score` against query `token`."""
+        cached = self._related_tokens_cache.get(token)
+        if cached is not None:
+            return cached
+        related: set[str] = set()
+        if token in self._token_texts:
+            related.add(token)
+        position = bisect_left(self._sorted_tokens, token)
+        while position < len(self._sorted_tokens) and self._sorted_tokens[position].startswith(token):
+            candidate = self._sorted_tokens[position]
+            if len(token) / len(candidate) >= _PREFIX_MIN_RATIO:
+                related.add(candidate)
+            position += 1
+        for end in range(_MIN_TOKEN_LENGTH, len(token)):
+            if token[:end] in self._token_texts and end / len(token) >= _PREFIX_MIN_RATIO:
+                related.add(token[:end])
+
+        # `quick_ratio` (symmetric) bounds `ratio` from above, so it rules out most typo candidates cheaply
+        matcher = SequenceMatcher(None, "", token)
+        for length, candidates in self._tokens_by_length.items():
+            if min(length, len(token)) / max(length, len(token)) < _TYPO_MIN_LENGTH_RATIO:
+                continue
+            for candidate in candidates:
+                if candidate in related:
+                    continue
+                matcher.set_seq1(candidate)
+                if matcher.quick_ratio() >= _TYPO_MIN_RATIO and _token_pair_score(token, candidate) > 0.0:
+                    related.add(candidate)
+
+        if len(self._related_tokens_cache) >= _RELATED_TOKENS_CACHE_SIZE:
+            self._related_tokens_cache.clear()
+        result = self._related_tokens_cache[token] = frozenset(related)
+        return result
+
+    def _score(self, query: str, query_tokens: list[str], matcher: SequenceMatcher, text_id: int) -> float:
+        """Return `_score_texts(query, text)`, reusing token pair scores across descriptions.
+
+        `matcher` has `query` as its second sequence; its `quick_ratio` skips typo checks
+        that cannot raise the score.
+
+        """
+        text = self._texts[text_id]
+        if query == text:
+            return 1.0
+        best = _prefix_score(query, text)
+        text_tokens = self._text_tokens[text_id]
+        if query_tokens and text_tokens:
+            if len(self._pair_scores) >= _PAIR_SCORE_CACHE_SIZE:
+                self._pair_scores.clear()
+            matched = 0.0
+            for query_token in query_tokens:
+                token_best = 0.0
+                for text_token in text_tokens:
+                    pair = (query_token, text_token)
+                    pair_score = self._pair_scores.get(pair)
+                    if pair_score is None:
+                        pair_score = self._pair_scores[pair] = _token_pair_score(query_token, text_token)
+                    token_best = max(token_best, pair_score)
+                matched += token_best
+            coverage = matched / len(query_tokens)
+            if coverage > 0.0:
+                best = max(best, 0.55 + 0.45 * coverage)
+        # `ratio` never exceeds `real_quick_ratio` or `quick_ratio`, so the typo check cannot beat a higher score
+        matcher.set_seq1(text)
+        if matcher.real_quick_ratio() > best and matcher.quick_ratio() > best:
+            best = max(best, _similar_typo(query, text))
+        return best
+
+    def _similar_texts(self, query: str, skip: set[int]) -> list[int]:
+        """Return IDs of descriptions (not in `skip`) that can pass the whole-string typo check."""
+        if len(query) < _MIN_TOKEN_LENGTH:
+            return []
+        tokens: set[str] = set()
+        for trigram in _trigrams(query):
+            tokens.update(self._trigram_tokens.get(trigram, ()))
+        if not tokens:
+            return []
+        same_length: set[int] = set()
+        for length, text_ids in self._text_ids_by_length.items():
+            if min(length, len(query)) / max(length, len(query)) >= _TYPO_MIN_LENGTH_RATIO:
+                same_length.update(text_ids)
+        sharing: set[int] = set()
+        for token in tokens:
+            sharing.update(self._token_texts[token])
+        matcher = SequenceMatcher(None, "", query)
+        similar = []
+        for text_id in (same_length & sharing) - skip:
+            matcher.set_seq1(self._texts[text_id])
+            if matcher.quick_ratio() >= _TYPO_MIN_RATIO:
+                similar.append(text_id)
+        return similar
 
 
 def suggest_categories(
@@ -63,6 +324,17 @@ def suggest_categories(
             scores[category_name] = score
         history_counts[category_name] = history_counts.get(category_name, 0) + max(count, 1)
 
+    _add_alias_scores(query, allowed, category_aliases, min_score, scores)
+    return _rank_categories(scores, history_counts, limit)
+
+
+def _add_alias_scores(
+    query: str,
+    allowed: set[str],
+    category_aliases: Mapping[str, Sequence[str]] | None,
+    min_score: float,
+    scores: dict[str, float],
+) -> None:
     for category_name in allowed:
         aliases = [category_name]
         if category_aliases is not None:
@@ -79,6 +351,15 @@ def suggest_categories(
         if best_alias > previous:
             scores[category_name] = best_alias
 
+
+def _prefix_score(query: str, candidate: str) -> float:
+    shorter, longer = (query, candidate) if len(query) <= len(candidate) else (candidate, query)
+    if len(shorter) < _MIN_TOKEN_LENGTH or not longer.startswith(shorter):
+        return 0.0
+    return 0.82 + 0.18 * (len(shorter) / len(longer))
+
+
+def _rank_categories(scores: dict[str, float], history_counts: dict[str, int], limit: int) -> list[str]:
     ranked = sorted(
         scores.items(),
         key=lambda item: (
@@ -89,13 +370,6 @@ def suggest_categories(
     return [name for name, _ in ranked[:limit]]
 
 
-def _prefix_score(query: str, candidate: str) -> float:
-    shorter, longer = (query, candidate) if len(query) <= len(candidate) else (candidate, query)
-    if len(shorter) < _MIN_TOKEN_LENGTH or not longer.startswith(shorter):
-        return 0.0
-    return 0.82 + 0.18 * (len(shorter) / len(longer))
-
-
 def _score_texts(query: str, candidate: str) -> float:
     if not query or not candidate:
         return 0.0
@@ -127,8 +401,8 @@ def _token_pair_score(left: str, right: str) -> float:
 
 
 def _token_score(query: str, candidate: str) -> float:
-    query_tokens = [token for token in _TOKEN_RE.findall(query) if len(token) >= _MIN_TOKEN_LENGTH]
-    candidate_tokens = [token for token in _TOKEN_RE.findall(candidate) if len(token) >= _MIN_TOKEN_LENGTH]
+    query_tokens = _tokens(query)
+    candidate_tokens = _tokens(candidate)
     if not query_tokens or not candidate_tokens:
         return 0.0
 
@@ -142,3 +416,11 @@ def _token_score(query: str, candidate: str) -> float:
     if coverage <= 0.0:
         return 0.0
     return 0.55 + 0.45 * coverage
+
+
+def _tokens(text: str) -> list[str]:
+    return [token for token in _TOKEN_RE.findall(text) if len(token) >= _MIN_TOKEN_LENGTH]
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[index : index + 3] for index in range(len(text) - 2)}
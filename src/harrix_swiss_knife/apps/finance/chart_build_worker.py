@@ -0,0 +1,408 @@
+"""Background computation of finance chart series with debounce and cancellation."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from PySide6.QtCore import QObject, QThread, QTimer, Signal
+
+from harrix_swiss_knife.apps.finance.chart_result_cache import ChartResultCache
+from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager
+from harrix_swiss_knife.apps.finance.transaction_helpers import (
+    ChartComputeContext,
+    compute_average_salary_by_year,
+    compute_balance_series,
+    compute_cumulative_compare_last_months,
+    compute_cumulative_compare_last_years,
+    compute_cumulative_compare_same_months,
+    compute_period_flow_by_category,
+    compute_period_flow_compare_last_years,
+    compute_period_flow_series,
+    iter_period_end_dates,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+CHART_KINDS: tuple[str, ...] = (
+    "average_salary",
+    "balance",
+    "category",
+    "compare_last",
+    "compare_last_years",
+    "compare_same_months",
+    "expense_income",
+    "expense_income_compare_last_years",
+)
+# Kinds whose periods end today, so the same controls give a different chart on another day
+DATE_RELATIVE_CHART_KINDS: frozenset[str] = frozenset(
+    {
+        "average_salary",
+        "compare_last",
+        "compare_last_years",
+        "compare_same_months",
+        "expense_income_compare_last_years",
+    }
+)
+
+NO_DATA_MESSAGE = "No data found for the selected period"
+NO_CATEGORIES_MESSAGE = "Please select at least one category"
+
+
+@dataclass(frozen=True, slots=True)
+class ChartBuildResult:
+    """Chart series computed off the UI thread, ready to draw with matplotlib.
+
+    `data` depends on `request.kind`:
+
+    - `average_salary`: `list[tuple[str, float, float]]` of year rows.
+    - `balance`: `list[tuple[str, float]]` balance series.
+    - `category`: `dict[str, list[tuple[str, float]]]` series by category name.
+    - `compare_*`: `list[tuple[str, int, series, labels, colors]]`, one entry per Expense/Income section.
+    - `expense_income`: `(expense_series, income_series)`, either may be `None`.
+    - `expense_income_compare_last_years`: `list[tuple[str, series, labels, colors]]` per section.
+
+    When `message` is set, there is nothing to draw and the message is shown instead.
+
+    """
+
+    request: ChartRequest
+    data: Any = None
+    message: str | None = None
+
+
+class ChartBuildScheduler(QObject):
+    """Debounce chart requests and compute only the latest one on a `ChartBuildWorker`.
+
+    Every `request` restarts the debounce timer and supersedes the previous one. When the timer fires
+    while a worker is still computing a superseded request, that worker is asked to stop and the
+    latest request starts as soon as it finishes. Results of superseded requests are never emitted.
+
+    Completed results are kept in `cache`; a request found there is answered immediately, without
+    debounce or worker.
+
+    """
+
+    chart_completed: Signal = Signal(object)  # ChartBuildResult
+    chart_failed: Signal = Signal(str)
+
+    def __init__(
+        self,
+        parent: QObject | None = None,
+        *,
+        interval_ms: int = 150,
+        cache: ChartResultCache | None = None,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+
+        - `parent` (`QObject | None`): Qt parent (usually the Finance window).
+        - `interval_ms` (`int`): Debounce interval. Defaults to `150`.
+        - `cache` (`ChartResultCache | None`): Result cache; a new one with the default budget
+          when `None`. Defaults to `None`.
+
+        """
+        super().__init__(parent)
+        self.cache = cache if cache is not None else ChartResultCache()
+        self._sequence = 0
+        self._pending: tuple[int, ChartRequest] | None = None
+        self._worker: ChartBuildWorker | None = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._start_pending)
+
+    @property
+    def busy(self) -> bool:
+        """Whether a request is waiting for the debounce timer or being computed."""
+        return self._pending is not None or (self._worker is not None and self._worker.isRunning())
+
+    def request(self, request: ChartRequest) -> int:
+        """Schedule `request`, superseding any earlier one, and return its sequence number.
+
+        A cached result is emitted through `chart_completed` before this returns.
+
+        """
+        self._sequence += 1
+        if self._worker is not None:
+            self._worker.requestInterruption()
+        cached = self.cache.get(request)
+        if cached is not None:
+            self._timer.stop()
+            self._pending = None
+            self.chart_completed.emit(cached)
+            return self._sequence
+        self._pending = (self._sequence, request)
+        self._timer.start()
+        return self._sequence
+
+    def shutdown(self, timeout_ms: int = 3000) -> None:
+        """Drop pending requests and stop the running worker (blocks up to `timeout_ms`)."""
+        self._timer.stop()
+        self._pending = None
+        self._sequence += 1
+        worker = self._worker
+        if worker is not None and worker.isRunning():
+            worker.requestInterruption()
+            worker.wait(timeout_ms)
+
+    def _on_worker_completed(self, result: ChartBuildResult) -> None:
+        self.cache.put(result)
+        worker = self.sender()
+        if isinstance(worker, ChartBuildWorker) and worker.sequence == self._sequence:
+            self.chart_completed.emit(result)
+
+    def _on_worker_failed(self, error_message: str) -> None:
+        worker = self.sender()
+        if isinstance(worker, ChartBuildWorker) and worker.sequence == self._sequence:
+            self.chart_failed.emit(error_message)
+
+    def _on_worker_finished(self) -> None:
+        worker = self.sender()
+        if worker is self._worker:
+            self._worker = None
+        if isinstance(worker, ChartBuildWorker):
+            worker.deleteLater()
+        if self._pending is not None and not self._timer.isActive():
+            self._start_pending()
+
+    def _start_pending(self) -> None:
+        if self._pending is None:
+            return
+        if self._worker is not None and self._worker.isRunning():
+            # Started again from `_on_worker_finished` once the superseded worker stops
+            self._worker.requestInterruption()
+            return
+        sequence, request = self._pending
+        self._pending = None
+        worker = ChartBuildWorker(request, sequence)
+        worker.chart_completed.connect(self._on_worker_completed)
+        worker.chart_failed.connect(self._on_worker_failed)
+        worker.finished.connect(self._on_worker_finished)
+        self._worker = worker
+        worker.start()
+
+
+class ChartBuildWorker(QThread):
+    """Load chart inputs from the database and compute series on a background thread."""
+
+    chart_completed: Signal = Signal(object)  # ChartBuildResult
+    chart_failed: Signal = Signal(str)
+
+    def __init__(self, request: ChartRequest, sequence: int = 0) -> None:
+        """Initialize the worker.
+
+        Args:
+
+        - `request` (`ChartRequest`): Snapshot of the chart controls; `db_filename` must be set.
+        - `sequence` (`int`): Request number assigned by `ChartBuildScheduler`. Defaults to `0`.
+
+        """
+        super().__init__()
+        self.request = request
+        self.sequence = sequence
+
+    def run(self) -> None:
+        """Compute the chart unless interrupted; interrupted runs emit nothing."""
+        db_manager: DatabaseManager | None = None
+        try:
+            if self.request.db_filename is None:
+                self.chart_failed.emit("Database path is not available for chart building.")
+                return
+            db_manager = DatabaseManager(self.request.db_filename, read_only=True)
+            result = compute_chart(self.request, db_manager, should_stop=self.isInterruptionRequested)
+            if result is not None and not self.isInterruptionRequested():
+                self.chart_completed.emit(result)
+        except Exception as e:
+            if not self.isInterruptionRequested():
+                self.chart_failed.emit(str(e))
+        finally:
+            if db_manager is not None:
+                db_manager.close()
+
+
+@dataclass(frozen=True, slots=True)
+class ChartRequest:
+    """Snapshot of the chart tab controls, taken on the UI thread.
+
+    `data_generation` is `DatabaseManager.data_generation()` at snapshot time and `today` is
+    the snapshot date for `DATE_RELATIVE_CHART_KINDS` (empty otherwise), so equal requests
+    are answered by equal results and can share a `ChartResultCache` entry.
+
+    """
+
+    kind: str
+    period: str
+    date_from: str
+    date_to: str
+    currency_symbol: str
+    data_generation: int = 0
+    expense_names: frozenset[str] = frozenset()
+    income_names: frozenset[str] = frozenset()
+    compare_count: int = 1
+    selected_month: int = 1
+    year_start_month: int = 1
+    year_start_day: int = 1
+    db_filename: str | None = None
+    today: str = ""
+
+    @property
+    def all_names(self) -> frozenset[str]:
+        """Return the checked expense and income category names."""
+        return self.expense_names | self.income_names
+
+
+def compute_chart(
+    request: ChartRequest,
+    db_manager: DatabaseManager,
+    *,
+    should_stop: Callable[[], bool] | None = None,
+) -> ChartBuildResult | None:
+    """Compute the series for `request` without touching any widget.
+
+    Args:
+
+    - `request` (`ChartRequest`): Snapshot of the chart controls.
+    - `db_manager` (`DatabaseManager`): Connection owned by the calling thread.
+    - `should_stop` (`Callable[[], bool] | None`): Polled between loading and computing steps.
+      Defaults to `None`.
+
+    Returns:
+
+    - `ChartBuildResult | None`: The computed chart, or `None` when `should_stop` returned `True`.
+
+    """
+    if request.kind not in CHART_KINDS:
+        msg = f"Unknown chart type: {request.kind}"
+        raise ValueError(msg)
+
+    def stopped() -> bool:
+        return should_stop is not None and should_stop()
+
+    if request.kind == "average_salary":
+        year_rows = compute_average_salary_by_year(
+            db_manager,
+            db_manager.get_default_currency_id(),
+            year_start_month=request.year_start_month,
+            year_start_day=request.year_start_day,
+        )
+        return ChartBuildResult(request, year_rows, None if year_rows else NO_DATA_MESSAGE)
+
+    if request.kind != "balance" and not request.all_names:
+        return ChartBuildResult(request, message=NO_CATEGORIES_MESSAGE)
+
+    transaction_rows = db_manager.get_all_transactions()
+    if stopped():
+        return None
+    ctx = ChartComputeContext.load(db_manager)
+    if stopped():
+        return None
+    sections = [
+        (title, category_type, set(names))
+        for title, category_type, names in (("Expense", 0, request.expense_names), ("Income", 1, request.income_names))
+        if names
+    ]
+
+    if request.kind == "balance":
+        exchange_rows = db_manager.get_all_currency_exchanges()
+        period_end_dates = iter_period_end_dates(request.date_from, request.date_to, request.period)
+        series = compute_balance_series(transaction_rows, exchange_rows, db_manager, period_end_dates, ctx=ctx)
+        return ChartBuildResult(request, series, None if series else NO_DATA_MESSAGE)
+
+    if request.kind == "category":
+        category_series = compute_period_flow_by_category(
+            transaction_rows,
+            db_manager,
+            request.date_from,
+            request.date_to,
+            request.period,
+            set(request.all_names),
+            ctx=ctx,
+        )
+        has_data = any(category_series.values())
+        return ChartBuildResult(request, category_series, None if has_data else NO_DATA_MESSAGE)
+
+    if request.kind == "expense_income":
+        flows: list[list[tuple[str, float]] | None] = [None, None]
+        for _title, category_type, names in sections:
+            if stopped():
+                return None
+            flows[category_type] = compute_period_flow_series(
+                transaction_rows,
+                db_manager,
+                request.date_from,
+                request.date_to,
+                request.period,
+                names,
+                category_type=category_type,
+                ctx=ctx,
+            )
+        return ChartBuildResult(request, tuple(flows))
+
+    compared: list[tuple[Any, ...]] = []
+    for title, category_type, names in sections:
+        if stopped():
+            return None
+        if request.kind == "expense_income_compare_last_years":
+            compared.append(
+                (
+                    title,
+                    *compute_period_flow_compare_last_years(
+                        transaction_rows,
+                        db_manager,
+                        request.compare_count,
+                        names,
+                        category_type,
+                        request.period,
+                        year_start_month=request.year_start_month,
+                        year_start_day=request.year_start_day,
+                        ctx=ctx,
+                    ),
+                )
+            )
+        elif request.kind == "compare_last":
+            compared.append(
+                (
+                    title,
+                    category_type,
+                    *compute_cumulative_compare_last_months(
+                        transaction_rows, db_manager, request.compare_count, names, category_type, ctx=ctx
+                    ),
+                )
+            )
+        elif request.kind == "compare_last_years":
+            compared.append(
+                (
+                    title,
+                    category_type,
+                    *compute_cumulative_compare_last_years(
+                        transaction_rows,
+                        db_manager,
+                        request.compare_count,
+                        names,
+                        category_type,
+                        year_start_month=request.year_start_month,
+                        year_start_day=request.year_start_day,
+                        ctx=ctx,
+                    ),
+                )
+            )
+        else:
+            compared.append(
+                (
+                    title,
+                    category_type,
+                    *compute_cumulative_compare_same_months(
+                        transaction_rows,
+                        db_manager,
+                        request.compare_count,
+                        request.selected_month,
+                        names,
+                        category_type,
+                        ctx=ctx,
+                    ),
+                )
+            )
+    return ChartBuildResult(request, compared)
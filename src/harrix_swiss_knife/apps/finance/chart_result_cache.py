@@ -0,0 +1,151 @@
+"""Generation-keyed LRU cache of computed finance chart series.
+
+A computed chart is keyed by its whole `ChartRequest`: chart kind, period, date range,
+currency, checked categories, the date for charts that end today, and the database
+`data_generation` token the request was taken under. Any transaction, exchange or rate
+write advances the token, so requests made after an edit never match results computed
+before it; those older entries are dropped as soon as a newer generation of the same
+database is seen.
+
+"""
+
+from __future__ import annotations
+
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from harrix_swiss_knife.apps.finance.chart_build_worker import ChartBuildResult, ChartRequest
+
+DEFAULT_CHART_CACHE_BUDGET_BYTES = 32 * 1024 * 1024
+
+
+class ChartResultCache:
+    """LRU of chart results bounded by an estimated memory budget.
+
+    Meant to be used from the UI thread only (lookups on request, stores when a worker reports back).
+
+    """
+
+    def __init__(self, budget_bytes: int = DEFAULT_CHART_CACHE_BUDGET_BYTES) -> None:
+        """Create an empty cache holding results up to `budget_bytes` in total (estimated)."""
+        self.budget_bytes = max(0, budget_bytes)
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+        self._entries: OrderedDict[ChartRequest, tuple[int, ChartBuildResult]] = OrderedDict()
+        self._generations: dict[str | None, int] = {}
+        self._size_bytes = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached results."""
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop every cached result (counters are kept)."""
+        self._entries.clear()
+        self._generations.clear()
+        self._size_bytes = 0
+
+    def get(self, request: ChartRequest) -> ChartBuildResult | None:
+        """Return the result cached for `request`, or `None` on a miss."""
+        self._observe_generation(request)
+        entry = self._entries.get(request)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(request)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, result: ChartBuildResult) -> None:
+        """Cache `result` under its request, evicting least recently used results past the budget.
+
+        Results of a generation older than one already seen for the same database, and results
+        larger than the whole budget, are not stored.
+
+        """
+        request = result.request
+        if request.data_generation < self._generations.get(request.db_filename, request.data_generation):
+            return
+        self._observe_generation(request)
+        size = _estimated_size(result.data) + sys.getsizeof(result)
+        if size > self.budget_bytes:
+            return
+        previous = self._entries.pop(request, None)
+        if previous is not None:
+            self._size_bytes -= previous[0]
+        self._entries[request] = (size, result)
+        self._size_bytes += size
+        while self._size_bytes > self.budget_bytes:
+            _request, (evicted_size, _result) = self._entries.popitem(last=False)
+            self._size_bytes -= evicted_size
+            self.evictions += 1
+
+    def reset_stats(self) -> None:
+        """Zero the hit/miss/stale/eviction counters."""
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+
+    def stats(self) -> ChartResultCacheStats:
+        """Return a snapshot of cache counters."""
+        return ChartResultCacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            stale=self.stale,
+            evictions=self.evictions,
+            size=len(self._entries),
+            size_bytes=self._size_bytes,
+            budget_bytes=self.budget_bytes,
+        )
+
+    def _observe_generation(self, request: ChartRequest) -> None:
+        """Drop results of older generations once `request` shows a newer one for its database."""
+        known = self._generations.get(request.db_filename)
+        if known is not None and known >= request.data_generation:
+            return
+        self._generations[request.db_filename] = request.data_generation
+        if known is None:
+            return
+        for cached_request in [cached for cached in self._entries if cached.db_filename == request.db_filename]:
+            size, _result = self._entries.pop(cached_request)
+            self._size_bytes -= size
+            self.stale += 1
+
+
+@dataclass(frozen=True, slots=True)
+class ChartResultCacheStats:
+    """Counters of a `ChartResultCache` at one point in time."""
+
+    hits: int
+    misses: int
+    stale: int
+    evictions: int
+    size: int
+    size_bytes: int
+    budget_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Return hits divided by lookups (`0.0` before the first lookup)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def _estimated_size(value: object) -> int:
+    """Return the approximate memory held by `value` and the containers, strings and arrays inside it."""
+    if isinstance(value, np.ndarray):
+        return sys.getsizeof(value) + (0 if value.base is None else value.nbytes)
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        return size + sum(_estimated_size(key) + _estimated_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(_estimated_size(item) for item in value)
+    return size
@@ -3,14 +3,68 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, NoReturn
+from typing import TYPE_CHECKING, Any
 
 from harrix_swiss_knife.apps.common.qt_database_manager_base import QtSqliteDatabaseManagerBase
-from harrix_swiss_knife.apps.finance.services.exchange_rates import ExchangeRatesService
+from harrix_swiss_knife.apps.common.query_result_cache import cached_read
+from harrix_swiss_knife.apps.common.schema_migrations import SchemaMigration
+from harrix_swiss_knife.apps.finance.services.exchange_rates import (
+    EXCHANGE_RATE_STORAGE_OBSERVED,
+    ExchangeRatesService,
+    rate_on_date_sql,
+)
+from harrix_swiss_knife.apps.finance.services.transaction_summary import TransactionSummaryService
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping
+
+    from harrix_swiss_knife.apps.common.scroll_pagination import KeysetCursor
+    from harrix_swiss_knife.apps.finance.services.exchange_rates import RateIngestResult
 
 logger = logging.getLogger(__name__)
 
 _DESCRIPTION_COLUMN_INDEX = 2
+_DESCRIPTION_EN_COLUMN_INDEX = 10
+# The trigram tokenizer indexes 3-character substrings; shorter filters are matched in Python
+_DESCRIPTION_INDEX_MIN_FILTER_LENGTH = 3
+# External-content FTS5 index over both descriptions, kept in sync with `transactions` by triggers.
+# `trigram` folds case with Unicode rules (Cyrillic included) and matches any substring.
+_DESCRIPTION_INDEX_SQL = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+        description, description_en, content='transactions', content_rowid='_id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS trg_transactions_fts_insert AFTER INSERT ON transactions BEGIN
+        INSERT INTO transactions_fts (rowid, description, description_en)
+        VALUES (NEW._id, NEW.description, NEW.description_en);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_transactions_fts_delete AFTER DELETE ON transactions BEGIN
+        INSERT INTO transactions_fts (transactions_fts, rowid, description, description_en)
+        VALUES ('delete', OLD._id, OLD.description, OLD.description_en);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_transactions_fts_update
+    AFTER UPDATE OF _id, description, description_en ON transactions BEGIN
+        INSERT INTO transactions_fts (transactions_fts, rowid, description, description_en)
+        VALUES ('delete', OLD._id, OLD.description, OLD.description_en);
+        INSERT INTO transactions_fts (rowid, description, description_en)
+        VALUES (NEW._id, NEW.description, NEW.description_en);
+    END""",
+    "INSERT INTO transactions_fts (transactions_fts) VALUES ('rebuild')",
+)
+_DROP_DESCRIPTION_INDEX_SQL = (
+    "DROP TRIGGER IF EXISTS trg_transactions_fts_insert",
+    "DROP TRIGGER IF EXISTS trg_transactions_fts_delete",
+    "DROP TRIGGER IF EXISTS trg_transactions_fts_update",
+    "DROP TABLE IF EXISTS transactions_fts",
+)
+# Tables charts and reports are computed from; `data_generation` advances when any of them is written
+_DATA_GENERATION_TABLES = (
+    "categories",
+    "currencies",
+    "currency_exchanges",
+    "exchange_rates",
+    "settings",
+    "transactions",
+)
 
 
 class DatabaseManager(QtSqliteDatabaseManagerBase):
@@ -25,29 +79,31 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
 
     _db_closed: bool
 
-    def __init__(self, db_filename: str) -> None:
+    def __init__(self, db_filename: str, *, read_only: bool = False) -> None:
         """Open a connection to an SQLite database stored in `db_filename`.
 
         Args:
 
         - `db_filename` (`str`): The path to the target database file.
+        - `read_only` (`bool`): Borrow a pooled read-only connection and skip schema
+          migrations. Meant for worker threads that only read; writers keep their own
+          connection. Defaults to `False`.
 
         Raises:
 
         - `ConnectionError`: If the underlying Qt driver fails to open the database.
 
         """
-        super().__init__(prefix="finance_db", db_filename=db_filename)
+        super().__init__(prefix="finance_db", db_filename=db_filename, read_only=read_only)
 
         self.exchange_rates = ExchangeRatesService(self)
+        self.summary = TransactionSummaryService(self)
+        # Whether `transactions_fts` exists; checked on the first description filter
+        self._description_index_available: bool | None = None
 
-        # Initialize default settings if they don't exist
-        self._init_default_settings()
-        self._ensure_category_name_local_column()
-        self._ensure_transaction_description_en_column()
-        self._ensure_standard_items_table()
-        self._ensure_system_categories()
-        self._ensure_performance_indexes()
+        # Default settings, legacy column renames, system categories and indexes
+        if not read_only:
+            self.migrate_schema()
 
         # Cached default currency (code, id); loaded once from DB, updated only by set_default_currency
         self._default_currency_cache: tuple[str, int] | None = None
@@ -259,7 +315,8 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
             "tag": tag,
             "description_en": description_en.strip() or None,
         }
-        return self.execute_simple_query(query, params)
+        with self.summary.track_dates(date):
+            return self.execute_simple_query(query, params)
 
     def check_exchange_rate_exists(self, currency_id: int, date: str) -> bool:
         """Check if exchange rate to USD exists for given currency and date.
@@ -298,15 +355,18 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
         - `bool`: `True` if the update succeeded.
 
         """
-        return self.execute_simple_query(
-            "UPDATE transactions SET tag = '' WHERE _id = :id",
-            {"id": transaction_id},
-        )
+        with self.summary.track_dates():
+            return self.execute_simple_query(
+                "UPDATE transactions SET tag = '' WHERE _id = :id",
+                {"id": transaction_id},
+            )
 
     def close(self) -> None:
         """Close the database connection."""
         self._default_currency_cache = None
+        self._description_index_available = None
         self.exchange_rates.clear_cache()
+        self.summary.clear_cache()
         super().close()
 
     def convert_from_minor_units(self, amount_minor: float, currency_id: int) -> float:
@@ -352,6 +412,25 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
         )
         return int(rows[0][0]) if rows else 0
 
+    def data_generation(self, tables: Iterable[str] = _DATA_GENERATION_TABLES) -> int:
+        """Return a token that grows with every transaction, exchange, rate, category, currency or settings write.
+
+        Generations are shared by every manager on the same file, so a token read on the GUI
+        connection also reflects writes committed by worker-thread managers (and vice versa).
+        Writes made outside the manager are seen only after `invalidate_result_cache`.
+
+        Args:
+
+        - `tables` (`Iterable[str]`): Lower-case names of the tables to watch. Defaults to the
+          tables charts and reports are computed from.
+
+        Returns:
+
+        - `int`: Sum of the tables' write generations (equal tokens mean no write in between).
+
+        """
+        return sum(self._table_generations.snapshot(tables))
+
     def delete_account(self, account_id: int) -> bool:
         """Delete an account from the database.
 
@@ -470,11 +549,15 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
 
         """
         query = "DELETE FROM transactions WHERE _id = :id"
-        return self.execute_simple_query(query, {"id": transaction_id})
+        with self.summary.track_dates(*self._transaction_dates([transaction_id])):
+            return self.execute_simple_query(query, {"id": transaction_id})
 
     def fill_missing_exchange_rates(self) -> int:
         """Fill missing exchange rates with previous available rates for all date gaps.
 
+        Only inserts rows in `daily` rate storage; `observed` storage resolves gaps with
+        as-of lookups and returns `0`.
+
         Returns:
 
         - `int`: Number of exchange rates that were filled.
@@ -498,50 +581,31 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
         usd_currency = self.get_currency_by_code("USD")
         usd_currency_id = usd_currency[0] if usd_currency else None
 
+        source_rate = rate_on_date_sql("a._id_currencies", "date('now')")
+        target_rate = rate_on_date_sql(":currency_id", "date('now')")
         if currency_id == usd_currency_id:
             # Converting to USD - direct rates
-            query = """
+            query = f"""
                 SELECT a.name,
                        CASE
                            WHEN a._id_currencies = :currency_id THEN a.balance
-                           ELSE COALESCE(er.rate * a.balance, a.balance)
+                           ELSE COALESCE({source_rate} * a.balance, a.balance)
                        END as converted_balance
                 FROM accounts a
-                LEFT JOIN exchange_rates er ON er._id_currency = a._id_currencies
-                                            AND er.date = (
-                                                SELECT MAX(date)
-                                                FROM exchange_rates er2
-                                                WHERE er2._id_currency = a._id_currencies
-                                                  AND er2.date <= date('now')
-                                            )
                 ORDER BY a.name
             """
         else:
             # Converting to non-USD currency via USD
-            query = """
+            query = f"""
                 SELECT a.name,
                        CASE
                            WHEN a._id_currencies = :currency_id THEN a.balance
                            WHEN a._id_currencies = :usd_currency_id THEN
-                               COALESCE(a.balance / NULLIF(target_er.rate, 0), a.balance)
+                               COALESCE(a.balance / NULLIF({target_rate}, 0), a.balance)
                            ELSE
-                               COALESCE(source_er.rate * a.balance / NULLIF(target_er.rate, 0), a.balance)
+                               COALESCE({source_rate} * a.balance / NULLIF({target_rate}, 0), a.balance)
                        END as converted_balance
                 FROM accounts a
-                LEFT JOIN exchange_rates source_er ON source_er._id_currency = a._id_currencies
-                                                   AND source_er.date = (
-                                                       SELECT MAX(date)
-                                                       FROM exchange_rates ser2
-                                                       WHERE ser2._id_currency = a._id_currencies
-                                                         AND ser2.date <= date('now')
-                                                   )
-                LEFT JOIN exchange_rates target_er ON target_er._id_currency = :currency_id
-                                                   AND target_er.date = (
-                                                       SELECT MAX(date)
-                                                       FROM exchange_rates ter2
-                                                       WHERE ter2._id_currency = :currency_id
-                                                         AND ter2.date <= date('now')
-                                                   )
                 ORDER BY a.name
             """
         if currency_id == usd_currency_id:
@@ -589,6 +653,7 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
 
         # Return raw balance values (in minor units) - conversion will be done in the UI layer
 
+    @cached_read("categories")
     def get_all_categories(self) -> list[list[Any]]:
         r"""Get all categories.
 
@@ -599,6 +664,7 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
         """
         return self.get_rows("SELECT _id, name, type, icon, name_local FROM categories ORDER BY type, name")
 
+    @cached_read("currencies")
     def get_all_currencies(self) -> list[list[Any]]:
         r"""Get all currencies.
 
@@ -624,6 +690,7 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
             by_id[currency_id] = (code, name, symbol)
         return by_code, by_id
 
+    @cached_read("currency_exchanges", "currencies")
     def get_all_currency_exchanges(self) -> list[list[Any]]:
         """Get all currency exchange records with currency information.
 
@@ -655,20 +722,28 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
 
         return rows
 
-    def get_all_exchange_rates(self, limit: int | None = None, offset: int = 0) -> list[list[Any]]:
+    def get_all_exchange_rates(
+        self,
+        limit: int | None = None,
+        offset: int = 0,
+        *,
+        after: KeysetCursor | None = None,
+    ) -> list[list[Any]]:
         """Get all exchange rates with currency information.
 
         Args:
 
         - `limit` (`int | None`): Maximum number of records to return. `None` for all records. Defaults to `None`.
         - `offset` (`int`): Number of records to skip. Defaults to `0`.
+        - `after` (`KeysetCursor | None`): Keyset cursor; when given, return rows after it
+          instead of skipping `offset` rows. Defaults to `None`.
 
         Returns:
 
         - `list[list[Any]]`: List of exchange rate records.
 
         """
-        return self.exchange_rates.get_all_exchange_rates(limit, offset)
+        return self.exchange_rates.get_all_exchange_rates(limit, offset, after=after)
 
     def get_all_standard_items(self) -> list[list[Any]]:
         r"""Get all standard catalog items with category info.
@@ -688,13 +763,22 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
             """
         )
 
-    def get_all_transactions(self, limit: int | None = None, offset: int = 0) -> list[list[Any]]:
+    @cached_read("transactions", "categories", "currencies")
+    def get_all_transactions(
+        self,
+        limit: int | None = None,
+        offset: int = 0,
+        *,
+        after: KeysetCursor | None = None,
+    ) -> list[list[Any]]:
         """Get all transactions with category and currency information.
 
         Args:
 
         - `limit` (`int | None`): Limit number of records. Defaults to `None` (no limit).
         - `offset` (`int`): Number of records to skip. Defaults to `0`.
+        - `after` (`KeysetCursor | None`): Keyset cursor; when given, return rows after it
+          instead of skipping `offset` rows. Defaults to `None`.
 
         Returns:
 
@@ -707,15 +791,20 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
             FROM transactions t
             JOIN categories cat ON t._id_categories = cat._id
             JOIN currencies c ON t._id_currencies = c._id
-            ORDER BY t.date DESC, t._id DESC
         """
 
-        params: dict[str, Any] | None = None
+        params: dict[str, Any] = {}
+        if after is not None:
+            query += " WHERE " + after.where_clause("t.date", "t._id")
+            params.update(after.params())
+            offset = 0
+        query += " ORDER BY t.date DESC, t._id DESC"
+
         if limit is not None:
             query += " LIMIT :limit OFFSET :offset"
-            params = {"limit": limit, "offset": offset}
+            params.update({"limit": limit, "offset": offset})
 
-        return self.get_rows(query, params)
+        return self.get_rows(query, params or None)
 
     def get_categories_by_type(self, category_type: int) -> list[str]:
         """Get category names by type.
@@ -807,6 +896,7 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
         """
         return self.get_rows("SELECT _id, code, name, symbol FROM currencies WHERE code != 'USD' ORDER BY code")
 
+    @cached_read("currencies")
     def get_currency_by_code(self, code: str) -> tuple[int, str, str] | None:
         """Get currency information by code.
 
@@ -981,6 +1071,8 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
         date_to: str | None = None,
         limit: int | None = None,
         offset: int = 0,
+        *,
+        after: KeysetCursor | None = None,
     ) -> list[list[Any]]:
         """Get filtered exchange rates with currency information.
 
@@ -991,13 +1083,17 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
         - `date_to` (`str | None`): End date in YYYY-MM-DD format. `None` for no end date filter.
         - `limit` (`int | None`): Maximum number of records to return. `None` for all records.
         - `offset` (`int`): Number of records to skip. Defaults to `0`.
+        - `after` (`KeysetCursor | None`): Keyset cursor; when given, return rows after it
+          instead of skipping `offset` rows. Defaults to `None`.
 
         Returns:
 
         - `list[list[Any]]`: List of filtered exchange rate records.
 
         """
-        return self.exchange_rates.get_filtered_exchange_rates(currency_id, date_from, date_to, limit, offset)
+        return self.exchange_rates.get_filtered_exchange_rates(
+            currency_id, date_from, date_to, limit, offset, after=after
+        )
 
     def get_filtered_transactions(
         self,
@@ -1009,6 +1105,8 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
         description_filter: str | None = None,
         limit: int | None = None,
         offset: int = 0,
+        *,
+        after: KeysetCursor | None = None,
     ) -> list[list[Any]]:
         """Get filtered transactions.
 
@@ -1019,14 +1117,21 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
         - `currency_code` (`str | None`): Filter by currency code. Defaults to `None`.
         - `date_from` (`str | None`): Filter from date. Defaults to `None`.
         - `date_to` (`str | None`): Filter to date. Defaults to `None`.
-        - `description_filter` (`str | None`): Filter by description substring (case insensitive). Defaults to `None`.
+        - `description_filter` (`str | None`): Filter by substring of the description or English
+          description (Unicode case insensitive). Defaults to `None`.
         - `limit` (`int | None`): Limit number of records. Defaults to `None` (no limit).
         - `offset` (`int`): Number of records to skip. Defaults to `0`.
+        - `after` (`KeysetCursor | None`): Keyset cursor; when given, return rows after it
+          instead of skipping `offset` rows. Defaults to `None`.
 
         Returns:
 
         - `list[list[Any]]`: List of filtered transaction records.
 
+        Filters of 3 or more characters are matched in SQL through the `transactions_fts` trigram
+        index, so `limit` and `offset` stay in the query; shorter filters (or databases without
+        the index) are matched in Python over every row passing the other filters.
+
         """
         conditions: list[str] = []
         params: dict[str, Any] = {}
@@ -1048,7 +1153,22 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
             params["date_from"] = date_from
             params["date_to"] = date_to
 
+        if after is not None:
+            conditions.append(after.where_clause("t.date", "t._id"))
+            params.update(after.params())
+            offset = 0
+
         normalized_description_filter = _normalize_description_filter(description_filter)
+        if (
+            normalized_description_filter is not None
+            and len(normalized_description_filter) >= _DESCRIPTION_INDEX_MIN_FILTER_LENGTH
+            and self._has_description_index()
+        ):
+            conditions.append(
+                "t._id IN (SELECT rowid FROM transactions_fts WHERE transactions_fts MATCH :description_match)"
+            )
+            params["description_match"] = _description_match_expression(normalized_description_filter)
+            normalized_description_filter = None
 
         query_text = """
             SELECT t._id, t.amount, t.description, cat.name, c.code, t.date, t.tag,
@@ -1066,7 +1186,7 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
         sql_limit: int | None = limit
         sql_offset: int = offset
         if normalized_description_filter is not None:
-            # SQLite LOWER() is ASCII-only; filter descriptions in Python with casefold().
+            # SQLite LOWER() is ASCII-only; without the trigram index filter in Python with casefold().
             sql_limit = None
             sql_offset = 0
 
@@ -1197,14 +1317,39 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
         """
         return self.exchange_rates.get_missing_exchange_rates_info(date_from, date_to)
 
-    def get_monthly_expense_totals_by_category(self, currency_id: int) -> dict[str, dict[int, float]]:
-        """Return expense totals grouped by YYYY-MM month and category ID (major units)."""
+    def get_monthly_expense_totals_by_category(
+        self,
+        currency_id: int,
+        *,
+        date_from: str | None = None,
+        date_to: str | None = None,
+    ) -> dict[str, dict[int, float]]:
+        """Return expense totals grouped by YYYY-MM month and category ID (major units).
+
+        Args:
+
+        - `currency_id` (`int`): Currency the totals are converted to.
+        - `date_from` (`str | None`): Only include transactions on or after this `YYYY-MM-DD` date.
+        - `date_to` (`str | None`): Only include transactions before this `YYYY-MM-DD` date.
+
+        Returns:
+
+        - `dict[str, dict[int, float]]`: Totals by month, then by category ID.
+
+        """
         join_clause, conversion_case, extra_params = self._get_currency_conversion_sql(
             currency_id,
             use_transaction_date=True,
         )
         params: dict[str, Any] = {"currency_id": currency_id}
         params.update(extra_params)
+        date_filter = ""
+        if date_from is not None:
+            date_filter += " AND t.date >= :date_from"
+            params["date_from"] = date_from
+        if date_to is not None:
+            date_filter += " AND t.date < :date_to"
+            params["date_to"] = date_to
         query = f"""
             SELECT strftime('%Y-%m', t.date) as month_key,
                    t._id_categories,
@@ -1212,7 +1357,7 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
             FROM transactions t
             JOIN categories cat ON t._id_categories = cat._id
             {join_clause}
-            WHERE cat.type = 0
+            WHERE cat.type = 0{date_filter}
             GROUP BY month_key, t._id_categories
             ORDER BY month_key
         """
@@ -1651,6 +1796,37 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
         """
         return self.exchange_rates.has_exchange_rates_data()
 
+    def ingest_exchange_rates(
+        self,
+        currency_id: int,
+        rates: Mapping[str, float] | Iterable[tuple[str, float]],
+        *,
+        min_relative_change: float = 0.0,
+        on_batch: Callable[[int, int], None] | None = None,
+    ) -> RateIngestResult:
+        """Write a fetched series of rates to USD for one currency in a single transaction.
+
+        Only dates without a rate and rates that changed by more than `min_relative_change`
+        are written, as `INSERT ... ON CONFLICT DO UPDATE` batches.
+
+        Args:
+
+        - `currency_id` (`int`): Currency ID (rates are always to USD).
+        - `rates` (`Mapping[str, float] | Iterable[tuple[str, float]]`): Rates by date in YYYY-MM-DD format.
+        - `min_relative_change` (`float`): Minimum relative difference to replace a stored rate.
+          Defaults to `0.0`.
+        - `on_batch` (`Callable[[int, int], None] | None`): Progress callback (rows written, rows to write).
+          Defaults to `None`.
+
+        Returns:
+
+        - `RateIngestResult`: Inserted, updated, unchanged and rejected rows.
+
+        """
+        return self.exchange_rates.ingest_exchange_rates(
+            currency_id, rates, min_relative_change=min_relative_change, on_batch=on_batch
+        )
+
     def lookup_existing_description_en_for_descriptions(self, descriptions: list[str]) -> dict[str, str]:
         """Return existing non-empty English translations keyed by description.
 
@@ -2066,21 +2242,23 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
             "description_en": description_en.strip() or None,
             "id": transaction_id,
         }
-        return self.execute_simple_query(query, params)
+        with self.summary.track_dates(date, *self._transaction_dates([transaction_id])):
+            return self.execute_simple_query(query, params)
 
     def update_transaction_description_en_by_description(self, description: str, description_en: str) -> bool:
         """Fill English description for all matching untranslated transactions."""
         if not description.strip() or not description_en.strip():
             return False
-        return self.execute_simple_query(
-            """
-            UPDATE transactions
-            SET description_en = :description_en
-            WHERE TRIM(description) = TRIM(:description)
-              AND (description_en IS NULL OR TRIM(description_en) = '')
-            """,
-            {"description": description, "description_en": description_en.strip()},
-        )
+        with self.summary.track_dates():
+            return self.execute_simple_query(
+                """
+                UPDATE transactions
+                SET description_en = :description_en
+                WHERE TRIM(description) = TRIM(:description)
+                  AND (description_en IS NULL OR TRIM(description_en) = '')
+                """,
+                {"description": description, "description_en": description_en.strip()},
+            )
 
     def update_transactions_date(self, transaction_ids: list[int], date: str) -> bool:
         """Set the same calendar date on many transactions (only the `date` column).
@@ -2097,19 +2275,14 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
         """
         if not transaction_ids:
             return True
-        try:
-            with self.sql_transaction():
-                for tid in transaction_ids:
-                    if not self.execute_simple_query(
-                        "UPDATE transactions SET date = :date WHERE _id = :id",
-                        {"date": date, "id": tid},
-                    ):
-                        _raise_runtime_error(f"Failed to update transaction date for id={tid}")
-        except Exception:
-            logger.exception("Failed to update transaction dates in batch")
-            return False
-        else:
-            return True
+        with self.summary.track_dates(date, *self._transaction_dates(transaction_ids)):
+            if not self.execute_many(
+                "UPDATE transactions SET date = :date WHERE _id = :id",
+                [{"date": date, "id": tid} for tid in transaction_ids],
+            ):
+                logger.error("Failed to update transaction dates in batch")
+                return False
+        return True
 
     def upsert_standard_item(self, name: str, category_id: int, name_en: str = "") -> tuple[bool, str]:
         """Insert a catalog item or update category/English when the name already exists.
@@ -2136,7 +2309,7 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
         ok = self.update_standard_item(item_id, name, category_id, new_en)
         return ok, "updated" if ok else "unchanged"
 
-    def _ensure_category_name_local_column(self) -> None:
+    def _ensure_category_name_local_column(self) -> bool:
         """Ensure `name_local` exists on categories (migrate from `name_ru` if needed)."""
         try:
             columns = {
@@ -2145,33 +2318,39 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
                 if row and len(row) > 1 and row[1] is not None
             }
             if "name_local" in columns:
-                return
+                return True
             if "name_ru" in columns:
                 if not self.execute_simple_query("ALTER TABLE categories RENAME COLUMN name_ru TO name_local"):
                     logger.error("Failed to rename categories.name_ru to name_local")
-                return
+                    return False
+                return True
             if not self.execute_simple_query("ALTER TABLE categories ADD COLUMN name_local TEXT"):
                 logger.error("Failed to add categories.name_local column")
+                return False
         except Exception:
             logger.exception("Could not ensure categories.name_local column")
+            return False
+        return True
 
-    def _ensure_performance_indexes(self) -> None:
+    def _ensure_performance_indexes(self) -> bool:
         """Create indexes for exchange_rates and transactions if missing (faster currency conversion)."""
         try:
-            self.execute_simple_query(
-                "CREATE INDEX IF NOT EXISTS idx_exchange_rates_currency_date ON exchange_rates(_id_currency, date)"
-            )
-            self.execute_simple_query(
-                "CREATE INDEX IF NOT EXISTS idx_transactions_date_currency ON transactions(date, _id_currencies)"
+            return all(
+                self.execute_simple_query(statement)
+                for statement in (
+                    "CREATE INDEX IF NOT EXISTS idx_exchange_rates_currency_date ON exchange_rates(_id_currency, date)",
+                    "CREATE INDEX IF NOT EXISTS idx_transactions_date_currency ON transactions(date, _id_currencies)",
+                    "CREATE INDEX IF NOT EXISTS idx_standard_items_name ON standard_items(name)",
+                )
             )
-            self.execute_simple_query("CREATE INDEX IF NOT EXISTS idx_standard_items_name ON standard_items(name)")
         except Exception:
             logger.exception("Could not ensure performance indexes")
+            return False
 
-    def _ensure_standard_items_table(self) -> None:
+    def _ensure_standard_items_table(self) -> bool:
         """Ensure the standard_items catalog table exists."""
         try:
-            self.execute_simple_query(
+            return self.execute_simple_query(
                 """
                 CREATE TABLE IF NOT EXISTS standard_items (
                     _id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -2184,23 +2363,49 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
             )
         except Exception:
             logger.exception("Could not ensure standard_items table")
+            return False
 
-    def _ensure_system_categories(self) -> None:
+    def _ensure_system_categories(self) -> bool:
         """Ensure revision categories exist and merge legacy Balance Correction."""
         try:
             rows = self.get_rows(
                 "SELECT name, type FROM categories WHERE name IN ('Revision Income', 'Revision Expense')"
             )
             existing = {(row[0], int(row[1])) for row in rows}
-            if ("Revision Income", 1) not in existing:
-                self.add_category("Revision Income", 1, "🧾")
-            if ("Revision Expense", 0) not in existing:
-                self.add_category("Revision Expense", 0, "🧾")
-            self._migrate_balance_correction_to_revision_expense()
+            if ("Revision Income", 1) not in existing and not self.add_category("Revision Income", 1, "🧾"):
+                return False
+            if ("Revision Expense", 0) not in existing and not self.add_category("Revision Expense", 0, "🧾"):
+                return False
+            return self._migrate_balance_correction_to_revision_expense()
         except Exception:
             logger.exception("Could not ensure system categories")
+            return False
+
+    def _ensure_transaction_and_exchange_indexes(self) -> bool:
+        """Create indexes for report, tag and date-paged queries on transactions, exchanges and rates.
+
+        `idx_transactions_date_currency` is dropped: `idx_transactions_date` serves date ordering
+        (the rowid tie-breaker is implicit) and `idx_transactions_currency_date` serves per-currency filters.
+
+        """
+        try:
+            return all(
+                self.execute_simple_query(statement)
+                for statement in (
+                    "DROP INDEX IF EXISTS idx_transactions_date_currency",
+                    "CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(date)",
+                    "CREATE INDEX IF NOT EXISTS idx_transactions_currency_date ON transactions(_id_currencies, date)",
+                    "CREATE INDEX IF NOT EXISTS idx_transactions_category_date ON transactions(_id_categories, date)",
+                    "CREATE INDEX IF NOT EXISTS idx_transactions_tag ON transactions(tag)",
+                    "CREATE INDEX IF NOT EXISTS idx_currency_exchanges_date ON currency_exchanges(date)",
+                    "CREATE INDEX IF NOT EXISTS idx_exchange_rates_date ON exchange_rates(date)",
+                )
+            )
+        except Exception:
+            logger.exception("Could not ensure transaction and exchange indexes")
+            return False
 
-    def _ensure_transaction_description_en_column(self) -> None:
+    def _ensure_transaction_description_en_column(self) -> bool:
         """Ensure `description_en` exists on transactions."""
         try:
             columns = {
@@ -2209,11 +2414,29 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
                 if row and len(row) > 1 and row[1] is not None
             }
             if "description_en" in columns:
-                return
+                return True
             if not self.execute_simple_query("ALTER TABLE transactions ADD COLUMN description_en TEXT"):
                 logger.error("Failed to add transactions.description_en column")
+                return False
         except Exception:
             logger.exception("Could not ensure transactions.description_en column")
+            return False
+        return True
+
+    def _ensure_transaction_description_index(self) -> bool:
+        """Create the `transactions_fts` trigram index and its sync triggers, filling it from `transactions`.
+
+        SQLite builds without FTS5 or the trigram tokenizer keep filtering descriptions in Python:
+        whatever was created is dropped again and the migration still succeeds.
+
+        """
+        try:
+            if all(self.execute_simple_query(statement) for statement in _DESCRIPTION_INDEX_SQL):
+                return True
+        except Exception:
+            logger.exception("Could not create transaction description index")
+        logger.warning("Transaction description index is unavailable; descriptions are filtered in Python")
+        return all(self.execute_simple_query(statement) for statement in _DROP_DESCRIPTION_INDEX_SQL)
 
     def _get_currency_conversion_sql(
         self,
@@ -2231,7 +2454,8 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
 
         Returns:
 
-        - `tuple[str, str, dict]`: (join_clause, conversion_case, extra_params).
+        - `tuple[str, str, dict]`: (join_clause, conversion_case, extra_params). `join_clause` is empty:
+          rates are looked up in `exchange_rate_intervals` inside `conversion_case`.
 
         """
         if not self.exchange_rates.has_exchange_rates_data():
@@ -2242,70 +2466,50 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
         usd_currency = self.get_currency_by_code("USD")
         usd_currency_id = usd_currency[0] if usd_currency else None
 
-        if use_transaction_date:
-            source_date_filter = "AND ser2.date <= t.date"
-            target_date_filter = "AND ter2.date <= t.date"
-            direct_date_filter = "AND er2.date <= t.date"
-        else:
-            source_date_filter = "AND ser2.date <= date('now')"
-            target_date_filter = "AND ter2.date <= date('now')"
-            direct_date_filter = "AND er2.date <= date('now')"
-
+        rate_date = "t.date" if use_transaction_date else "date('now')"
+        source_rate = rate_on_date_sql("t._id_currencies", rate_date)
+        target_rate = rate_on_date_sql(":currency_id", rate_date)
+        # Rate lookups sit inside CASE branches, so rows already in the target currency skip them
+        join_clause = ""
         if currency_id == usd_currency_id:
-            join_clause = f"""
-            LEFT JOIN exchange_rates er ON er._id_currency = t._id_currencies
-                                        AND er.date = (
-                                            SELECT MAX(date)
-                                            FROM exchange_rates er2
-                                            WHERE er2._id_currency = t._id_currencies
-                                            {direct_date_filter}
-                                        )
-            """
-            conversion_case = """
+            conversion_case = f"""
                 CASE
                     WHEN t._id_currencies = :currency_id THEN t.amount
-                    ELSE COALESCE(er.rate * t.amount, t.amount)
+                    ELSE COALESCE({source_rate} * t.amount, t.amount)
                 END
             """
             return join_clause, conversion_case, {}
-        join_clause = f"""
-            LEFT JOIN exchange_rates source_er ON source_er._id_currency = t._id_currencies
-                                            AND source_er.date = (
-                                                SELECT MAX(date)
-                                                FROM exchange_rates ser2
-                                                WHERE ser2._id_currency = t._id_currencies
-                                                    {source_date_filter}
-                                            )
-            LEFT JOIN exchange_rates target_er ON target_er._id_currency = :currency_id
-                                            AND target_er.date = (
-                                                SELECT MAX(date)
-                                                FROM exchange_rates ter2
-                                                WHERE ter2._id_currency = :currency_id
-                                                    {target_date_filter}
-                                            )
-            """
-        conversion_case = """
+        conversion_case = f"""
                 CASE
                     WHEN t._id_currencies = :currency_id THEN t.amount
                     WHEN t._id_currencies = :usd_currency_id THEN
-                        COALESCE(t.amount / NULLIF(target_er.rate, 0), t.amount)
+                        COALESCE(t.amount / NULLIF({target_rate}, 0), t.amount)
                     ELSE
-                        COALESCE(source_er.rate * t.amount / NULLIF(target_er.rate, 0), t.amount)
+                        COALESCE({source_rate} * t.amount / NULLIF({target_rate}, 0), t.amount)
                 END
             """
         return join_clause, conversion_case, {"usd_currency_id": usd_currency_id}
 
-    def _init_default_settings(self) -> None:
+    def _has_description_index(self) -> bool:
+        """Return whether the `transactions_fts` description index exists (checked once per connection)."""
+        if self._description_index_available is None:
+            self._description_index_available = self.table_exists("transactions_fts")
+        return self._description_index_available
+
+    def _init_default_settings(self) -> bool:
         """Initialize default settings if they don't exist."""
         try:
             # Check if default_currency setting exists
             rows = self.get_rows("SELECT COUNT(*) FROM settings WHERE key = 'default_currency'")
             if rows and rows[0][0] == 0:
                 # Insert default currency setting (RUB has ID 1)
-                self.execute_simple_query("INSERT INTO settings (key, value) VALUES ('default_currency', '1')")
+                if not self.execute_simple_query("INSERT INTO settings (key, value) VALUES ('default_currency', '1')"):
+                    return False
                 logger.info("Initialized default currency setting")
         except Exception:
             logger.exception("Could not initialize default settings")
+            return False
+        return True
 
     def _load_default_currency_cache(self) -> None:
         """Load default currency from DB into cache (once per run)."""
@@ -2327,43 +2531,79 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
                 code = stored_value or "RUB"
         self._default_currency_cache = (code, currency_id)
 
-    def _migrate_balance_correction_to_revision_expense(self) -> None:
+    def _migrate_balance_correction_to_revision_expense(self) -> bool:
         """Move transactions from legacy Balance Correction onto Revision Expense."""
         balance_rows = self.get_rows("SELECT _id FROM categories WHERE name = 'Balance Correction'")
         if not balance_rows:
-            return
+            return True
 
         revision_rows = self.get_rows("SELECT _id FROM categories WHERE name = 'Revision Expense' AND type = 0")
         if not revision_rows:
             if not self.add_category("Revision Expense", 0, "🧾"):
                 logger.error("Failed to create Revision Expense while migrating Balance Correction")
-                return
+                return False
             revision_rows = self.get_rows("SELECT _id FROM categories WHERE name = 'Revision Expense' AND type = 0")
             if not revision_rows:
                 logger.error("Revision Expense still missing after create")
-                return
+                return False
 
         balance_id = int(balance_rows[0][0])
         revision_id = int(revision_rows[0][0])
         if balance_id == revision_id:
-            return
+            return True
 
         if not self.execute_simple_query(
             "UPDATE transactions SET _id_categories = :revision_id WHERE _id_categories = :balance_id",
             {"revision_id": revision_id, "balance_id": balance_id},
         ):
             logger.error("Failed to reassign Balance Correction transactions")
-            return
+            return False
 
         if not self.delete_category(balance_id):
             logger.error("Failed to delete legacy Balance Correction category id=%s", balance_id)
-            return
+            return False
 
         logger.info(
             "Migrated Balance Correction (id=%s) transactions to Revision Expense (id=%s)",
             balance_id,
             revision_id,
         )
+        return True
+
+    def _schema_migrations(self) -> list[SchemaMigration]:
+        """Return finance schema migrations; versions are stamped into `PRAGMA user_version`."""
+        return [
+            SchemaMigration(1, "default settings", self._init_default_settings),
+            SchemaMigration(2, "categories.name_local column", self._ensure_category_name_local_column),
+            SchemaMigration(3, "transactions.description_en column", self._ensure_transaction_description_en_column),
+            SchemaMigration(4, "standard_items table", self._ensure_standard_items_table),
+            SchemaMigration(5, "revision system categories", self._ensure_system_categories),
+            SchemaMigration(6, "performance indexes", self._ensure_performance_indexes),
+            SchemaMigration(7, "transaction report indexes", self._ensure_transaction_and_exchange_indexes),
+            SchemaMigration(8, "exchange rate intervals", self.exchange_rates.ensure_rate_intervals),
+            SchemaMigration(9, "observed exchange rate storage", self._use_observed_exchange_rate_storage),
+            SchemaMigration(10, "unique exchange rate dates", self.exchange_rates.ensure_unique_rate_dates),
+            SchemaMigration(11, "transaction description index", self._ensure_transaction_description_index),
+            SchemaMigration(12, "exchange rate coverage", self.exchange_rates.ensure_rate_coverage),
+        ]
+
+    def _transaction_dates(self, transaction_ids: list[int]) -> list[str]:
+        """Return the distinct dates of `transaction_ids` (before a write moves or deletes them)."""
+        placeholders = ", ".join(f":id{index}" for index in range(len(transaction_ids)))
+        rows = self.get_rows(
+            f"SELECT DISTINCT date FROM transactions WHERE _id IN ({placeholders})",
+            {f"id{index}": transaction_id for index, transaction_id in enumerate(transaction_ids)},
+        )
+        return [str(row[0]) for row in rows]
+
+    def _use_observed_exchange_rate_storage(self) -> bool:
+        """Switch rate storage to observed rates only, compacting forward-filled rows."""
+        return self.exchange_rates.set_storage_mode(EXCHANGE_RATE_STORAGE_OBSERVED)
+
+
+def _description_match_expression(description_filter: str) -> str:
+    """Return an FTS5 phrase matching `description_filter` literally (quotes doubled)."""
+    return '"' + description_filter.replace('"', '""') + '"'
 
 
 def _description_matches_filter(description: str | None, description_filter: str) -> bool:
@@ -2374,7 +2614,15 @@ def _description_matches_filter(description: str | None, description_filter: str
 
 
 def _filter_rows_by_description(rows: list[list[Any]], description_filter: str) -> list[list[Any]]:
-    return [row for row in rows if _description_matches_filter(row[_DESCRIPTION_COLUMN_INDEX], description_filter)]
+    return [
+        row
+        for row in rows
+        if _description_matches_filter(row[_DESCRIPTION_COLUMN_INDEX], description_filter)
+        or (
+            len(row) > _DESCRIPTION_EN_COLUMN_INDEX
+            and _description_matches_filter(row[_DESCRIPTION_EN_COLUMN_INDEX], description_filter)
+        )
+    ]
 
 
 def _normalize_description_filter(description_filter: str | None) -> str | None:
@@ -2382,7 +2630,3 @@ def _normalize_description_filter(description_filter: str | None) -> str | None:
         return None
     normalized = description_filter.strip()
     return normalized or None
-
-
-def _raise_runtime_error(message: str) -> NoReturn:
-    raise RuntimeError(message)
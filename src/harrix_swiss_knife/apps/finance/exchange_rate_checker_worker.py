@@ -49,7 +49,7 @@ class ExchangeRateCheckerWorker(QThread):
         try:
             self.progress_updated.emit("🔍 Starting exchange rates check...")
 
-            db_manager = DatabaseManager(self.db_filename)
+            db_manager = DatabaseManager(self.db_filename, read_only=True)
 
             # Get all currencies except USD (base currency)
             currencies = db_manager.get_currencies_except_usd()
@@ -6,17 +6,31 @@ background updates of exchange rates from various data sources.
 """
 
 from datetime import UTC, datetime, timedelta
+from pathlib import Path
 
-import pandas as pd
-import yfinance as yf
 from PySide6.QtCore import QThread, Signal
 
 from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager
+from harrix_swiss_knife.apps.finance.services.rate_fetching import (
+    RateFetchRequest,
+    RateFetchResult,
+    RateFetchScheduler,
+    RateHistoryCache,
+    RateHistoryProvider,
+    YFinanceRateProvider,
+    candidate_tickers,
+    default_cache_dir,
+)
 
 
 class ExchangeRateUpdateWorker(QThread):
     """Worker thread for updating and adding exchange rate records from yfinance.
 
+    Rates for all currencies are fetched up front by a `RateFetchScheduler` (concurrent,
+    retried, cached on disk per ticker). Each currency's series is then written with
+    `DatabaseManager.ingest_exchange_rates`: one diff query and one batched upsert
+    transaction instead of a round trip per rate.
+
     Attributes:
 
     - `progress_updated` (`Signal`): Signal for progress message updates.
@@ -25,6 +39,8 @@ class ExchangeRateUpdateWorker(QThread):
     - `finished_success` (`Signal`): Signal emitted on success (total_processed, total_operations).
     - `finished_error` (`Signal`): Signal emitted on error with error message.
     - `should_stop` (`bool`): Flag to request worker to stop.
+    - `provider` (`RateHistoryProvider | None`): Rate history source; `None` uses yfinance.
+    - `cache_dir` (`Path | None`): Rate history cache folder; `None` uses `data/cache/exchange_rates`.
 
     """
 
@@ -38,21 +54,33 @@ class ExchangeRateUpdateWorker(QThread):
     db_filename: str
     currencies_to_process: list
     should_stop: bool
+    provider: RateHistoryProvider | None
+    cache_dir: Path | None
     unresolved_rates: dict[str, list[str]]
 
-    def __init__(self, db_filename: str, currencies_to_process: list) -> None:
+    def __init__(
+        self,
+        db_filename: str,
+        currencies_to_process: list,
+        provider: RateHistoryProvider | None = None,
+        cache_dir: Path | None = None,
+    ) -> None:
         """Initialize the exchange rate update worker.
 
         Args:
 
         - `db_filename` (`str`): Path to SQLite database file.
         - `currencies_to_process` (`list`): List of tuples (currency_id, code, records_dict).
+        - `provider` (`RateHistoryProvider | None`): Rate history source. Defaults to `None` (yfinance).
+        - `cache_dir` (`Path | None`): Rate history cache folder. Defaults to `None` (`data/cache/exchange_rates`).
 
         """
         super().__init__()
         self.db_filename = db_filename
         self.currencies_to_process = currencies_to_process  # List of (currency_id, code, records_dict)
         self.should_stop = False
+        self.provider = provider
+        self.cache_dir = cache_dir
         # currency_code -> list[date_str] where no rate was obtained
         self.unresolved_rates = {}
 
@@ -80,180 +108,7 @@ class ExchangeRateUpdateWorker(QThread):
             if cleaned_count > 0:
                 self.progress_updated.emit(f"🧹 Cleaned {cleaned_count} invalid exchange rate records")
 
-            def get_yfinance_data_batch(currency_code: str, dates: list[str], currency_id: int) -> dict[str, float]:
-                """Get exchange rate data from yfinance for multiple dates at once.
-
-                Args:
-
-                - `currency_code` (`str`): Currency code (e.g., `EUR`, `RUB`).
-                - `dates` (`list[str]`): List of dates in YYYY-MM-DD format.
-                - `currency_id` (`int`): Currency ID in database.
-
-                Returns:
-
-                - `dict[str, float]`: Dictionary mapping date to rate (currency to USD rate).
-
-                """
-                if not dates:
-                    return {}
-
-                # Sort dates to get range
-                sorted_dates = sorted(dates)
-                start_date = sorted_dates[0]
-                end_date = sorted_dates[-1]
-
-                # Add one day to end_date for yfinance API
-                end_date_obj = datetime.fromisoformat(end_date)
-                end_date_plus = (end_date_obj + timedelta(days=1)).strftime("%Y-%m-%d")
-
-                self.progress_updated.emit(f"📊 Fetching {currency_code} rates from {start_date} to {end_date}...")
-
-                # Check if currency has a saved ticker
-                saved_ticker = db_manager.get_currency_ticker(currency_id)
-
-                if saved_ticker:
-                    # Use saved ticker
-                    self.progress_updated.emit(f"🔄 Using saved ticker: {saved_ticker}")
-                    ticker_lists = {"primary": [saved_ticker], "inverse": []}
-                else:
-                    # Define ticker configurations for fallback
-                    special_cases = {
-                        "RUB": {"primary": ["RUBUSD=X", "RUB=X"], "inverse": ["USDRUB=X", "USD/RUB=X"]},
-                        "EUR": {"primary": ["EURUSD=X", "EUR=X"], "inverse": ["USDEUR=X", "USD/EUR=X"]},
-                        "CNY": {"primary": ["CNYUSD=X", "CNY=X"], "inverse": ["USDCNY=X", "USD/CNY=X"]},
-                        "TRY": {"primary": ["TRYUSD=X", "TRY=X"], "inverse": ["USDTRY=X", "USD/TRY=X"]},
-                        "VND": {"primary": ["VNDUSD=X", "VND=X"], "inverse": ["USDVND=X", "USD/VND=X"]},
-                    }
-
-                    # Get ticker lists for this currency
-                    if currency_code in special_cases:
-                        ticker_lists = special_cases[currency_code]
-                    else:
-                        # Default ticker formats
-                        ticker_lists = {
-                            "primary": [
-                                f"{currency_code}USD=X",
-                                f"{currency_code}/USD",
-                                f"{currency_code}USD",
-                            ],
-                            "inverse": [
-                                f"USD{currency_code}=X",
-                                f"USD/{currency_code}",
-                                f"USD{currency_code}",
-                            ],
-                        }
-
-                primary_list = ticker_lists["primary"]
-                inverse_list = ticker_lists["inverse"]
-
-                # Try primary tickers first (no inversion needed)
-                for ticker_symbol in primary_list:
-                    if self.should_stop:
-                        return {}
-
-                    try:
-                        self.progress_updated.emit(f"🔄 Trying primary ticker: {ticker_symbol}")
-                        ticker = yf.Ticker(ticker_symbol)
-
-                        # Download historical data for the date range
-                        hist = ticker.history(start=start_date, end=end_date_plus, interval="1d")
-
-                        if not hist.empty:
-                            # Convert to dictionary of date -> rate
-                            result = {}
-                            for date_idx in hist.index:
-                                date_str = date_idx.strftime("%Y-%m-%d")
-                                if date_str in dates:  # Only include requested dates
-                                    close_price = hist.loc[date_idx, "Close"]
-                                    if not pd.isna(close_price) and close_price > 0:
-                                        result[date_str] = float(close_price)
-
-                            if result:
-                                self.progress_updated.emit(
-                                    f"✅ Found {len(result)} rates with {ticker_symbol} (primary)"
-                                )
-                                # Save successful ticker if not already saved
-                                if not saved_ticker:
-                                    db_manager.update_currency_ticker(currency_id, ticker_symbol)
-                                    self.progress_updated.emit(f"💾 Saved successful ticker: {ticker_symbol}")
-                                return result
-
-                    except Exception as e:
-                        if "delisted" not in str(e).lower():
-                            self.progress_updated.emit(f"⚠️ Error with {ticker_symbol}: {str(e)[:50]}...")
-                        continue
-
-                # Try inverse tickers (need inversion)
-                for ticker_symbol in inverse_list:
-                    if self.should_stop:
-                        return {}
-
-                    try:
-                        self.progress_updated.emit(f"🔄 Trying inverse ticker: {ticker_symbol}")
-                        ticker = yf.Ticker(ticker_symbol)
-
-                        # Download historical data for the date range
-                        hist = ticker.history(start=start_date, end=end_date_plus, interval="1d")
-
-                        if not hist.empty:
-                            # Convert to dictionary of date -> rate (inverted)
-                            result = {}
-                            for date_idx in hist.index:
-                                date_str = date_idx.strftime("%Y-%m-%d")
-                                if date_str in dates:  # Only include requested dates
-                                    close_price = hist.loc[date_idx, "Close"]
-                                    if not pd.isna(close_price) and close_price > 0:
-                                        # Invert the rate: USD/CURRENCY -> CURRENCY/USD
-                                        result[date_str] = 1.0 / float(close_price)
-
-                            if result:
-                                self.progress_updated.emit(
-                                    f"✅ Found {len(result)} rates with {ticker_symbol} (inverted)"
-                                )
-                                # Save successful ticker if not already saved
-                                if not saved_ticker:
-                                    db_manager.update_currency_ticker(currency_id, ticker_symbol)
-                                    self.progress_updated.emit(f"💾 Saved successful ticker: {ticker_symbol}")
-                                return result
-
-                    except Exception as e:
-                        if "delisted" not in str(e).lower():
-                            self.progress_updated.emit(f"⚠️ Error with {ticker_symbol}: {str(e)[:50]}...")
-                        continue
-
-                # No ticker worked
-                self.progress_updated.emit(
-                    f"❌ No valid data found for {currency_code} in range {start_date} to {end_date}"
-                )
-                return {}
-
-            def get_fallback_rate(currency_code: str, date: str) -> float | None:
-                """Get fallback rate using the most recent available rate.
-
-                Args:
-
-                - `currency_code` (`str`): Currency code.
-                - `date` (`str`): Date in YYYY-MM-DD format.
-
-                Returns:
-
-                - `float | None`: Fallback rate or `None` if not found.
-
-                """
-                try:
-                    query = """
-                        SELECT rate FROM exchange_rates
-                        WHERE _id_currency = (SELECT _id FROM currencies WHERE code = :currency_code)
-                        AND date < :date
-                        ORDER BY date DESC
-                        LIMIT 1
-                    """
-                    rows = db_manager.get_rows(query, {"currency_code": currency_code, "date": date})
-                    if rows and rows[0][0]:
-                        return float(rows[0][0])
-                except Exception as e:
-                    self.progress_updated.emit(f"⚠️ Error getting fallback rate: {e}")
-                return None
+            fetched = self._fetch_all_rates(db_manager, recent_cutoff)
 
             # Process each currency
             for currency_id, currency_code, records_dict in self.currencies_to_process:
@@ -268,82 +123,62 @@ class ExchangeRateUpdateWorker(QThread):
                     f"📈 Processing {currency_code}: {len(missing_dates)} missing + {len(existing_records)} updates"
                 )
 
+                def report_batch(written: int, total: int, currency_code: str = currency_code) -> None:
+                    self.progress_updated.emit(f"💾 {currency_code}: wrote {written}/{total} rates")
+
                 currency_processed = 0
 
-                # Batch process missing dates
-                if missing_dates:
-                    # Download all missing dates at once
-                    rates_dict = get_yfinance_data_batch(currency_code, missing_dates, currency_id)
-
-                    # Prepare batch insert data
-                    batch_data = []
-
-                    for date_str in missing_dates:
-                        if self.should_stop:
-                            break
-
-                        if date_str in rates_dict:
-                            # Use downloaded rate
-                            new_rate = rates_dict[date_str]
-                        else:
-                            # Try fallback for weekends/holidays
-                            date_obj = datetime.fromisoformat(date_str)
-                            weekend_days = (5, 6)  # Saturday=5, Sunday=6
-                            if date_obj.weekday() in weekend_days:
-                                self.progress_updated.emit(f"📅 {date_str} is weekend, using fallback...")
-                                new_rate = get_fallback_rate(currency_code, date_str)
-                            else:
-                                new_rate = None
-
-                        if new_rate is not None and new_rate > 0:
-                            batch_data.append((currency_id, new_rate, date_str))
-                            currency_processed += 1
-                            self.rates_added.emit(currency_code, new_rate, date_str)
-                        else:
-                            self.progress_updated.emit(f"⚠️ Skipping {currency_code} on {date_str}: no valid rate")
-                            self.unresolved_rates.setdefault(currency_code, []).append(date_str)
+                # Download all missing dates at once and write them as one batch
+                fetch_result = fetched.get(currency_code, RateFetchResult(currency_code))
+                rates_dict = fetch_result.rates
+                if fetch_result.ticker and not db_manager.get_currency_ticker(currency_id):
+                    db_manager.update_currency_ticker(currency_id, fetch_result.ticker)
+                    self.progress_updated.emit(f"💾 Saved successful ticker: {fetch_result.ticker}")
 
-                    # Batch insert all rates at once
-                    if batch_data:
-                        success_count = self._batch_insert_rates(db_manager, batch_data)
-                        total_processed += success_count
-                        self.progress_updated.emit(f"✅ Batch inserted {success_count} rates for {currency_code}")
+                if missing_dates:
+                    new_rates = self._rates_for_missing_dates(
+                        db_manager, currency_id, currency_code, missing_dates, rates_dict
+                    )
+
+                    if new_rates and not self.should_stop:
+                        result = db_manager.ingest_exchange_rates(currency_id, new_rates, on_batch=report_batch)
+                        if not result.ok:
+                            self.progress_updated.emit(f"❌ Could not save {currency_code} rates")
+                        for date_str, rate in result.inserted + result.updated:
+                            self.rates_added.emit(currency_code, rate, date_str)
+                        total_processed += result.written
+                        currency_processed += result.written
+                        self.progress_updated.emit(f"✅ Batch inserted {result.written} rates for {currency_code}")
 
                 # Update existing records (only recent ones, not weekends)
-                if existing_records:
-                    # Only update last 7 days of records
-                    recent_records = [(date, rate) for date, rate in existing_records if date >= recent_cutoff]
-
-                    if recent_records:
-                        # Get dates for batch download
-                        update_dates = [date for date, _ in recent_records]
-                        rates_dict = get_yfinance_data_batch(currency_code, update_dates, currency_id)
-
-                        for date_str, old_rate in recent_records:
-                            if self.should_stop:
-                                break
-
-                            if date_str in rates_dict:
-                                new_rate = rates_dict[date_str]
-
-                                # Only update if significantly different
-                                rate_diff = abs(new_rate - old_rate) / old_rate if old_rate != 0 else 1
-                                min_rate_diff = 0.001
-                                if rate_diff > min_rate_diff and db_manager.update_exchange_rate(
-                                    currency_id, date_str, new_rate
-                                ):
-                                    total_processed += 1
-                                    currency_processed += 1
-                                    self.rates_added.emit(currency_code, new_rate, date_str)
-                                    self.progress_updated.emit(
-                                        f"✅ Updated {currency_code} rate for {date_str}: "
-                                        f"{old_rate:.6f} → {new_rate:.6f}"
-                                    )
-                            else:
-                                self.progress_updated.emit(
-                                    f"⚠️ Skipping update {currency_code} on {date_str}: no valid rate"
-                                )
-                                self.unresolved_rates.setdefault(currency_code, []).append(date_str)
+                # Only update last 7 days of records
+                recent_records = [(date, rate) for date, rate in existing_records if date >= recent_cutoff]
+                if recent_records and not self.should_stop:
+                    update_dates = [date for date, _ in recent_records]
+                    for date_str in update_dates:
+                        if date_str not in rates_dict:
+                            self.progress_updated.emit(
+                                f"⚠️ Skipping update {currency_code} on {date_str}: no valid rate"
+                            )
+                            self.unresolved_rates.setdefault(currency_code, []).append(date_str)
+
+                    # Only update if significantly different
+                    min_rate_diff = 0.001
+                    result = db_manager.ingest_exchange_rates(
+                        currency_id,
+                        {date_str: rates_dict[date_str] for date_str in update_dates if date_str in rates_dict},
+                        min_relative_change=min_rate_diff,
+                        on_batch=report_batch,
+                    )
+                    old_rates = dict(recent_records)
+                    for date_str, new_rate in result.updated + result.inserted:
+                        total_processed += 1
+                        currency_processed += 1
+                        self.rates_added.emit(currency_code, new_rate, date_str)
+                        self.progress_updated.emit(
+                            f"✅ Updated {currency_code} rate for {date_str}: "
+                            f"{old_rates[date_str]:.6f} → {new_rate:.6f}"
+                        )
 
                 self.progress_updated.emit(f"📊 Processed {currency_processed} operations for {currency_code}")
 
@@ -361,30 +196,85 @@ class ExchangeRateUpdateWorker(QThread):
         """Request worker to stop."""
         self.should_stop = True
 
-    def _batch_insert_rates(self, db_manager: DatabaseManager, batch_data: list[tuple]) -> int:
-        """Batch insert exchange rates.
+    def _fetch_all_rates(self, db_manager: DatabaseManager, recent_cutoff: str) -> dict[str, RateFetchResult]:
+        """Fetch missing and recent dates of every currency concurrently; return results by currency code."""
+        requests = []
+        for currency_id, currency_code, records in self.currencies_to_process:
+            recent_dates = [date for date, _ in records["existing_records"] if date >= recent_cutoff]
+            tickers = candidate_tickers(currency_code, db_manager.get_currency_ticker(currency_id))
+            requests.append(RateFetchRequest(currency_code, [*records["missing_dates"], *recent_dates], tickers))
+
+        scheduler = RateFetchScheduler(
+            self.provider if self.provider is not None else YFinanceRateProvider(),
+            cache=RateHistoryCache(self.cache_dir if self.cache_dir is not None else default_cache_dir()),
+            should_stop=lambda: self.should_stop,
+            on_progress=self.progress_updated.emit,
+        )
+        self.progress_updated.emit(f"🌐 Fetching rates for {len(requests)} currencies...")
+        return scheduler.fetch(requests)
+
+    def _fallback_rate(self, db_manager: DatabaseManager, currency_id: int, date: str) -> tuple[str, float] | None:
+        """Return the most recent stored `(date, rate)` before `date`, or `None` if not found."""
+        try:
+            rows = db_manager.get_rows(
+                """SELECT date, rate FROM exchange_rates
+                   WHERE _id_currency = :currency_id AND date < :date
+                   ORDER BY date DESC
+                   LIMIT 1""",
+                {"currency_id": currency_id, "date": date},
+            )
+            if rows and rows[0][1]:
+                return str(rows[0][0]), float(rows[0][1])
+        except Exception as e:
+            self.progress_updated.emit(f"⚠️ Error getting fallback rate: {e}")
+        return None
+
+    def _rates_for_missing_dates(
+        self,
+        db_manager: DatabaseManager,
+        currency_id: int,
+        currency_code: str,
+        missing_dates: list[str],
+        rates_dict: dict[str, float],
+    ) -> dict[str, float]:
+        """Return the rates to store for `missing_dates`, filling weekends with the previous rate.
+
+        The previous rate is the latest of the rates fetched in this batch and the stored ones;
+        dates without a rate are recorded in `unresolved_rates`.
 
         Args:
 
-        - `batch_data` (`list[tuple]`): List of tuples (currency_id, rate, date).
+        - `db_manager` (`DatabaseManager`): Open database for stored fallback rates.
+        - `currency_id` (`int`): Currency ID in database.
+        - `currency_code` (`str`): Currency code.
+        - `missing_dates` (`list[str]`): Dates in YYYY-MM-DD format.
+        - `rates_dict` (`dict[str, float]`): Downloaded rates by date.
 
         Returns:
 
-        - `int`: Number of successfully inserted records.
+        - `dict[str, float]`: Rates by date, in date order.
 
         """
-        try:
-            success_count = 0
-            batch_size = 500  # Insert in batches of batch_size
-
-            for i in range(0, len(batch_data), batch_size):
-                batch = batch_data[i : i + batch_size]
-
-                # Prepare batch insert query
-                for currency_id, rate, date in batch:
-                    if db_manager.add_exchange_rate(currency_id, rate, date):
-                        success_count += 1
-        except Exception as e:
-            self.progress_updated.emit(f"❌ Batch insert error: {e}")
-            return 0
-        return success_count
+        weekend_days = (5, 6)  # Saturday=5, Sunday=6
+        new_rates: dict[str, float] = {}
+        previous: tuple[str, float] | None = None
+
+        for date_str in sorted(missing_dates):
+            if self.should_stop:
+                break
+
+            new_rate = rates_dict.get(date_str)
+            if new_rate is None and datetime.fromisoformat(date_str).weekday() in weekend_days:
+                # Try fallback for weekends/holidays
+                self.progress_updated.emit(f"📅 {date_str} is weekend, using fallback...")
+                stored = self._fallback_rate(db_manager, currency_id, date_str)
+                candidates = [item for item in (previous, stored) if item is not None]
+                new_rate = max(candidates)[1] if candidates else None
+
+            if new_rate is not None and new_rate > 0:
+                new_rates[date_str] = new_rate
+                previous = (date_str, new_rate)
+            else:
+                self.progress_updated.emit(f"⚠️ Skipping {currency_code} on {date_str}: no valid rate")
+                self.unresolved_rates.setdefault(currency_code, []).append(date_str)
+        return new_rates
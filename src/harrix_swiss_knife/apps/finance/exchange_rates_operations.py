@@ -20,7 +20,7 @@ from PySide6.QtWidgets import QAbstractItemView, QMessageBox, QWidget
 
 from harrix_swiss_knife import qt_modality
 from harrix_swiss_knife.apps.common import message_box
-from harrix_swiss_knife.apps.common.scroll_pagination import on_scroll_load_more
+from harrix_swiss_knife.apps.common.scroll_pagination import KeysetCursor, on_scroll_load_more
 from harrix_swiss_knife.apps.finance.delegates import AmountDelegate
 from harrix_swiss_knife.apps.finance.exchange_rate_checker_worker import ExchangeRateCheckerWorker
 from harrix_swiss_knife.apps.finance.exchange_rate_worker import ExchangeRateUpdateWorker
@@ -588,8 +588,8 @@ class ExchangeRatesOperations:
             logger.exception("Error creating exchange rate chart")
             self._show_no_data_label(self.verticalLayout_exchange_rates_content, f"Error creating chart: {e}")
 
-    def _fetch_exchange_rates_rows(self, limit: int | None, offset: int) -> list[list[Any]]:
-        """Fetch exchange rate rows with optional filters and pagination."""
+    def _fetch_exchange_rates_rows(self, limit: int | None, after: KeysetCursor | None = None) -> list[list[Any]]:
+        """Fetch exchange rate rows with optional filters, seeking past the `after` keyset cursor."""
         if self.db_manager is None:
             return []
 
@@ -597,9 +597,9 @@ class ExchangeRatesOperations:
             return self.db_manager.get_filtered_exchange_rates(
                 **self._exchange_rates_filter_params,
                 limit=limit,
-                offset=offset,
+                after=after,
             )
-        return self.db_manager.get_all_exchange_rates(limit=limit, offset=offset)
+        return self.db_manager.get_all_exchange_rates(limit=limit, after=after)
 
     def _get_exchange_rates_data(self, currency_id: int, date_from: str, date_to: str) -> list[tuple[str, float]]:
         """Get exchange rates data for the specified currency and date range.
@@ -648,7 +648,8 @@ class ExchangeRatesOperations:
             self._reset_exchange_rates_pagination_state()
 
         limit: int = self.count_exchange_rates_to_show
-        rows: list[list[Any]] = self._fetch_exchange_rates_rows(limit, 0)
+        rows: list[list[Any]] = self._fetch_exchange_rates_rows(limit)
+        cursor: KeysetCursor | None = _exchange_rate_row_cursor(rows[-1]) if rows else None
         transformed_data: list[list] = self._transform_exchange_rates_data(rows)
 
         self.models["exchange_rates"] = self._create_colored_table_model(
@@ -657,7 +658,7 @@ class ExchangeRatesOperations:
         self._set_table_model_and_stretch_columns(self.tableView_exchange_rates, self.models["exchange_rates"])
         self._setup_exchange_rates_table_delegates()
 
-        self._exchange_rates_pagination.record_first_page(len(rows), limit)
+        self._exchange_rates_pagination.record_first_page(len(rows), limit, cursor=cursor)
 
     def _load_more_exchange_rates(self) -> None:
         """Append the next page of exchange rates when scrolling to the bottom."""
@@ -670,10 +671,11 @@ class ExchangeRatesOperations:
             source_model = cast("QStandardItemModel", proxy.sourceModel())
             self._append_colored_rows_to_model(source_model, transformed_data)
 
-        self._exchange_rates_pagination.load_more(
+        self._exchange_rates_pagination.load_more_after(
             load_more_count=self.exchange_rates_load_more_count,
             fetch_rows=self._fetch_exchange_rates_rows,
             append_rows=append_rows,
+            cursor_of=_exchange_rate_row_cursor,
         )
 
     def _mark_exchange_rates_changed(self) -> None:
@@ -892,6 +894,11 @@ class ExchangeRatesOperations:
         return rates_transformed_data
 
 
+def _exchange_rate_row_cursor(row: list[Any]) -> KeysetCursor:
+    """Return the keyset cursor of a raw exchange rate row (`_id` at 0, `date` at 4)."""
+    return KeysetCursor.from_row(row, date_index=4, id_index=0)
+
+
 def _require_db_filename_for_worker(db_manager: object) -> str:
     db_filename = str(getattr(db_manager, "_db_filename", ""))
     if not db_filename:
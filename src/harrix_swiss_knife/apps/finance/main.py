@@ -19,6 +19,10 @@ from typing import TYPE_CHECKING, Any, cast
 if TYPE_CHECKING:
     from collections.abc import Callable
 
+    from PySide6.QtCore import QAbstractItemModel
+
+    from harrix_swiss_knife.apps.finance.services.transaction_summary import SummaryAmount
+
 import harrix_pylib as h
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.dates import date2num
@@ -86,8 +90,9 @@ from harrix_swiss_knife.apps.common.chart_colors import generate_pastel_qcolors
 from harrix_swiss_knife.apps.common.date_edit_quick import attach_date_edit_quick_controls
 from harrix_swiss_knife.apps.common.db_init import init_tracker_database
 from harrix_swiss_knife.apps.common.qt_main_window import AppWindowMixin
-from harrix_swiss_knife.apps.common.scroll_pagination import ScrollPagination, on_scroll_load_more
-from harrix_swiss_knife.apps.common.table_models import create_table_proxy_model
+from harrix_swiss_knife.apps.common.qt_sql_profiler import sql_profile_cycle
+from harrix_swiss_knife.apps.common.scroll_pagination import KeysetCursor, ScrollPagination, on_scroll_load_more
+from harrix_swiss_knife.apps.common.table_models import LazyTableModel, create_table_proxy_model, source_row_id
 from harrix_swiss_knife.apps.common.widgets.image_picker import ImagePicker, ImagePickerMode
 from harrix_swiss_knife.apps.finance import database_manager, window
 from harrix_swiss_knife.apps.finance.account_edit_dialog import AccountEditDialog
@@ -97,7 +102,14 @@ from harrix_swiss_knife.apps.finance.balance_check_worker import BalanceCheckRes
 from harrix_swiss_knife.apps.finance.categories_table import create_categories_table_proxy_model
 from harrix_swiss_knife.apps.finance.category_add_dialog import CategoryAddDialog
 from harrix_swiss_knife.apps.finance.category_edit_dialog import CategoryEditDialog
-from harrix_swiss_knife.apps.finance.category_suggest import suggest_categories
+from harrix_swiss_knife.apps.finance.category_suggest import CategorySuggestIndex
+from harrix_swiss_knife.apps.finance.chart_build_worker import (
+    DATE_RELATIVE_CHART_KINDS,
+    ChartBuildResult,
+    ChartBuildScheduler,
+    ChartRequest,
+    compute_chart,
+)
 from harrix_swiss_knife.apps.finance.chart_year_start_dialog import ChartYearStartDialog
 from harrix_swiss_knife.apps.finance.deferred_ui_refresh import DeferredUiRefreshScheduler
 from harrix_swiss_knife.apps.finance.delegates import (
@@ -136,25 +148,14 @@ from harrix_swiss_knife.apps.finance.standard_items_dialog import StandardItemsD
 from harrix_swiss_knife.apps.finance.text_input_dialog import TextInputDialog
 from harrix_swiss_knife.apps.finance.transaction_helpers import (
     MIN_TRANSACTION_ROW_LENGTH,
-    ChartComputeContext,
-    compute_average_salary_by_year,
-    compute_balance_series,
-    compute_cumulative_compare_last_months,
-    compute_cumulative_compare_last_years,
-    compute_cumulative_compare_same_months,
-    compute_period_flow_by_category,
-    compute_period_flow_compare_last_years,
-    compute_period_flow_series,
     fiscal_period_month_labels_by_index,
-    get_natural_cumulative_income_expense_minor_by_currency,
     get_natural_currency_reconciliation,
-    iter_period_end_dates,
     plan_revision_expense_consolidation_for_positive_diff,
 )
-from harrix_swiss_knife.apps.finance.transaction_helpers import calculate_daily_expenses as calc_daily_expenses
 from harrix_swiss_knife.apps.finance.transaction_helpers import calculate_exchange_loss as calc_exchange_loss
-from harrix_swiss_knife.apps.finance.transaction_helpers import (
-    transform_transaction_data as transform_transaction_data_helper,
+from harrix_swiss_knife.apps.finance.transaction_page_formatter import (
+    FormattedTransactionPage,
+    TransactionPageFormatter,
 )
 from harrix_swiss_knife.apps.finance.transaction_translate_parser import (
     align_translations_to_descriptions,
@@ -279,7 +280,7 @@ class MainWindow(
         self.count_exchange_rates_to_show: int = initial_count
         self.exchange_rates_load_more_count: int = load_more_count
         self.description_autocomplete_limit: int = initial_count
-        self._description_category_pairs: list[tuple[str, str, int]] = []
+        self._category_suggest_index = CategorySuggestIndex()
         self._category_suggest_timer = QTimer(self)
         self._category_suggest_timer.setSingleShot(True)
         self._category_suggest_timer.setInterval(700)
@@ -296,9 +297,8 @@ class MainWindow(
 
         # Transactions table pagination state
         self._transactions_pagination = ScrollPagination()
-        self._transactions_dates_with_totals: set[str] = set()
-        self._transactions_date_color_map: dict[str, int] = {}
-        self._transactions_color_index: int = 0
+        self._transactions_page_formatter = TransactionPageFormatter(self.date_colors)
+        self._transactions_last_page: FormattedTransactionPage | None = None
 
         # Exchange rates table pagination state
         self._exchange_rates_pagination = ScrollPagination()
@@ -324,6 +324,10 @@ class MainWindow(
         # Charts tab: auto-draw only on first visit.
         self._charts_initialized: bool = False
         self._chart_build_toast: toast_countdown_notification.ToastCountdownNotification | None = None
+        # Charts tab: series are computed on a worker; rapid control changes supersede each other.
+        self._chart_build_scheduler = ChartBuildScheduler(self, interval_ms=150)
+        self._chart_build_scheduler.chart_completed.connect(self._on_chart_build_completed)
+        self._chart_build_scheduler.chart_failed.connect(self._on_chart_build_failed)
         self._report_build_toast: toast_countdown_notification.ToastCountdownNotification | None = None
         self._compare_last_years_start_month: int = 1
         self._compare_last_years_start_day: int = 1
@@ -486,7 +490,10 @@ class MainWindow(
         if report_worker is not None and report_worker.isRunning():
             report_worker.wait(3000)
 
+        self._chart_build_scheduler.shutdown()
+
         self._close_report_build_toast()
+        self._close_chart_build_toast()
 
         # Close progress dialogs if open
         if hasattr(self, "progress_dialog"):
@@ -500,6 +507,7 @@ class MainWindow(
 
         # Close DB
         if self.db_manager:
+            self.db_manager.close_read_only_pool()
             self.db_manager.close()
             self.db_manager = None
 
@@ -913,10 +921,13 @@ class MainWindow(
                 )
 
             def on_success(data: Any) -> None:
-                _amount, _desc, _cat_id, _curr_id, _date, _tag = data
+                _amount, desc, cat_id, _curr_id, _date, _tag = data
                 current_date = self.dateEdit.date()
                 self._refresh_after_transaction_add(categories_may_change=False)
-                self._update_autocomplete_data()
+                self._update_autocomplete_data(reload_category_pairs=False)
+                category = self.db_manager.get_category_by_id(cat_id) if self.db_manager is not None else None
+                if category is not None:
+                    self._category_suggest_index.add(desc, str(category[1]))
                 self.doubleSpinBox_amount.setValue(100.0)
                 self.lineEdit_description.clear()
                 self.lineEdit_tag.clear()
@@ -1342,6 +1353,7 @@ class MainWindow(
             logger.exception("Error showing tables")
             message_box.warning(self, "Database Error", f"Failed to load tables: {e}")
 
+    @sql_profile_cycle("finance.update_all")
     @requires_database(is_show_warning=False)
     def update_all(self) -> None:
         """Refresh all tables and comboboxes."""
@@ -1399,7 +1411,11 @@ class MainWindow(
 
     @requires_database()
     def update_summary_labels(self) -> None:
-        """Update Quick Summary / today and yesterday labels using natural per-currency amounts."""
+        """Update Quick Summary / today and yesterday labels using natural per-currency amounts.
+
+        Figures come from `DatabaseManager.summary`, which keeps grouped per-day and per-month sums.
+
+        """
         if self.db_manager is None:
             logger.error("❌ Database manager is not initialized")
             return
@@ -1409,27 +1425,15 @@ class MainWindow(
             default_currency_info = db.get_currency_by_code(db.get_default_currency())
             currency_symbol: str = default_currency_info[2] if default_currency_info else "₽"
 
-            transaction_rows: list = db.get_all_transactions()
-
-            income_minor: dict[int, int]
-            expense_minor: dict[int, int]
-            income_minor, expense_minor = get_natural_cumulative_income_expense_minor_by_currency(transaction_rows, db)
+            today: date = datetime.now(UTC).astimezone().date()
+            today_str: str = today.strftime("%Y-%m-%d")
+            yesterday_str: str = (today - timedelta(days=1)).strftime("%Y-%m-%d")
+            summary = db.summary.summary((today_str, yesterday_str))
 
-            def _currency_sort_key(cid: int) -> str:
-                cur = db.get_currency_by_id(cid)
-                return cur[0] if cur else f"#{cid}"
+            def _amount_lines(amounts: list[SummaryAmount]) -> list[str]:
+                return [f"{amount.code}: {format_amount(f'{amount.amount:.2f}')}{amount.symbol}" for amount in amounts]
 
-            income_lines: list[str] = []
-            for cid in sorted(income_minor, key=_currency_sort_key):
-                minor = income_minor[cid]
-                if minor == 0:
-                    continue
-                cur = db.get_currency_by_id(cid)
-                code = cur[0] if cur else str(cid)
-                sym = cur[2] if cur else ""
-                major = db.convert_from_minor_units(minor, cid)
-                formatted_major = format_amount(f"{major:.2f}")
-                income_lines.append(f"{code}: {formatted_major}{sym}")
+            income_lines: list[str] = _amount_lines(summary.income)
             income_text = (
                 "Total Income:\n" + "\n".join(income_lines)
                 if income_lines
@@ -1437,17 +1441,7 @@ class MainWindow(
             )
             self.label_total_income.setText(income_text)
 
-            expense_lines: list[str] = []
-            for cid in sorted(expense_minor, key=_currency_sort_key):
-                minor = expense_minor[cid]
-                if minor == 0:
-                    continue
-                cur = db.get_currency_by_id(cid)
-                code = cur[0] if cur else str(cid)
-                sym = cur[2] if cur else ""
-                major = db.convert_from_minor_units(minor, cid)
-                formatted_major = format_amount(f"{major:.2f}")
-                expense_lines.append(f"{code}: {formatted_major}{sym}")
+            expense_lines: list[str] = _amount_lines(summary.expenses)
             expense_text = (
                 "Total Expenses:\n" + "\n".join(expense_lines)
                 if expense_lines
@@ -1455,41 +1449,13 @@ class MainWindow(
             )
             self.label_total_expenses.setText(expense_text)
 
-            today: date = datetime.now(UTC).astimezone().date()
-            today_str: str = today.strftime("%Y-%m-%d")
-            yesterday_str: str = (today - timedelta(days=1)).strftime("%Y-%m-%d")
-
-            def _expense_lines_for_date(target_date: str) -> list[str]:
-                expense_minor_by_date: dict[int, int] = {}
-                for row in transaction_rows:
-                    if len(row) < MIN_TRANSACTION_ROW_LENGTH:
-                        continue
-                    if row[5] != target_date or int(row[7]) != 0:
-                        continue
-                    currency_info = db.get_currency_by_code(row[4])
-                    cid = currency_info[0] if currency_info else 1
-                    expense_minor_by_date[cid] = expense_minor_by_date.get(cid, 0) + int(row[1])
-
-                lines: list[str] = []
-                for cid in sorted(expense_minor_by_date, key=_currency_sort_key):
-                    minor = expense_minor_by_date[cid]
-                    if minor == 0:
-                        continue
-                    cur = db.get_currency_by_id(cid)
-                    code = cur[0] if cur else str(cid)
-                    sym = cur[2] if cur else ""
-                    major = db.convert_from_minor_units(minor, cid)
-                    formatted_major = format_amount(f"{major:.2f}")
-                    lines.append(f"{code}: {formatted_major}{sym}")
-                return lines
-
-            expense_today_lines: list[str] = _expense_lines_for_date(today_str)
+            expense_today_lines: list[str] = _amount_lines(summary.day_expenses[today_str])
             if expense_today_lines:
                 self.label_today_expense.setText("\n".join(expense_today_lines))
             else:
                 self.label_today_expense.setText(f"{format_amount('0.00')}{currency_symbol}")
 
-            expense_yesterday_lines: list[str] = _expense_lines_for_date(yesterday_str)
+            expense_yesterday_lines: list[str] = _amount_lines(summary.day_expenses[yesterday_str])
             if expense_yesterday_lines:
                 self.label_yesterday_expense.setText("\n".join(expense_yesterday_lines))
             else:
@@ -1664,11 +1630,17 @@ class MainWindow(
 
     def _append_transformed_rows_to_model(
         self,
-        model: QStandardItemModel,
+        model: QAbstractItemModel,
         transformed_data: list[list],
         id_column: int = -2,
     ) -> None:
         """Append transformed transaction rows to an existing source model."""
+        if isinstance(model, LazyTableModel):
+            model.append_rows(transformed_data)
+            return
+        if not isinstance(model, QStandardItemModel):
+            return
+
         start_row_idx: int = model.rowCount()
         for row_offset, row in enumerate(transformed_data):
             row_idx: int = start_row_idx + row_offset
@@ -1682,10 +1654,7 @@ class MainWindow(
                 item.setBackground(QBrush(row_color))
 
                 if col_idx == self._TRANSACTION_AMOUNT_COLUMN:
-                    original_value: str = (
-                        str(value).replace("-", "") if value and str(value).startswith("-") else str(value)
-                    )
-                    item.setData(original_value, Qt.ItemDataRole.UserRole)
+                    item.setData(_unsigned_amount_text(value), Qt.ItemDataRole.UserRole)
 
                 if col_idx == len(display_data) - 1:
                     item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
@@ -1811,6 +1780,36 @@ class MainWindow(
     def _chart_date_nums(x_values: list[datetime]) -> list[float]:
         return list(date2num(x_values))
 
+    def _chart_request(self, db_filename: str | None) -> ChartRequest:
+        """Snapshot the Charts tab controls for computing the chart off the UI thread."""
+        kinds = (
+            (self.radioButton_type_of_chart_average_salary, "average_salary"),
+            (self.radioButton_type_of_chart_balance, "balance"),
+            (self.radioButton_type_of_chart_compare_last, "compare_last"),
+            (self.radioButton_type_of_chart_compare_last_years, "compare_last_years"),
+            (self.radioButton_type_of_chart_compare_same_months, "compare_same_months"),
+            (self.radioButton_expense_and_income_compare_last_years, "expense_income_compare_last_years"),
+            (self.radioButton_expense_and_income, "expense_income"),
+        )
+        kind = next((kind for radio_button, kind in kinds if radio_button.isChecked()), "category")
+        expense_names, income_names, _all_names = self._get_checked_chart_categories()
+        return ChartRequest(
+            kind=kind,
+            period=self.comboBox_chart_period.currentText(),
+            date_from=self.dateEdit_chart_from.date().toString("yyyy-MM-dd"),
+            date_to=self.dateEdit_chart_to.date().toString("yyyy-MM-dd"),
+            currency_symbol=self._get_default_currency_symbol(),
+            data_generation=self.db_manager.data_generation() if self.db_manager is not None else 0,
+            expense_names=frozenset(expense_names),
+            income_names=frozenset(income_names),
+            compare_count=self.spinBox_compare_last.value(),
+            selected_month=self.comboBox_compare_same_months.currentIndex() + 1,
+            year_start_month=self._compare_last_years_start_month,
+            year_start_day=self._compare_last_years_start_day,
+            db_filename=db_filename,
+            today=datetime.now(UTC).astimezone().date().isoformat() if kind in DATE_RELATIVE_CHART_KINDS else "",
+        )
+
     def _clean_category_display_name(self, category_value: str) -> str:
         """Strip emoji / income marker from a category cell display value."""
         clean_category_name = category_value
@@ -2195,6 +2194,9 @@ class MainWindow(
     ) -> QSortFilterProxyModel:
         """Create a special model for transactions table with non-editable total column.
 
+        The source model is a `LazyTableModel`, so cells are formatted only when painted
+        instead of allocating a `QStandardItem` per cell.
+
         Args:
 
         - `data` (`list[list]`): The table data with color information.
@@ -2206,47 +2208,20 @@ class MainWindow(
         - `QSortFilterProxyModel`: A filterable and sortable model with colored data and non-editable total column.
 
         """
-        model: QStandardItemModel = QStandardItemModel()
-        model.setHorizontalHeaderLabels(headers)
-
-        for row_idx, row in enumerate(data):
-            # Extract color information (last element) and ID (second-to-last element)
-            row_color: QColor = row[-1]  # Color is at the last position
-            row_id: int = row[id_column]  # ID is at second-to-last position
-
-            # Create items for display columns only (exclude ID and color)
-            items: list[QStandardItem] = []
-            display_data: list = row[:-2]  # Exclude last two elements (ID and color)
-
-            for col_idx, value in enumerate(display_data):
-                item: QStandardItem = QStandardItem(str(value) if value is not None else "")
-
-                # Set background color for the item
-                item.setBackground(QBrush(row_color))
-
-                # For amount column, store original value without minus sign for editing
-                if col_idx == self._TRANSACTION_AMOUNT_COLUMN:
-                    # Remove minus sign for editing, keep only the numeric value
-                    original_value: str = (
-                        str(value).replace("-", "") if value and str(value).startswith("-") else str(value)
-                    )
-                    item.setData(original_value, Qt.ItemDataRole.UserRole)
-
-                # Make the "Total per day" column (last column) non-editable
-                if col_idx == len(display_data) - 1:  # Last column
-                    item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-
-                items.append(item)
-
-            model.appendRow(items)
-
-            # Set the ID in vertical header
-            model.setVerticalHeaderItem(
-                row_idx,
-                QStandardItem(str(row_id)),
-            )
+        # Color is the last element and the ID the second-to-last; the "Total per day"
+        # column (last displayed) is read-only, and the amount column keeps its unsigned
+        # value in UserRole for editing
+        model = LazyTableModel(
+            headers,
+            id_column=id_column,
+            color_column=-1,
+            read_only_columns={len(headers) - 1},
+            user_role_columns={self._TRANSACTION_AMOUNT_COLUMN: _unsigned_amount_text},
+        )
+        model.append_rows(data)
 
         proxy: QSortFilterProxyModel = QSortFilterProxyModel()
+        model.setParent(proxy)
         proxy.setSourceModel(model)
         return proxy
 
@@ -2446,29 +2421,60 @@ class MainWindow(
         self._add_finance_chart_stats_box(ax, all_values, currency_symbol)
         self._add_chart_canvas(fig)
 
-    def _draw_compare_chart(self, mode: str) -> None:
-        if self.db_manager is None:
-            return
-
-        expense_names, income_names, all_names = self._get_checked_chart_categories()
-        if not all_names:
-            self._show_no_data_label(self.verticalLayout_charts_content, "Please select at least one category")
+    def _draw_chart_result(self, result: ChartBuildResult) -> None:
+        """Draw a chart computed by `compute_chart` into the Charts tab."""
+        request = result.request
+        self._clear_layout(self.verticalLayout_charts_content)
+        if result.message is not None:
+            self._show_no_data_label(self.verticalLayout_charts_content, result.message)
             return
 
-        transaction_rows = self.db_manager.get_all_transactions()
-        currency_symbol = self._get_default_currency_symbol()
-        chart_ctx = ChartComputeContext.load(self.db_manager)
-        sections: list[tuple[str, int, set[str]]] = []
-        if expense_names:
-            sections.append(("Expense", 0, expense_names))
-        if income_names:
-            sections.append(("Income", 1, income_names))
-
-        if not sections:
-            self._show_no_data_label(self.verticalLayout_charts_content, "Please select at least one category")
-            return
+        if request.kind == "average_salary":
+            self._draw_average_salary_by_year_chart(
+                result.data,
+                request.currency_symbol,
+                year_start_month=request.year_start_month,
+                year_start_day=request.year_start_day,
+            )
+        elif request.kind == "balance":
+            self._draw_balance_chart(result.data, request.period, request.currency_symbol)
+        elif request.kind == "category":
+            self._draw_category_chart(result.data, request.period, request.currency_symbol)
+        elif request.kind == "expense_income":
+            expense_series, income_series = result.data
+            self._draw_expense_income_chart(expense_series, income_series, request.period, request.currency_symbol)
+        elif request.kind == "expense_income_compare_last_years":
+            self._draw_expense_income_compare_last_years_chart(
+                result.data,
+                request.period,
+                request.currency_symbol,
+                request.compare_count,
+                year_start_month=request.year_start_month,
+                year_start_day=request.year_start_day,
+            )
+        else:
+            mode = {"compare_last": "last", "compare_last_years": "last_years"}.get(request.kind, "same")
+            self._draw_compare_chart(
+                mode,
+                result.data,
+                request.currency_symbol,
+                request.compare_count,
+                selected_month=request.selected_month,
+                year_start_month=request.year_start_month,
+                year_start_day=request.year_start_day,
+            )
 
-        compare_count = self.spinBox_compare_last.value()
+    def _draw_compare_chart(
+        self,
+        mode: str,
+        sections: list[tuple[str, int, list[list[tuple[int, float]]], list[str], list[str]]],
+        currency_symbol: str,
+        compare_count: int,
+        *,
+        selected_month: int = 1,
+        year_start_month: int = 1,
+        year_start_day: int = 1,
+    ) -> None:
         max_days_in_all_periods = 0
         rendered_any = False
 
@@ -2477,32 +2483,12 @@ class MainWindow(
         else:
             self.label_compare_last.setText("Number of months:")
 
-        for section_title, category_type, selected_names in sections:
+        for section_title, _category_type, series_data, labels, colors in sections:
             if mode == "last":
-                series_data, labels, colors = compute_cumulative_compare_last_months(
-                    transaction_rows,
-                    self.db_manager,
-                    compare_count,
-                    selected_names,
-                    category_type,
-                    ctx=chart_ctx,
-                )
                 chart_title = f"{section_title} (Last {compare_count} months comparison)"
                 x_label = "Day of Month"
                 default_max_x = 31
             elif mode == "last_years":
-                year_start_month = self._compare_last_years_start_month
-                year_start_day = self._compare_last_years_start_day
-                series_data, labels, colors = compute_cumulative_compare_last_years(
-                    transaction_rows,
-                    self.db_manager,
-                    compare_count,
-                    selected_names,
-                    category_type,
-                    year_start_month=year_start_month,
-                    year_start_day=year_start_day,
-                    ctx=chart_ctx,
-                )
                 if year_start_month == 1 and year_start_day == 1:
                     chart_title = f"{section_title} (Last {compare_count} years comparison)"
                 else:
@@ -2512,17 +2498,7 @@ class MainWindow(
                 x_label = "Day of Year"
                 default_max_x = 366
             else:
-                selected_month = self.comboBox_compare_same_months.currentIndex() + 1
-                series_data, labels, colors = compute_cumulative_compare_same_months(
-                    transaction_rows,
-                    self.db_manager,
-                    compare_count,
-                    selected_month,
-                    selected_names,
-                    category_type,
-                    ctx=chart_ctx,
-                )
-                month_name = self.comboBox_compare_same_months.currentText()
+                month_name = self.comboBox_compare_same_months.itemText(selected_month - 1)
                 chart_title = f"{section_title} ({month_name} comparison)"
                 x_label = "Day of Month"
                 default_max_x = 31
@@ -2602,19 +2578,14 @@ class MainWindow(
 
     def _draw_expense_income_compare_last_years_chart(
         self,
-        expense_names: set[str],
-        income_names: set[str],
+        sections: list[tuple[str, list[list[tuple[int, float, str]]], list[str], list[str]]],
         period: str,
         currency_symbol: str,
         years_count: int,
+        *,
+        year_start_month: int = 1,
+        year_start_day: int = 1,
     ) -> None:
-        if self.db_manager is None:
-            return
-
-        transaction_rows = self.db_manager.get_all_transactions()
-        chart_ctx = ChartComputeContext.load(self.db_manager)
-        year_start_month = self._compare_last_years_start_month
-        year_start_day = self._compare_last_years_start_day
         self.label_compare_last.setText("Number of years:")
 
         all_series: list[list[tuple[int, float, str]]] = []
@@ -2622,43 +2593,12 @@ class MainWindow(
         all_colors: list[str] = []
         max_period = 0
 
-        if expense_names:
-            expense_data, expense_labels, expense_colors = compute_period_flow_compare_last_years(
-                transaction_rows,
-                self.db_manager,
-                years_count,
-                expense_names,
-                0,
-                period,
-                year_start_month=year_start_month,
-                year_start_day=year_start_day,
-                ctx=chart_ctx,
-            )
-            for series, label, color in zip(expense_data, expense_labels, expense_colors, strict=False):
+        for section_title, section_data, section_labels, section_colors in sections:
+            for series, label, color in zip(section_data, section_labels, section_colors, strict=False):
                 if not series:
                     continue
                 all_series.append(series)
-                all_labels.append(f"Expense {label}")
-                all_colors.append(color)
-                max_period = max(max_period, series[-1][0])
-
-        if income_names:
-            income_data, income_labels, income_colors = compute_period_flow_compare_last_years(
-                transaction_rows,
-                self.db_manager,
-                years_count,
-                income_names,
-                1,
-                period,
-                year_start_month=year_start_month,
-                year_start_day=year_start_day,
-                ctx=chart_ctx,
-            )
-            for series, label, color in zip(income_data, income_labels, income_colors, strict=False):
-                if not series:
-                    continue
-                all_series.append(series)
-                all_labels.append(f"Income {label}")
+                all_labels.append(f"{section_title} {label}")
                 all_colors.append(color)
                 max_period = max(max_period, series[-1][0])
 
@@ -2723,15 +2663,15 @@ class MainWindow(
         ax.legend(loc="upper left", fontsize=9)
         self._add_chart_canvas(fig)
 
-    def _fetch_transaction_rows(self, limit: int | None, offset: int) -> list[list[Any]]:
-        """Fetch transaction rows with optional filters and pagination."""
+    def _fetch_transaction_rows(self, limit: int | None, after: KeysetCursor | None = None) -> list[list[Any]]:
+        """Fetch transaction rows with optional filters, seeking past the `after` keyset cursor."""
         if self.db_manager is None:
             return []
 
         filter_params: dict[str, Any] | None = self._get_transactions_filter_params()
         if filter_params is not None:
-            return self.db_manager.get_filtered_transactions(**filter_params, limit=limit, offset=offset)
-        return self.db_manager.get_all_transactions(limit=limit, offset=offset)
+            return self.db_manager.get_filtered_transactions(**filter_params, limit=limit, after=after)
+        return self.db_manager.get_all_transactions(limit=limit, after=after)
 
     def _filter_by_category_from_table(self, category_value: str) -> None:
         """Filter transactions by category from table row.
@@ -3329,13 +3269,13 @@ class MainWindow(
         def append_rows(rows: list) -> None:
             transformed_data: list[list] = self._transform_transaction_data(rows, append_state=True)
             proxy = cast("QSortFilterProxyModel", self.models["transactions"])
-            source_model = cast("QStandardItemModel", proxy.sourceModel())
-            self._append_transformed_rows_to_model(source_model, transformed_data)
+            self._append_transformed_rows_to_model(proxy.sourceModel(), transformed_data)
 
-        self._transactions_pagination.load_more(
+        self._transactions_pagination.load_more_after(
             load_more_count=self.transactions_load_more_count,
             fetch_rows=self._fetch_transaction_rows,
             append_rows=append_rows,
+            cursor_of=_transaction_row_cursor,
         )
 
     def _load_simple_colored_table(
@@ -3371,7 +3311,8 @@ class MainWindow(
             self._reset_transactions_pagination_state()
 
         limit: int | None = None if self.show_all_transactions else self.count_transactions_to_show
-        rows: list = self._fetch_transaction_rows(limit, 0)
+        rows: list = self._fetch_transaction_rows(limit)
+        cursor: KeysetCursor | None = _transaction_row_cursor(rows[-1]) if rows else None
         transformed_data: list[list] = self._transform_transaction_data(rows, append_state=False)
 
         self.models["transactions"] = self._create_transactions_table_model(
@@ -3386,6 +3327,7 @@ class MainWindow(
             len(rows),
             limit,
             pagination_enabled=not self.show_all_transactions,
+            cursor=cursor,
         )
         self._connect_table_auto_save_signals()
 
@@ -3736,6 +3678,16 @@ class MainWindow(
             return
         self._open_category_edit_dialog_for_index(index)
 
+    def _on_chart_build_completed(self, result: ChartBuildResult) -> None:
+        """Draw the latest chart computed by the chart worker."""
+        self._close_chart_build_toast()
+        self._draw_chart_result(result)
+
+    def _on_chart_build_failed(self, error_message: str) -> None:
+        """Handle chart worker failure."""
+        self._close_chart_build_toast()
+        logger.error("%s", f"Error building chart: {error_message}")
+
     def _on_check_completed(self, currencies_to_process: list) -> None:
         """Handle successful completion of exchange rate check.
 
@@ -4280,15 +4232,15 @@ class MainWindow(
                 return
 
             source_model = proxy_model.sourceModel()
-            if source_model is None or not isinstance(source_model, QStandardItemModel):
+            if source_model is None:
                 return
 
             # Get the row ID from vertical header
-            row_id_item = source_model.verticalHeaderItem(current.row())
-            if row_id_item is None:
+            row_id = source_row_id(source_model, current.row())
+            if row_id is None:
                 return
 
-            transaction_id: int = int(row_id_item.text())
+            transaction_id: int = int(row_id)
 
             # Get transaction data from database
             transaction_data = self.db_manager.get_transaction_by_id(transaction_id)
@@ -4860,9 +4812,7 @@ class MainWindow(
     def _reset_transactions_pagination_state(self) -> None:
         """Reset pagination counters and display state for transactions table."""
         self._transactions_pagination.reset()
-        self._transactions_dates_with_totals = set()
-        self._transactions_date_color_map = {}
-        self._transactions_color_index = 0
+        self._transactions_last_page = None
 
     def _restore_table_column_widths(self, table_view: QTableView, column_widths: list[int]) -> None:
         """Restore column widths for a table view.
@@ -4904,12 +4854,7 @@ class MainWindow(
             if local:
                 aliases.append(str(local))
             category_aliases[category_name] = aliases
-        suggested = suggest_categories(
-            text,
-            self._description_category_pairs,
-            category_names,
-            category_aliases=category_aliases,
-        )
+        suggested = self._category_suggest_index.suggest(text, category_names, category_aliases=category_aliases)
         self._apply_category_suggestions(suggested)
 
     def _save_table_column_widths(self, table_view: QTableView) -> list[int]:
@@ -6100,20 +6045,13 @@ class MainWindow(
         - `list[list]`: Transformed data with colors and daily totals.
 
         """
-        daily_expenses: dict[str, float] = calc_daily_expenses(rows, self.db_manager)
-        result = transform_transaction_data_helper(
-            rows,
-            daily_expenses,
-            self.date_colors,
-            self.db_manager,
-            dates_with_totals=self._transactions_dates_with_totals if append_state else None,
-            date_to_color_index=self._transactions_date_color_map if append_state else None,
-            color_index=self._transactions_color_index if append_state else 0,
+        if self.db_manager is None:
+            return []
+        page = self._transactions_page_formatter.format_page(
+            self.db_manager, rows, self._transactions_last_page if append_state else None
         )
-        self._transactions_dates_with_totals = result.dates_with_totals
-        self._transactions_date_color_map = result.date_to_color_index
-        self._transactions_color_index = result.color_index
-        return result.rows
+        self._transactions_last_page = page
+        return page.rows
 
     def _update_accounts_balance_display(self) -> None:
         """Update the display of total accounts balance."""
@@ -6141,8 +6079,16 @@ class MainWindow(
             self.label_balance_accounts.setText("Error")
             self.label_balance_account_details.setText("Failed to load balance")
 
-    def _update_autocomplete_data(self) -> None:
-        """Update autocomplete data from database."""
+    def _update_autocomplete_data(self, *, reload_category_pairs: bool = True) -> None:
+        """Update autocomplete data from database.
+
+        Args:
+
+        - `reload_category_pairs` (`bool`): Rebuild the category suggestion index from the
+          description/category history. Pass `False` when the caller adds the new pair to the
+          index itself. Defaults to `True`.
+
+        """
         if not self._validate_database_connection():
             return
 
@@ -6158,9 +6104,10 @@ class MainWindow(
 
             self.description_completer_source_model.setStringList(descriptions)
             self.description_completer_proxy.invalidateFilter()
-            self._description_category_pairs = self.db_manager.get_recent_description_category_pairs(
-                self.description_autocomplete_limit,
-            )
+            if reload_category_pairs:
+                self._category_suggest_index.set_pairs(
+                    self.db_manager.get_recent_description_category_pairs(self.description_autocomplete_limit),
+                )
 
         except Exception:
             logger.exception("Error updating autocomplete data")
@@ -6258,7 +6205,7 @@ class MainWindow(
 
     @requires_database()
     def _update_finance_chart(self, *_args: object) -> None:
-        """Build and render the finance chart according to the selected chart type."""
+        """Snapshot the chart controls and build the selected chart on a background worker."""
         if self.db_manager is None:
             return
         if not self._charts_initialized:
@@ -6274,154 +6221,34 @@ class MainWindow(
         ) and not self._prompt_compare_last_years_start():
             return
 
-        self._close_chart_build_toast()
-        self._chart_build_toast = toast_countdown_notification.ToastCountdownNotification("Building chart…")
-        self._chart_build_toast.start_countdown()
-        QApplication.processEvents()
-
         try:
-            self._clear_layout(self.verticalLayout_charts_content)
-
-            period = self.comboBox_chart_period.currentText()
-            date_from = self.dateEdit_chart_from.date().toString("yyyy-MM-dd")
-            date_to = self.dateEdit_chart_to.date().toString("yyyy-MM-dd")
-            currency_symbol = self._get_default_currency_symbol()
-            transaction_rows = self.db_manager.get_all_transactions()
-            exchange_rows = self.db_manager.get_all_currency_exchanges()
-            chart_ctx = ChartComputeContext.load(self.db_manager)
-
-            if self.radioButton_type_of_chart_average_salary.isChecked():
-                year_start_month = self._compare_last_years_start_month
-                year_start_day = self._compare_last_years_start_day
-                year_rows = compute_average_salary_by_year(
-                    self.db_manager,
-                    self.db_manager.get_default_currency_id(),
-                    year_start_month=year_start_month,
-                    year_start_day=year_start_day,
-                )
-                if not year_rows:
-                    self._show_no_data_label(
-                        self.verticalLayout_charts_content,
-                        "No data found for the selected period",
-                    )
-                    return
-                self._draw_average_salary_by_year_chart(
-                    year_rows,
-                    currency_symbol,
-                    year_start_month=year_start_month,
-                    year_start_day=year_start_day,
-                )
-                return
-
-            if self.radioButton_type_of_chart_balance.isChecked():
-                period_end_dates = iter_period_end_dates(date_from, date_to, period)
-                series = compute_balance_series(
-                    transaction_rows, exchange_rows, self.db_manager, period_end_dates, ctx=chart_ctx
-                )
-                if not series:
-                    self._show_no_data_label(
-                        self.verticalLayout_charts_content,
-                        "No data found for the selected period",
-                    )
-                    return
-                self._draw_balance_chart(series, period, currency_symbol)
-                return
-
-            if self.radioButton_type_of_chart_compare_last.isChecked():
-                self._draw_compare_chart("last")
-                return
-
-            if self.radioButton_type_of_chart_compare_last_years.isChecked():
-                self._draw_compare_chart("last_years")
-                return
-
-            if self.radioButton_type_of_chart_compare_same_months.isChecked():
-                self._draw_compare_chart("same")
-                return
-
-            expense_names, income_names, all_names = self._get_checked_chart_categories()
+            db_filename: str | None = _require_db_filename_for_worker(self.db_manager)
+        except DbFilenameUnavailableForWorkerThreadError:
+            db_filename = None
+        request = self._chart_request(db_filename)
+        if db_filename is None:
+            # In-memory or unnamed databases cannot be reopened from a worker thread
+            self._chart_build_scheduler.shutdown()
+            result = compute_chart(request, self.db_manager)
+            if result is not None:
+                self._on_chart_build_completed(result)
+            return
 
-            if self.radioButton_expense_and_income_compare_last_years.isChecked():
-                if not expense_names and not income_names:
-                    self._show_no_data_label(
-                        self.verticalLayout_charts_content,
-                        "Please select at least one category",
-                    )
-                    return
-                years_count = self.spinBox_compare_last.value()
-                self._draw_expense_income_compare_last_years_chart(
-                    expense_names,
-                    income_names,
-                    period,
-                    currency_symbol,
-                    years_count,
-                )
-                return
+        self._chart_build_scheduler.request(request)
+        if self._chart_build_scheduler.busy and self._chart_build_toast is None:
+            self._chart_build_toast = toast_countdown_notification.ToastCountdownNotification("Building chart…")
+            self._chart_build_toast.start_countdown()
 
-            if self.radioButton_expense_and_income.isChecked():
-                if not expense_names and not income_names:
-                    self._show_no_data_label(
-                        self.verticalLayout_charts_content,
-                        "Please select at least one category",
-                    )
-                    return
 
-                expense_series: list[tuple[str, float]] | None = None
-                income_series: list[tuple[str, float]] | None = None
-                if expense_names:
-                    expense_series = compute_period_flow_series(
-                        transaction_rows,
-                        self.db_manager,
-                        date_from,
-                        date_to,
-                        period,
-                        expense_names,
-                        category_type=0,
-                        ctx=chart_ctx,
-                    )
-                if income_names:
-                    income_series = compute_period_flow_series(
-                        transaction_rows,
-                        self.db_manager,
-                        date_from,
-                        date_to,
-                        period,
-                        income_names,
-                        category_type=1,
-                        ctx=chart_ctx,
-                    )
-                if expense_series is None and income_series is None:
-                    self._show_no_data_label(
-                        self.verticalLayout_charts_content,
-                        "No data found for the selected period",
-                    )
-                    return
-                self._draw_expense_income_chart(expense_series, income_series, period, currency_symbol)
-                return
+def _transaction_row_cursor(row: list[Any]) -> KeysetCursor:
+    """Return the keyset cursor of a raw transaction row (`_id` at 0, `date` at 5)."""
+    return KeysetCursor.from_row(row, date_index=5, id_index=0)
 
-            if not all_names:
-                self._show_no_data_label(self.verticalLayout_charts_content, "Please select at least one category")
-                return
 
-            if self.radioButton_type_of_chart_category.isChecked():
-                category_series = compute_period_flow_by_category(
-                    transaction_rows,
-                    self.db_manager,
-                    date_from,
-                    date_to,
-                    period,
-                    all_names,
-                    ctx=chart_ctx,
-                )
-                if not category_series or all(not values for values in category_series.values()):
-                    self._show_no_data_label(
-                        self.verticalLayout_charts_content,
-                        "No data found for the selected period",
-                    )
-                    return
-                self._draw_category_chart(category_series, period, currency_symbol)
-        finally:
-            self._close_chart_build_toast()
+def _unsigned_amount_text(value: object) -> str:
+    """Return the amount text without its leading minus sign (the value edited in the table)."""
+    text = str(value)
+    return text.replace("-", "") if value and text.startswith("-") else text
 
 
 if __name__ == "__main__":
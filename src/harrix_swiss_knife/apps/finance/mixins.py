@@ -24,6 +24,7 @@ if TYPE_CHECKING:
 
     from matplotlib.axes import Axes
     from matplotlib.figure import Figure
+    from PySide6.QtCore import QAbstractItemModel
     from PySide6.QtGui import QStandardItemModel
     from PySide6.QtWidgets import QWidget
 
@@ -241,12 +242,12 @@ class AutoSaveOperations(AutoSaveMixin):
         # Exchange rates are complex to update, so we'll skip auto-save for now
         message_box.information(cast("QWidget", self), "Info", "Exchange rate auto-save not implemented yet")
 
-    def _save_transaction_data(self, model: QStandardItemModel, row: int, row_id: str) -> None:
+    def _save_transaction_data(self, model: QAbstractItemModel, row: int, row_id: str) -> None:
         """Save transaction data.
 
         Args:
 
-        - `model` (`QStandardItemModel`): The model containing the data.
+        - `model` (`QAbstractItemModel`): The model containing the data.
         - `row` (`int`): Row index.
         - `row_id` (`str`): Database ID of the row.
 
@@ -23,8 +23,12 @@ class ReportBuildContext:
 
     @classmethod
     def load(cls, db_filename: str) -> ReportBuildContext:
-        """Open the database and preload currencies and exchange rates."""
-        db_manager = DatabaseManager(db_filename)
+        """Open a pooled read-only connection and preload currencies and exchange rates.
+
+        The caller owns `db_manager` and must `close()` it in the loading thread.
+
+        """
+        db_manager = DatabaseManager(db_filename, read_only=True)
         currencies_by_code, currencies_by_id = db_manager.get_all_currencies_map()
         return cls(
             db_manager=db_manager,
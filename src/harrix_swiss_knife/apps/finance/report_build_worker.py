@@ -15,6 +15,10 @@ from harrix_swiss_knife.apps.finance.report_generators import (
     get_income_vs_expenses_report_data,
     get_monthly_summary_report_data,
 )
+from harrix_swiss_knife.apps.finance.services.report_month_cache import (
+    ReportMonthCacheStore,
+    default_report_month_cache_dir,
+)
 
 
 @dataclass(frozen=True, slots=True)
@@ -41,6 +45,7 @@ class ReportBuildWorker(QThread):
         *,
         year_start_month: int = 1,
         year_start_day: int = 1,
+        month_cache_store: ReportMonthCacheStore | None = None,
     ) -> None:
         """Initialize the worker.
 
@@ -50,6 +55,8 @@ class ReportBuildWorker(QThread):
         - `report_type` (`str`): Value from the report type list.
         - `year_start_month` (`int`): Fiscal year start month (1-12).
         - `year_start_day` (`int`): Fiscal year start day.
+        - `month_cache_store` (`ReportMonthCacheStore | None`): Closed-month fragments of the
+          Monthly Summary; the store in `data/cache/report_months` when `None`. Defaults to `None`.
 
         """
         super().__init__()
@@ -57,15 +64,17 @@ class ReportBuildWorker(QThread):
         self.report_type = report_type
         self.year_start_month = year_start_month
         self.year_start_day = year_start_day
+        self.month_cache_store = month_cache_store or ReportMonthCacheStore(default_report_month_cache_dir())
 
     def run(self) -> None:
         """Compute report data for the selected report type."""
+        ctx: ReportBuildContext | None = None
         try:
             ctx = ReportBuildContext.load(self.db_filename)
             report_type = self.report_type
 
             if report_type == "Monthly Summary":
-                headers, rows, expense_categories, _ = get_monthly_summary_report_data(ctx)
+                headers, rows, expense_categories, _ = get_monthly_summary_report_data(ctx, self.month_cache_store)
                 result = ReportBuildResult(
                     report_type=report_type,
                     headers=headers,
@@ -98,3 +107,6 @@ class ReportBuildWorker(QThread):
             self.report_completed.emit(result)
         except Exception as e:
             self.report_failed.emit(str(e))
+        finally:
+            if ctx is not None:
+                ctx.db_manager.close()
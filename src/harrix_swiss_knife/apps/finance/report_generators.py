@@ -5,6 +5,7 @@ from __future__ import annotations
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING
 
+from harrix_swiss_knife.apps.finance.services.report_month_cache import ReportMonthCacheService
 from harrix_swiss_knife.apps.finance.transaction_helpers import (
     compute_average_salary_by_year,
     get_transaction_money_op_value,
@@ -14,6 +15,7 @@ from harrix_swiss_knife.apps.finance.transaction_helpers import (
 if TYPE_CHECKING:
     from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager
     from harrix_swiss_knife.apps.finance.report_build_context import ReportBuildContext
+    from harrix_swiss_knife.apps.finance.services.report_month_cache import ReportMonthCacheStore
 
 
 def get_account_balances_report_data(
@@ -217,13 +219,19 @@ def get_income_vs_expenses_report_data(
 
 def get_monthly_summary_report_data(
     ctx: ReportBuildContext,
+    month_cache: ReportMonthCacheStore | None = None,
 ) -> tuple[
     list[str],
     list[tuple[str, float, float, dict[int, float]]],
     list[tuple[int, str, str]],
     set[int],
 ]:
-    """Build monthly summary report data (expenses by category per month)."""
+    """Build monthly summary report data (expenses by category per month).
+
+    With `month_cache`, totals of closed months whose rows and rates did not change are
+    read from the cache instead of the database; the result is the same.
+
+    """
     db_manager = ctx.db_manager
     currency_id = ctx.currency_id
     all_categories: list = db_manager.get_all_categories()
@@ -258,7 +266,11 @@ def get_monthly_summary_report_data(
     end_date: datetime = datetime.now(UTC).astimezone()
     month_names = _iter_month_keys_from_earliest(db_manager, end_date)
     monthly_data: dict[str, dict[int, float]] = {month: {} for month in month_names}
-    sql_monthly = db_manager.get_monthly_expense_totals_by_category(currency_id)
+    if month_cache is None:
+        sql_monthly = db_manager.get_monthly_expense_totals_by_category(currency_id)
+    else:
+        cache_service = ReportMonthCacheService(db_manager, month_cache)
+        sql_monthly = cache_service.monthly_expense_totals(currency_id, end_date.strftime("%Y-%m")).totals
     for month_name, category_amounts in sql_monthly.items():
         if month_name not in monthly_data:
             monthly_data[month_name] = {}
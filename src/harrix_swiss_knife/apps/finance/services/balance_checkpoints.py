@@ -0,0 +1,201 @@
+"""Persisted month-end checkpoints of the natural balance journal for the balance check.
+
+The balance check compares account balances with the journal of each currency: income
+minus expenses in that currency, minus exchange debits (`amount_from + fee`), plus
+exchange credits (`amount_to`). `BalanceCheckpointService.journal` keeps the cumulative
+journal at the end of every closed month in a `BalanceCheckpointStore` file, together with
+a checksum of the transaction and exchange rows dated in that month.
+
+A run first recomputes the per-month checksums with one grouped query, resumes from the
+last checkpoint whose month (and every earlier month) still has the same checksum, and
+reads only rows dated after it. Adding, editing or deleting a row in an old month, or
+changing a category's type, changes that month's checksum, so it and every later
+checkpoint are rebuilt.
+
+Accounts have no per-row link to transactions, so checkpoints are kept per currency.
+
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from harrix_swiss_knife.apps.finance.services.cache_files import JsonFileStore, next_month_start, row_hash_sql
+from harrix_swiss_knife.paths import get_project_root
+
+if TYPE_CHECKING:
+    from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager
+
+_CHECKPOINT_FORMAT_VERSION = 2
+
+_TRANSACTION_HASH_SQL = row_hash_sql("t._id", "t.amount", "t._id_currencies", "cat.type")
+_EXCHANGE_HASH_SQL = row_hash_sql(
+    "ce._id", "ce.amount_from", "ce.amount_to", "COALESCE(ce.fee, 0)", "ce._id_currency_from", "ce._id_currency_to"
+)
+
+_MONTH_CHECKSUMS_SQL = f"""
+    SELECT month, source, COUNT(*), SUM(amount), SUM(row_hash)
+    FROM (
+        SELECT substr(t.date, 1, 7) AS month, 'T' AS source, t.amount AS amount,
+               {_TRANSACTION_HASH_SQL} AS row_hash
+        FROM transactions t
+        JOIN categories cat ON t._id_categories = cat._id
+        JOIN currencies c ON t._id_currencies = c._id
+        UNION ALL
+        SELECT substr(ce.date, 1, 7), 'E', ce.amount_from,
+               {_EXCHANGE_HASH_SQL}
+        FROM currency_exchanges ce
+        JOIN currencies cf ON ce._id_currency_from = cf._id
+        JOIN currencies ct ON ce._id_currency_to = ct._id
+    )
+    GROUP BY month, source
+"""
+
+_MONTH_DELTAS_SQL = """
+    SELECT month, currency_id, SUM(delta)
+    FROM (
+        SELECT substr(t.date, 1, 7) AS month, t._id_currencies AS currency_id,
+               CASE WHEN cat.type = 0 THEN -t.amount ELSE t.amount END AS delta
+        FROM transactions t
+        JOIN categories cat ON t._id_categories = cat._id
+        JOIN currencies c ON t._id_currencies = c._id
+        WHERE t.date >= :date_from
+        UNION ALL
+        SELECT substr(ce.date, 1, 7), ce._id_currency_from, -(ce.amount_from + COALESCE(ce.fee, 0))
+        FROM currency_exchanges ce
+        JOIN currencies cf ON ce._id_currency_from = cf._id
+        JOIN currencies ct ON ce._id_currency_to = ct._id
+        WHERE ce.date >= :date_from
+        UNION ALL
+        SELECT substr(ce.date, 1, 7), ce._id_currency_to, ce.amount_to
+        FROM currency_exchanges ce
+        JOIN currencies cf ON ce._id_currency_from = cf._id
+        JOIN currencies ct ON ce._id_currency_to = ct._id
+        WHERE ce.date >= :date_from
+    )
+    GROUP BY month, currency_id
+"""
+
+
+class BalanceCheckpointService:
+    """Cumulative per-currency journal resumed from validated month-end checkpoints."""
+
+    def __init__(self, db: DatabaseManager, store: BalanceCheckpointStore) -> None:
+        """Wire service to a finance `DatabaseManager` and the store holding its checkpoints."""
+        self._db = db
+        self.store = store
+
+    def journal(self) -> BalanceJournal:
+        """Return the journal of every currency and refresh the stored checkpoints.
+
+        Returns:
+
+        - `BalanceJournal`: Net journal per currency in minor units, plus the month the
+          computation resumed from.
+
+        """
+        db_filename = str(getattr(self._db, "_db_filename", ""))
+        checksums = self._month_checksums()
+        months = sorted(checksums)
+        stored = self.store.load(db_filename)
+        valid = 0
+        for checkpoint, month in zip(stored, months, strict=False):
+            if checkpoint.month != month or checkpoint.checksum != checksums[month]:
+                break
+            valid += 1
+
+        base = stored[valid - 1] if valid else None
+        journal_minor: dict[int, int] = dict(base.journal_minor) if base is not None else {}
+        deltas = self._month_deltas(next_month_start(base.month) if base is not None else "")
+        checkpoints = stored[:valid]
+        current_month = datetime.now(UTC).astimezone().strftime("%Y-%m")
+        for month in months[valid:]:
+            for currency_id, delta in deltas.get(month, {}).items():
+                journal_minor[currency_id] = journal_minor.get(currency_id, 0) + delta
+            if month < current_month:
+                checkpoints.append(MonthCheckpoint(month, checksums[month], dict(journal_minor)))
+
+        if checkpoints != stored:
+            self.store.save(db_filename, checkpoints)
+        return BalanceJournal(
+            journal_minor=journal_minor,
+            resumed_from=base.month if base is not None else None,
+            months_read=len(months) - valid,
+        )
+
+    def _month_checksums(self) -> dict[str, str]:
+        checksums: dict[str, list[str]] = {}
+        for month, source, count, amount_total, hash_total in self._db.get_rows(_MONTH_CHECKSUMS_SQL):
+            checksums.setdefault(str(month), []).append(f"{source}{count}:{amount_total}:{hash_total}")
+        return {month: "|".join(sorted(parts)) for month, parts in checksums.items()}
+
+    def _month_deltas(self, date_from: str) -> dict[str, dict[int, int]]:
+        deltas: dict[str, dict[int, int]] = {}
+        for month, currency_id, delta in self._db.get_rows(_MONTH_DELTAS_SQL, {"date_from": date_from}):
+            deltas.setdefault(str(month), {})[int(currency_id)] = int(delta or 0)
+        return deltas
+
+
+class BalanceCheckpointStore(JsonFileStore):
+    """One JSON file of month-end checkpoints per finance database."""
+
+    description = "balance checkpoints"
+
+    def load(self, db_filename: str) -> list[MonthCheckpoint]:
+        """Return the checkpoints saved for `db_filename`, oldest first (empty when missing or unreadable)."""
+        return self._read_json(self._database_path(db_filename), _parse_checkpoints, list)
+
+    def save(self, db_filename: str, checkpoints: list[MonthCheckpoint]) -> None:
+        """Write `checkpoints` for `db_filename` atomically (temp file plus rename)."""
+        payload = {
+            "version": _CHECKPOINT_FORMAT_VERSION,
+            "db_filename": str(Path(db_filename).resolve()),
+            "months": [
+                {
+                    "month": checkpoint.month,
+                    "checksum": checkpoint.checksum,
+                    "journal": {str(key): value for key, value in sorted(checkpoint.journal_minor.items())},
+                }
+                for checkpoint in checkpoints
+            ],
+        }
+        self._write_json(self._database_path(db_filename), payload)
+
+
+@dataclass(frozen=True, slots=True)
+class BalanceJournal:
+    """Net journal in minor units per currency ID that has transactions or exchanges."""
+
+    journal_minor: dict[int, int]
+    resumed_from: str | None = None
+    months_read: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class MonthCheckpoint:
+    """Cumulative journal per currency at the end of `month` (`YYYY-MM`) and the checksum of its rows."""
+
+    month: str
+    checksum: str
+    journal_minor: dict[int, int] = field(default_factory=dict)
+
+
+def default_checkpoint_dir() -> Path:
+    """Return the default balance checkpoint folder (`data/cache/balance_checkpoints`)."""
+    return get_project_root() / "data" / "cache" / "balance_checkpoints"
+
+
+def _parse_checkpoints(data: Any) -> list[MonthCheckpoint]:
+    if data.get("version") != _CHECKPOINT_FORMAT_VERSION:
+        return []
+    return [
+        MonthCheckpoint(
+            month=str(item["month"]),
+            checksum=str(item["checksum"]),
+            journal_minor={int(key): int(value) for key, value in item["journal"].items()},
+        )
+        for item in data.get("months", [])
+    ]
@@ -0,0 +1,96 @@
+"""Shared pieces of the finance caches persisted under `data/cache`.
+
+`JsonFileStore` is the base of the stores that keep one JSON file per key (a database
+or a ticker) and replace it atomically on every save.
+
+`row_hash_sql` builds the per-row hash the month checksums sum in SQL. Row hashes are
+reduced modulo a prime so sums cannot overflow SQLite integers. Each row hash mixes its
+fields with a positional base and then multiplies the result by a factor derived from
+the row ID, so exchanging a field value between two rows, or between two fields of one
+row, changes the sum.
+
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+ROW_HASH_MODULUS = 2_147_483_647  # 2**31 - 1: the product of two reduced values still fits in 63 bits
+
+_FIELD_BASE = 1_000_003
+_ID_MULTIPLIER = 48_271
+
+T = TypeVar("T")
+
+
+class JsonFileStore:
+    """Directory of JSON files, each written atomically (temp file plus rename)."""
+
+    description = "cache file"
+
+    def __init__(self, directory: Path) -> None:
+        """Store files in `directory`."""
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _database_path(self, db_filename: str) -> Path:
+        """Return the file of `db_filename`: its stem plus a digest of its resolved path."""
+        resolved = Path(db_filename).resolve()
+        digest = hashlib.sha256(str(resolved).encode("utf-8")).hexdigest()[:16]
+        return self.directory / f"{resolved.stem}-{digest}.json"
+
+    def _read_json(self, path: Path, parse: Callable[[Any], T], default: Callable[[], T]) -> T:
+        """Return `parse` of the JSON in `path`, or `default()` when it is missing or unreadable."""
+        try:
+            return parse(json.loads(path.read_text(encoding="utf-8")))
+        except FileNotFoundError:
+            return default()
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            logger.warning("Ignoring unreadable %s %s", self.description, path)
+            return default()
+
+    def _write_json(self, path: Path, payload: dict[str, Any]) -> None:
+        with self._lock:
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                temp_path = path.with_suffix(".tmp")
+                temp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+                temp_path.replace(path)
+            except OSError:
+                logger.warning("Could not write %s %s", self.description, path)
+
+
+def next_month_start(month: str) -> str:
+    """Return the first day (`YYYY-MM-DD`) of the month after `month` (`YYYY-MM`)."""
+    year, month_number = (int(part) for part in month.split("-"))
+    return f"{year + month_number // 12:04d}-{month_number % 12 + 1:02d}-01"
+
+
+def row_hash_sql(id_column: str, *columns: str) -> str:
+    """Return a SQL expression hashing one row to an integer smaller than `ROW_HASH_MODULUS` in magnitude.
+
+    Args:
+
+    - `id_column` (`str`): Integer expression identifying the row (for example `t._id`).
+    - `*columns` (`str`): Integer expressions of the hashed fields, in a fixed order.
+
+    Returns:
+
+    - `str`: Expression whose sum over rows changes when a field value moves to another
+      row or another field.
+
+    """
+    fields = "0"
+    for column in columns:
+        fields = f"(({fields}) * {_FIELD_BASE} + ({column})) % {ROW_HASH_MODULUS}"
+    return f"(({fields}) * ({id_column} * {_ID_MULTIPLIER} % {ROW_HASH_MODULUS}) + {id_column}) % {ROW_HASH_MODULUS}"
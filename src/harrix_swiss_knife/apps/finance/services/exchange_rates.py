@@ -1,19 +1,140 @@
-"""Exchange rates: CRUD, queries, and short-lived rate cache for finance DB."""
+"""Exchange rates: CRUD, queries, and short-lived rate cache for finance DB.
+
+Currency conversion in report SQL reads `exchange_rate_intervals`: one row per
+currency and rate date with `[valid_from, valid_to)` covering the days that rate
+applies to (the last row is open-ended). Triggers on `exchange_rates` keep it in
+sync row by row, whichever path writes the rates; `rate_on_date_sql` builds the
+single-seek lookup used instead of correlated `MAX(date)` subqueries.
+
+Storage comes in two modes, kept in the `exchange_rates_storage` setting. `daily`
+is the legacy layout: `fill_missing_exchange_rates` inserts a copy of the previous
+rate for every day without a quote. `observed` (the default since schema version 9)
+keeps only rows where the rate changes, plus the latest row per currency as the
+"checked through" marker; every reader answers "rate on date D" as of D, so both
+layouts return the same values. Writes in `observed` mode drop rows that merely
+repeat their predecessor. Which dates were actually checked is kept separately in
+`exchange_rate_coverage` (per-currency date ranges, extended by every rate write), so
+a stretch that was never fetched still counts as missing even when rates exist on
+both sides of it.
+
+Rates are unique per currency and date (schema version 10), so every write is an
+`INSERT ... ON CONFLICT DO UPDATE`. `ingest_exchange_rates` takes a fetched series,
+diffs it against the stored rows with one query and writes the changed rows as a
+single batch in one transaction.
+
+`preload_all_rates` returns a `PreloadedExchangeRates` snapshot for bulk work in
+memory: scalar lookups bisect per-currency date lists, and `convert_many` converts
+whole columns at once with `numpy.searchsorted` over per-currency date ordinals.
+
+"""
 
 from __future__ import annotations
 
 import bisect
 import logging
+import math
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
+
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+
+    from harrix_swiss_knife.apps.common.scroll_pagination import KeysetCursor
     from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager
 
 
 logger = logging.getLogger(__name__)
 
+_UPSERT_EXCHANGE_RATE_SQL = """INSERT INTO exchange_rates (_id_currency, rate, date)
+                   VALUES (:currency_id, :rate, :date)
+                   ON CONFLICT (_id_currency, date) DO UPDATE SET rate = excluded.rate"""
+# Keeps the row with the highest `_id`, the one lookups already preferred
+_DELETE_DUPLICATE_RATE_DATES_SQL = """
+    DELETE FROM exchange_rates
+    WHERE _id NOT IN (SELECT MAX(_id) FROM exchange_rates GROUP BY _id_currency, date)
+"""
+INGEST_BATCH_SIZE = 500
+# `NaT` as an int64 day number; sorts before every real date
+DATE_ORDINAL_NAT = np.iinfo(np.int64).min
+_DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+RATE_INTERVAL_OPEN_END = "9999-12-31"
+
+EXCHANGE_RATE_STORAGE_DAILY = "daily"
+EXCHANGE_RATE_STORAGE_OBSERVED = "observed"
+EXCHANGE_RATE_STORAGE_MODES = (EXCHANGE_RATE_STORAGE_DAILY, EXCHANGE_RATE_STORAGE_OBSERVED)
+_STORAGE_SETTING_KEY = "exchange_rates_storage"
+
+_CREATE_RATE_COVERAGE_SQL = """
+    CREATE TABLE IF NOT EXISTS exchange_rate_coverage (
+        _id_currency INTEGER NOT NULL,
+        date_from TEXT NOT NULL,
+        date_to TEXT NOT NULL,
+        PRIMARY KEY (_id_currency, date_from)
+    ) WITHOUT ROWID
+"""
+_INSERT_RATE_COVERAGE_SQL = """INSERT INTO exchange_rate_coverage (_id_currency, date_from, date_to)
+                               VALUES (:currency_id, :date_from, :date_to)"""
+
+_CREATE_RATE_INTERVALS_SQL = """
+    CREATE TABLE IF NOT EXISTS exchange_rate_intervals (
+        _id_currency INTEGER NOT NULL,
+        valid_from TEXT NOT NULL,
+        valid_to TEXT NOT NULL,
+        rate REAL NOT NULL,
+        PRIMARY KEY (_id_currency, valid_to)
+    ) WITHOUT ROWID
+"""
+# Lets the sync triggers find the interval starting at a given rate date without a scan
+_CREATE_RATE_INTERVALS_FROM_INDEX_SQL = """
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_exchange_rate_intervals_currency_from
+    ON exchange_rate_intervals(_id_currency, valid_from)
+"""
+_REBUILD_RATE_INTERVALS_SQL = f"""
+    INSERT INTO exchange_rate_intervals (_id_currency, valid_from, valid_to, rate)
+    SELECT _id_currency,
+           date,
+           COALESCE(LEAD(date) OVER (PARTITION BY _id_currency ORDER BY date), '{RATE_INTERVAL_OPEN_END}'),
+           rate
+    FROM (
+        -- Latest row wins when a currency has several rates on one date
+        SELECT _id_currency, date, rate, MAX(_id) FROM exchange_rates GROUP BY _id_currency, date
+    )
+"""
+
+# Deletes rows repeating the previous rate of the same currency; the last row per
+# currency stays. All rows are judged before any is deleted, so a run of equal rates
+# collapses onto its first row.
+_COMPACT_EXCHANGE_RATES_SQL = """
+    DELETE FROM exchange_rates WHERE _id IN (
+        SELECT _id FROM (
+            SELECT _id,
+                   rate,
+                   LAG(rate) OVER w AS previous_rate,
+                   LEAD(_id) OVER w AS next_id
+            FROM exchange_rates
+            {where}
+            WINDOW w AS (PARTITION BY _id_currency ORDER BY date, _id)
+        )
+        WHERE rate = previous_rate AND next_id IS NOT NULL
+    )
+"""
+# Two distinct dates on each side of `:date`: enough context to judge the rows that
+# a write on `:date` can make redundant (its neighbours and itself)
+_COMPACT_AROUND_DATE_WHERE = f"""
+    WHERE _id_currency = :currency_id
+      AND date >= COALESCE((SELECT DISTINCT date FROM exchange_rates
+                            WHERE _id_currency = :currency_id AND date < :date
+                            ORDER BY date DESC LIMIT 1 OFFSET 1), '')
+      AND date <= COALESCE((SELECT DISTINCT date FROM exchange_rates
+                            WHERE _id_currency = :currency_id AND date > :date
+                            ORDER BY date LIMIT 1 OFFSET 1), '{RATE_INTERVAL_OPEN_END}')
+"""
+
 
 class ExchangeRatesService:
     """Exchange rate operations and caching; uses `DatabaseManager` as DB access."""
@@ -23,41 +144,58 @@ class ExchangeRatesService:
         self._db = db
         self._exchange_rate_cache: dict[str, float] = {}
         self._cache_timestamp: datetime | None = None
+        self._storage_mode: str | None = None
 
     def add_exchange_rate(self, currency_id: int, rate: float, date: str, *, invalidate_cache: bool = True) -> bool:
-        """Insert one USD-quoted rate row."""
-        query = """INSERT INTO exchange_rates (_id_currency, rate, date)
-                   VALUES (:currency_id, :rate, :date)"""
+        """Insert or replace one USD-quoted rate (in `observed` storage, drop rows it makes redundant)."""
         params = {
             "currency_id": currency_id,
             "rate": rate,
             "date": date,
         }
-        ok = self._db.execute_simple_query(query, params)
+        ok = self._db.execute_simple_query(_UPSERT_EXCHANGE_RATE_SQL, params)
+        if ok:
+            self._mark_checked(currency_id, [date])
+        if ok and self.get_storage_mode() == EXCHANGE_RATE_STORAGE_OBSERVED:
+            self.compact_exchange_rates(currency_id, around_date=date)
         if ok and invalidate_cache:
             self._invalidate_rate_cache()
         return ok
 
     def check_exchange_rate_exists(self, currency_id: int, date: str) -> bool:
-        """Return `True` if a row exists in `exchange_rates` for currency and date."""
-        rows = self._db.get_rows(
-            "SELECT COUNT(*) FROM exchange_rates WHERE _id_currency = :currency_id AND date = :date",
-            {"currency_id": currency_id, "date": date},
-        )
+        """Return `True` if the currency has a rate for `date`.
+
+        In `daily` storage that is a row dated `date`; in `observed` storage, `date`
+        inside one of the currency's checked ranges in `exchange_rate_coverage`.
+
+        """
+        if self.get_storage_mode() == EXCHANGE_RATE_STORAGE_OBSERVED:
+            query = """
+                SELECT EXISTS (
+                    SELECT 1 FROM exchange_rate_coverage
+                    WHERE _id_currency = :currency_id AND date_from <= :date AND date_to >= :date
+                )
+            """
+        else:
+            query = "SELECT COUNT(*) FROM exchange_rates WHERE _id_currency = :currency_id AND date = :date"
+        rows = self._db.get_rows(query, {"currency_id": currency_id, "date": date})
         return rows[0][0] > 0 if rows else False
 
     def clean_invalid_exchange_rates(self) -> int:
         """Delete rows with null, empty, or zero rate; return affected row count."""
-        if self._db.db is None:
-            return 0
-        query = """DELETE FROM exchange_rates WHERE rate IS NULL OR rate = '' OR rate = 0"""
-        cursor = self._db.db.exec(query)
-        if cursor.lastError().isValid():
-            logger.error("Error cleaning exchange rates: %s", cursor.lastError().text())
+        invalid_rows = self._db.get_rows(
+            "SELECT _id_currency, date FROM exchange_rates WHERE rate IS NULL OR rate = '' OR rate = 0"
+        )
+        # Through `execute_query` so the write also expires cached reads of `exchange_rates`
+        query = self._db.execute_query("""DELETE FROM exchange_rates WHERE rate IS NULL OR rate = '' OR rate = 0""")
+        if query is None:
+            logger.error("Error cleaning exchange rates")
             return 0
 
-        affected_rows = cursor.numRowsAffected()
-        cursor.clear()
+        affected_rows = query.numRowsAffected()
+        query.clear()
+        for currency_id, date in invalid_rows:
+            self._uncheck(int(currency_id), str(date), str(date))
         logger.info("Cleaned %s invalid exchange rate records", affected_rows)
         self._invalidate_rate_cache()
         return affected_rows
@@ -67,10 +205,49 @@ class ExchangeRatesService:
         self._exchange_rate_cache.clear()
         self._cache_timestamp = None
 
+    def compact_exchange_rates(self, currency_id: int | None = None, *, around_date: str | None = None) -> int:
+        """Delete rows that repeat the previous rate of their currency; return the deleted count.
+
+        Lookups are as-of, so these rows never change a result. The latest row of each
+        currency is kept as the "checked through" marker.
+
+        Args:
+
+        - `currency_id` (`int | None`): Only compact this currency. Defaults to all currencies.
+        - `around_date` (`str | None`): With `currency_id`, only judge the rows a write on
+          this date can affect. Defaults to the whole history.
+
+        Returns:
+
+        - `int`: Number of deleted rows (`0` on error).
+
+        """
+        if currency_id is None:
+            where, params = "", None
+        elif around_date is None:
+            where, params = "WHERE _id_currency = :currency_id", {"currency_id": currency_id}
+        else:
+            where = _COMPACT_AROUND_DATE_WHERE
+            params = {"currency_id": currency_id, "date": around_date}
+
+        query = self._db.execute_query(_COMPACT_EXCHANGE_RATES_SQL.format(where=where), params)
+        if query is None:
+            logger.error("Error compacting exchange rates")
+            return 0
+
+        deleted = query.numRowsAffected()
+        query.clear()
+        if deleted:
+            self._invalidate_rate_cache()
+        return deleted
+
     def delete_exchange_rate(self, rate_id: int) -> bool:
-        """Delete one `exchange_rates` row by primary key."""
+        """Delete one `exchange_rates` row by primary key; its date counts as unchecked again."""
+        rows = self._db.get_rows("SELECT _id_currency, date FROM exchange_rates WHERE _id = :id", {"id": rate_id})
         ok = self._db.execute_simple_query("DELETE FROM exchange_rates WHERE _id = :id", {"id": rate_id})
         if ok:
+            for currency_id, date in rows:
+                self._uncheck(int(currency_id), str(date), str(date))
             self._invalidate_rate_cache()
         return ok
 
@@ -86,6 +263,7 @@ class ExchangeRatesService:
 
             success = self._db.execute_simple_query(query, params)
             if success:
+                self._uncheck(None, cutoff_date, RATE_INTERVAL_OPEN_END)
                 self._invalidate_rate_cache()
                 query_obj = self._db.execute_query("SELECT changes()")
                 if query_obj and query_obj.next():
@@ -97,8 +275,80 @@ class ExchangeRatesService:
             return False, 0
         return False, 0
 
+    def ensure_rate_coverage(self) -> bool:
+        """Create `exchange_rate_coverage`; a new table is seeded with the runs of consecutive row dates.
+
+        Dates between two rows that are not on consecutive days are not assumed to have
+        been checked, so after compaction those gaps are reported missing once more.
+
+        """
+        try:
+            existed = bool(
+                self._db.get_rows(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'exchange_rate_coverage'"
+                )
+            )
+            if not self._db.execute_simple_query(_CREATE_RATE_COVERAGE_SQL):
+                return False
+            if existed:
+                return True
+            dates_by_currency: dict[int, list[str]] = {}
+            for currency_id, date_str in self._db.get_rows(
+                "SELECT DISTINCT _id_currency, date FROM exchange_rates ORDER BY _id_currency, date"
+            ):
+                dates_by_currency.setdefault(int(currency_id), []).append(str(date_str))
+            rows = [
+                {"currency_id": currency_id, "date_from": date_from, "date_to": date_to}
+                for currency_id, dates in dates_by_currency.items()
+                for date_from, date_to in _date_runs(dates)
+            ]
+            return not rows or self._db.execute_many(_INSERT_RATE_COVERAGE_SQL, rows)
+        except Exception:
+            logger.exception("Could not ensure exchange rate coverage")
+            return False
+
+    def ensure_rate_intervals(self) -> bool:
+        """Create `exchange_rate_intervals` and its sync triggers, filling it from `exchange_rates`."""
+        try:
+            statements = (
+                _CREATE_RATE_INTERVALS_SQL,
+                _CREATE_RATE_INTERVALS_FROM_INDEX_SQL,
+                *_rate_interval_trigger_sql(),
+            )
+            if not all(self._db.execute_simple_query(statement) for statement in statements):
+                return False
+            return self.rebuild_rate_intervals()
+        except Exception:
+            logger.exception("Could not ensure exchange rate intervals")
+            return False
+
+    def ensure_unique_rate_dates(self) -> bool:
+        """Drop duplicate rates per currency and date (keeping the newest row) and make the pair unique."""
+        try:
+            statements = (
+                _DELETE_DUPLICATE_RATE_DATES_SQL,
+                "DROP INDEX IF EXISTS idx_exchange_rates_currency_date",
+                "CREATE UNIQUE INDEX idx_exchange_rates_currency_date ON exchange_rates(_id_currency, date)",
+            )
+            ok = all(self._db.execute_simple_query(statement) for statement in statements)
+        except Exception:
+            logger.exception("Could not make exchange rate dates unique")
+            return False
+        if ok:
+            self._invalidate_rate_cache()
+        return ok
+
     def fill_missing_exchange_rates(self) -> int:
-        """Forward-fill missing daily rates from earliest transaction date through today."""
+        """Forward-fill missing daily rates from earliest transaction date through today.
+
+        Only stores rows in `daily` storage; `observed` storage answers those dates
+        with as-of lookups, so nothing is inserted and `0` is returned.
+
+        """
+        if self.get_storage_mode() == EXCHANGE_RATE_STORAGE_OBSERVED:
+            logger.info("Exchange rates use observed storage; missing days are resolved by as-of lookups")
+            return 0
+
         currencies = self._db.get_currencies_except_usd()
         total_filled = 0
 
@@ -130,43 +380,59 @@ class ExchangeRatesService:
             existing_rates = {row[0]: row[1] for row in rows}
             current_date = start_date
             last_known_rate = None
-            currency_filled = 0
+            missing_rows: list[dict[str, Any]] = []
 
             while current_date <= end_date:
                 date_str = current_date.strftime("%Y-%m-%d")
 
                 if date_str in existing_rates:
                     last_known_rate = existing_rates[date_str]
-                elif last_known_rate is not None and self.add_exchange_rate(
-                    currency_id, last_known_rate, date_str, invalidate_cache=False
-                ):
-                    currency_filled += 1
-                    total_filled += 1
-                    logger.debug("Filled %s for %s with rate %s", date_str, currency_code, last_known_rate)
+                elif last_known_rate is not None:
+                    missing_rows.append({"currency_id": currency_id, "rate": last_known_rate, "date": date_str})
 
                 current_date = current_date + timedelta(days=1)
 
-            logger.info("Filled %s missing dates for %s", currency_filled, currency_code)
+            if missing_rows and self._db.execute_many(_UPSERT_EXCHANGE_RATE_SQL, missing_rows):
+                self._mark_checked(currency_id, [row["date"] for row in missing_rows])
+                total_filled += len(missing_rows)
+                logger.info("Filled %s missing dates for %s", len(missing_rows), currency_code)
+            elif missing_rows:
+                logger.error("Failed to fill %s missing dates for %s", len(missing_rows), currency_code)
 
         self._invalidate_rate_cache()
         logger.info("Total filled: %s exchange rate records", total_filled)
         return total_filled
 
-    def get_all_exchange_rates(self, limit: int | None = None, offset: int = 0) -> list[list[Any]]:
-        """Return all USD-quoted rate rows joined with currency code (newest first)."""
+    def get_all_exchange_rates(
+        self,
+        limit: int | None = None,
+        offset: int = 0,
+        *,
+        after: KeysetCursor | None = None,
+    ) -> list[list[Any]]:
+        """Return all USD-quoted rate rows joined with currency code (newest first).
+
+        With `after`, rows are sought past that keyset cursor and `offset` is ignored.
+
+        """
         query = """
             SELECT er._id, 'USD', c.code, er.rate, er.date
             FROM exchange_rates er
             JOIN currencies c ON er._id_currency = c._id
-            ORDER BY er.date DESC, er._id DESC
         """
 
-        params: dict[str, Any] | None = None
+        params: dict[str, Any] = {}
+        if after is not None:
+            query += " WHERE " + after.where_clause("er.date", "er._id")
+            params.update(after.params())
+            offset = 0
+        query += " ORDER BY er.date DESC, er._id DESC"
+
         if limit is not None:
             query += " LIMIT :limit OFFSET :offset"
-            params = {"limit": limit, "offset": offset}
+            params.update({"limit": limit, "offset": offset})
 
-        rows = self._db.get_rows(query, params)
+        rows = self._db.get_rows(query, params or None)
         exchange_rate_index = 3
 
         for row in rows:
@@ -185,17 +451,31 @@ class ExchangeRatesService:
         return rows
 
     def get_currency_exchange_rate_by_date(self, currency_id: int, date: str) -> float:
-        """Return stored rate for exact currency and date (1.0 for USD or if missing)."""
+        """Return the currency's rate for `date` (1.0 for USD or if missing).
+
+        In `daily` storage the row dated `date`; in `observed` storage the rate in effect
+        on `date` when `check_exchange_rate_exists` covers it.
+
+        """
         try:
             usd_currency = self._db.get_currency_by_code("USD")
             if usd_currency and currency_id == usd_currency[0]:
                 return 1.0
 
-            query = """
-                SELECT rate FROM exchange_rates
-                WHERE _id_currency = :currency_id AND date = :date
-                LIMIT 1
-            """
+            if self.get_storage_mode() == EXCHANGE_RATE_STORAGE_OBSERVED:
+                query = """
+                    SELECT rate FROM exchange_rates
+                    WHERE _id_currency = :currency_id AND date <= :date
+                      AND EXISTS (SELECT 1 FROM exchange_rates WHERE _id_currency = :currency_id AND date >= :date)
+                    ORDER BY date DESC, _id DESC
+                    LIMIT 1
+                """
+            else:
+                query = """
+                    SELECT rate FROM exchange_rates
+                    WHERE _id_currency = :currency_id AND date = :date
+                    LIMIT 1
+                """
             params = {"currency_id": currency_id, "date": date}
 
             rows = self._db.get_rows(query, params)
@@ -240,8 +520,14 @@ class ExchangeRatesService:
         date_to: str | None = None,
         limit: int | None = None,
         offset: int = 0,
+        *,
+        after: KeysetCursor | None = None,
     ) -> list[list[Any]]:
-        """Query exchange rates with optional currency and date range filters."""
+        """Query exchange rates with optional currency and date range filters.
+
+        With `after`, rows are sought past that keyset cursor and `offset` is ignored.
+
+        """
         query = """
             SELECT er._id, 'USD', c.code, er.rate, er.date
             FROM exchange_rates er
@@ -263,6 +549,11 @@ class ExchangeRatesService:
             conditions.append("er.date <= :date_to")
             params["date_to"] = date_to
 
+        if after is not None:
+            conditions.append(after.where_clause("er.date", "er._id"))
+            params.update(after.params())
+            offset = 0
+
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
 
@@ -312,9 +603,14 @@ class ExchangeRatesService:
         return [(row[0], float(row[1])) for row in reversed(rows)] if rows else []
 
     def get_missing_exchange_rates_info(self, date_from: str, date_to: str) -> dict[int, list[str]]:
-        """Map non-USD currency ID to dates in range with no rate row (with console logging)."""
+        """Map non-USD currency ID to dates in range without a rate (with console logging).
+
+        A date has a rate as defined by `check_exchange_rate_exists` for the storage mode.
+
+        """
         missing_info: dict[int, list[str]] = {}
         currencies = self._db.get_currencies_except_usd()
+        observed_storage = self.get_storage_mode() == EXCHANGE_RATE_STORAGE_OBSERVED
 
         start_date = datetime.fromisoformat(date_from).date()
         end_date = datetime.fromisoformat(date_to).date()
@@ -328,16 +624,25 @@ class ExchangeRatesService:
         logger.info("Checking exchange rates from %s to %s (%s days)", date_from, date_to, len(all_dates))
 
         for currency_id, currency_code, _, _ in currencies:
-            query = """
-                SELECT DISTINCT date FROM exchange_rates
-                WHERE _id_currency = :currency_id
-                AND date BETWEEN :date_from AND :date_to
-                ORDER BY date
-            """
-
-            rows = self._db.get_rows(query, {"currency_id": currency_id, "date_from": date_from, "date_to": date_to})
-            existing_dates = {row[0] for row in rows}
-            missing_dates = [date_str for date_str in all_dates if date_str not in existing_dates]
+            if observed_storage:
+                checked_ranges = self._checked_ranges(currency_id)
+                missing_dates = [
+                    date_str
+                    for date_str in all_dates
+                    if not any(date_from <= date_str <= date_to for date_from, date_to in checked_ranges)
+                ]
+            else:
+                query = """
+                    SELECT DISTINCT date FROM exchange_rates
+                    WHERE _id_currency = :currency_id
+                    AND date BETWEEN :date_from AND :date_to
+                    ORDER BY date
+                """
+                rows = self._db.get_rows(
+                    query, {"currency_id": currency_id, "date_from": date_from, "date_to": date_to}
+                )
+                existing_dates = {row[0] for row in rows}
+                missing_dates = [date_str for date_str in all_dates if date_str not in existing_dates]
 
             if missing_dates:
                 logger.info("%s: %s missing rates", currency_code, len(missing_dates))
@@ -378,6 +683,14 @@ class ExchangeRatesService:
 
         return missing_info
 
+    def get_storage_mode(self) -> str:
+        """Return the `exchange_rates_storage` setting: `observed` or `daily` (when unset)."""
+        if self._storage_mode is None:
+            rows = self._db.get_rows("SELECT value FROM settings WHERE key = :key", {"key": _STORAGE_SETTING_KEY})
+            value = rows[0][0] if rows else None
+            self._storage_mode = value if value in EXCHANGE_RATE_STORAGE_MODES else EXCHANGE_RATE_STORAGE_DAILY
+        return self._storage_mode
+
     def get_usd_to_currency_rate(self, currency_id: int, date: str | None = None) -> float:
         """Return currency→USD rate (minor naming quirk); cached briefly in memory."""
         usd_currency = self._db.get_currency_by_code("USD")
@@ -429,6 +742,95 @@ class ExchangeRatesService:
             logger.exception("Error checking exchange rates data")
             return False
 
+    def ingest_exchange_rates(
+        self,
+        currency_id: int,
+        rates: Mapping[str, float] | Iterable[tuple[str, float]],
+        *,
+        min_relative_change: float = 0.0,
+        batch_size: int = INGEST_BATCH_SIZE,
+        on_batch: Callable[[int, int], None] | None = None,
+    ) -> RateIngestResult:
+        """Write a fetched rate series for one currency in a single transaction.
+
+        The series is normalized (sorted by date, last value per date wins, non-positive or
+        non-finite rates rejected), diffed against the stored rows of its date range with one
+        query, and only new dates and changed rates are upserted, in batches of `batch_size`.
+
+        Args:
+
+        - `currency_id` (`int`): Non-USD currency ID.
+        - `rates` (`Mapping[str, float] | Iterable[tuple[str, float]]`): Rates by `YYYY-MM-DD` date.
+        - `min_relative_change` (`float`): Stored rates are only replaced when they differ by more
+          than this fraction. Defaults to `0.0` (any difference).
+        - `batch_size` (`int`): Rows per upsert batch. Defaults to `500`.
+        - `on_batch` (`Callable[[int, int], None] | None`): Called after each batch with the rows
+          written so far and the total to write. Defaults to `None`.
+
+        Returns:
+
+        - `RateIngestResult`: Inserted and updated rows; `ok` is `False` if nothing was written
+          because of an error (the transaction is rolled back).
+
+        """
+        result = RateIngestResult()
+        usd_currency = self._db.get_currency_by_code("USD")
+        if usd_currency and currency_id == usd_currency[0]:
+            result.ok = False
+            return result
+
+        dates, values = _normalize_rate_series(rates, result.rejected)
+        if not dates:
+            return result
+
+        existing = {
+            str(row[0]): float(row[1])
+            for row in self._db.get_rows(
+                """SELECT date, rate FROM exchange_rates
+                   WHERE _id_currency = :currency_id AND date BETWEEN :date_from AND :date_to""",
+                {"currency_id": currency_id, "date_from": dates[0], "date_to": dates[-1]},
+            )
+        }
+        for date_str, rate in zip(dates, values, strict=True):
+            old_rate = existing.get(date_str)
+            if old_rate is None:
+                result.inserted.append((date_str, rate))
+            elif rate != old_rate and (old_rate == 0 or abs(rate - old_rate) / old_rate > min_relative_change):
+                result.updated.append((date_str, rate))
+            else:
+                result.unchanged += 1
+
+        rows = [
+            {"currency_id": currency_id, "rate": rate, "date": date_str}
+            for date_str, rate in sorted(result.inserted + result.updated)
+        ]
+        if not rows:
+            # Unchanged dates were still checked against the provider
+            self._mark_checked(currency_id, dates)
+            return result
+
+        batch_size = max(1, batch_size)
+        try:
+            with self._db.sql_transaction():
+                for start in range(0, len(rows), batch_size):
+                    if not self._db.execute_many(_UPSERT_EXCHANGE_RATE_SQL, rows[start : start + batch_size]):
+                        msg = "Exchange rate batch failed"
+                        raise RuntimeError(msg)  # noqa: TRY301
+                    if on_batch is not None:
+                        on_batch(min(start + batch_size, len(rows)), len(rows))
+                if not self._mark_checked(currency_id, dates):
+                    msg = "Exchange rate coverage update failed"
+                    raise RuntimeError(msg)  # noqa: TRY301
+                if self.get_storage_mode() == EXCHANGE_RATE_STORAGE_OBSERVED:
+                    self.compact_exchange_rates(currency_id)
+        except Exception:
+            logger.exception("Could not ingest exchange rates for currency %s", currency_id)
+            result.inserted.clear()
+            result.updated.clear()
+            result.ok = False
+        self._invalidate_rate_cache()
+        return result
+
     def preload_all_rates(self) -> PreloadedExchangeRates:
         """Load all exchange rates into memory for fast repeated lookups."""
         usd_currency = self._db.get_currency_by_code("USD")
@@ -455,6 +857,59 @@ class ExchangeRatesService:
             dated_rates=dated_rates,
         )
 
+    def rebuild_rate_intervals(self) -> bool:
+        """Recompute every row of `exchange_rate_intervals` from `exchange_rates` in one transaction.
+
+        The triggers keep the table current; this is for the initial fill and repairs.
+
+        """
+        try:
+            with self._db.sql_transaction():
+                if not self._db.execute_simple_query("DELETE FROM exchange_rate_intervals"):
+                    return False
+                return self._db.execute_simple_query(_REBUILD_RATE_INTERVALS_SQL)
+        except Exception:
+            logger.exception("Could not rebuild exchange rate intervals")
+            return False
+
+    def set_storage_mode(self, mode: str) -> bool:
+        """Store the `exchange_rates_storage` setting; switching to `observed` compacts existing rows.
+
+        Switching back to `daily` keeps the compacted rows; `fill_missing_exchange_rates`
+        restores the per-day layout.
+
+        Args:
+
+        - `mode` (`str`): `observed` or `daily`.
+
+        Returns:
+
+        - `bool`: `True` if the setting (and compaction) succeeded, `False` otherwise.
+
+        """
+        if mode not in EXCHANGE_RATE_STORAGE_MODES:
+            logger.error("Unknown exchange rate storage mode: %s", mode)
+            return False
+        try:
+            with self._db.sql_transaction():
+                if not self._db.execute_simple_query(
+                    "INSERT OR REPLACE INTO settings (key, value) VALUES (:key, :value)",
+                    {"key": _STORAGE_SETTING_KEY, "value": mode},
+                ):
+                    return False
+                self._storage_mode = mode
+                if mode == EXCHANGE_RATE_STORAGE_OBSERVED:
+                    # Record the dates the rows cover before compaction drops the repeats
+                    if not self.ensure_rate_coverage():
+                        return False
+                    deleted = self.compact_exchange_rates()
+                    logger.info("Compacted %s forward-filled exchange rate records", deleted)
+        except Exception:
+            logger.exception("Could not set exchange rate storage mode")
+            self._storage_mode = None
+            return False
+        return True
+
     def should_update_exchange_rates(self) -> bool:
         """Return `True` if any non-USD currency lacks a rate dated today."""
         try:
@@ -488,29 +943,12 @@ class ExchangeRatesService:
             if usd_currency and currency_id == usd_currency[0]:
                 return False
 
-            check_query = """
-                SELECT _id FROM exchange_rates
-                WHERE _id_currency = :currency_id AND date = :date
-                LIMIT 1
-            """
-            check_params = {"currency_id": currency_id, "date": date}
-            existing_rows = self._db.get_rows(check_query, check_params)
-
-            if existing_rows:
-                update_query = """
-                    UPDATE exchange_rates
-                    SET rate = :rate
-                    WHERE _id_currency = :currency_id AND date = :date
-                """
-                params_u = {"currency_id": currency_id, "date": date, "rate": rate}
-                ok = self._db.execute_simple_query(update_query, params_u)
-            else:
-                insert_query = """
-                    INSERT INTO exchange_rates (_id_currency, date, rate)
-                    VALUES (:currency_id, :date, :rate)
-                """
-                params_i = {"currency_id": currency_id, "date": date, "rate": rate}
-                ok = self._db.execute_simple_query(insert_query, params_i)
+            params = {"currency_id": currency_id, "date": date, "rate": rate}
+            ok = self._db.execute_simple_query(_UPSERT_EXCHANGE_RATE_SQL, params)
+            if ok:
+                self._mark_checked(currency_id, [date])
+            if ok and self.get_storage_mode() == EXCHANGE_RATE_STORAGE_OBSERVED:
+                self.compact_exchange_rates(currency_id, around_date=date)
             if ok:
                 self._invalidate_rate_cache()
         except Exception:
@@ -519,19 +957,155 @@ class ExchangeRatesService:
         else:
             return ok
 
+    def _checked_ranges(self, currency_id: int) -> list[tuple[str, str]]:
+        """Return the currency's checked `(date_from, date_to)` ranges in date order."""
+        rows = self._db.get_rows(
+            """SELECT date_from, date_to FROM exchange_rate_coverage
+               WHERE _id_currency = :currency_id ORDER BY date_from""",
+            {"currency_id": currency_id},
+        )
+        return [(str(date_from), str(date_to)) for date_from, date_to in rows]
+
     def _invalidate_rate_cache(self) -> None:
         self._exchange_rate_cache.clear()
         self._cache_timestamp = None
 
+    def _mark_checked(self, currency_id: int, dates: Iterable[str]) -> bool:
+        """Add `dates` to the currency's checked coverage, merging touching ranges."""
+        ranges = _date_runs(dates)
+        if not ranges:
+            return True
+        return self._write_checked_ranges(currency_id, _merge_date_ranges(self._checked_ranges(currency_id) + ranges))
+
+    def _uncheck(self, currency_id: int | None, date_from: str, date_to: str) -> bool:
+        """Remove `date_from..date_to` from the checked coverage of one currency (or of all when `None`)."""
+        if currency_id is None:
+            currency_ids = [
+                int(row[0]) for row in self._db.get_rows("SELECT DISTINCT _id_currency FROM exchange_rate_coverage")
+            ]
+        else:
+            currency_ids = [currency_id]
+        ok = True
+        for one_currency_id in currency_ids:
+            ranges = self._checked_ranges(one_currency_id)
+            remaining = _subtract_date_range(ranges, date_from, date_to)
+            if remaining != ranges:
+                ok = self._write_checked_ranges(one_currency_id, remaining) and ok
+        return ok
+
+    def _write_checked_ranges(self, currency_id: int, ranges: list[tuple[str, str]]) -> bool:
+        """Replace the currency's checked coverage with `ranges` in one transaction."""
+        rows = [
+            {"currency_id": currency_id, "date_from": date_from, "date_to": date_to} for date_from, date_to in ranges
+        ]
+        try:
+            with self._db.sql_transaction():
+                if not self._db.execute_simple_query(
+                    "DELETE FROM exchange_rate_coverage WHERE _id_currency = :currency_id",
+                    {"currency_id": currency_id},
+                ):
+                    return False
+                return not rows or self._db.execute_many(_INSERT_RATE_COVERAGE_SQL, rows)
+        except Exception:
+            logger.exception("Could not update exchange rate coverage for currency %s", currency_id)
+            return False
+
+
+@dataclass(slots=True)
+class RateIngestResult:
+    """Rows written by `ExchangeRatesService.ingest_exchange_rates` for one currency."""
+
+    inserted: list[tuple[str, float]] = field(default_factory=list)
+    updated: list[tuple[str, float]] = field(default_factory=list)
+    unchanged: int = 0
+    rejected: list[str] = field(default_factory=list)
+    ok: bool = True
+
+    @property
+    def written(self) -> int:
+        """Return the number of inserted plus updated rows."""
+        return len(self.inserted) + len(self.updated)
+
 
 @dataclass(frozen=True, slots=True)
 class PreloadedExchangeRates:
-    """In-memory USD-pivot exchange rates for bulk balance-check calculations."""
+    """In-memory USD-pivot exchange rates for bulk balance-check calculations.
+
+    `dated_rates` holds each currency's `(date, rate)` pairs sorted by date. They are
+    indexed once on construction: date lists for scalar `bisect` lookups, and NumPy
+    arrays of date ordinals and rates for the vectorized `convert_many`.
+
+    """
 
     has_data: bool
     usd_currency_id: int | None
     latest_rates: dict[int, float] = field(default_factory=dict)
     dated_rates: dict[int, list[tuple[str, float]]] = field(default_factory=dict)
+    _dates: dict[int, list[str]] = field(init=False, repr=False, compare=False)
+    _ordinals: dict[int, np.ndarray] = field(init=False, repr=False, compare=False)
+    _rates: dict[int, np.ndarray] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Index `dated_rates` for scalar and vectorized lookups."""
+        dates: dict[int, list[str]] = {}
+        ordinals: dict[int, np.ndarray] = {}
+        rates: dict[int, np.ndarray] = {}
+        for currency_id, series in self.dated_rates.items():
+            if not series:
+                continue
+            dates[currency_id] = [item[0] for item in series]
+            series_ordinals = date_ordinals(dates[currency_id])
+            # Unparseable stored dates cannot be placed on the ordinal axis
+            valid = series_ordinals != DATE_ORDINAL_NAT
+            ordinals[currency_id] = series_ordinals[valid]
+            rates[currency_id] = np.fromiter((item[1] for item in series), dtype=np.float64, count=len(series))[valid]
+        object.__setattr__(self, "_dates", dates)
+        object.__setattr__(self, "_ordinals", ordinals)
+        object.__setattr__(self, "_rates", rates)
+
+    def convert_many(
+        self,
+        amounts: Sequence[float] | np.ndarray,
+        currency_ids: Sequence[int] | np.ndarray,
+        dates: Sequence[str] | np.ndarray | None,
+        target_currency_id: int,
+        *,
+        latest_fallback: bool = False,
+    ) -> np.ndarray:
+        """Convert a column of amounts to `target_currency_id` at each row's date.
+
+        Row by row this equals `amount * get_exchange_rate(currency_id, target, date)`,
+        keeping the amount where the rate is `0`, like `convert_currency_amount_cached`.
+        Lookups run per distinct currency with one `searchsorted` over its rate dates.
+
+        Args:
+
+        - `amounts` (`Sequence[float] | np.ndarray`): Amounts in major units.
+        - `currency_ids` (`Sequence[int] | np.ndarray`): Currency of each amount.
+        - `dates` (`Sequence[str] | np.ndarray | None`): Rate date of each amount, as
+          accepted by `date_ordinals`; `None` uses the latest rates.
+        - `target_currency_id` (`int`): Currency to convert to.
+        - `latest_fallback` (`bool`): Retry rows whose dated rate is `1.0` with the latest
+          rates, as `ChartComputeContext.convert_amount` does. Defaults to `False`.
+
+        Returns:
+
+        - `np.ndarray`: Converted amounts as `float64`.
+
+        """
+        amount_array = np.asarray(amounts, dtype=np.float64)
+        id_array = np.asarray(currency_ids, dtype=np.int64)
+        if not self.has_data or self.usd_currency_id is None or amount_array.size == 0:
+            return amount_array.copy()
+
+        ordinals = None if dates is None else date_ordinals(dates)
+        rate = self._pair_rates(id_array, ordinals, target_currency_id)
+        if latest_fallback and ordinals is not None:
+            retry = (rate == 1.0) & (id_array != target_currency_id)
+            if retry.any():
+                rate[retry] = self._pair_rates(id_array[retry], None, target_currency_id)
+        usable = (rate != 0) & (id_array != target_currency_id)
+        return np.where(usable, amount_array * rate, amount_array)
 
     def get_exchange_rate(self, from_currency_id: int, to_currency_id: int, date: str | None = None) -> float:
         """Convert between two currencies using USD as pivot (same semantics as `ExchangeRatesService`)."""
@@ -559,11 +1133,223 @@ class PreloadedExchangeRates:
             return 1.0
         if date is None:
             return self.latest_rates.get(currency_id, 1.0)
-        series = self.dated_rates.get(currency_id)
-        if not series:
+        dates = self._dates.get(currency_id)
+        if not dates:
             return 1.0
-        dates = [item[0] for item in series]
         idx = bisect.bisect_right(dates, date) - 1
         if idx < 0:
             return 1.0
-        return series[idx][1]
+        return self.dated_rates[currency_id][idx][1]
+
+    def _pair_rates(self, currency_ids: np.ndarray, ordinals: np.ndarray | None, target: int) -> np.ndarray:
+        """Vectorized `get_exchange_rate(currency_id, target, date)` for each row."""
+        source = np.ones(currency_ids.shape, dtype=np.float64)
+        if currency_ids.size:
+            # Few distinct currencies: one sort, then each currency's rows are a contiguous slice
+            order = np.argsort(currency_ids, kind="stable")
+            sorted_ids = currency_ids[order]
+            bounds = np.flatnonzero(np.diff(sorted_ids)) + 1
+            for rows in np.split(order, bounds):
+                source[rows] = self._usd_rates(int(currency_ids[rows[0]]), None if ordinals is None else ordinals[rows])
+        if target == self.usd_currency_id:
+            rate = source
+        else:
+            target_rate = self._usd_rates(target, ordinals)
+            if ordinals is None:
+                target_rate = np.full(currency_ids.shape, target_rate)
+            usable = (source != 0) & (target_rate != 0)
+            rate = np.divide(source, target_rate, out=np.ones_like(source), where=usable)
+        rate[currency_ids == target] = 1.0
+        return rate
+
+    def _usd_rates(self, currency_id: int, ordinals: np.ndarray | None) -> np.ndarray | float:
+        """Vectorized `get_usd_to_currency_rate` of one currency; a scalar when `ordinals` is `None`."""
+        if currency_id == self.usd_currency_id:
+            return 1.0 if ordinals is None else np.ones(ordinals.shape, dtype=np.float64)
+        if ordinals is None:
+            return self.latest_rates.get(currency_id, 1.0)
+        rate_ordinals = self._ordinals.get(currency_id)
+        if rate_ordinals is None or rate_ordinals.size == 0:
+            return np.ones(ordinals.shape, dtype=np.float64)
+        positions = np.searchsorted(rate_ordinals, ordinals, side="right") - 1
+        return np.where(positions >= 0, self._rates[currency_id][positions.clip(0)], 1.0)
+
+
+def date_ordinals(dates: Sequence[str] | np.ndarray) -> np.ndarray:
+    """Return dates as `int64` day numbers (days since 1970-01-01), parsed column-wise.
+
+    `YYYY-MM-DD` strings are decoded from their bytes in a few array operations, which
+    is several times faster than NumPy's own date parsing. Longer strings are cut to
+    their first ten characters; empty or malformed dates become `DATE_ORDINAL_NAT`,
+    which sorts before every real date. `datetime64` arrays are converted and integer
+    arrays are taken as day numbers already, so callers can parse a column once.
+
+    Args:
+
+    - `dates` (`Sequence[str] | np.ndarray`): Date column.
+
+    Returns:
+
+    - `np.ndarray`: Day numbers, one per date.
+
+    """
+    if isinstance(dates, np.ndarray):
+        if dates.dtype.kind == "M":
+            return dates.astype("datetime64[D]").astype(np.int64)
+        if dates.dtype.kind in "iu":
+            return dates.astype(np.int64, copy=False)
+    try:
+        chars = np.asarray(dates, dtype="S10")
+    except UnicodeEncodeError:
+        chars = np.array([str(day)[:10].encode("ascii", "replace") for day in dates], dtype="S10")
+    codes = chars.reshape(-1).view(np.uint8).reshape(-1, 10)
+    digits = codes[:, [0, 1, 2, 3, 5, 6, 8, 9]].astype(np.int64) - ord("0")
+    well_formed = ((digits >= 0) & (digits <= 9)).all(axis=1)  # noqa: PLR2004
+    well_formed &= (codes[:, 4] == ord("-")) & (codes[:, 7] == ord("-"))
+    year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    month = digits[:, 4] * 10 + digits[:, 5]
+    day = digits[:, 6] * 10 + digits[:, 7]
+    well_formed &= (month >= 1) & (month <= 12) & (day >= 1)  # noqa: PLR2004
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month = month.clip(1, 12)
+    well_formed &= day <= _DAYS_IN_MONTH[month] + (leap & (month == 2))  # noqa: PLR2004
+    # Days from the civil date (Howard Hinnant's algorithm), March-based years
+    year -= month <= 2  # noqa: PLR2004
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * np.where(month > 2, month - 3, month + 9) + 2) // 5 + day - 1  # noqa: PLR2004
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return np.where(well_formed, era * 146_097 + day_of_era - 719_468, DATE_ORDINAL_NAT)
+
+
+def rate_on_date_sql(currency_sql: str, date_sql: str) -> str:
+    """Return a scalar subquery for the USD rate of `currency_sql` in effect on `date_sql`.
+
+    Equivalent to the rate of the latest `exchange_rates` row dated on or before the
+    date, `NULL` before the first rate. It costs one seek on the interval table's
+    primary key, and placed inside a `CASE` branch it only runs for rows that need it.
+
+    Args:
+
+    - `currency_sql` (`str`): SQL expression for the currency ID (column or parameter).
+    - `date_sql` (`str`): SQL expression for the `YYYY-MM-DD` date.
+
+    Returns:
+
+    - `str`: Parenthesized SQL expression.
+
+    """
+    return f"""(SELECT CASE WHEN ri.valid_from <= {date_sql} THEN ri.rate END
+                FROM exchange_rate_intervals ri
+                WHERE ri._id_currency = {currency_sql} AND ri.valid_to > {date_sql}
+                ORDER BY ri.valid_to LIMIT 1)"""
+
+
+def _date_runs(dates: Iterable[str]) -> list[tuple[str, str]]:
+    """Return the runs of consecutive days in `dates` as `(first, last)` pairs, in date order."""
+    runs: list[tuple[str, str]] = []
+    for date_str in sorted(set(dates)):
+        if runs and _next_day(runs[-1][1]) == date_str:
+            runs[-1] = (runs[-1][0], date_str)
+        else:
+            runs.append((date_str, date_str))
+    return runs
+
+
+def _merge_date_ranges(ranges: Iterable[tuple[str, str]]) -> list[tuple[str, str]]:
+    """Return `ranges` sorted, with overlapping or adjacent ranges joined."""
+    merged: list[tuple[str, str]] = []
+    for date_from, date_to in sorted(ranges):
+        if merged and date_from <= _next_day(merged[-1][1]):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], date_to))
+        else:
+            merged.append((date_from, date_to))
+    return merged
+
+
+def _next_day(date_str: str) -> str:
+    return (datetime.fromisoformat(date_str) + timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+def _normalize_rate_series(
+    rates: Mapping[str, float] | Iterable[tuple[str, float]], rejected: list[str]
+) -> tuple[list[str], list[float]]:
+    """Return parallel date-sorted date and rate lists; dates with unusable values go to `rejected`."""
+    items = rates.items() if isinstance(rates, Mapping) else rates
+    by_date: dict[str, float] = {}
+    for date_raw, rate_raw in items:
+        date_str = str(date_raw)[:10]
+        try:
+            datetime.strptime(date_str, "%Y-%m-%d")  # noqa: DTZ007
+            rate = float(rate_raw)
+        except (TypeError, ValueError):
+            rejected.append(str(date_raw))
+            continue
+        if not math.isfinite(rate) or rate <= 0:
+            rejected.append(date_str)
+            by_date.pop(date_str, None)
+            continue
+        by_date[date_str] = rate
+    dates = sorted(by_date)
+    return dates, [by_date[date_str] for date_str in dates]
+
+
+def _rate_interval_refresh_sql(row: str) -> str:
+    """Return trigger statements that re-derive the intervals around `row` (`NEW` or `OLD`).
+
+    Drops the interval starting at the row's date, re-points the previous interval's
+    end at the next remaining rate date, then re-inserts the interval for the date if
+    any rate still has it. Each step is an index seek, so bulk inserts stay linear.
+
+    """
+    currency = f"{row}._id_currency"
+    day = f"{row}.date"
+    next_date = f"""COALESCE(
+                (SELECT MIN(date) FROM exchange_rates WHERE _id_currency = {currency} AND date > {{after}}),
+                '{RATE_INTERVAL_OPEN_END}'
+            )"""
+    return f"""
+        DELETE FROM exchange_rate_intervals WHERE _id_currency = {currency} AND valid_from = {day};
+        UPDATE exchange_rate_intervals
+        SET valid_to = {next_date.format(after="exchange_rate_intervals.valid_from")}
+        WHERE _id_currency = {currency}
+          AND valid_from = (SELECT MAX(date) FROM exchange_rates WHERE _id_currency = {currency} AND date < {day});
+        INSERT INTO exchange_rate_intervals (_id_currency, valid_from, valid_to, rate)
+        SELECT {currency}, {day}, {next_date.format(after=day)}, rate
+        FROM exchange_rates
+        WHERE _id_currency = {currency} AND date = {day}
+        ORDER BY _id DESC
+        LIMIT 1;
+    """
+
+
+def _previous_day(date_str: str) -> str:
+    return (datetime.fromisoformat(date_str) - timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+def _rate_interval_trigger_sql() -> tuple[str, ...]:
+    return (
+        f"""CREATE TRIGGER IF NOT EXISTS trg_exchange_rates_intervals_insert
+            AFTER INSERT ON exchange_rates
+            BEGIN {_rate_interval_refresh_sql("NEW")} END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_exchange_rates_intervals_update
+            AFTER UPDATE OF _id_currency, date, rate ON exchange_rates
+            BEGIN {_rate_interval_refresh_sql("OLD")} {_rate_interval_refresh_sql("NEW")} END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_exchange_rates_intervals_delete
+            AFTER DELETE ON exchange_rates
+            BEGIN {_rate_interval_refresh_sql("OLD")} END""",
+    )
+
+
+def _subtract_date_range(ranges: list[tuple[str, str]], date_from: str, date_to: str) -> list[tuple[str, str]]:
+    """Return `ranges` without the days `date_from..date_to`."""
+    remaining: list[tuple[str, str]] = []
+    for range_from, range_to in ranges:
+        if range_to < date_from or range_from > date_to:
+            remaining.append((range_from, range_to))
+            continue
+        if range_from < date_from:
+            remaining.append((range_from, _previous_day(date_from)))
+        if range_to > date_to:
+            remaining.append((_next_day(date_to), range_to))
+    return remaining
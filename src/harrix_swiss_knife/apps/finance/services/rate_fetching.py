@@ -0,0 +1,371 @@
+"""Concurrent, cached download of daily exchange rate history for the rate updater.
+
+`RateFetchScheduler` resolves one `RateFetchRequest` per currency on a bounded
+thread pool. Each request tries its candidate tickers in order (direct quotes
+first, then inverse ones) and stops at the first ticker that has data for the
+requested dates. Provider calls are retried with exponential backoff, and the
+`should_stop` callback is polled before every call and during backoff waits.
+
+Fetched history is kept per ticker in `RateHistoryCache` (one JSON file each)
+together with the date range the provider already returned closes for, so later
+runs only ask the provider for days outside that range plus a short tail of
+recent days whose closes may still change. Requests that came back empty are not
+recorded and are asked for again.
+
+Data comes from a `RateHistoryProvider`; `YFinanceRateProvider` is the network
+implementation and tests use local fakes.
+
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any, Protocol
+
+from harrix_swiss_knife.apps.finance.services.cache_files import JsonFileStore
+from harrix_swiss_knife.paths import get_project_root
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+    from pathlib import Path
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FETCH_WORKERS = 4
+DEFAULT_FETCH_RETRIES = 3
+DEFAULT_BACKOFF_SECONDS = 0.5
+DEFAULT_TAIL_REFRESH_DAYS = 3
+
+_CANCEL_POLL_SECONDS = 0.05
+# Days without a close between two quoted days (a weekend plus a holiday) still count as one range
+_MAX_CLOSE_GAP_DAYS = 4
+_SPECIAL_TICKERS: dict[str, tuple[list[str], list[str]]] = {
+    "RUB": (["RUBUSD=X", "RUB=X"], ["USDRUB=X", "USD/RUB=X"]),
+    "EUR": (["EURUSD=X", "EUR=X"], ["USDEUR=X", "USD/EUR=X"]),
+    "CNY": (["CNYUSD=X", "CNY=X"], ["USDCNY=X", "USD/CNY=X"]),
+    "TRY": (["TRYUSD=X", "TRY=X"], ["USDTRY=X", "USD/TRY=X"]),
+    "VND": (["VNDUSD=X", "VND=X"], ["USDVND=X", "USD/VND=X"]),
+}
+
+
+class RateHistoryProvider(Protocol):
+    """Source of daily closing prices per ticker."""
+
+    def fetch_history(self, ticker: str, start: date, end: date) -> dict[str, float]:
+        """Return closes by `YYYY-MM-DD` for `start <= day <= end`; empty when the ticker has none.
+
+        Raise on transient failures (network, rate limits) so the scheduler can retry.
+
+        """
+        ...
+
+
+@dataclass(frozen=True, slots=True)
+class RateFetchRequest:
+    """Dates to fetch for one currency and the tickers to try, in order."""
+
+    currency_code: str
+    dates: list[str]
+    tickers: list[TickerCandidate]
+
+
+@dataclass(frozen=True, slots=True)
+class RateFetchResult:
+    """Currency-to-USD rates found for a request and the ticker that provided them."""
+
+    currency_code: str
+    rates: dict[str, float] = field(default_factory=dict)
+    ticker: str | None = None
+    cancelled: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class TickerCandidate:
+    """A ticker symbol; `inverse` quotes (`USDXXX=X`) are currency units per USD and get inverted."""
+
+    symbol: str
+    inverse: bool = False
+
+
+class RateFetchScheduler:
+    """Fetch rate history for many currencies concurrently, with retries, caching and cancellation."""
+
+    def __init__(
+        self,
+        provider: RateHistoryProvider,
+        *,
+        cache: RateHistoryCache | None = None,
+        max_workers: int = DEFAULT_FETCH_WORKERS,
+        retries: int = DEFAULT_FETCH_RETRIES,
+        backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+        should_stop: Callable[[], bool] | None = None,
+        on_progress: Callable[[str], None] | None = None,
+    ) -> None:
+        """Configure the scheduler.
+
+        Args:
+
+        - `provider` (`RateHistoryProvider`): Data source.
+        - `cache` (`RateHistoryCache | None`): On-disk history cache. Defaults to `None` (always fetch).
+        - `max_workers` (`int`): Requests fetched in parallel. Defaults to `4`.
+        - `retries` (`int`): Extra attempts per provider call after a failure. Defaults to `3`.
+        - `backoff_seconds` (`float`): Wait before the first retry; doubles on each retry. Defaults to `0.5`.
+        - `should_stop` (`Callable[[], bool] | None`): Polled for cancellation. Defaults to `None`.
+        - `on_progress` (`Callable[[str], None] | None`): Receives progress messages, possibly from
+          worker threads. Defaults to `None`.
+
+        """
+        self.provider = provider
+        self.cache = cache
+        self.max_workers = max(1, max_workers)
+        self.retries = max(0, retries)
+        self.backoff_seconds = backoff_seconds
+        self._should_stop = should_stop or (lambda: False)
+        self._on_progress = on_progress
+
+    def fetch(self, requests: Sequence[RateFetchRequest]) -> dict[str, RateFetchResult]:
+        """Resolve `requests` concurrently and return the results by currency code.
+
+        Requests not finished when `should_stop` turns true come back with `cancelled=True`.
+
+        """
+        results: dict[str, RateFetchResult] = {}
+        pending = [request for request in requests if request.dates]
+        if not pending:
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+            futures = {request.currency_code: executor.submit(self._fetch_request, request) for request in pending}
+            for currency_code, future in futures.items():
+                try:
+                    results[currency_code] = future.result()
+                except Exception:
+                    logger.exception("Fetching rates for %s failed", currency_code)
+                    results[currency_code] = RateFetchResult(currency_code)
+        return results
+
+    def _fetch_request(self, request: RateFetchRequest) -> RateFetchResult:
+        dates = sorted(set(request.dates))
+        start, end = date.fromisoformat(dates[0]), date.fromisoformat(dates[-1])
+        self._progress(f"📊 Fetching {request.currency_code} rates from {dates[0]} to {dates[-1]}...")
+
+        for candidate in request.tickers:
+            if self._should_stop():
+                return RateFetchResult(request.currency_code, cancelled=True)
+            history = self._ticker_history(candidate.symbol, start, end)
+            if history is None:
+                return RateFetchResult(request.currency_code, cancelled=True)
+
+            rates: dict[str, float] = {}
+            for date_str in dates:
+                close = history.get(date_str)
+                if close is not None and math.isfinite(close) and close > 0:
+                    rates[date_str] = 1.0 / close if candidate.inverse else close
+            if rates:
+                kind = "inverted" if candidate.inverse else "primary"
+                self._progress(f"✅ Found {len(rates)} rates with {candidate.symbol} ({kind})")
+                return RateFetchResult(request.currency_code, rates, candidate.symbol)
+
+        self._progress(f"❌ No valid data found for {request.currency_code} in range {dates[0]} to {dates[-1]}")
+        return RateFetchResult(request.currency_code)
+
+    def _fetch_with_retries(self, ticker: str, start: date, end: date) -> dict[str, float] | None:
+        """Return the provider's history or `None` when cancelled; re-raise the last error after all retries."""
+        delay = self.backoff_seconds
+        for attempt in range(self.retries + 1):
+            if self._should_stop():
+                return None
+            try:
+                return self.provider.fetch_history(ticker, start, end)
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                logger.debug("Retrying %s after error: %s", ticker, e)
+            if not self._wait(delay):
+                return None
+            delay *= 2
+        return None
+
+    def _progress(self, message: str) -> None:
+        if self._on_progress is not None:
+            self._on_progress(message)
+
+    def _report_failure(self, ticker: str, error: Exception) -> None:
+        if "delisted" not in str(error).lower():
+            self._progress(f"⚠️ Error with {ticker}: {str(error)[:50]}...")
+
+    def _ticker_history(self, ticker: str, start: date, end: date) -> dict[str, float] | None:
+        """Return cached plus newly fetched closes for `ticker`, or `None` when cancelled."""
+        if self.cache is None:
+            try:
+                return self._fetch_with_retries(ticker, start, end)
+            except Exception as e:
+                self._report_failure(ticker, e)
+                return {}
+
+        history = self.cache.load(ticker)
+        for gap_start, gap_end in history.missing_ranges(start, end, self.cache.tail_refresh_days):
+            try:
+                fetched = self._fetch_with_retries(ticker, gap_start, gap_end)
+            except Exception as e:
+                # Failed ranges are not recorded, so the next run asks for them again
+                self._report_failure(ticker, e)
+                break
+            if fetched is None:
+                return None
+            history.merge(gap_start, gap_end, fetched)
+        self.cache.save(history)
+        return history.closes
+
+    def _wait(self, seconds: float) -> bool:
+        """Sleep up to `seconds`; return `False` as soon as `should_stop` is set."""
+        deadline = time.monotonic() + seconds
+        while (remaining := deadline - time.monotonic()) > 0:
+            if self._should_stop():
+                return False
+            time.sleep(min(_CANCEL_POLL_SECONDS, remaining))
+        return not self._should_stop()
+
+
+class RateHistoryCache(JsonFileStore):
+    """Per-ticker JSON files with fetched closes and the date range already requested."""
+
+    description = "rate cache"
+
+    def __init__(self, directory: Path, *, tail_refresh_days: int = DEFAULT_TAIL_REFRESH_DAYS) -> None:
+        """Store cache files in `directory`; the last `tail_refresh_days` of each range are re-fetched."""
+        super().__init__(directory)
+        self.tail_refresh_days = tail_refresh_days
+
+    def load(self, ticker: str) -> TickerHistory:
+        """Return the cached history of `ticker` (empty when missing or unreadable)."""
+
+        def parse(data: Any) -> TickerHistory:
+            return TickerHistory(
+                ticker=ticker,
+                fetched_from=data.get("fetched_from"),
+                fetched_to=data.get("fetched_to"),
+                closes={str(key): float(value) for key, value in data.get("closes", {}).items()},
+            )
+
+        return self._read_json(self._path(ticker), parse, lambda: TickerHistory(ticker))
+
+    def save(self, history: TickerHistory) -> None:
+        """Write `history` atomically (temp file plus rename)."""
+        payload = {
+            "version": 1,
+            "ticker": history.ticker,
+            "fetched_from": history.fetched_from,
+            "fetched_to": history.fetched_to,
+            "closes": dict(sorted(history.closes.items())),
+        }
+        self._write_json(self._path(history.ticker), payload)
+
+    def _path(self, ticker: str) -> Path:
+        safe_name = "".join(char if char.isalnum() or char in "-_=" else "_" for char in ticker)
+        return self.directory / f"{safe_name}.json"
+
+
+@dataclass(slots=True)
+class TickerHistory:
+    """Cached closes of one ticker; `[fetched_from, fetched_to]` is the range already requested."""
+
+    ticker: str
+    fetched_from: str | None = None
+    fetched_to: str | None = None
+    closes: dict[str, float] = field(default_factory=dict)
+
+    def merge(self, start: date, end: date, closes: dict[str, float]) -> None:
+        """Record a fetch of `start..end`; the range is only extended when it stays contiguous.
+
+        Only the days between the first and last close returned for `start..end` count as
+        fetched: providers answer throttled or failed requests with no data, and those days
+        must be asked for again on the next run.
+
+        """
+        self.closes.update(closes)
+        returned = sorted(day for day in closes if start.isoformat() <= day <= end.isoformat())
+        if not returned:
+            return
+        covered_from, covered_to = date.fromisoformat(returned[0]), date.fromisoformat(returned[-1])
+        if self.fetched_from is None or self.fetched_to is None:
+            self.fetched_from, self.fetched_to = covered_from.isoformat(), covered_to.isoformat()
+            return
+        cached_from, cached_to = date.fromisoformat(self.fetched_from), date.fromisoformat(self.fetched_to)
+        max_gap = timedelta(days=_MAX_CLOSE_GAP_DAYS)
+        if covered_from <= cached_to + max_gap and covered_to >= cached_from - max_gap:
+            self.fetched_from = min(cached_from, covered_from).isoformat()
+            self.fetched_to = max(cached_to, covered_to).isoformat()
+
+    def missing_ranges(self, start: date, end: date, tail_refresh_days: int = 0) -> list[tuple[date, date]]:
+        """Return the ranges to request so that `start..end` is covered.
+
+        Days outside the cached range and its last `tail_refresh_days` are requested. Ranges
+        reach back to the cached range so it stays contiguous after `merge`.
+
+        """
+        if self.fetched_from is None or self.fetched_to is None:
+            return [(start, end)]
+        cached_from = date.fromisoformat(self.fetched_from)
+        cached_to = date.fromisoformat(self.fetched_to)
+        reliable_to = cached_to - timedelta(days=max(0, tail_refresh_days))
+        if reliable_to < cached_from:
+            return [(min(start, cached_from), max(end, cached_to))]
+        ranges: list[tuple[date, date]] = []
+        if start < cached_from:
+            ranges.append((start, cached_from - timedelta(days=1)))
+        if end > reliable_to:
+            ranges.append((reliable_to + timedelta(days=1), end))
+        return ranges
+
+
+class YFinanceRateProvider:
+    """`RateHistoryProvider` backed by `yfinance` daily history."""
+
+    def fetch_history(self, ticker: str, start: date, end: date) -> dict[str, float]:
+        """Return daily closes of `ticker` from Yahoo Finance."""
+        import pandas as pd  # noqa: PLC0415
+        import yfinance as yf  # noqa: PLC0415
+
+        hist = yf.Ticker(ticker).history(
+            start=start.isoformat(), end=(end + timedelta(days=1)).isoformat(), interval="1d"
+        )
+        if hist.empty:
+            return {}
+        closes: dict[str, float] = {}
+        for date_idx in hist.index:
+            close_price = hist.loc[date_idx, "Close"]
+            if not pd.isna(close_price) and close_price > 0:
+                closes[date_idx.strftime("%Y-%m-%d")] = float(close_price)
+        return closes
+
+
+def candidate_tickers(currency_code: str, saved_ticker: str | None = None) -> list[TickerCandidate]:
+    """Return the tickers to try for `currency_code`: the saved one, else known or generic quotes.
+
+    A saved ticker is used alone and never inverted, as the updater has always done.
+
+    """
+    if saved_ticker:
+        return [TickerCandidate(saved_ticker)]
+    primary, inverse = _SPECIAL_TICKERS.get(
+        currency_code,
+        (
+            [f"{currency_code}USD=X", f"{currency_code}/USD", f"{currency_code}USD"],
+            [f"USD{currency_code}=X", f"USD/{currency_code}", f"USD{currency_code}"],
+        ),
+    )
+    return [TickerCandidate(symbol) for symbol in primary] + [
+        TickerCandidate(symbol, inverse=True) for symbol in inverse
+    ]
+
+
+def default_cache_dir() -> Path:
+    """Return the default rate history cache folder (`data/cache/exchange_rates`)."""
+    return get_project_root() / "data" / "cache" / "exchange_rates"
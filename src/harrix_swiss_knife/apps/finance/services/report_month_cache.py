@@ -0,0 +1,247 @@
+"""Persisted per-month fragments of the Monthly Summary report.
+
+The Monthly Summary report shows expense totals per category for every month since the
+first transaction, converted to the default currency at the rate of each transaction
+date. `ReportMonthCacheService.monthly_expense_totals` keeps the totals of every closed
+month in a `ReportMonthCacheStore` file, together with a checksum of what they were
+computed from: the month's transaction rows, the exchange-rate intervals in effect during
+that month, the category types and the target currency.
+
+A run first hashes all rows dated before the current month in one pass. When that
+checksum matches the stored one, every stored month is reused and only the current month
+is read. Otherwise the per-month checksums are recomputed with grouped queries and only
+the months whose checksum changed are read again. Adding, editing or deleting a
+transaction or a rate invalidates the months it touches; changing a category's type or
+the target currency invalidates every month.
+
+"""
+
+from __future__ import annotations
+
+import hashlib
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from harrix_swiss_knife.apps.finance.services.cache_files import JsonFileStore, next_month_start, row_hash_sql
+from harrix_swiss_knife.paths import get_project_root
+
+if TYPE_CHECKING:
+    from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager
+
+_CACHE_FORMAT_VERSION = 2
+
+# Rows of every category are hashed, so no join is needed; category types are part of the context.
+_TRANSACTION_HASH_SQL = row_hash_sql("_id", "amount", "_id_currencies", "_id_categories", "substr(date, 9, 2)")
+# A date converts at the rate of the interval covering it. Intervals are contiguous per currency,
+# so a month's rates are the intervals starting in it plus, per currency, the one covering the 1st.
+_RATE_HASH_SQL = row_hash_sql("_id_currency", "substr(valid_from, 9, 2)")
+_RATE_WEIGHTED_SQL = f"rate * ({_RATE_HASH_SQL} % 1009 + 1)"
+
+_CLOSED_MONTHS_CHECKSUM_SQL = f"""
+    SELECT 'T', COUNT(*), SUM({_TRANSACTION_HASH_SQL}), NULL
+    FROM transactions
+    WHERE date < :date_to
+    UNION ALL
+    SELECT 'R', COUNT(*), SUM({_RATE_HASH_SQL}), SUM({_RATE_WEIGHTED_SQL})
+    FROM exchange_rate_intervals
+    WHERE valid_from < :date_to
+"""
+
+_MONTH_TRANSACTION_CHECKSUMS_SQL = f"""
+    SELECT substr(date, 1, 7) AS month, COUNT(*), SUM({_TRANSACTION_HASH_SQL})
+    FROM transactions
+    WHERE date < :date_to
+    GROUP BY month
+"""
+
+_MONTH_RATE_CHECKSUMS_SQL = f"""
+    SELECT substr(valid_from, 1, 7) AS month, COUNT(*), SUM({_RATE_HASH_SQL}), SUM({_RATE_WEIGHTED_SQL})
+    FROM exchange_rate_intervals
+    WHERE valid_from < :date_to
+    GROUP BY month
+"""
+
+_CARRIED_RATE_INTERVALS_SQL = """
+    SELECT _id_currency, valid_from, valid_to, rate
+    FROM exchange_rate_intervals
+    WHERE valid_from < :date_to
+      AND valid_to > substr(valid_from, 1, 8) || '32'
+      AND valid_to > date(valid_from, 'start of month', '+1 month')
+"""
+
+_CATEGORY_TYPES_SQL = f"SELECT COUNT(*), SUM({row_hash_sql('_id', 'type')}) FROM categories"
+
+
+class ReportMonthCacheService:
+    """Monthly expense totals by category, reusing stored totals of unchanged closed months."""
+
+    def __init__(self, db: DatabaseManager, store: ReportMonthCacheStore) -> None:
+        """Wire service to a finance `DatabaseManager` and the store holding its month fragments."""
+        self._db = db
+        self.store = store
+
+    def monthly_expense_totals(self, currency_id: int, current_month: str) -> ReportMonthTotals:
+        """Return expense totals per month and category and refresh the stored fragments.
+
+        Args:
+
+        - `currency_id` (`int`): Currency the totals are converted to.
+        - `current_month` (`str`): `YYYY-MM` month that is still open; it and later months
+          are always read from the database and never stored.
+
+        Returns:
+
+        - `ReportMonthTotals`: Same totals as `DatabaseManager.get_monthly_expense_totals_by_category`,
+          plus the months that had to be read from the database.
+
+        """
+        db_filename = str(getattr(self._db, "_db_filename", ""))
+        current_month_start = f"{current_month}-01"
+        context = self._context(currency_id)
+        checksum = self._closed_months_checksum(context, current_month_start)
+        cached = self.store.load(db_filename)
+        fragments = cached.fragments
+        stale: list[str] = []
+        if cached.checksum != checksum:
+            checksums = self._month_checksums(context, current_month_start)
+            fragments = {
+                month: fragment
+                for month, fragment in cached.fragments.items()
+                if checksums.get(month) == fragment.checksum
+            }
+            stale = sorted(set(checksums) - set(fragments))
+            read: dict[str, dict[int, float]] = {}
+            for date_from, date_to in _date_ranges(stale):
+                read.update(
+                    self._db.get_monthly_expense_totals_by_category(currency_id, date_from=date_from, date_to=date_to)
+                )
+            for month in stale:
+                fragments[month] = MonthFragment(checksums[month], read.get(month, {}))
+            self.store.save(db_filename, ReportMonthCache(checksum, fragments))
+
+        totals = {month: fragment.totals for month, fragment in sorted(fragments.items()) if fragment.totals}
+        open_months = self._db.get_monthly_expense_totals_by_category(currency_id, date_from=current_month_start)
+        totals.update(open_months)
+        return ReportMonthTotals(totals=totals, months_read=[*stale, *open_months])
+
+    def _closed_months_checksum(self, context: str, date_to: str) -> str:
+        rows = self._db.get_rows(_CLOSED_MONTHS_CHECKSUM_SQL, {"date_to": date_to})
+        parts = [f"{date_to}|{context}"]
+        parts.extend(f"{source}{count}:{hash_total}:{rate_total!r}" for source, count, hash_total, rate_total in rows)
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+    def _context(self, currency_id: int) -> str:
+        """Return the inputs shared by every month: target currency, conversion mode and category types."""
+        category_count, category_hash = self._db.get_rows(_CATEGORY_TYPES_SQL)[0]
+        context = f"C{currency_id}:K{category_count}:{category_hash}"
+        if self._db.exchange_rates.has_exchange_rates_data():
+            usd_currency = self._db.get_currency_by_code("USD")
+            context += f":U{usd_currency[0] if usd_currency else None}"
+        return context
+
+    def _month_checksums(self, context: str, date_to: str) -> dict[str, str]:
+        params = {"date_to": date_to}
+        transaction_parts = {
+            str(month): f"T{count}:{hash_total}"
+            for month, count, hash_total in self._db.get_rows(_MONTH_TRANSACTION_CHECKSUMS_SQL, params)
+            if month is not None
+        }
+        months = sorted(transaction_parts)
+        rate_parts: dict[str, list[str]] = {}
+        for month, count, hash_total, rate_total in self._db.get_rows(_MONTH_RATE_CHECKSUMS_SQL, params):
+            rate_parts.setdefault(str(month), []).append(f"R{count}:{hash_total}:{rate_total!r}")
+        for currency, valid_from, valid_to, rate in self._db.get_rows(_CARRIED_RATE_INTERVALS_SQL, params):
+            position = bisect_left(months, next_month_start(str(valid_from)[:7])[:7])
+            while position < len(months) and f"{months[position]}-01" < str(valid_to):
+                rate_parts.setdefault(months[position], []).append(f"S{currency}:{valid_from}:{float(rate)!r}")
+                position += 1
+
+        checksums = {}
+        for month, transaction_part in transaction_parts.items():
+            text = "|".join([context, transaction_part, *sorted(rate_parts.get(month, []))])
+            checksums[month] = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return checksums
+
+
+class ReportMonthCacheStore(JsonFileStore):
+    """One JSON file of Monthly Summary month fragments per finance database."""
+
+    description = "report month cache"
+
+    def load(self, db_filename: str) -> ReportMonthCache:
+        """Return the fragments saved for `db_filename` (empty when missing or unreadable)."""
+        return self._read_json(self._database_path(db_filename), _parse_cache, ReportMonthCache)
+
+    def save(self, db_filename: str, cache: ReportMonthCache) -> None:
+        """Write `cache` for `db_filename` atomically (temp file plus rename)."""
+        payload = {
+            "version": _CACHE_FORMAT_VERSION,
+            "db_filename": str(Path(db_filename).resolve()),
+            "checksum": cache.checksum,
+            "months": [
+                {
+                    "month": month,
+                    "checksum": fragment.checksum,
+                    "totals": {str(key): value for key, value in fragment.totals.items()},
+                }
+                for month, fragment in sorted(cache.fragments.items())
+            ],
+        }
+        self._write_json(self._database_path(db_filename), payload)
+
+
+@dataclass(frozen=True, slots=True)
+class MonthFragment:
+    """Expense totals by category ID (major units) of one closed month and the checksum of their inputs."""
+
+    checksum: str
+    totals: dict[int, float] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class ReportMonthCache:
+    """Fragments of closed `YYYY-MM` months and the checksum of all rows dated before the current month."""
+
+    checksum: str = ""
+    fragments: dict[str, MonthFragment] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class ReportMonthTotals:
+    """Expense totals by `YYYY-MM` month and category ID, and the months read from the database."""
+
+    totals: dict[str, dict[int, float]]
+    months_read: list[str] = field(default_factory=list)
+
+
+def default_report_month_cache_dir() -> Path:
+    """Return the default report month cache folder (`data/cache/report_months`)."""
+    return get_project_root() / "data" / "cache" / "report_months"
+
+
+def _date_ranges(months: list[str]) -> list[tuple[str, str]]:
+    """Return `[date_from, date_to)` ranges covering runs of consecutive sorted `YYYY-MM` months."""
+    ranges: list[tuple[str, str]] = []
+    for month in months:
+        if ranges and ranges[-1][1] == f"{month}-01":
+            ranges[-1] = (ranges[-1][0], next_month_start(month))
+        else:
+            ranges.append((f"{month}-01", next_month_start(month)))
+    return ranges
+
+
+def _parse_cache(data: Any) -> ReportMonthCache:
+    if data.get("version") != _CACHE_FORMAT_VERSION:
+        return ReportMonthCache()
+    return ReportMonthCache(
+        checksum=str(data["checksum"]),
+        fragments={
+            str(item["month"]): MonthFragment(
+                checksum=str(item["checksum"]),
+                totals={int(key): float(value) for key, value in item["totals"].items()},
+            )
+            for item in data.get("months", [])
+        },
+    )
@@ -0,0 +1,183 @@
+"""Quick Summary figures (total income/expenses, one day's expenses) from grouped SQL aggregates.
+
+`TransactionSummaryService` keeps partial sums of transaction amounts per day and per
+month, split by currency and by expense (category type `0`) vs income (any other type).
+They come from one `GROUP BY date, currency, expense` query; totals add up the month
+buckets and a day's expenses read its day bucket, so a refresh no longer walks every
+transaction in Python.
+
+Transaction writes made through `DatabaseManager` report the dates they touch with
+`track_dates`, and the next `summary` re-queries only those days and adjusts their
+months. Any other change to `transactions`, `categories` or `currencies` (a write
+not reported this way, or one made by another manager on the file) is noticed through
+the shared table generations and triggers a full reload.
+
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager
+
+# Tables whose writes can change the summary; `track_dates` accounts for transaction writes
+SUMMARY_TABLES = ("categories", "currencies", "transactions")
+
+_SUMMARY_SQL = """
+    SELECT t.date, t._id_currencies, cat.type = 0 AS is_expense, SUM(t.amount)
+    FROM transactions t
+    JOIN categories cat ON t._id_categories = cat._id
+    JOIN currencies c ON t._id_currencies = c._id
+    {where}
+    GROUP BY t.date, t._id_currencies, is_expense
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class SummaryAmount:
+    """One currency's line of a summary label, in that currency's major units."""
+
+    currency_id: int
+    code: str
+    symbol: str
+    amount: float
+
+
+@dataclass(frozen=True, slots=True)
+class TransactionSummary:
+    """Figures for the Quick Summary labels; each list is sorted by currency code without zero amounts."""
+
+    income: list[SummaryAmount]
+    expenses: list[SummaryAmount]
+    day_expenses: dict[str, list[SummaryAmount]]
+
+
+class TransactionSummaryService:
+    """Per-day and per-month transaction sums for the Quick Summary; uses `DatabaseManager` as DB access."""
+
+    def __init__(self, db: DatabaseManager) -> None:
+        """Wire service to an open finance `DatabaseManager` instance."""
+        self._db = db
+        # Date / month -> {(currency_id, is_expense): amount in minor units}
+        self._days: dict[str, dict[tuple[int, bool], int]] = {}
+        self._months: dict[str, dict[tuple[int, bool], int]] = {}
+        self._dirty_dates: set[str] = set()
+        self._generation: int | None = None
+        self.full_loads = 0
+        self.partial_loads = 0
+
+    def clear_cache(self) -> None:
+        """Drop every partial sum; the next `summary` reloads them all."""
+        self._days.clear()
+        self._months.clear()
+        self._dirty_dates.clear()
+        self._generation = None
+
+    def summary(self, dates: Iterable[str] = ()) -> TransactionSummary:
+        """Return total income and expenses per currency, plus the expenses of each of `dates`.
+
+        Args:
+
+        - `dates` (`Iterable[str]`): `YYYY-MM-DD` dates to report expenses for (e.g. today and
+          yesterday). Defaults to none.
+
+        Returns:
+
+        - `TransactionSummary`: Amounts in each transaction's own currency (no exchange rates).
+
+        """
+        self._refresh()
+        income: defaultdict[int, int] = defaultdict(int)
+        expenses: defaultdict[int, int] = defaultdict(int)
+        for bucket in self._months.values():
+            for (currency_id, is_expense), minor in bucket.items():
+                (expenses if is_expense else income)[currency_id] += minor
+        _by_code, currencies_by_id = self._db.get_all_currencies_map()
+        day_expenses = {
+            date: self._amounts(
+                {
+                    currency_id: minor
+                    for (currency_id, is_expense), minor in self._days.get(date, {}).items()
+                    if is_expense
+                },
+                currencies_by_id,
+            )
+            for date in dates
+        }
+        return TransactionSummary(
+            self._amounts(income, currencies_by_id), self._amounts(expenses, currencies_by_id), day_expenses
+        )
+
+    @contextmanager
+    def track_dates(self, *dates: str | None) -> Iterator[None]:
+        """Report that the transaction write inside the block only changes sums on `dates`.
+
+        When the sums were up to date before the write, they stay valid except for `dates`,
+        which the next `summary` re-queries. Otherwise the pending full reload stays pending.
+
+        """
+        before = self._db.data_generation(SUMMARY_TABLES)
+        try:
+            yield
+        finally:
+            if self._generation is not None and self._generation == before:
+                self._generation = self._db.data_generation(SUMMARY_TABLES)
+                self._dirty_dates.update(date for date in dates if date)
+
+    def _amounts(
+        self, minor_by_currency: dict[int, int], currencies_by_id: dict[int, tuple[str, str, str]]
+    ) -> list[SummaryAmount]:
+        amounts: list[SummaryAmount] = []
+        for currency_id, minor in minor_by_currency.items():
+            if minor == 0:
+                continue
+            code, _name, symbol = currencies_by_id.get(currency_id, (str(currency_id), "", ""))
+            amounts.append(
+                SummaryAmount(currency_id, code, symbol, self._db.convert_from_minor_units(minor, currency_id))
+            )
+        return sorted(amounts, key=lambda amount: amount.code)
+
+    def _apply_rows(self, rows: list[list[object]]) -> None:
+        for date, currency_id, is_expense, minor in rows:
+            key = (int(currency_id), bool(is_expense))
+            day = self._days.setdefault(str(date), {})
+            day[key] = day.get(key, 0) + int(minor)
+            month = self._months.setdefault(str(date)[:7], {})
+            month[key] = month.get(key, 0) + int(minor)
+
+    def _refresh(self) -> None:
+        generation = self._db.data_generation(SUMMARY_TABLES)
+        if self._generation is not None and generation == self._generation:
+            if self._dirty_dates:
+                self._reload_dates(sorted(self._dirty_dates))
+                self._dirty_dates.clear()
+            return
+        # Snapshot before reading so a concurrent write makes these sums stale, not wrong
+        self.clear_cache()
+        self._apply_rows(self._db.get_rows(_SUMMARY_SQL.format(where="")))
+        self.full_loads += 1
+        if self._db.is_database_open():
+            self._generation = generation
+
+    def _reload_dates(self, dates: list[str]) -> None:
+        for date in dates:
+            old_day = self._days.pop(date, None)
+            if old_day is None:
+                continue
+            month = self._months[date[:7]]
+            for key, minor in old_day.items():
+                month[key] -= minor
+        placeholders = ", ".join(f":d{index}" for index in range(len(dates)))
+        self._apply_rows(
+            self._db.get_rows(
+                _SUMMARY_SQL.format(where=f"WHERE t.date IN ({placeholders})"),
+                {f"d{index}": date for index, date in enumerate(dates)},
+            )
+        )
+        self.partial_loads += 1
@@ -24,11 +24,17 @@ from __future__ import annotations
 import calendar
 import logging
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import UTC, date, datetime, timedelta
 from typing import TYPE_CHECKING, Any, NamedTuple
 
+import numpy as np
+
+from harrix_swiss_knife.apps.finance.services.exchange_rates import date_ordinals
+
 if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping, Sequence
+
     from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager
     from harrix_swiss_knife.apps.finance.services.exchange_rates import PreloadedExchangeRates
 
@@ -37,6 +43,20 @@ logger = logging.getLogger(__name__)
 
 _MONTHS_PER_YEAR = 12
 
+# Same row set as `get_all_transactions` / `get_all_currency_exchanges` (inner joins on currencies)
+_CHART_TRANSACTION_COLUMNS_SQL = """
+    SELECT t._id, t.date, t.amount, t._id_currencies, t._id_categories, cat.type
+    FROM transactions t
+    JOIN categories cat ON t._id_categories = cat._id
+    JOIN currencies c ON t._id_currencies = c._id
+"""
+_CHART_EXCHANGE_COLUMNS_SQL = """
+    SELECT ce.date, ce._id_currency_from, ce._id_currency_to, ce.amount_from, ce.amount_to, COALESCE(ce.fee, 0)
+    FROM currency_exchanges ce
+    JOIN currencies cf ON ce._id_currency_from = cf._id
+    JOIN currencies ct ON ce._id_currency_to = ct._id
+"""
+
 
 @dataclass(frozen=True, slots=True)
 class ChartComputeContext:
@@ -46,12 +66,22 @@ class ChartComputeContext:
     per-transaction currency, subdivision, and exchange-rate lookups become
     in-memory operations instead of repeated SQL queries.
 
+    `load` also snapshots all transactions and exchanges as typed columns. Helpers
+    given a context with columns aggregate them with `bincount`, `cumsum` and
+    `searchsorted` and ignore their row arguments, which must then hold the same
+    data (all rows, as `get_all_transactions` returns them). A context without
+    columns (`load_references`) keeps the per-row path, which is also what the
+    transactions table formatting uses.
+
     """
 
     rates: PreloadedExchangeRates
     default_currency_id: int
     code_to_id: dict[str, int]
     id_to_subdivision: dict[int, int]
+    transactions: TransactionColumns | None = None
+    exchanges: ExchangeColumns | None = None
+    category_ids_by_name: dict[str, list[int]] = field(default_factory=dict)
 
     def convert_amount(self, amount_major: float, from_currency_id: int, to_currency_id: int, date: str) -> float:
         """Convert a major-unit amount between currencies, mirroring `convert_currency_amount`."""
@@ -64,15 +94,66 @@ class ChartComputeContext:
             return amount_major * rate
         return amount_major
 
+    def convert_many(
+        self,
+        amounts_major: Sequence[float] | np.ndarray,
+        currency_ids: Sequence[int] | np.ndarray,
+        dates: Sequence[str] | np.ndarray,
+        to_currency_id: int | None = None,
+    ) -> np.ndarray:
+        """Convert a column of major-unit amounts at once; row by row equal to `convert_amount`."""
+        target = self.default_currency_id if to_currency_id is None else to_currency_id
+        return self.rates.convert_many(amounts_major, currency_ids, dates, target, latest_fallback=True)
+
     @classmethod
     def load(cls, db_manager: DatabaseManager) -> ChartComputeContext:
-        """Preload currencies and exchange rates from an open `DatabaseManager`."""
+        """Preload currencies, exchange rates, transactions and exchanges from an open `DatabaseManager`."""
+        references = cls.load_references(db_manager)
+        rates = references.rates
+        default_currency_id = references.default_currency_id
+        id_to_subdivision = references.id_to_subdivision
+        category_ids_by_name: dict[str, list[int]] = {}
+        for category_id, name in db_manager.get_rows("SELECT _id, name FROM categories"):
+            category_ids_by_name.setdefault(str(name), []).append(int(category_id))
+
+        ids, date_strings, amount_minor, currency_ids, category_ids, category_types = db_manager.get_columns(
+            _CHART_TRANSACTION_COLUMNS_SQL, dtypes=("int64", None, "int64", "int64", "int64", "int64")
+        )
+        dates = date_ordinals(date_strings)
+        subdivisions = _subdivision_column(currency_ids, id_to_subdivision)
+        transactions = TransactionColumns(
+            ids=ids,
+            dates=dates,
+            amount_minor=amount_minor,
+            currency_ids=currency_ids,
+            category_ids=category_ids,
+            category_types=category_types,
+            amount_default=rates.convert_many(
+                amount_minor / subdivisions, currency_ids, dates, default_currency_id, latest_fallback=True
+            ),
+        )
+        exchange_columns = db_manager.get_columns(
+            _CHART_EXCHANGE_COLUMNS_SQL, dtypes=(None, "int64", "int64", "int64", "int64", "int64")
+        )
+        exchanges = ExchangeColumns(date_ordinals(exchange_columns[0]), *exchange_columns[1:])
+        return cls(
+            rates=rates,
+            default_currency_id=default_currency_id,
+            code_to_id=references.code_to_id,
+            id_to_subdivision=id_to_subdivision,
+            transactions=transactions,
+            exchanges=exchanges,
+            category_ids_by_name=category_ids_by_name,
+        )
+
+    @classmethod
+    def load_references(cls, db_manager: DatabaseManager) -> ChartComputeContext:
+        """Preload only currencies, exchange rates and the default currency (a context without columns)."""
         currencies_by_code, _ = db_manager.get_all_currencies_map()
-        code_to_id = {code: info[0] for code, info in currencies_by_code.items()}
         return cls(
             rates=db_manager.exchange_rates.preload_all_rates(),
             default_currency_id=db_manager.get_default_currency_id(),
-            code_to_id=code_to_id,
+            code_to_id={code: info[0] for code, info in currencies_by_code.items()},
             id_to_subdivision=db_manager.get_currency_subdivisions(),
         )
 
@@ -85,14 +166,65 @@ class ChartComputeContext:
             total += self.convert_amount(major, currency_id, self.default_currency_id, rate_date)
         return total
 
+    def transaction_mask(
+        self,
+        selected_category_names: set[str],
+        category_type: int | None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+    ) -> np.ndarray:
+        """Boolean mask of transaction columns matching the chart filter, like `_transaction_matches_chart_filter`."""
+        columns = self.transactions
+        if columns is None:
+            msg = "ChartComputeContext was built without transaction columns"
+            raise ValueError(msg)
+        category_ids = [
+            category_id for name in selected_category_names for category_id in self.category_ids_by_name.get(name, ())
+        ]
+        mask = np.isin(columns.category_ids, category_ids)
+        if category_type is not None:
+            mask &= columns.category_types == category_type
+        if date_from is not None:
+            mask &= columns.dates >= date_ordinals([date_from])[0]
+        if date_to is not None:
+            mask &= columns.dates <= date_ordinals([date_to])[0]
+        return mask
+
     def transaction_amount_in_default(self, row: list[Any]) -> float:
         """Signed-free amount of a transaction row converted to the default currency."""
-        amount_minor = int(row[1])
-        source_currency_id = self.code_to_id.get(row[4], 1)
-        subdivision = self.id_to_subdivision.get(source_currency_id, 100)
-        amount_major = float(amount_minor) / subdivision
+        source_currency_id, amount_major = self.transaction_amount_major(row)
         return self.convert_amount(amount_major, source_currency_id, self.default_currency_id, str(row[5]))
 
+    def transaction_amount_major(self, row: list[Any]) -> tuple[int, float]:
+        """Currency ID and major-unit amount of a transaction row, as `convert_from_minor_units` gives them."""
+        source_currency_id = self.code_to_id.get(row[4], 1)
+        return source_currency_id, float(row[1]) / self.id_to_subdivision.get(source_currency_id, 100)
+
+
+@dataclass(frozen=True, slots=True)
+class ExchangeColumns:
+    """Currency exchanges as parallel NumPy columns (dates are `date_ordinals` day numbers)."""
+
+    dates: np.ndarray
+    from_currency_ids: np.ndarray
+    to_currency_ids: np.ndarray
+    amount_from_minor: np.ndarray
+    amount_to_minor: np.ndarray
+    fee_minor: np.ndarray
+
+
+@dataclass(frozen=True, slots=True)
+class TransactionColumns:
+    """Transactions as parallel NumPy columns; `amount_default` is the amount converted on its date."""
+
+    ids: np.ndarray
+    dates: np.ndarray
+    amount_minor: np.ndarray
+    currency_ids: np.ndarray
+    category_ids: np.ndarray
+    category_types: np.ndarray
+    amount_default: np.ndarray
+
 
 class TransformTransactionDataResult(NamedTuple):
     """Result of transform_transaction_data with pagination state."""
@@ -107,6 +239,7 @@ def calculate_daily_expenses(
     rows: list[list[Any]],
     db_manager: DatabaseManager | None,
     target_currency_id: int | None = None,
+    ctx: ChartComputeContext | None = None,
 ) -> dict[str, float]:
     """Calculate daily expenses from transaction data in target or default currency.
 
@@ -119,6 +252,8 @@ def calculate_daily_expenses(
     - `rows` (`list[list[Any]]`): Raw transaction data from database.
     - `db_manager` (`DatabaseManager | None`): Database manager for currency conversion.
     - `target_currency_id` (`int | None`): Target currency ID. `None` = project default currency.
+    - `ctx` (`ChartComputeContext | None`): Preloaded currencies and rates; when given, no
+      per-row queries are made and `db_manager` is not used.
 
     Returns:
 
@@ -134,7 +269,11 @@ def calculate_daily_expenses(
 
         # Only count expenses (category_type == 0)
         if category_type == 0:
-            if db_manager:
+            if ctx is not None:
+                source_currency_id, amount_major = ctx.transaction_amount_major(row)
+                target_id = ctx.default_currency_id if target_currency_id is None else target_currency_id
+                amount = ctx.convert_amount(amount_major, source_currency_id, target_id, date)
+            elif db_manager:
                 currency_code: str = row[4]
                 currency_info = db_manager.get_currency_by_code(currency_code)
                 source_currency_id: int = currency_info[0] if currency_info else 1
@@ -355,6 +494,8 @@ def compute_balance_series(
     """Cumulative natural journal balance converted at each period-end rate."""
     if db_manager is None or not period_end_dates:
         return []
+    if ctx is not None and ctx.transactions is not None and ctx.exchanges is not None:
+        return _balance_series_from_columns(ctx, ctx.transactions, ctx.exchanges, sorted(period_end_dates))
 
     events = _merge_finance_events_ascending(transaction_rows, exchange_rows)
     journal_minor: defaultdict[int, int] = defaultdict(int)
@@ -582,9 +723,14 @@ def compute_fast_balance_check(
     currencies_by_code: dict[str, tuple[int, str, str]],
     currencies_by_id: dict[int, tuple[str, str, str]],
     target_currency_id: int | None = None,
+    *,
+    journal_minor: Mapping[int, int] | None = None,
 ) -> tuple[float, float, float, float, list[dict[str, Any]]]:
     """Fast balance reconciliation using SQL transaction totals and cached exchange math.
 
+    When `journal_minor` is given (see `get_natural_currency_reconciliation`), `transaction_rows`
+    is not read and may be empty.
+
     Returns:
 
     - `tuple[float, float, float, float, list[dict[str, Any]]]`: Accounting historical,
@@ -620,6 +766,7 @@ def compute_fast_balance_check(
         db_manager,
         currencies_by_code=currencies_by_code,
         currencies_by_id=currencies_by_id,
+        journal_minor=journal_minor,
     )
     return accounting_balance, accounts_balance, difference, accounting_balance_latest, natural_rows
 
@@ -638,6 +785,8 @@ def compute_period_flow_by_category(
         return {}
 
     buckets = iter_period_buckets(date_from, date_to, period)
+    if ctx is not None and ctx.transactions is not None:
+        return _period_flow_by_category_from_columns(ctx, ctx.transactions, buckets, sorted(selected_category_names))
     series: dict[str, list[tuple[str, float]]] = {name: [] for name in sorted(selected_category_names)}
 
     # Precompute (name, date, amount) once per matching row to avoid repeated FX lookups.
@@ -686,12 +835,8 @@ def compute_period_flow_compare_last_years(
     labels: list[str] = []
     colors: list[str] = []
 
-    # Precompute (date, amount) once per matching row; reused across every year and bucket.
-    matching: list[tuple[str, float]] = [
-        (str(row[5]), _amount_in_default(row, db_manager, ctx))
-        for row in transaction_rows
-        if _transaction_matches_chart_filter(row, selected_category_names, category_type)
-    ]
+    # Matching rows are selected and converted once; reused across every year and bucket.
+    bucket_totals = _flow_bucket_totals(transaction_rows, db_manager, selected_category_names, category_type, ctx)
 
     for i in range(years_count):
         fiscal_start = _add_calendar_years(current_fiscal_start, -i)
@@ -701,13 +846,14 @@ def compute_period_flow_compare_last_years(
 
         date_from = fiscal_start.strftime("%Y-%m-%d")
         date_to = period_end.strftime("%Y-%m-%d")
-        period_data: list[tuple[int, float, str]] = []
-        for period_index, (bucket_start, bucket_end) in enumerate(
-            iter_period_buckets(date_from, date_to, period),
-            start=1,
-        ):
-            total = sum(amount for date_str, amount in matching if bucket_start <= date_str <= bucket_end)
-            period_data.append((period_index, total, bucket_end))
+        buckets = iter_period_buckets(date_from, date_to, period)
+        period_data: list[tuple[int, float, str]] = [
+            (period_index, total, bucket_end)
+            for period_index, ((_, bucket_end), total) in enumerate(
+                zip(buckets, bucket_totals(buckets), strict=True),
+                start=1,
+            )
+        ]
 
         yearly_data.append(period_data)
 
@@ -741,18 +887,9 @@ def compute_period_flow_series(
     if db_manager is None or not selected_category_names:
         return []
 
-    # Precompute (date, amount) once per matching row to avoid repeated FX lookups per bucket.
-    matching: list[tuple[str, float]] = [
-        (str(row[5]), _amount_in_default(row, db_manager, ctx))
-        for row in transaction_rows
-        if _transaction_matches_chart_filter(row, selected_category_names, category_type)
-    ]
-
-    result: list[tuple[str, float]] = []
-    for bucket_start, bucket_end in iter_period_buckets(date_from, date_to, period):
-        total = sum(amount for date_str, amount in matching if bucket_start <= date_str <= bucket_end)
-        result.append((bucket_end, total))
-    return result
+    buckets = iter_period_buckets(date_from, date_to, period)
+    bucket_totals = _flow_bucket_totals(transaction_rows, db_manager, selected_category_names, category_type, ctx)
+    return [(bucket_end, total) for (_, bucket_end), total in zip(buckets, bucket_totals(buckets), strict=True)]
 
 
 def convert_currency_amount(
@@ -1170,6 +1307,7 @@ def get_natural_currency_reconciliation(
     *,
     currencies_by_code: dict[str, tuple[int, str, str]] | None = None,
     currencies_by_id: dict[int, tuple[str, str, str]] | None = None,
+    journal_minor: Mapping[int, int] | None = None,
 ) -> list[dict[str, Any]]:
     """Compute per-currency journal vs account balances (minor units, no FX).
 
@@ -1186,6 +1324,9 @@ def get_natural_currency_reconciliation(
     - `exchange_rows` (`list[list[Any]]`): All currency exchanges.
     - `accounts_rows` (`list[list[Any]]`): All accounts with currency ID in column 6.
     - `db_manager` (`DatabaseManager | None`): For currency codes/symbols.
+    - `journal_minor` (`Mapping[int, int] | None`): Journal per currency ID computed elsewhere
+      (e.g. by `BalanceCheckpointService`); when given, `transaction_rows` and `exchange_rows`
+      are not read. Defaults to `None`.
 
     Returns:
 
@@ -1215,7 +1356,10 @@ def get_natural_currency_reconciliation(
             return cur_db[0], cur_db[2]
         return f"#{currency_id}", ""
 
-    journal_minor: defaultdict[int, int] = defaultdict(int)
+    if journal_minor is not None:
+        return _natural_reconciliation_rows(defaultdict(int, journal_minor), accounts_rows, _currency_display)
+
+    journal: defaultdict[int, int] = defaultdict(int)
 
     for row in transaction_rows:
         if len(row) < MIN_TRANSACTION_ROW_LENGTH:
@@ -1225,9 +1369,9 @@ def get_natural_currency_reconciliation(
         currency_code: str = row[4]
         currency_id: int = _currency_id_from_code(currency_code)
         if category_type == 0:
-            journal_minor[currency_id] -= amount_minor
+            journal[currency_id] -= amount_minor
         else:
-            journal_minor[currency_id] += amount_minor
+            journal[currency_id] += amount_minor
 
     for row in exchange_rows:
         if len(row) < MIN_EXCHANGE_ROW_LENGTH:
@@ -1250,37 +1394,10 @@ def get_natural_currency_reconciliation(
             fee_minor = int(row[6] or 0)
         except (TypeError, ValueError):
             continue
-        journal_minor[from_id] -= amount_from_minor + fee_minor
-        journal_minor[to_id] += amount_to_minor
+        journal[from_id] -= amount_from_minor + fee_minor
+        journal[to_id] += amount_to_minor
 
-    accounts_minor: defaultdict[int, int] = defaultdict(int)
-    for row in accounts_rows:
-        if len(row) < MIN_ACCOUNTS_ROW_LENGTH:
-            continue
-        try:
-            cid = int(row[6])
-            bal = int(row[2])
-        except (TypeError, ValueError):
-            continue
-        accounts_minor[cid] += bal
-
-    all_ids: set[int] = set(journal_minor) | set(accounts_minor)
-    result: list[dict[str, Any]] = []
-    for currency_id in sorted(all_ids, key=lambda i: _currency_display(i)[0]):
-        code, symbol = _currency_display(currency_id)
-        jm = journal_minor[currency_id]
-        am = accounts_minor[currency_id]
-        result.append(
-            {
-                "currency_id": currency_id,
-                "code": code,
-                "symbol": symbol,
-                "journal_minor": jm,
-                "accounts_minor": am,
-                "diff_minor": am - jm,
-            }
-        )
-    return result
+    return _natural_reconciliation_rows(journal, accounts_rows, _currency_display)
 
 
 def get_natural_journal_net_minor_by_date(
@@ -1589,6 +1706,7 @@ def transform_transaction_data(
     dates_with_totals: set[str] | None = None,
     date_to_color_index: dict[str, int] | None = None,
     color_index: int = 0,
+    ctx: ChartComputeContext | None = None,
 ) -> TransformTransactionDataResult:
     """Transform transaction data for display with colors and daily totals.
 
@@ -1601,6 +1719,8 @@ def transform_transaction_data(
     - `dates_with_totals` (`set[str] | None`): Dates that already have a daily total shown.
     - `date_to_color_index` (`dict[str, int] | None`): Existing date-to-color mapping for pagination.
     - `color_index` (`int`): Next color index when extending date_to_color_index.
+    - `ctx` (`ChartComputeContext | None`): Preloaded currencies; when given, amounts are
+      converted from minor units without per-row queries.
 
     Returns:
 
@@ -1626,7 +1746,9 @@ def transform_transaction_data(
         )
 
         amount: float
-        if db_manager:
+        if ctx is not None:
+            amount = ctx.transaction_amount_major(row)[1]
+        elif db_manager:
             currency_info = db_manager.get_currency_by_code(currency_code)
             currency_id = currency_info[0] if currency_info else 1
             amount = db_manager.convert_from_minor_units(amount_cents, currency_id)
@@ -1724,6 +1846,50 @@ def _apply_natural_journal_event(
     journal_minor[to_id] += amount_to_minor
 
 
+def _balance_series_from_columns(
+    ctx: ChartComputeContext,
+    transactions: TransactionColumns,
+    exchanges: ExchangeColumns,
+    period_ends: list[str],
+) -> list[tuple[str, float]]:
+    """Vectorized `compute_balance_series`: per-currency running journal balances sampled at period ends."""
+    signed_amounts = np.where(transactions.category_types == 0, -transactions.amount_minor, transactions.amount_minor)
+    event_dates = np.concatenate((transactions.dates, exchanges.dates, exchanges.dates))
+    event_currencies = np.concatenate(
+        (transactions.currency_ids, exchanges.from_currency_ids, exchanges.to_currency_ids)
+    )
+    event_minor = np.concatenate(
+        (signed_amounts, -(exchanges.amount_from_minor + exchanges.fee_minor), exchanges.amount_to_minor)
+    )
+    end_ordinals = date_ordinals(period_ends)
+    totals = np.zeros(len(period_ends), dtype=np.float64)
+    for currency_id in np.unique(event_currencies).tolist():
+        rows = event_currencies == currency_id
+        order = np.argsort(event_dates[rows], kind="stable")
+        dates = event_dates[rows][order]
+        running_minor = np.cumsum(event_minor[rows][order])
+        positions = np.searchsorted(dates, end_ordinals, side="right")
+        balance_minor = np.where(positions > 0, running_minor[(positions - 1).clip(0)], 0)
+        balance_major = balance_minor / ctx.id_to_subdivision.get(currency_id, 100)
+        totals += ctx.convert_many(balance_major, np.full(len(period_ends), currency_id), end_ordinals)
+    return list(zip(period_ends, totals.tolist(), strict=True))
+
+
+def _bucket_positions(dates: np.ndarray, buckets: list[tuple[str, str]]) -> tuple[np.ndarray, np.ndarray]:
+    """Return each date's index among ascending inclusive `(start, end)` buckets and whether it falls in one."""
+    starts = date_ordinals([start for start, _ in buckets])
+    ends = date_ordinals([end for _, end in buckets])
+    positions = np.searchsorted(starts, dates, side="right") - 1
+    inside = (positions >= 0) & (dates <= ends[positions.clip(0)]) if buckets else np.zeros(dates.shape, dtype=bool)
+    return positions, inside
+
+
+def _bucket_totals(dates: np.ndarray, amounts: np.ndarray, buckets: list[tuple[str, str]]) -> np.ndarray:
+    """Sum `amounts` into ascending inclusive `(start, end)` date buckets."""
+    positions, inside = _bucket_positions(dates, buckets)
+    return np.bincount(positions[inside], weights=amounts[inside], minlength=len(buckets))
+
+
 def _build_cumulative_by_day_in_range(
     transaction_rows: list[list[Any]],
     db_manager: DatabaseManager,
@@ -1737,13 +1903,20 @@ def _build_cumulative_by_day_in_range(
     cumulative_data: list[tuple[int, float]] = []
     cumulative_value = 0.0
 
-    filtered_rows = [
-        row
-        for row in transaction_rows
-        if _transaction_matches_chart_filter(row, selected_category_names, category_type)
-        and date_from <= str(row[5]) <= date_to
-    ]
-    filtered_rows.sort(key=lambda row: (str(row[5]), int(row[0])))
+    if ctx is not None and ctx.transactions is not None:
+        days, values = _cumulative_from_columns(ctx, selected_category_names, category_type, date_from, date_to)
+        day_numbers = days.astype("datetime64[D]")
+        days_of_month = (day_numbers - day_numbers.astype("datetime64[M]")).astype(np.int64) + 1
+        cumulative_data = list(zip(days_of_month.tolist(), values.tolist(), strict=True))
+        filtered_rows: list[list[Any]] = []
+    else:
+        filtered_rows = [
+            row
+            for row in transaction_rows
+            if _transaction_matches_chart_filter(row, selected_category_names, category_type)
+            and date_from <= str(row[5]) <= date_to
+        ]
+        filtered_rows.sort(key=lambda row: (str(row[5]), int(row[0])))
 
     for row in filtered_rows:
         cumulative_value += _amount_in_default(row, db_manager, ctx)
@@ -1774,13 +1947,23 @@ def _build_cumulative_by_day_of_year_in_range(
     cumulative_data: list[tuple[int, float]] = []
     cumulative_value = 0.0
 
-    filtered_rows = [
-        row
-        for row in transaction_rows
-        if _transaction_matches_chart_filter(row, selected_category_names, category_type)
-        and date_from <= str(row[5]) <= date_to
-    ]
-    filtered_rows.sort(key=lambda row: (str(row[5]), int(row[0])))
+    if ctx is not None and ctx.transactions is not None:
+        days, values = _cumulative_from_columns(ctx, selected_category_names, category_type, date_from, date_to)
+        if period_start is not None:
+            day_indexes = days - date_ordinals([period_start.isoformat()])[0] + 1
+        else:
+            day_numbers = days.astype("datetime64[D]")
+            day_indexes = (day_numbers - day_numbers.astype("datetime64[Y]")).astype(np.int64) + 1
+        cumulative_data = list(zip(day_indexes.tolist(), values.tolist(), strict=True))
+        filtered_rows: list[list[Any]] = []
+    else:
+        filtered_rows = [
+            row
+            for row in transaction_rows
+            if _transaction_matches_chart_filter(row, selected_category_names, category_type)
+            and date_from <= str(row[5]) <= date_to
+        ]
+        filtered_rows.sort(key=lambda row: (str(row[5]), int(row[0])))
 
     for row in filtered_rows:
         cumulative_value += _amount_in_default(row, db_manager, ctx)
@@ -1797,6 +1980,23 @@ def _build_cumulative_by_day_of_year_in_range(
     return cumulative_data
 
 
+def _cumulative_from_columns(
+    ctx: ChartComputeContext,
+    selected_category_names: set[str],
+    category_type: int,
+    date_from: str,
+    date_to: str,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return day numbers and running totals of matching transactions in `(date, _id)` order."""
+    columns = ctx.transactions
+    if columns is None:
+        msg = "ChartComputeContext was built without transaction columns"
+        raise ValueError(msg)
+    mask = ctx.transaction_mask(selected_category_names, category_type, date_from, date_to)
+    order = np.lexsort((columns.ids[mask], columns.dates[mask]))
+    return columns.dates[mask][order], np.cumsum(columns.amount_default[mask][order])
+
+
 def _currency_id_for_code(
     code: str,
     db_manager: DatabaseManager,
@@ -1890,6 +2090,31 @@ def _exchange_fee_and_loss_signed_cached(
         return (fee_in_target, loss_in_target_signed)
 
 
+def _flow_bucket_totals(
+    transaction_rows: list[list[Any]],
+    db_manager: DatabaseManager,
+    selected_category_names: set[str],
+    category_type: int | None,
+    ctx: ChartComputeContext | None,
+) -> Callable[[list[tuple[str, str]]], list[float]]:
+    """Select and convert matching transactions once; return a function summing them per bucket."""
+    if ctx is not None and ctx.transactions is not None:
+        mask = ctx.transaction_mask(selected_category_names, category_type)
+        dates, amounts = ctx.transactions.dates[mask], ctx.transactions.amount_default[mask]
+        return lambda buckets: _bucket_totals(dates, amounts, buckets).tolist()
+
+    # Precompute (date, amount) once per matching row to avoid repeated FX lookups per bucket.
+    matching: list[tuple[str, float]] = [
+        (str(row[5]), _amount_in_default(row, db_manager, ctx))
+        for row in transaction_rows
+        if _transaction_matches_chart_filter(row, selected_category_names, category_type)
+    ]
+    return lambda buckets: [
+        sum(amount for date_str, amount in matching if bucket_start <= date_str <= bucket_end)
+        for bucket_start, bucket_end in buckets
+    ]
+
+
 def _fiscal_year_end(fiscal_start: date) -> date:
     return _add_calendar_years(fiscal_start, 1) - timedelta(days=1)
 
@@ -1984,10 +2209,77 @@ def _natural_minor_to_default_major(
     return total
 
 
+def _natural_reconciliation_rows(
+    journal_minor: defaultdict[int, int],
+    accounts_rows: list[list[Any]],
+    currency_display: Callable[[int], tuple[str, str]],
+) -> list[dict[str, Any]]:
+    """Pair each currency's journal with its accounts total for `get_natural_currency_reconciliation`."""
+    accounts_minor: defaultdict[int, int] = defaultdict(int)
+    for row in accounts_rows:
+        if len(row) < MIN_ACCOUNTS_ROW_LENGTH:
+            continue
+        try:
+            cid = int(row[6])
+            bal = int(row[2])
+        except (TypeError, ValueError):
+            continue
+        accounts_minor[cid] += bal
+
+    all_ids: set[int] = set(journal_minor) | set(accounts_minor)
+    result: list[dict[str, Any]] = []
+    for currency_id in sorted(all_ids, key=lambda i: currency_display(i)[0]):
+        code, symbol = currency_display(currency_id)
+        jm = journal_minor[currency_id]
+        am = accounts_minor[currency_id]
+        result.append(
+            {
+                "currency_id": currency_id,
+                "code": code,
+                "symbol": symbol,
+                "journal_minor": jm,
+                "accounts_minor": am,
+                "diff_minor": am - jm,
+            }
+        )
+    return result
+
+
+def _period_flow_by_category_from_columns(
+    ctx: ChartComputeContext,
+    columns: TransactionColumns,
+    buckets: list[tuple[str, str]],
+    names: list[str],
+) -> dict[str, list[tuple[str, float]]]:
+    """Vectorized `compute_period_flow_by_category`: one `bincount` over (category, bucket) cells."""
+    name_index = np.full(int(columns.category_ids.max(initial=0)) + 1, -1, dtype=np.int64)
+    for index, name in enumerate(names):
+        ids = [category_id for category_id in ctx.category_ids_by_name.get(name, ()) if category_id < name_index.size]
+        name_index[ids] = index
+    rows = name_index[columns.category_ids]
+    positions, inside = _bucket_positions(columns.dates, buckets)
+    inside &= rows >= 0
+    cells = rows[inside] * len(buckets) + positions[inside]
+    totals = np.bincount(cells, weights=columns.amount_default[inside], minlength=len(names) * len(buckets))
+    bucket_ends = [bucket_end for _, bucket_end in buckets]
+    return {
+        name: list(zip(bucket_ends, totals[index * len(buckets) : (index + 1) * len(buckets)].tolist(), strict=True))
+        for index, name in enumerate(names)
+    }
+
+
 def _parse_iso_date(date_str: str) -> date:
     return date.fromisoformat(date_str)
 
 
+def _subdivision_column(currency_ids: np.ndarray, id_to_subdivision: dict[int, int]) -> np.ndarray:
+    """Return the subdivision of each row's currency (`100` when unknown) as `float64`."""
+    subdivisions = np.full(currency_ids.shape, 100.0)
+    for currency_id, subdivision in id_to_subdivision.items():
+        subdivisions[currency_ids == currency_id] = subdivision
+    return subdivisions
+
+
 def _transaction_amount_in_default(
     row: list[Any],
     db_manager: DatabaseManager,
@@ -0,0 +1,146 @@
+"""Transactions table pages formatted without per-row database lookups.
+
+`transform_transaction_data` and `calculate_daily_expenses` used to ask the database for
+the currency ID, subdivision and exchange rate of every row. `TransactionPageFormatter`
+resolves that reference data once per data generation into a `ChartComputeContext`
+(`load_references`) and formats each fetched page in one pass over in-memory maps.
+
+Formatted pages are kept in a small LRU keyed by the IDs of the page rows and the page
+they were appended to, so reloading the same first page (after a tab switch or a reset
+filter) or scrolling through the same pages again reuses them. Any write the
+`DatabaseManager.data_generation` token watches drops every cached page and the
+reference maps.
+
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from harrix_swiss_knife.apps.finance.transaction_helpers import (
+    ChartComputeContext,
+    calculate_daily_expenses,
+    transform_transaction_data,
+)
+
+if TYPE_CHECKING:
+    from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager
+
+DEFAULT_MAX_CACHED_PAGES = 32
+
+
+class TransactionPageFormatter:
+    """Format transaction rows for the table from preloaded reference data, caching formatted pages.
+
+    Meant to be used from the UI thread only.
+
+    """
+
+    def __init__(self, date_colors: list[Any], max_pages: int = DEFAULT_MAX_CACHED_PAGES) -> None:
+        """Color days with `date_colors` and keep up to `max_pages` formatted pages."""
+        self.date_colors = date_colors
+        self.max_pages = max(0, max_pages)
+        self.hits = 0
+        self.misses = 0
+        self.reference_loads = 0
+        self._db: DatabaseManager | None = None
+        self._generation: int | None = None
+        self._context: ChartComputeContext | None = None
+        self._pages: OrderedDict[tuple[int | None, tuple[int, ...]], FormattedTransactionPage] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached pages."""
+        return len(self._pages)
+
+    def clear(self) -> None:
+        """Drop cached pages and reference maps (counters are kept)."""
+        self._pages.clear()
+        self._context = None
+        self._generation = None
+
+    def format_page(
+        self,
+        db_manager: DatabaseManager,
+        rows: list[list[Any]],
+        previous: FormattedTransactionPage | None = None,
+    ) -> FormattedTransactionPage:
+        """Return display rows for `rows`, continuing the colors and daily totals of `previous`.
+
+        Args:
+
+        - `db_manager` (`DatabaseManager`): Open database the rows were fetched from.
+        - `rows` (`list[list[Any]]`): Raw transaction rows (`get_filtered_transactions` layout).
+        - `previous` (`FormattedTransactionPage | None`): Page the rows are appended to, or
+          `None` for a first page.
+
+        Returns:
+
+        - `FormattedTransactionPage`: Same rows and pagination state as `transform_transaction_data`
+          with daily expenses from `calculate_daily_expenses` gives.
+
+        """
+        self._observe_generation(db_manager)
+        key = (previous.token if previous is not None else None, tuple(int(row[0]) for row in rows))
+        page = self._pages.get(key)
+        if page is not None:
+            self._pages.move_to_end(key)
+            self.hits += 1
+            return page
+
+        self.misses += 1
+        ctx = self._reference_context(db_manager)
+        result = transform_transaction_data(
+            rows,
+            calculate_daily_expenses(rows, db_manager, ctx=ctx),
+            self.date_colors,
+            db_manager,
+            dates_with_totals=previous.dates_with_totals if previous is not None else None,
+            date_to_color_index=previous.date_to_color_index if previous is not None else None,
+            color_index=previous.color_index if previous is not None else 0,
+            ctx=ctx,
+        )
+        page = FormattedTransactionPage(
+            token=hash(key),
+            rows=result.rows,
+            dates_with_totals=result.dates_with_totals,
+            date_to_color_index=result.date_to_color_index,
+            color_index=result.color_index,
+        )
+        if self.max_pages:
+            self._pages[key] = page
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        return page
+
+    def _observe_generation(self, db_manager: DatabaseManager) -> None:
+        """Drop pages and reference maps when the database or its data generation changed."""
+        generation = db_manager.data_generation()
+        if db_manager is self._db and generation == self._generation:
+            return
+        self.clear()
+        self._db = db_manager
+        self._generation = generation
+
+    def _reference_context(self, db_manager: DatabaseManager) -> ChartComputeContext:
+        if self._context is None:
+            self._context = ChartComputeContext.load_references(db_manager)
+            self.reference_loads += 1
+        return self._context
+
+
+@dataclass(frozen=True, slots=True)
+class FormattedTransactionPage:
+    """Display rows of one transactions page and the color/total state after it.
+
+    `token` identifies the page together with every page before it; the state objects are
+    shared with the cache and must not be mutated.
+
+    """
+
+    token: int
+    rows: list[list[Any]]
+    dates_with_totals: set[str] = field(default_factory=set)
+    date_to_color_index: dict[str, int] = field(default_factory=dict)
+    color_index: int = 0
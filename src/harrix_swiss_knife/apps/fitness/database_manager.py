@@ -5,9 +5,13 @@ from __future__ import annotations
 import logging
 from collections import Counter
 from datetime import UTC, datetime
-from typing import Any, NoReturn
+from typing import TYPE_CHECKING, Any, NoReturn
 
 from harrix_swiss_knife.apps.common.qt_database_manager_base import QtSqliteDatabaseManagerBase
+from harrix_swiss_knife.apps.common.schema_migrations import SchemaMigration
+
+if TYPE_CHECKING:
+    from harrix_swiss_knife.apps.common.scroll_pagination import KeysetCursor
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +39,7 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
 
         """
         super().__init__(prefix="fitness_db", db_filename=db_filename)
-        self._ensure_name_local_columns()
+        self.migrate_schema()
 
     def add_exercise(
         self,
@@ -750,6 +754,8 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
         date_to: str | None = None,
         limit: int | None = None,
         offset: int = 0,
+        *,
+        after: KeysetCursor | None = None,
     ) -> list[list[Any]]:
         """Get filtered process records.
 
@@ -761,6 +767,8 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
         - `date_to` (`str | None`): Filter to date (YYYY-MM-DD). Defaults to `None`.
         - `limit` (`int | None`): Limit number of records. Defaults to `None` (no limit).
         - `offset` (`int`): Number of records to skip. Defaults to `0`.
+        - `after` (`KeysetCursor | None`): Keyset cursor; when given, return rows after it
+          instead of skipping `offset` rows. Defaults to `None`.
 
         Returns:
 
@@ -783,6 +791,11 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
             params["date_from"] = date_from
             params["date_to"] = date_to
 
+        if after is not None:
+            conditions.append(after.where_clause("p.date", "p._id"))
+            params.update(after.params())
+            offset = 0
+
         query_text = """
             SELECT p._id,
                 e.name,
@@ -1005,37 +1018,28 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
                 return None
         return None
 
-    def get_limited_process_records(self, limit: int = 5000, offset: int = 0) -> list[list[Any]]:
+    def get_limited_process_records(
+        self,
+        limit: int = 5000,
+        offset: int = 0,
+        *,
+        after: KeysetCursor | None = None,
+    ) -> list[list[Any]]:
         r"""Get limited number of process records with exercise and type names.
 
         Args:
 
         - `limit` (`int`): Maximum number of records to return. Defaults to `5000`.
         - `offset` (`int`): Number of records to skip. Defaults to `0`.
+        - `after` (`KeysetCursor | None`): Keyset cursor; when given, return rows after it
+          instead of skipping `offset` rows. Defaults to `None`.
 
         Returns:
 
         - `list[list[Any]]`: List of process records [\_id, exercise_name, type_name, value, unit, date].
 
         """
-        return self.get_rows(
-            """
-            SELECT p._id,
-                e.name,
-                IFNULL(t.type, ''),
-                p.value,
-                e.unit,
-                p.date
-            FROM process p
-            JOIN exercises e ON p._id_exercises = e._id
-            LEFT JOIN types t
-                ON p._id_types = t._id
-                AND t._id_exercises = e._id
-            ORDER BY p.date DESC, p._id DESC
-            LIMIT :limit OFFSET :offset
-        """,
-            {"limit": limit, "offset": offset},
-        )
+        return self.get_filtered_process_records(limit=limit, offset=offset, after=after)
 
     def get_sets_chart_data(self, date_from: str, date_to: str) -> list[tuple[str, int]]:
         """Get sets (workout count) data for charting.
@@ -1317,18 +1321,34 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
         params = {"v": value, "d": date, "id": record_id}
         return self.execute_simple_query(query, params)
 
-    def _ensure_name_local_columns(self) -> None:
+    def _ensure_name_local_columns(self) -> bool:
         """Ensure `name_local` exists on `exercises` and `types`."""
-        self._ensure_table_text_column("exercises", "name_local")
-        self._ensure_table_text_column("types", "name_local")
+        exercises_ok = self._ensure_table_text_column("exercises", "name_local")
+        types_ok = self._ensure_table_text_column("types", "name_local")
+        return exercises_ok and types_ok
 
-    def _ensure_table_text_column(self, table_name: str, column_name: str) -> None:
+    def _ensure_performance_indexes(self) -> bool:
+        """Create indexes for per-exercise lookups and date-ordered `process` / `weight` queries."""
+        try:
+            return all(
+                self.execute_simple_query(statement)
+                for statement in (
+                    "CREATE INDEX IF NOT EXISTS idx_process_exercise_date ON process(_id_exercises, _id_types, date)",
+                    "CREATE INDEX IF NOT EXISTS idx_process_date ON process(date)",
+                    "CREATE INDEX IF NOT EXISTS idx_weight_date ON weight(date)",
+                )
+            )
+        except Exception:
+            logger.exception("Could not ensure performance indexes")
+            return False
+
+    def _ensure_table_text_column(self, table_name: str, column_name: str) -> bool:
         """Add a TEXT column when missing (`exercises` / `types` only)."""
         allowed_tables = {"exercises", "types"}
         allowed_columns = {"name_local"}
         if table_name not in allowed_tables or column_name not in allowed_columns:
             logger.error("Refusing to alter unexpected table/column: %s.%s", table_name, column_name)
-            return
+            return False
         try:
             columns = {
                 str(row[1])
@@ -1336,11 +1356,21 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
                 if row and len(row) > 1 and row[1] is not None
             }
             if column_name in columns:
-                return
+                return True
             if not self.execute_simple_query(f"ALTER TABLE {table_name} ADD COLUMN {column_name} TEXT"):
                 logger.error("Failed to add %s.%s column", table_name, column_name)
+                return False
         except Exception:
             logger.exception("Could not ensure %s.%s column", table_name, column_name)
+            return False
+        return True
+
+    def _schema_migrations(self) -> list[SchemaMigration]:
+        """Return fitness schema migrations; versions are stamped into `PRAGMA user_version`."""
+        return [
+            SchemaMigration(1, "exercises/types name_local columns", self._ensure_name_local_columns),
+            SchemaMigration(2, "process/weight performance indexes", self._ensure_performance_indexes),
+        ]
 
 
 def _raise_runtime_error(message: str) -> NoReturn:
@@ -90,7 +90,8 @@ from harrix_swiss_knife.apps.common.exercise_media import (
     is_exercise_media_path,
 )
 from harrix_swiss_knife.apps.common.qt_main_window import AppWindowMixin
-from harrix_swiss_knife.apps.common.scroll_pagination import ScrollPagination, on_scroll_load_more
+from harrix_swiss_knife.apps.common.qt_sql_profiler import sql_profile_cycle
+from harrix_swiss_knife.apps.common.scroll_pagination import KeysetCursor, ScrollPagination, on_scroll_load_more
 from harrix_swiss_knife.apps.common.table_models import create_table_proxy_model, sort_table_by_header_click
 from harrix_swiss_knife.apps.common.ui_helpers import reveal_in_file_explorer
 from harrix_swiss_knife.apps.common.widgets.exercise_list_hover_preview import (
@@ -2954,6 +2955,7 @@ class MainWindow(
             logger.exception("Error showing tables")
             message_box.warning(self, "Database Error", f"Failed to load tables: {e}")
 
+    @sql_profile_cycle("fitness.update_all")
     def update_all(
         self,
         *,
@@ -4740,17 +4742,17 @@ class MainWindow(
             lambda section, key=table_key: self._on_exercise_table_header_clicked(key, section)
         )
 
-    def _fetch_process_rows(self, limit: int | None, offset: int) -> list[list[Any]]:
-        """Fetch process rows with optional filters and pagination."""
+    def _fetch_process_rows(self, limit: int | None, after: KeysetCursor | None = None) -> list[list[Any]]:
+        """Fetch process rows with optional filters, seeking past the `after` keyset cursor."""
         if self.db_manager is None:
             return []
 
         if self._process_filter_is_active():
             filter_params: dict[str, str | None] = self._get_process_filter_params()
-            return self.db_manager.get_filtered_process_records(**filter_params, limit=limit, offset=offset)
+            return self.db_manager.get_filtered_process_records(**filter_params, limit=limit, after=after)
         if limit is None:
             return self.db_manager.get_all_process_records()
-        return self.db_manager.get_limited_process_records(limit, offset)
+        return self.db_manager.get_limited_process_records(limit, after=after)
 
     def _filter_exercises_list(self, text: str = "") -> None:
         """Hide exercises in `listView_exercises` that do not match the filter text.
@@ -5493,10 +5495,11 @@ class MainWindow(
             source_model = cast("QStandardItemModel", proxy.sourceModel())
             self._append_process_rows_to_model(source_model, transformed_data)
 
-        self._process_pagination.load_more(
+        self._process_pagination.load_more_after(
             load_more_count=self.process_load_more_count,
             fetch_rows=self._fetch_process_rows,
             append_rows=append_rows,
+            cursor_of=_process_row_cursor,
         )
 
     def _load_process_page(self, *, reset: bool = True) -> None:
@@ -5508,7 +5511,8 @@ class MainWindow(
             self._reset_process_pagination_state()
 
         limit: int | None = None if self.show_all_records else self.count_records_to_show
-        rows: list[list] = self._fetch_process_rows(limit, 0)
+        rows: list[list] = self._fetch_process_rows(limit)
+        cursor: KeysetCursor | None = _process_row_cursor(rows[-1]) if rows else None
         transformed_data: list[list] = self._transform_process_data(rows, append_state=False)
 
         self.models["process"] = self._create_colored_process_table_model(
@@ -5521,6 +5525,7 @@ class MainWindow(
             len(rows),
             limit,
             pagination_enabled=not self.show_all_records,
+            cursor=cursor,
         )
 
     def _mark_exercises_changed(self) -> None:
@@ -6562,6 +6567,8 @@ class MainWindow(
         """Transform process rows for table display with date-based coloring."""
         date_to_color: dict[str, QColor] = dict(self._process_date_color_map) if append_state else {}
         color_index: int = len(date_to_color)
+        # Names come joined from SQL, so the loop only formats; the fallback color is built once
+        default_color = QColor(255, 255, 255)
 
         transformed_rows: list[list] = []
         for row in rows:
@@ -6570,7 +6577,7 @@ class MainWindow(
                 date_to_color[date_str] = self.exercise_colors[color_index % len(self.exercise_colors)]
                 color_index += 1
 
-            date_color = date_to_color.get(date_str, QColor(255, 255, 255))
+            date_color = date_to_color.get(date_str, default_color)
             transformed_row = [row[1], row[2], f"{row[3]} {row[4] or 'times'}", row[5], row[0], date_color]
             transformed_rows.append(transformed_row)
 
@@ -6785,5 +6792,10 @@ class MainWindow(
                     item.setIcon(icon)
 
 
+def _process_row_cursor(row: list[Any]) -> KeysetCursor:
+    """Return the keyset cursor of a raw process row (`_id` at 0, `date` at 5)."""
+    return KeysetCursor.from_row(row, date_index=5, id_index=0)
+
+
 if __name__ == "__main__":
     run_app_main(MainWindow)
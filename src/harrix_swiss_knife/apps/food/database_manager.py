@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass
 from datetime import UTC, datetime
-from typing import Any, NoReturn
+from typing import TYPE_CHECKING, Any
 
 from harrix_swiss_knife.apps.common.qt_database_manager_base import QtSqliteDatabaseManagerBase
+from harrix_swiss_knife.apps.common.schema_migrations import SchemaMigration
+
+if TYPE_CHECKING:
+    from harrix_swiss_knife.apps.common.scroll_pagination import KeysetCursor
+
+
+logger = logging.getLogger(__name__)
 
 
 class DatabaseManager(QtSqliteDatabaseManagerBase):
@@ -34,6 +42,7 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
 
         """
         super().__init__(prefix="food_db", db_filename=db_filename)
+        self.migrate_schema()
 
     def add_food_item(
         self,
@@ -505,13 +514,21 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
         """
         return self.get_rows(query)
 
-    def get_recent_food_log_records(self, limit: int = 5000, offset: int = 0) -> list[list[Any]]:
+    def get_recent_food_log_records(
+        self,
+        limit: int = 5000,
+        offset: int = 0,
+        *,
+        after: KeysetCursor | None = None,
+    ) -> list[list[Any]]:
         r"""Get recent food log records for table display.
 
         Args:
 
         - `limit` (`int`): Maximum number of records to return. Defaults to `5000`.
         - `offset` (`int`): Number of records to skip. Defaults to `0`.
+        - `after` (`KeysetCursor | None`): Keyset cursor; when given, return rows after it
+          instead of skipping `offset` rows. Defaults to `None`.
 
         Returns:
 
@@ -519,15 +536,17 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
           calories_per_100g, name, name_en, is_drink].
 
         """
-        return self.get_rows(
-            """
+        query = """
             SELECT _id, date, weight, portion_calories, calories_per_100g, name, name_en, is_drink
             FROM food_log
-            ORDER BY date DESC, _id DESC
-            LIMIT :limit OFFSET :offset
-            """,
-            {"limit": limit, "offset": offset},
-        )
+        """
+        params: dict[str, Any] = {"limit": limit, "offset": offset}
+        if after is not None:
+            query += " WHERE " + after.where_clause()
+            params.update(after.params())
+            params["offset"] = 0
+        query += " ORDER BY date DESC, _id DESC LIMIT :limit OFFSET :offset"
+        return self.get_rows(query, params)
 
     def get_recent_food_names_for_autocomplete(self, limit: int = 1000) -> list[FoodAutocompleteEntry]:
         """Get recent unique food names (with English names) for autocomplete.
@@ -764,19 +783,10 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
         """
         if not record_ids:
             return True
-        try:
-            with self.sql_transaction():
-                for record_id in record_ids:
-                    if not self.execute_simple_query(
-                        "UPDATE food_log SET date = :date WHERE _id = :id",
-                        {"date": date, "id": record_id},
-                    ):
-                        msg = f"Failed to update food_log date for id={record_id}"
-                        _raise_runtime_error(msg)
-        except Exception:
-            return False
-        else:
-            return True
+        return self.execute_many(
+            "UPDATE food_log SET date = :date WHERE _id = :id",
+            [{"date": date, "id": record_id} for record_id in record_ids],
+        )
 
     def update_food_log_weight_and_calories(
         self,
@@ -809,6 +819,29 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
         }
         return self.execute_simple_query(query, params)
 
+    def _ensure_performance_indexes(self) -> bool:
+        """Create indexes for date-grouped and by-name `food_log` queries.
+
+        Indexes whose column is missing (legacy `datetime`-based files) are skipped.
+
+        """
+        try:
+            columns = {str(row[1]) for row in self.get_rows("PRAGMA table_info(food_log)") if len(row) > 1}
+            return all(
+                self.execute_simple_query(f"CREATE INDEX IF NOT EXISTS idx_food_log_{column} ON food_log({column})")
+                for column in ("date", "name")
+                if column in columns
+            )
+        except Exception:
+            logger.exception("Could not ensure performance indexes")
+            return False
+
+    def _schema_migrations(self) -> list[SchemaMigration]:
+        """Return food schema migrations; versions are stamped into `PRAGMA user_version`."""
+        return [
+            SchemaMigration(1, "food_log performance indexes", self._ensure_performance_indexes),
+        ]
+
 
 @dataclass(frozen=True, slots=True)
 class FoodAutocompleteEntry:
@@ -873,11 +906,6 @@ def _put_autocomplete_name(target: dict[str, str | None], name: str, name_en: st
         target[name] = name_en
 
 
-def _raise_runtime_error(message: str) -> NoReturn:
-    """Raise `RuntimeError` (helper for TRY301 inside SQL transactions)."""
-    raise RuntimeError(message)
-
-
 def _sql_in_clause(values: list[str], param_prefix: str) -> tuple[str, dict[str, Any]]:
     """Build `IN (:p0, :p1, ...)` placeholders and bind parameters for `values`."""
     placeholders = ", ".join(f":{param_prefix}{index}" for index in range(len(values)))
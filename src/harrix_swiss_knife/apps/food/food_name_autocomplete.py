@@ -7,15 +7,14 @@ from PySide6.QtCore import (
     QObject,
     QPersistentModelIndex,
     QPoint,
-    QSortFilterProxyModel,
     Qt,
     QTimer,
 )
 from PySide6.QtGui import QCursor
-from PySide6.QtWidgets import QCompleter, QLabel, QStyleOptionViewItem, QWidget
+from PySide6.QtWidgets import QCompleter, QLabel, QStyleOptionViewItem
 from shiboken6 import isValid
 
-from harrix_swiss_knife.keyboard_layout_search import autocomplete_match_tier
+from harrix_swiss_knife.apps.common.autocomplete_index import AutocompleteProxyModel
 
 
 class CompleterPopupTooltipHelper(QObject):
@@ -170,99 +169,43 @@ class CompleterPopupTooltipHelper(QObject):
         self._tooltip.show()
 
 
-class FoodNameAutocompleteProxyModel(QSortFilterProxyModel):
+class FoodNameAutocompleteProxyModel(AutocompleteProxyModel):
     """Proxy model for food name autocomplete with exact/starts-with/contains ordering.
 
-    Matches against both display name (`DisplayRole`) and English name (`UserRole`).
+    Matches against both display name (`DisplayRole`) and English name (`UserRole`) through the
+    shared `AutocompleteIndex`, and sorts alphabetically (case-insensitive) within each tier.
 
     """
 
-    def __init__(self, parent: QWidget | None = None) -> None:
-        """Initialize the proxy model."""
-        super().__init__(parent)
-        self.filter_text = ""
-        self.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
-        self.setSortCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+    sort_by_text = True
 
-    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex | QPersistentModelIndex) -> bool:  # noqa: N802
-        """Determine if a row should be accepted by the filter."""
-        if not self.filter_text:
-            return True
+    def _row_entry(self, source_model: QAbstractItemModel, row: int) -> tuple[str, str]:
+        index = source_model.index(row, 0)
+        name = source_model.data(index, Qt.ItemDataRole.DisplayRole)
+        name_en = source_model.data(index, Qt.ItemDataRole.UserRole)
+        return ("" if name is None else str(name), str(name_en) if name_en else "")
 
-        source_model = self.sourceModel()
-        if source_model is None:
-            return False
-
-        index = source_model.index(source_row, 0, source_parent)
-        return _row_match_tier(source_model, index, self.filter_text) is not None
-
-    def lessThan(  # noqa: N802
+    def _unfiltered_less_than(
         self,
         source_left: QModelIndex | QPersistentModelIndex,
         source_right: QModelIndex | QPersistentModelIndex,
     ) -> bool:
-        """Sort by match tier, then alphabetically (case-insensitive) within tier."""
         source_model = self.sourceModel()
         if source_model is None:
             return False
-
-        if not self.filter_text:
-            left_data = source_model.data(source_left, Qt.ItemDataRole.DisplayRole)
-            right_data = source_model.data(source_right, Qt.ItemDataRole.DisplayRole)
-            if left_data is None or right_data is None:
-                return False
-            left_lower = str(left_data).lower()
-            right_lower = str(right_data).lower()
-            if left_lower != right_lower:
-                return left_lower < right_lower
-            return source_left.row() < source_right.row()
-
-        left_tier = _row_match_tier(source_model, source_left, self.filter_text)
-        right_tier = _row_match_tier(source_model, source_right, self.filter_text)
-        left_rank = 2 if left_tier is None else left_tier
-        right_rank = 2 if right_tier is None else right_tier
-
-        if left_rank != right_rank:
-            return left_rank < right_rank
-
         left_data = source_model.data(source_left, Qt.ItemDataRole.DisplayRole)
         right_data = source_model.data(source_right, Qt.ItemDataRole.DisplayRole)
         if left_data is None or right_data is None:
             return False
-
         left_lower = str(left_data).lower()
         right_lower = str(right_data).lower()
         if left_lower != right_lower:
             return left_lower < right_lower
-
         return source_left.row() < source_right.row()
 
-    def set_filter_text(self, text: str) -> None:
-        """Set the filter text and trigger re-filtering and sorting."""
-        self.filter_text = text
-        self.invalidateFilter()
-        self.sort(0)
-
 
 def setup_completer_item_tooltips(completer: QCompleter) -> CompleterPopupTooltipHelper:
     """Enable tooltips for elided items in a QCompleter popup list."""
     helper = CompleterPopupTooltipHelper(completer)
     completer._tooltip_helper = helper  # keep reference alive  # noqa: SLF001
     return helper
-
-
-def _row_match_tier(
-    source_model: QAbstractItemModel,
-    index: QModelIndex | QPersistentModelIndex,
-    filter_text: str,
-) -> int | None:
-    """Return best autocomplete match tier for name or English name."""
-    name = source_model.data(index, Qt.ItemDataRole.DisplayRole)
-    name_en = source_model.data(index, Qt.ItemDataRole.UserRole)
-
-    best = autocomplete_match_tier(str(name), filter_text) if name is not None else None
-    if name_en:
-        en_tier = autocomplete_match_tier(str(name_en), filter_text)
-        if en_tier is not None and (best is None or en_tier < best):
-            best = en_tier
-    return best
@@ -59,7 +59,7 @@ from harrix_swiss_knife.apps.common.date_edit_quick import attach_date_edit_quic
 from harrix_swiss_knife.apps.common.db_init import init_tracker_database
 from harrix_swiss_knife.apps.common.dialogs.simple_recording_dialog import SimpleRecordingDialog
 from harrix_swiss_knife.apps.common.qt_main_window import AppWindowMixin
-from harrix_swiss_knife.apps.common.scroll_pagination import ScrollPagination, on_scroll_load_more
+from harrix_swiss_knife.apps.common.scroll_pagination import KeysetCursor, ScrollPagination, on_scroll_load_more
 from harrix_swiss_knife.apps.common.table_models import create_table_proxy_model
 from harrix_swiss_knife.apps.common.widgets.image_picker import ImagePicker, ImagePickerMode
 from harrix_swiss_knife.apps.food import database_manager, window
@@ -2191,8 +2191,9 @@ class MainWindow(
             self._food_log_pagination.record_first_page(len(rows), None, pagination_enabled=False)
         else:
             limit: int = self.count_food_records_to_show
-            rows = self.db_manager.get_recent_food_log_records(limit, 0)
-            self._food_log_pagination.record_first_page(len(rows), limit)
+            rows = self.db_manager.get_recent_food_log_records(limit)
+            cursor: KeysetCursor | None = _food_log_row_cursor(rows[-1]) if rows else None
+            self._food_log_pagination.record_first_page(len(rows), limit, cursor=cursor)
 
         transformed_data: list[list] = self._transform_food_log_data(rows, append_state=False)
         self.models["food_log"] = self._create_colored_food_log_table_model(
@@ -2219,10 +2220,12 @@ class MainWindow(
             source_model = cast("QStandardItemModel", proxy.sourceModel())
             self._append_food_log_rows_to_model(source_model, transformed_data)
 
-        self._food_log_pagination.load_more(
+        db_manager = self.db_manager
+        self._food_log_pagination.load_more_after(
             load_more_count=self.food_log_load_more_count,
-            fetch_rows=self.db_manager.get_recent_food_log_records,
+            fetch_rows=lambda limit, after: db_manager.get_recent_food_log_records(limit, after=after),
             append_rows=append_rows,
+            cursor_of=_food_log_row_cursor,
         )
 
     def _on_autocomplete_selected(self, text: str) -> None:
@@ -3263,6 +3266,8 @@ class MainWindow(
         dates_with_totals: set[str] = set(self._food_log_dates_with_totals) if append_state else set()
         color_index: int = len(date_to_color)
 
+        # Food names come joined from SQL; calories are computed once per row for both passes
+        row_calories: list[float] = []
         date_to_total_calories: dict[str, float] = {}
         for row in rows:
             date_str = row[1]
@@ -3275,15 +3280,16 @@ class MainWindow(
                 calculated_calories = float(portion_calories)
             elif calories_per_100g and calories_per_100g > 0 and weight and weight > 0:
                 calculated_calories = (float(calories_per_100g) * float(weight)) / 100
+            row_calories.append(calculated_calories)
 
             if date_str:
                 date_to_total_calories[date_str] = date_to_total_calories.get(date_str, 0.0) + calculated_calories
 
+        default_color = QColor(255, 255, 255)
         transformed_rows: list[list] = []
-        for row in rows:
+        for row, calculated_calories in zip(rows, row_calories, strict=True):
             portion_calories = row[3]
             calories_per_100g = row[4]
-            weight = row[2]
             date_str = row[1]
 
             if date_str not in date_to_color:
@@ -3295,12 +3301,6 @@ class MainWindow(
             else:
                 calories_per_100g_display = calories_per_100g if calories_per_100g is not None else ""
 
-            calculated_calories = 0.0
-            if portion_calories and portion_calories > 0:
-                calculated_calories = float(portion_calories)
-            elif calories_per_100g and calories_per_100g > 0 and weight and weight > 0:
-                calculated_calories = (float(calories_per_100g) * float(weight)) / 100
-
             is_first_of_day = date_str not in dates_with_totals
             if is_first_of_day:
                 dates_with_totals.add(date_str)
@@ -3319,7 +3319,7 @@ class MainWindow(
                 row[6],
                 total_per_day_display,
             ]
-            date_color = date_to_color.get(date_str, QColor(255, 255, 255))
+            date_color = date_to_color.get(date_str, default_color)
             transformed_row.extend([row[0], date_color])
             transformed_rows.append(transformed_row)
 
@@ -3696,5 +3696,10 @@ class MainWindow(
             message_box.warning(self, "Database Error", f"Failed to load calories per day data: {e}")
 
 
+def _food_log_row_cursor(row: list[Any]) -> KeysetCursor:
+    """Return the keyset cursor of a raw food log row (`_id` at 0, `date` at 1)."""
+    return KeysetCursor.from_row(row, date_index=1, id_index=0)
+
+
 if __name__ == "__main__":
     run_app_main(MainWindow, set_tab_index_zero=False)
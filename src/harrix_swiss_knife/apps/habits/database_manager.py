@@ -10,6 +10,7 @@ if TYPE_CHECKING:
     from collections.abc import Sequence
 
 from harrix_swiss_knife.apps.common.qt_database_manager_base import QtSqliteDatabaseManagerBase
+from harrix_swiss_knife.apps.common.schema_migrations import SchemaMigration
 from harrix_swiss_knife.apps.habits.habit_emojis import default_habit_emoji, normalize_habit_emoji
 
 logger = logging.getLogger(__name__)
@@ -782,6 +783,20 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
         """Copy `_id` into `sort_order` so existing habits keep insertion order."""
         return self.execute_simple_query("UPDATE habits SET sort_order = _id")
 
+    def _ensure_performance_indexes(self) -> bool:
+        """Create indexes for per-habit check-in lookups and date-ordered `process_habits` queries."""
+        try:
+            return all(
+                self.execute_simple_query(statement)
+                for statement in (
+                    "CREATE INDEX IF NOT EXISTS idx_process_habits_habit ON process_habits(_id_habit, date, value)",
+                    "CREATE INDEX IF NOT EXISTS idx_process_habits_date ON process_habits(date)",
+                )
+            )
+        except Exception:
+            logger.exception("Could not ensure performance indexes")
+            return False
+
     def _next_habit_sort_order(self) -> int:
         """Return the next `sort_order` so a new habit is appended."""
         rows = self.get_rows("SELECT COALESCE(MAX(sort_order), -1) FROM habits")
@@ -789,6 +804,13 @@ class DatabaseManager(QtSqliteDatabaseManagerBase):
             return 0
         return int(rows[0][0]) + 1
 
+    def _schema_migrations(self) -> list[SchemaMigration]:
+        """Return habits schema migrations; versions are stamped into `PRAGMA user_version`."""
+        return [
+            SchemaMigration(1, "habits is_archived/emoji/sort_order columns", self.ensure_habits_schema),
+            SchemaMigration(2, "process_habits performance indexes", self._ensure_performance_indexes),
+        ]
+
 
 def _chunks(items: list[Any], size: int) -> list[list[Any]]:
     """Split `items` into consecutive slices of at most `size`."""
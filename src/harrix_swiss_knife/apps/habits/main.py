@@ -1625,7 +1625,7 @@ class MainWindow(
 
         def _on_db_opened(db_manager: database_manager.DatabaseManager) -> None:
             with contextlib.suppress(Exception):
-                db_manager.ensure_habits_schema()
+                db_manager.migrate_schema()
 
         self.db_manager = init_tracker_database(
             self,
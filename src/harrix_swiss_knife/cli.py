@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import sys
+import tempfile
 from pathlib import Path
 from typing import cast
 
@@ -48,6 +49,23 @@ from harrix_swiss_knife.actions.vscode import (
     OnVscodeCheck,
     OnVscodeFormat,
 )
+from harrix_swiss_knife.apps.common.db_benchmark import (
+    DEFAULT_BENCHMARK_ROUNDS,
+    DEFAULT_TOLERANCE,
+    compare_to_baselines,
+    default_baseline_path,
+    format_benchmark_report,
+    load_baselines,
+    run_benchmarks,
+    save_baselines,
+)
+from harrix_swiss_knife.apps.common.qt_sql_profiler import (
+    default_slow_query_log_path,
+    format_sql_profile_report,
+    load_slow_query_log,
+    slow_query_log_stats,
+)
+from harrix_swiss_knife.apps.common.synthetic_data import SYNTHETIC_APPS
 from harrix_swiss_knife.paths import get_project_root
 
 
@@ -177,6 +195,62 @@ def dev_build_install_zips(
     _finish_timed_action(action)
 
 
+@dev_group.command("db-benchmark")
+@click.option(
+    "--years",
+    "years",
+    type=float,
+    multiple=True,
+    default=(1.0, 10.0),
+    show_default=True,
+    help="Synthetic history length in years (repeat for several scales, e.g. 1, 10, 50).",
+)
+@click.option(
+    "--app", "apps", type=click.Choice(SYNTHETIC_APPS), multiple=True, help="Only benchmark these apps (repeatable)."
+)
+@click.option("--rounds", default=DEFAULT_BENCHMARK_ROUNDS, show_default=True, help="Timed calls per method.")
+@click.option("--seed", default=0, show_default=True, help="Synthetic data seed.")
+@click.option(
+    "--baseline",
+    "baseline_file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Baseline JSON (default: data/benchmarks/db_benchmark_baselines.json).",
+)
+@click.option("--update-baseline", is_flag=True, help="Store this run's medians as the new baseline.")
+@click.option(
+    "--tolerance",
+    default=DEFAULT_TOLERANCE,
+    show_default=True,
+    help="Allowed relative slowdown against the baseline before the run fails.",
+)
+def dev_db_benchmark(
+    *,
+    years: tuple[float, ...],
+    apps: tuple[str, ...],
+    rounds: int,
+    seed: int,
+    baseline_file: Path | None,
+    update_baseline: bool,
+    tolerance: float,
+) -> None:
+    """Benchmark DatabaseManager read methods on synthetic databases; exit 1 on regressions."""
+    baseline_path = baseline_file or default_baseline_path()
+    with tempfile.TemporaryDirectory(prefix="hsk_db_benchmark_") as work_dir:
+        run = run_benchmarks(Path(work_dir), apps=apps or SYNTHETIC_APPS, years=years, rounds=rounds, seed=seed)
+    baselines = load_baselines(baseline_path)
+    regressions = compare_to_baselines(run.results, baselines, tolerance=tolerance)
+    click.echo(format_benchmark_report(run.results, baselines=baselines, regressions=regressions))
+    for key, reason in sorted(run.skipped.items()):
+        click.echo(f"Skipped {key}: {reason}")
+    if update_baseline:
+        save_baselines(baseline_path, run.results)
+        click.echo(f"Baseline updated: {baseline_path}")
+        return
+    if regressions:
+        click.echo(f"{len(regressions)} method(s) slower than the baseline by more than {tolerance:.0%}", err=True)
+        sys.exit(1)
+
+
 @dev_group.command("install-cli")
 def dev_install_cli() -> None:
     """Install global `hsk` CLI on PATH (`uv tool install -e`)."""
@@ -271,6 +345,27 @@ def dev_pack_private_data(
     )
 
 
+@dev_group.command("sql-profile-report")
+@click.argument("log_file", required=False, type=click.Path(dir_okay=False, path_type=Path))
+@click.option("--top", default=20, show_default=True, help="Number of statements to show.")
+@click.option(
+    "--order-by",
+    type=click.Choice(["total_ms", "max_ms", "mean_ms", "calls", "rows"]),
+    default="total_ms",
+    show_default=True,
+    help="Column to rank statements by.",
+)
+def dev_sql_profile_report(log_file: Path | None, top: int, order_by: str) -> None:
+    """Print the top slow SQL statements from the `HSK_SQL_PROFILE` slow-query log (LOG_FILE or the default)."""
+    path = log_file or default_slow_query_log_path()
+    entries = load_slow_query_log(path)
+    if not entries:
+        click.echo(f"No slow-query entries in {path}")
+        return
+    click.echo(f"{len(entries)} slow statements in {path}")
+    click.echo(format_sql_profile_report(slow_query_log_stats(entries), top=top, order_by=order_by))
+
+
 @dev_group.command("setup-data-for-hsk")
 @click.option(
     "--parent",
@@ -1,10 +1,80 @@
-"""Pytest defaults for Harrix Swiss Knife."""
+"""Pytest defaults and shared fixtures for Harrix Swiss Knife."""
 
 from __future__ import annotations
 
 import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+from PySide6.QtWidgets import QApplication
 
 from harrix_swiss_knife.actions.common.subprocess_run import QT_OFFSCREEN_PLATFORM
+from harrix_swiss_knife.apps.common.qt_sqlite_connection import close_shared_read_only_pool
+from harrix_swiss_knife.apps.common.synthetic_data import SyntheticDatabase, generate_database
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager
+
+FINANCE_RECOVER_SQL = (
+    Path(__file__).resolve().parents[1] / "src" / "harrix_swiss_knife" / "apps" / "finance" / "recover.sql"
+)
 
 # Qt tests must not map real windows (they flash during `hsk py check`).
 os.environ.setdefault("QT_QPA_PLATFORM", QT_OFFSCREEN_PLATFORM)
+
+
+@pytest.fixture(scope="module")
+def qapp() -> QApplication:
+    app = QApplication.instance()
+    if app is None:
+        return QApplication([])
+    if not isinstance(app, QApplication):
+        msg = "QApplication.instance() returned a non-QApplication object."
+        raise TypeError(msg)
+    return app
+
+
+@pytest.fixture
+def finance_years() -> int:
+    """Years of synthetic history in `finance_database`; override it in a test module for a larger database."""
+    return 2
+
+
+@pytest.fixture
+def finance_database(tmp_path: Path, qapp: QApplication, finance_years: int) -> Iterator[SyntheticDatabase]:  # noqa: ARG001
+    database = generate_database("finance", tmp_path / "finance.db", years=finance_years)
+    yield database
+    close_shared_read_only_pool(str(database.path))
+
+
+@pytest.fixture
+def finance_db(finance_database: SyntheticDatabase) -> Iterator[DatabaseManager]:
+    # Imported here so the non-finance tests do not load the whole finance app
+    from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager  # noqa: PLC0415
+
+    db = DatabaseManager(str(finance_database.path))
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def empty_finance_db_path(tmp_path: Path, qapp: QApplication) -> Iterator[Path]:  # noqa: ARG001
+    """Finance database created from `recover.sql`: the schema and default rows, without transactions or rates."""
+    from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager  # noqa: PLC0415
+
+    path = tmp_path / "finance.db"
+    assert DatabaseManager.create_database_from_sql(str(path), str(FINANCE_RECOVER_SQL))
+    yield path
+    close_shared_read_only_pool(str(path))
+
+
+@pytest.fixture
+def empty_finance_db(empty_finance_db_path: Path) -> Iterator[DatabaseManager]:
+    from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager  # noqa: PLC0415
+
+    db = DatabaseManager(str(empty_finance_db_path))
+    yield db
+    db.close()
@@ -0,0 +1,144 @@
+"""Tests for the shared autocomplete index and the proxy models that delegate to it."""
+
+from __future__ import annotations
+
+import random
+import time
+
+import pytest
+from PySide6.QtCore import QStringListModel, Qt
+from PySide6.QtGui import QStandardItem, QStandardItemModel
+from PySide6.QtWidgets import QApplication
+
+from harrix_swiss_knife.apps.common.autocomplete_index import AutocompleteIndex, AutocompleteMatch
+from harrix_swiss_knife.apps.finance.description_autocomplete import DescriptionAutocompleteProxyModel
+from harrix_swiss_knife.apps.food.food_name_autocomplete import FoodNameAutocompleteProxyModel
+from harrix_swiss_knife.keyboard_layout_search import autocomplete_match_tier
+
+DESCRIPTIONS = [
+    "Привет мир",
+    "Привет",
+    "Hello Привет",
+    "Молоко",
+    "Молоко 3.2%",
+    "Кефир молочный",
+    "Finance",
+    "Fine dining",
+    "Coffee",
+    "Кофе",
+    "coffee beans",
+]
+QUERIES = ["ghbdtn", "ghbd", "привет", "мол", "vjk", "finance", "аштфтсу", "fin", "кофе", "coffee", "e", "zzz"]
+
+
+@pytest.fixture(scope="module")
+def qapp() -> QApplication:
+    app = QApplication.instance()
+    if app is None:
+        return QApplication([])
+    if not isinstance(app, QApplication):
+        msg = "QApplication.instance() returned a non-QApplication object."
+        raise TypeError(msg)
+    return app
+
+
+def _expected(entries: list[tuple[str, str]], query: str, *, sort_by_text: bool = False) -> list[AutocompleteMatch]:
+    """Rank entries one by one with `autocomplete_match_tier`, the way the proxies used to."""
+    matches = []
+    for position, (text, alternate) in enumerate(entries):
+        tiers = [autocomplete_match_tier(part, query) for part in (text, alternate) if part]
+        tiers = [tier for tier in tiers if tier is not None]
+        if tiers:
+            rank = (text.lower(), position) if sort_by_text else (position,)
+            matches.append((min(tiers), rank, AutocompleteMatch(text, alternate, min(tiers))))
+    return [match for _tier, _rank, match in sorted(matches, key=lambda item: item[:2])]
+
+
+def test_search_ranks_like_autocomplete_match_tier() -> None:
+    entries = [(text, "") for text in DESCRIPTIONS]
+    food_entries = [("Молоко", "Milk"), ("Молочный коктейль", "Milkshake"), ("Кефир", "Kefir"), ("Сыр", "")]
+    index = AutocompleteIndex(DESCRIPTIONS)
+    food_index = AutocompleteIndex(food_entries, sort_by_text=True)
+
+    for query in [*QUERIES, "milk", "ьшдл", "kef", "СЫР"]:
+        assert index.search(query) == _expected(entries, query)
+        assert index.search(query, limit=2) == _expected(entries, query)[:2]
+        assert food_index.search(query) == _expected(food_entries, query, sort_by_text=True)
+    assert index.search("") == []
+    assert [match.tier for match in index.search("ghbdtn")] == [0, 1, 2]
+
+
+def test_incremental_updates_match_a_fresh_index() -> None:
+    index = AutocompleteIndex(DESCRIPTIONS[:6])
+    index.add("Кофе")
+    index.add("Привет")  # Already indexed: keeps its rank
+    assert index.search("кофе") == [AutocompleteMatch("Кофе", "", 0)]
+
+    reloaded = ["Кофе и молоко", *DESCRIPTIONS[3:], "Молоко"]
+    index.set_entries(reloaded)
+    assert len(index) == len(dict.fromkeys(reloaded))
+    assert "Привет" not in index
+    for query in QUERIES:
+        assert index.search(query) == AutocompleteIndex(reloaded).search(query)
+
+
+def test_proxy_models_follow_their_source_models(qapp: QApplication) -> None:  # noqa: ARG001
+    source = QStringListModel(DESCRIPTIONS)
+    proxy = DescriptionAutocompleteProxyModel()
+    proxy.setSourceModel(source)
+
+    def shown() -> list[str]:
+        return [proxy.index(row, 0).data() for row in range(proxy.rowCount())]
+
+    proxy.set_filter_text("ghbdtn")
+    assert shown() == ["Привет", "Привет мир", "Hello Привет"]
+
+    row = source.rowCount()
+    source.insertRows(row, 1)
+    source.setData(source.index(row, 0), "Приветствие")
+    assert shown() == ["Привет", "Привет мир", "Приветствие", "Hello Привет"]
+    source.setStringList(["Хлеб", "Привет, мир"])
+    assert shown() == ["Привет, мир"]
+    proxy.set_filter_text("")
+    assert shown() == ["Хлеб", "Привет, мир"]
+
+    food_source = QStandardItemModel()
+    for name, name_en in [("Сыр", ""), ("Молочный коктейль", "Milkshake"), ("Молоко", "Milk")]:
+        item = QStandardItem(name)
+        item.setData(name_en, Qt.ItemDataRole.UserRole)
+        food_source.appendRow(item)
+    food_proxy = FoodNameAutocompleteProxyModel()
+    food_proxy.setSourceModel(food_source)
+    food_proxy.sort(0)
+    assert [food_proxy.index(row, 0).data() for row in range(food_proxy.rowCount())] == [
+        "Молоко",
+        "Молочный коктейль",
+        "Сыр",
+    ]
+    food_proxy.set_filter_text("milk")
+    assert [food_proxy.index(row, 0).data() for row in range(food_proxy.rowCount())] == [
+        "Молоко",
+        "Молочный коктейль",
+    ]
+
+
+@pytest.mark.slow
+def test_top_k_search_is_faster_than_scanning_every_candidate() -> None:
+    rng = random.Random(7)  # noqa: S311
+    words = [word for text in DESCRIPTIONS for word in text.split()]
+    candidates = list(dict.fromkeys(f"{' '.join(rng.sample(words, 3))} {number}" for number in range(20_000)))
+    index = AutocompleteIndex(candidates)
+    queries = ["vjk", "ghb", "кофе", "fin", "hello", "молоко 3", "coffee b", "m"]
+    index.search(queries[0])  # Lays out the contains index once
+
+    started = time.perf_counter()
+    for query in queries:
+        index.search(query, limit=50)
+    index_seconds = (time.perf_counter() - started) / len(queries)
+    started = time.perf_counter()
+    for query in queries:
+        [text for text in candidates if autocomplete_match_tier(text, query) is not None]
+    scan_seconds = (time.perf_counter() - started) / len(queries)
+
+    assert index_seconds < 0.001
+    assert index_seconds < scan_seconds / 10
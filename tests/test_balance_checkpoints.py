@@ -0,0 +1,210 @@
+"""Tests for the month-end natural journal checkpoints used by the balance check."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from harrix_swiss_knife.apps.common.qt_sqlite_connection import close_shared_read_only_pool
+from harrix_swiss_knife.apps.common.synthetic_data import SyntheticDatabase, generate_database
+from harrix_swiss_knife.apps.finance.balance_check_worker import BalanceCheckResult, BalanceCheckWorker
+from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager
+from harrix_swiss_knife.apps.finance.services.balance_checkpoints import (
+    BalanceCheckpointService,
+    BalanceCheckpointStore,
+)
+from harrix_swiss_knife.apps.finance.transaction_helpers import get_natural_currency_reconciliation
+
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QApplication
+
+
+@pytest.fixture
+def finance_years() -> int:
+    return 3
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> BalanceCheckpointStore:
+    return BalanceCheckpointStore(tmp_path / "checkpoints")
+
+
+def _full_natural_rows(db: DatabaseManager) -> list[dict]:
+    return get_natural_currency_reconciliation(
+        db.get_all_transactions(), db.get_all_currency_exchanges(), db.get_all_accounts(), db
+    )
+
+
+def _checkpoint_natural_rows(db: DatabaseManager, store: BalanceCheckpointStore) -> tuple[list[dict], str | None]:
+    journal = BalanceCheckpointService(db, store).journal()
+    rows = get_natural_currency_reconciliation([], [], db.get_all_accounts(), db, journal_minor=journal.journal_minor)
+    return rows, journal.resumed_from
+
+
+def _last_ids(db: DatabaseManager, table: str) -> list[int]:
+    return sorted(int(row[0]) for row in db.get_rows(f"SELECT _id FROM {table} ORDER BY _id DESC LIMIT 2"))
+
+
+def _data_months(db: DatabaseManager) -> list[str]:
+    rows = db.get_rows(
+        """
+        SELECT DISTINCT substr(date, 1, 7) FROM transactions
+        UNION SELECT DISTINCT substr(date, 1, 7) FROM currency_exchanges
+        ORDER BY 1
+        """
+    )
+    return [str(row[0]) for row in rows]
+
+
+def test_journal_resumes_from_the_last_checkpoint(finance_db: DatabaseManager, store: BalanceCheckpointStore) -> None:
+    expected = _full_natural_rows(finance_db)
+    service = BalanceCheckpointService(finance_db, store)
+
+    first = service.journal()
+    second = service.journal()
+
+    checkpoints = store.load(str(finance_db._db_filename))
+    assert first.resumed_from is None
+    assert first.months_read == len(_data_months(finance_db))
+    assert [checkpoint.month for checkpoint in checkpoints] == _data_months(finance_db)[: len(checkpoints)]
+    assert second.resumed_from == checkpoints[-1].month
+    assert second.months_read == len(_data_months(finance_db)) - len(checkpoints)
+    assert second.journal_minor == first.journal_minor
+    assert _checkpoint_natural_rows(finance_db, store)[0] == expected
+
+
+def test_edits_to_old_months_invalidate_later_checkpoints(
+    finance_db: DatabaseManager, store: BalanceCheckpointStore
+) -> None:
+    months = _data_months(finance_db)
+    BalanceCheckpointService(finance_db, store).journal()
+    edited_month = months[5]
+    transaction_id = finance_db.get_rows(
+        "SELECT MIN(_id) FROM transactions WHERE substr(date, 1, 7) = :month", {"month": edited_month}
+    )[0][0]
+
+    edits = [
+        lambda: finance_db.execute_simple_query(
+            "UPDATE transactions SET amount = amount + 1 WHERE _id = :id", {"id": transaction_id}
+        ),
+        lambda: finance_db.add_currency_exchange(2, 1, 10.0, 900.0, 90.0, 1.0, f"{edited_month}-15"),
+        lambda: finance_db.delete_transaction(transaction_id),
+    ]
+    for edit in edits:
+        assert edit()
+        rows, resumed_from = _checkpoint_natural_rows(finance_db, store)
+        assert resumed_from == months[4]
+        assert rows == _full_natural_rows(finance_db)
+
+    # Flipping a category's type changes every month it is used in
+    category_id, first_used = finance_db.get_rows(
+        "SELECT _id_categories, MIN(substr(date, 1, 7)) FROM transactions WHERE date >= :d GROUP BY 1 ORDER BY 2 DESC",
+        {"d": f"{edited_month}-01"},
+    )[0]
+    assert finance_db.execute_simple_query("UPDATE categories SET type = 1 - type WHERE _id = :id", {"id": category_id})
+    rows, resumed_from = _checkpoint_natural_rows(finance_db, store)
+    assert resumed_from is None or resumed_from < first_used
+    assert rows == _full_natural_rows(finance_db)
+
+    # A row in a month that had no data before shifts every later month out of line
+    assert finance_db.add_transaction(5.0, "Old receipt", 2, 1, "1999-12-31")
+    rows, resumed_from = _checkpoint_natural_rows(finance_db, store)
+    assert resumed_from is None
+    assert rows == _full_natural_rows(finance_db)
+
+
+def test_swapping_currencies_between_rows_of_an_old_month_invalidates_it(
+    finance_db: DatabaseManager, store: BalanceCheckpointStore
+) -> None:
+    months = _data_months(finance_db)
+    edited_month = months[5]
+    for amount, currency_id in ((120.0, 1), (7.5, 2)):
+        assert finance_db.add_transaction(amount, "Swap", 2, currency_id, f"{edited_month}-10")
+    for currency_from, currency_to, amount_from in ((1, 2, 900.0), (2, 3, 15.0)):
+        assert finance_db.add_currency_exchange(
+            currency_from, currency_to, amount_from, 10.0, 90.0, 0.0, f"{edited_month}-12"
+        )
+    first_transaction, second_transaction = _last_ids(finance_db, "transactions")
+    first_exchange, second_exchange = _last_ids(finance_db, "currency_exchanges")
+    BalanceCheckpointService(finance_db, store).journal()
+
+    edits = [
+        (
+            "UPDATE transactions SET _id_currencies = 3 - _id_currencies WHERE _id IN (:first, :second)",
+            {"first": first_transaction, "second": second_transaction},
+        ),
+        (
+            "UPDATE currency_exchanges SET _id_currency_from = 3 - _id_currency_from WHERE _id IN (:first, :second)",
+            {"first": first_exchange, "second": second_exchange},
+        ),
+        (
+            """
+            UPDATE currency_exchanges SET _id_currency_from = _id_currency_to, _id_currency_to = _id_currency_from
+            WHERE _id = :id
+            """,
+            {"id": second_exchange},
+        ),
+    ]
+    for query, params in edits:
+        assert finance_db.execute_simple_query(query, params)
+        rows, resumed_from = _checkpoint_natural_rows(finance_db, store)
+        assert resumed_from == months[4]
+        assert rows == _full_natural_rows(finance_db)
+
+
+def test_unreadable_checkpoints_fall_back_to_a_full_pass(
+    finance_db: DatabaseManager, store: BalanceCheckpointStore
+) -> None:
+    db_filename = str(finance_db._db_filename)
+    BalanceCheckpointService(finance_db, store).journal()
+    saved = store.load(db_filename)
+    store._database_path(db_filename).write_text("{not json", encoding="utf-8")
+
+    journal = BalanceCheckpointService(finance_db, store).journal()
+
+    assert journal.resumed_from is None
+    assert store.load(db_filename) == saved
+
+
+def test_balance_check_worker_matches_a_full_recomputation(
+    finance_database: SyntheticDatabase, finance_db: DatabaseManager, store: BalanceCheckpointStore
+) -> None:
+    expected = _full_natural_rows(finance_db)
+    results: list[BalanceCheckResult] = []
+    for _ in range(2):
+        worker = BalanceCheckWorker(str(finance_database.path), store)
+        worker.check_completed.connect(results.append)
+        worker.check_failed.connect(pytest.fail)
+        worker.run()
+
+    assert [result.natural_rows for result in results] == [expected, expected]
+    assert store.load(str(finance_database.path))
+
+
+@pytest.mark.slow
+def test_checkpointed_journal_is_faster_than_a_full_recomputation(
+    tmp_path: Path,
+    store: BalanceCheckpointStore,
+    qapp: QApplication,  # noqa: ARG001
+) -> None:
+    database = generate_database("finance", tmp_path / "finance_8y.db", years=8)
+    db = DatabaseManager(str(database.path))
+    try:
+        BalanceCheckpointService(db, store).journal()
+
+        started = time.perf_counter()
+        expected = _full_natural_rows(db)
+        full_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        actual, resumed_from = _checkpoint_natural_rows(db, store)
+        checkpoint_seconds = time.perf_counter() - started
+
+        assert resumed_from is not None
+        assert actual == expected
+        assert checkpoint_seconds < full_seconds / 2
+    finally:
+        db.close()
+        close_shared_read_only_pool(str(database.path))
@@ -0,0 +1,156 @@
+"""Tests for computing finance charts off the UI thread with `ChartBuildScheduler`."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+import pytest
+from PySide6.QtCore import QEventLoop, QTimer
+
+from harrix_swiss_knife.apps.finance.chart_build_worker import (
+    CHART_KINDS,
+    NO_CATEGORIES_MESSAGE,
+    ChartBuildResult,
+    ChartBuildScheduler,
+    ChartRequest,
+    compute_chart,
+)
+from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager
+from harrix_swiss_knife.apps.finance.transaction_helpers import (
+    ChartComputeContext,
+    compute_balance_series,
+    compute_period_flow_by_category,
+    iter_period_end_dates,
+)
+
+if TYPE_CHECKING:
+    from harrix_swiss_knife.apps.common.synthetic_data import SyntheticDatabase
+
+
+@pytest.fixture
+def finance_years() -> int:
+    return 8
+
+
+def _request(database: SyntheticDatabase, db: DatabaseManager, kind: str, period: str = "Months") -> ChartRequest:
+    names = db.get_rows("SELECT name, type FROM categories")
+    return ChartRequest(
+        kind=kind,
+        period=period,
+        date_from=database.samples["date_from"],
+        date_to=database.samples["date_to"],
+        currency_symbol="₽",
+        expense_names=frozenset(name for name, category_type in names if category_type == 0),
+        income_names=frozenset(name for name, category_type in names if category_type == 1),
+        compare_count=2,
+        db_filename=str(database.path),
+    )
+
+
+def _run_until(predicate: Callable[[], bool], timeout_seconds: float = 30) -> list[float]:
+    """Spin the event loop until `predicate()` holds; return the gaps between 5 ms timer ticks."""
+    gaps: list[float] = []
+    last_tick = time.perf_counter()
+    loop = QEventLoop()
+
+    def tick() -> None:
+        nonlocal last_tick
+        now = time.perf_counter()
+        gaps.append(now - last_tick)
+        last_tick = now
+        if predicate() or sum(gaps) > timeout_seconds:
+            loop.quit()
+
+    timer = QTimer()
+    timer.setInterval(5)
+    timer.timeout.connect(tick)
+    timer.start()
+    loop.exec()
+    timer.stop()
+    return gaps
+
+
+def _run_superseded_requests(requests: list[ChartRequest]) -> tuple[list[ChartBuildResult], list[str], list[float]]:
+    """Start the first request, supersede it mid-run with the rest and return results, errors and tick gaps."""
+    scheduler = ChartBuildScheduler(interval_ms=20)
+    completed: list[ChartBuildResult] = []
+    failed: list[str] = []
+    scheduler.chart_completed.connect(completed.append)
+    scheduler.chart_failed.connect(failed.append)
+
+    # The first request starts computing, then rapid control changes supersede it mid-run
+    scheduler.request(requests[0])
+    _run_until(lambda: scheduler.busy and scheduler._pending is None)
+    for request in requests[1:]:
+        scheduler.request(request)
+    gaps = _run_until(lambda: not scheduler.busy)
+    scheduler.shutdown()
+    return completed, failed, gaps
+
+
+def test_compute_chart_matches_the_chart_helpers(finance_database: SyntheticDatabase) -> None:
+    db = DatabaseManager(str(finance_database.path))
+    try:
+        balance_request = _request(finance_database, db, "balance")
+        ctx = ChartComputeContext.load(db)
+        transactions = db.get_all_transactions()
+
+        balance = compute_chart(balance_request, db)
+        category = compute_chart(_request(finance_database, db, "category"), db)
+
+        assert balance is not None
+        assert category is not None
+        period_ends = iter_period_end_dates(balance_request.date_from, balance_request.date_to, "Months")
+        assert balance.data == compute_balance_series(
+            transactions, db.get_all_currency_exchanges(), db, period_ends, ctx=ctx
+        )
+        assert category.data == compute_period_flow_by_category(
+            transactions,
+            db,
+            balance_request.date_from,
+            balance_request.date_to,
+            "Months",
+            set(balance_request.all_names),
+            ctx=ctx,
+        )
+        for kind in CHART_KINDS:
+            result = compute_chart(_request(finance_database, db, kind), db)
+            assert result is not None
+            assert result.message is None
+        no_categories = ChartRequest("category", "Months", "2024-01-01", "2024-12-31", "₽")
+        assert compute_chart(no_categories, db) == ChartBuildResult(no_categories, message=NO_CATEGORIES_MESSAGE)
+        assert compute_chart(balance_request, db, should_stop=lambda: True) is None
+        with pytest.raises(ValueError, match="Unknown chart type"):
+            compute_chart(ChartRequest("pie", "Months", "2024-01-01", "2024-12-31", "₽"), db)
+    finally:
+        db.close()
+
+
+def test_scheduler_emits_only_the_latest_request(finance_database: SyntheticDatabase) -> None:
+    db = DatabaseManager(str(finance_database.path))
+    try:
+        requests = [_request(finance_database, db, kind, "Days") for kind in ("balance", "category", "balance")]
+    finally:
+        db.close()
+
+    completed, failed, _gaps = _run_superseded_requests(requests)
+    assert failed == []
+    assert [result.request for result in completed] == [requests[-1]]
+
+
+@pytest.mark.slow
+def test_scheduler_keeps_the_ui_responsive(finance_database: SyntheticDatabase) -> None:
+    db = DatabaseManager(str(finance_database.path))
+    try:
+        requests = [_request(finance_database, db, kind, "Days") for kind in ("balance", "category", "balance")]
+        started = time.perf_counter()
+        compute_chart(requests[-1], db)
+        blocking_seconds = time.perf_counter() - started
+    finally:
+        db.close()
+
+    _completed, failed, gaps = _run_superseded_requests(requests)
+    assert failed == []
+    assert max(gaps) < max(0.1, blocking_seconds / 2)
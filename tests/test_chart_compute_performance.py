@@ -1,19 +1,23 @@
 """Equivalence tests for the cached chart compute path vs the legacy DB path.
 
 Each `compute_*` chart helper is run twice: once with `ctx=None` (the legacy
-per-row DB lookups) and once with a preloaded :class:`ChartComputeContext`. The
-optimization must not change results, so the two outputs must match.
+per-row DB lookups) and once with a preloaded :class:`ChartComputeContext`, both
+with its NumPy columns and without them (per-row cached lookups). The
+optimization must not change results, so the outputs must match.
 """
 
 from __future__ import annotations
 
-from collections.abc import Iterator
+import dataclasses
+import time
+from collections.abc import Callable, Iterator
 from pathlib import Path
 from typing import Any
 
 import pytest
 from PySide6.QtWidgets import QApplication
 
+from harrix_swiss_knife.apps.common.synthetic_data import generate_database
 from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager
 from harrix_swiss_knife.apps.finance.transaction_helpers import (
     ChartComputeContext,
@@ -68,9 +72,12 @@ def finance_db(tmp_path: Path, qapp: QApplication) -> Iterator[DatabaseManager]:
     db.close()
 
 
-@pytest.fixture
-def chart_ctx(finance_db: DatabaseManager) -> ChartComputeContext:
-    return ChartComputeContext.load(finance_db)
+@pytest.fixture(params=["columns", "rows"])
+def chart_ctx(finance_db: DatabaseManager, request: pytest.FixtureRequest) -> ChartComputeContext:
+    ctx = ChartComputeContext.load(finance_db)
+    if request.param == "rows":
+        return dataclasses.replace(ctx, transactions=None, exchanges=None)
+    return ctx
 
 
 def _category_names(rows: list[list[Any]], category_type: int | None = None) -> set[str]:
@@ -196,3 +203,61 @@ def test_cumulative_compare_same_months_matches_legacy(
         compute_cumulative_compare_same_months(transactions, finance_db, 3, 2, names, 0, ctx=None),
         compute_cumulative_compare_same_months(transactions, finance_db, 3, 2, names, 0, ctx=chart_ctx),
     )
+
+
+@dataclasses.dataclass(frozen=True)
+class _TwoYearCharts:
+    """Balance and flow charts of two synthetic years, computable with or without context columns."""
+
+    charts: Callable[[ChartComputeContext], list[Any]]
+    rows_ctx: ChartComputeContext
+    columns_ctx: ChartComputeContext
+
+
+@pytest.fixture
+def two_year_charts(tmp_path: Path, qapp: QApplication) -> Iterator[_TwoYearCharts]:  # noqa: ARG001
+    database = generate_database("finance", tmp_path / "finance_2y.db", years=2)
+    db = DatabaseManager(str(database.path))
+    try:
+        transactions = db.get_all_transactions()
+        exchanges = db.get_all_currency_exchanges()
+        columns_ctx = ChartComputeContext.load(db)
+        names = _category_names(transactions)
+        date_from, date_to = database.samples["date_from"], database.samples["date_to"]
+        period_ends = iter_period_end_dates(date_from, date_to, "Days")
+
+        def charts(ctx: ChartComputeContext) -> list[Any]:
+            return [
+                compute_balance_series(transactions, exchanges, db, period_ends, ctx=ctx),
+                compute_period_flow_series(transactions, db, date_from, date_to, "Days", names, 0, ctx=ctx),
+                compute_period_flow_by_category(transactions, db, date_from, date_to, "Days", names, ctx=ctx),
+            ]
+
+        yield _TwoYearCharts(charts, dataclasses.replace(columns_ctx, transactions=None, exchanges=None), columns_ctx)
+    finally:
+        db.close()
+
+
+def _timed(run: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    run()
+    return time.perf_counter() - started
+
+
+def test_columns_path_matches_rows_path_on_two_years_of_data(two_year_charts: _TwoYearCharts) -> None:
+    expected_balance, expected_flow, expected_by_category = two_year_charts.charts(two_year_charts.rows_ctx)
+    balance, flow, by_category = two_year_charts.charts(two_year_charts.columns_ctx)
+
+    assert [value for _, value in balance] == pytest.approx([value for _, value in expected_balance])
+    assert [value for _, value in flow] == pytest.approx([value for _, value in expected_flow])
+    assert by_category.keys() == expected_by_category.keys()
+    for name, series in by_category.items():
+        assert [value for _, value in series] == pytest.approx([value for _, value in expected_by_category[name]])
+
+
+@pytest.mark.slow
+def test_columns_path_is_faster_on_two_years_of_data(two_year_charts: _TwoYearCharts) -> None:
+    rows_seconds = _timed(lambda: two_year_charts.charts(two_year_charts.rows_ctx))
+    columns_seconds = _timed(lambda: two_year_charts.charts(two_year_charts.columns_ctx))
+
+    assert columns_seconds < rows_seconds / 5
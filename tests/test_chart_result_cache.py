@@ -0,0 +1,141 @@
+"""Tests for the generation-keyed finance chart result cache and `DatabaseManager.data_generation`."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from harrix_swiss_knife.apps.finance.chart_build_worker import ChartBuildResult, ChartBuildScheduler, ChartRequest
+from harrix_swiss_knife.apps.finance.chart_result_cache import ChartResultCache
+from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager
+
+RUB, USD = 1, 2
+
+
+def _balance_request(db: DatabaseManager, empty_finance_db_path: Path, *, period: str = "Months") -> ChartRequest:
+    return ChartRequest(
+        kind="balance",
+        period=period,
+        date_from="2024-01-01",
+        date_to="2024-06-30",
+        currency_symbol="₽",
+        data_generation=db.data_generation(),
+        db_filename=str(empty_finance_db_path),
+    )
+
+
+def _wait_for(scheduler: ChartBuildScheduler, timeout_seconds: float = 10) -> None:
+    deadline = time.perf_counter() + timeout_seconds
+    while scheduler.busy and time.perf_counter() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.005)
+    QCoreApplication.processEvents()
+
+
+def _result(request: ChartRequest, points: int) -> ChartBuildResult:
+    return ChartBuildResult(request, [(f"2024-01-{day % 28 + 1:02d}", float(day)) for day in range(points)])
+
+
+def test_data_generation_advances_on_every_chart_data_write(
+    empty_finance_db: DatabaseManager, empty_finance_db_path: Path
+) -> None:
+    reader = DatabaseManager(str(empty_finance_db_path), read_only=True)
+    try:
+        generations = [empty_finance_db.data_generation()]
+        category_id = empty_finance_db.get_rows("SELECT MIN(_id) FROM categories WHERE type = 0")[0][0]
+        assert empty_finance_db.add_transaction(100.0, "Food", category_id, RUB, "2024-01-10")
+        generations.append(empty_finance_db.data_generation())
+        assert empty_finance_db.add_currency_exchange(USD, RUB, 10.0, 900.0, 90.0, 0.0, "2024-01-11")
+        generations.append(empty_finance_db.data_generation())
+        assert empty_finance_db.add_exchange_rate(RUB, 90.0, "2024-01-11")
+        generations.append(empty_finance_db.data_generation())
+        assert empty_finance_db.set_default_currency("USD")
+        generations.append(empty_finance_db.data_generation())
+
+        empty_finance_db.get_all_transactions()
+        reader.get_all_currency_exchanges()
+        assert empty_finance_db.data_generation() == generations[-1]
+        assert reader.data_generation() == generations[-1]
+        assert generations == sorted(set(generations))
+    finally:
+        reader.close()
+
+
+def test_scheduler_serves_repeated_requests_from_cache_until_an_edit(
+    empty_finance_db: DatabaseManager, empty_finance_db_path: Path
+) -> None:
+    category_id = empty_finance_db.get_rows("SELECT MIN(_id) FROM categories WHERE type = 1")[0][0]
+    assert empty_finance_db.add_exchange_rate(RUB, 90.0, "2024-01-01")
+    assert empty_finance_db.add_transaction(1000.0, "Salary", category_id, RUB, "2024-01-15")
+    scheduler = ChartBuildScheduler(interval_ms=0)
+    completed: list[ChartBuildResult] = []
+    scheduler.chart_completed.connect(completed.append)
+
+    monthly = _balance_request(empty_finance_db, empty_finance_db_path)
+    scheduler.request(monthly)
+    _wait_for(scheduler)
+    scheduler.request(_balance_request(empty_finance_db, empty_finance_db_path, period="Days"))
+    _wait_for(scheduler)
+    # Toggling back to the first chart is answered synchronously, without a worker
+    scheduler.request(monthly)
+    assert not scheduler.busy
+    assert completed[-1] is completed[0]
+    assert scheduler.cache.stats().hits == 1
+    assert scheduler.cache.stats().misses == 2
+
+    assert empty_finance_db.add_transaction(500.0, "Bonus", category_id, RUB, "2024-02-01")
+    edited = _balance_request(empty_finance_db, empty_finance_db_path)
+    assert edited != monthly
+    scheduler.request(edited)
+    assert scheduler.busy
+    _wait_for(scheduler)
+    scheduler.shutdown()
+
+    stats = scheduler.cache.stats()
+    assert (stats.hits, stats.misses, stats.stale, stats.size) == (1, 3, 2, 1)
+    assert stats.hit_rate == pytest.approx(0.25)
+    assert completed[0].data[-1][1] == pytest.approx(1000.0)
+    assert completed[-1].request == edited
+    assert completed[-1].data[-1][1] == pytest.approx(1500.0)
+
+
+def test_date_relative_charts_are_cached_per_day() -> None:
+    cache = ChartResultCache()
+    yesterday = ChartRequest("compare_last", "Months", "2024-01-01", "2024-12-31", "₽", today="2024-12-30")
+    cache.put(_result(yesterday, 10))
+
+    assert cache.get(yesterday) is not None
+    assert (
+        cache.get(ChartRequest("compare_last", "Months", "2024-01-01", "2024-12-31", "₽", today="2024-12-31")) is None
+    )
+
+
+def test_cache_evicts_least_recently_used_results_past_its_memory_budget() -> None:
+    requests = [ChartRequest("balance", "Days", "2024-01-01", f"2024-12-{day:02d}", "₽") for day in range(1, 11)]
+    cache = ChartResultCache(budget_bytes=110_000)
+
+    for request in requests[:4]:
+        cache.put(_result(request, 100))
+    assert cache.get(requests[0]) is not None
+    for request in requests[4:]:
+        cache.put(_result(request, 100))
+
+    stats = cache.stats()
+    assert 0 < stats.size_bytes <= stats.budget_bytes
+    assert stats.evictions == 10 - stats.size
+    assert cache.get(requests[0]) is not None
+    assert cache.get(requests[1]) is None
+    assert cache.get(requests[-1]) is not None
+
+    cache.put(_result(ChartRequest("balance", "Days", "2020-01-01", "2024-12-31", "₽"), 5000))
+    assert len(cache) == stats.size
+    # A result computed under an older generation than one already seen is not stored
+    cache.put(_result(ChartRequest("balance", "Days", "2024-01-01", "2024-12-31", "₽", data_generation=1), 10))
+    cache.put(_result(requests[1], 10))
+    assert (len(cache), cache.stats().stale) == (1, stats.size)
+    cache.clear()
+    cache.reset_stats()
+    assert cache.stats().size == cache.stats().hits == 0
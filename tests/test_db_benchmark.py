@@ -0,0 +1,105 @@
+"""Tests for the synthetic tracker databases and the `DatabaseManager` read benchmark."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from harrix_swiss_knife.apps.common.db_benchmark import (
+    BenchmarkResult,
+    benchmark_database,
+    compare_to_baselines,
+    discover_read_methods,
+    format_benchmark_report,
+    load_baselines,
+    manager_class_for,
+    run_benchmarks,
+    save_baselines,
+)
+from harrix_swiss_knife.apps.common.synthetic_data import SYNTHETIC_APPS, generate_database
+
+
+@pytest.fixture(scope="module")
+def qapp() -> QApplication:
+    app = QApplication.instance()
+    if app is None:
+        return QApplication([])
+    if not isinstance(app, QApplication):
+        msg = "QApplication.instance() returned a non-QApplication object."
+        raise TypeError(msg)
+    return app
+
+
+def _table_dump(path: Path) -> list[tuple[object, ...]]:
+    with sqlite3.connect(path) as connection:
+        tables = [row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        return [row for table in sorted(tables) for row in connection.execute(f'SELECT * FROM "{table}"')]
+
+
+def test_generated_databases_are_deterministic_and_scale_with_years(tmp_path: Path) -> None:
+    first = generate_database("finance", tmp_path / "a.db", years=0.5, seed=3)
+    second = generate_database("finance", tmp_path / "b.db", years=0.5, seed=3)
+    other_seed = generate_database("finance", tmp_path / "c.db", years=0.5, seed=4)
+    longer = generate_database("finance", tmp_path / "d.db", years=2, seed=3)
+
+    assert _table_dump(first.path) == _table_dump(second.path)
+    assert first.samples == second.samples
+    assert _table_dump(first.path) != _table_dump(other_seed.path)
+    assert 3.5 < longer.row_counts["transactions"] / first.row_counts["transactions"] < 4.5
+    assert longer.samples["date_to"] == "2025-12-31"
+
+
+def test_generate_database_rejects_unknown_app(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="Unknown app"):
+        generate_database("notes", tmp_path / "notes.db")
+
+
+@pytest.mark.parametrize("app", SYNTHETIC_APPS)
+def test_every_read_method_runs_on_synthetic_data(app: str, tmp_path: Path, qapp: QApplication) -> None:  # noqa: ARG001
+    database = generate_database(app, tmp_path / f"{app}.db", years=0.25)
+
+    run = benchmark_database(database, rounds=1)
+
+    assert run.skipped == {}
+    assert {result.method for result in run.results} == set(discover_read_methods(manager_class_for(app)))
+    assert all(result.median_ms >= 0 for result in run.results)
+
+
+def test_baselines_round_trip_and_flag_regressions(tmp_path: Path) -> None:
+    baseline_path = tmp_path / "benchmarks" / "baselines.json"
+    fast = BenchmarkResult(scale="1y", app="habits", method="get_all_habits", median_ms=2.0, min_ms=1.9, rounds=5)
+    tiny = BenchmarkResult(scale="1y", app="habits", method="get_habit_by_id", median_ms=0.1, min_ms=0.1, rounds=5)
+    save_baselines(baseline_path, [fast, tiny])
+    save_baselines(baseline_path, [BenchmarkResult("10y", "food", "get_all_food_items", 5.0, 4.0, 5)])
+
+    baselines = load_baselines(baseline_path)
+    assert baselines == {
+        "10y/food.get_all_food_items": 5.0,
+        "1y/habits.get_all_habits": 2.0,
+        "1y/habits.get_habit_by_id": 0.1,
+    }
+    assert json.loads(baseline_path.read_text(encoding="utf-8"))["version"] == 1
+
+    slower = [
+        BenchmarkResult("1y", "habits", "get_all_habits", 3.0, 2.9, 5),
+        BenchmarkResult("1y", "habits", "get_habit_by_id", 0.3, 0.3, 5),
+        BenchmarkResult("1y", "habits", "get_habits", 50.0, 50.0, 5),
+    ]
+    regressions = compare_to_baselines(slower, baselines, tolerance=0.25)
+
+    assert [(item.key, item.ratio) for item in regressions] == [("1y/habits.get_all_habits", 1.5)]
+    assert compare_to_baselines(slower, baselines, tolerance=0.6) == []
+    assert "REGRESSION" in format_benchmark_report(slower, baselines=baselines, regressions=regressions)
+
+
+@pytest.mark.slow
+def test_benchmark_ten_year_databases(tmp_path: Path, qapp: QApplication) -> None:  # noqa: ARG001
+    """Time every read method on ten years of data for all apps."""
+    run = run_benchmarks(tmp_path, years=(10,), rounds=3)
+
+    assert run.skipped == {}
+    assert {result.app for result in run.results} == set(SYNTHETIC_APPS)
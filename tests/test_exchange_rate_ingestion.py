@@ -0,0 +1,175 @@
+"""Tests for bulk exchange rate ingestion and `ExchangeRateUpdateWorker` with a local rate source."""
+
+from __future__ import annotations
+
+import time
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from harrix_swiss_knife.apps.finance.exchange_rate_worker import ExchangeRateUpdateWorker
+
+if TYPE_CHECKING:
+    from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager
+
+RUB, USD, EUR = 1, 2, 3
+
+
+class StubRateProvider:
+    """Serves closes from a dict instead of the network and records every request."""
+
+    def __init__(self, closes: dict[str, dict[str, float]]) -> None:
+        """Serve `closes` (closes by date, per ticker)."""
+        self.closes = closes
+        self.calls: list[tuple[str, date, date]] = []
+
+    def fetch_history(self, ticker: str, start: date, end: date) -> dict[str, float]:
+        """Return the known closes between `start` and `end`."""
+        self.calls.append((ticker, start, end))
+        known = self.closes.get(ticker, {})
+        return {day: close for day, close in known.items() if start.isoformat() <= day <= end.isoformat()}
+
+
+@pytest.fixture
+def daily_finance_db(empty_finance_db: DatabaseManager) -> DatabaseManager:
+    assert empty_finance_db.exchange_rates.set_storage_mode("daily")
+    return empty_finance_db
+
+
+def _rate_rows(db: DatabaseManager, currency_id: int) -> list[list[object]]:
+    return db.get_rows(
+        "SELECT date, rate FROM exchange_rates WHERE _id_currency = :id ORDER BY date", {"id": currency_id}
+    )
+
+
+def test_ingest_diffs_against_stored_rows_and_reports_batches(daily_finance_db: DatabaseManager) -> None:
+    assert daily_finance_db.add_exchange_rate(RUB, 90.0, "2024-01-02")
+    assert daily_finance_db.add_exchange_rate(RUB, 91.0, "2024-01-03")
+    progress: list[tuple[int, int]] = []
+
+    result = daily_finance_db.exchange_rates.ingest_exchange_rates(
+        RUB,
+        [
+            ("2024-01-05", 93.0),
+            ("2024-01-02", 90.05),
+            ("2024-01-03", 95.0),
+            ("2024-01-04", 0.0),
+            ("not a date", 1.0),
+            ("2024-01-01", 89.0),
+            ("2024-01-05", 94.0),
+            ("2024-01-06", float("nan")),
+        ],
+        min_relative_change=0.001,
+        batch_size=2,
+        on_batch=lambda written, total: progress.append((written, total)),
+    )
+
+    assert result.ok
+    assert result.inserted == [("2024-01-01", 89.0), ("2024-01-05", 94.0)]
+    assert result.updated == [("2024-01-03", 95.0)]
+    assert (result.unchanged, result.written) == (1, 3)
+    assert sorted(result.rejected) == ["2024-01-04", "2024-01-06", "not a date"]
+    assert progress == [(2, 3), (3, 3)]
+    assert _rate_rows(daily_finance_db, RUB) == [
+        ["2024-01-01", 89.0],
+        ["2024-01-02", 90.0],
+        ["2024-01-03", 95.0],
+        ["2024-01-05", 94.0],
+    ]
+    assert daily_finance_db.get_exchange_rate(RUB, USD, "2024-01-04") == 95.0
+
+    # Single-row writes upsert too, and the interval table follows every path
+    assert daily_finance_db.add_exchange_rate(RUB, 96.0, "2024-01-03")
+    assert daily_finance_db.update_exchange_rate(RUB, "2024-01-04", 97.0)
+    assert _rate_rows(daily_finance_db, RUB)[2:] == [["2024-01-03", 96.0], ["2024-01-04", 97.0], ["2024-01-05", 94.0]]
+    intervals = daily_finance_db.get_rows("SELECT * FROM exchange_rate_intervals ORDER BY _id_currency, valid_from")
+    assert daily_finance_db.exchange_rates.rebuild_rate_intervals()
+    assert (
+        daily_finance_db.get_rows("SELECT * FROM exchange_rate_intervals ORDER BY _id_currency, valid_from")
+        == intervals
+    )
+
+    assert not daily_finance_db.exchange_rates.ingest_exchange_rates(USD, {"2024-01-01": 1.0}).ok
+
+
+def test_failed_batch_rolls_back_the_whole_series(daily_finance_db: DatabaseManager) -> None:
+    assert daily_finance_db.execute_simple_query(
+        """CREATE TEMP TRIGGER reject_rate BEFORE INSERT ON exchange_rates
+           WHEN NEW.date = '2024-01-04' BEGIN SELECT RAISE(ABORT, 'rejected'); END"""
+    )
+
+    result = daily_finance_db.exchange_rates.ingest_exchange_rates(
+        EUR, {f"2024-01-0{day}": 0.9 for day in range(1, 6)}, batch_size=2
+    )
+
+    assert not result.ok
+    assert result.written == 0
+    assert _rate_rows(daily_finance_db, EUR) == []
+
+
+def test_worker_ingests_stub_rates_with_weekend_fallback(
+    empty_finance_db_path: Path, daily_finance_db: DatabaseManager, tmp_path: Path
+) -> None:
+    today = datetime.now(UTC).astimezone().date()
+    recent = (today - timedelta(days=1)).isoformat()
+    assert daily_finance_db.add_exchange_rate(EUR, 0.9, recent)
+    # 2024-01-05 is a Friday, 2024-01-08 a Monday
+    missing = ["2024-01-05", "2024-01-06", "2024-01-07", "2024-01-08", "2024-01-09"]
+    provider = StubRateProvider({"RUBUSD=X": {"2024-01-05": 0.011, "2024-01-08": 0.012}, "EURUSD=X": {recent: 0.95}})
+    worker = ExchangeRateUpdateWorker(
+        str(empty_finance_db_path),
+        [
+            (RUB, "RUB", {"missing_dates": missing, "existing_records": []}),
+            (EUR, "EUR", {"missing_dates": [], "existing_records": [(recent, 0.9)]}),
+        ],
+        provider=provider,
+        cache_dir=tmp_path / "rate_cache",
+    )
+    added: list[tuple[str, float, str]] = []
+    messages: list[str] = []
+    finished: list[tuple[int, int]] = []
+    worker.rates_added.connect(lambda code, rate, day: added.append((code, rate, day)))
+    worker.progress_updated.connect(messages.append)
+    worker.finished_success.connect(lambda processed, total: finished.append((processed, total)))
+
+    worker.run()
+
+    assert sorted(call[0] for call in provider.calls) == ["EURUSD=X", "RUBUSD=X"]
+    assert (daily_finance_db.get_currency_ticker(RUB), daily_finance_db.get_currency_ticker(EUR)) == (
+        "RUBUSD=X",
+        "EURUSD=X",
+    )
+    assert _rate_rows(daily_finance_db, RUB) == [
+        ["2024-01-05", 0.011],
+        ["2024-01-06", 0.011],
+        ["2024-01-07", 0.011],
+        ["2024-01-08", 0.012],
+    ]
+    assert _rate_rows(daily_finance_db, EUR) == [[recent, 0.95]]
+    assert worker.unresolved_rates == {"RUB": ["2024-01-09"]}
+    assert ("EUR", 0.95, recent) in added
+    assert len(added) == 5
+    assert finished == [(5, 6)]
+    assert "💾 RUB: wrote 4/4 rates" in messages
+
+
+@pytest.mark.slow
+def test_bulk_ingestion_beats_per_row_writes(daily_finance_db: DatabaseManager) -> None:
+    """Compare writing ten years of daily rates for two currencies row by row and as one ingestion."""
+    start = date(2015, 1, 1)
+    series = {(start + timedelta(days=offset)).isoformat(): 1 + offset / 10_000 for offset in range(3650)}
+
+    started = time.perf_counter()
+    for date_str, rate in series.items():
+        assert daily_finance_db.update_exchange_rate(RUB, date_str, rate)
+    per_row = time.perf_counter() - started
+
+    started = time.perf_counter()
+    result = daily_finance_db.ingest_exchange_rates(EUR, series)
+    bulk = time.perf_counter() - started
+
+    assert result.written == len(series)
+    assert _rate_rows(daily_finance_db, EUR) == [[date_str, rate] for date_str, rate in series.items()]
+    assert bulk < per_row
@@ -0,0 +1,103 @@
+"""Tests for `CategorySuggestIndex` against the pair-by-pair `suggest_categories` scoring."""
+
+from __future__ import annotations
+
+import random
+import time
+
+import pytest
+
+from harrix_swiss_knife.apps.finance.category_suggest import CategorySuggestIndex, suggest_categories
+
+_CATEGORIES = ["Cafe", "Food", "Transport", "Healthcare", "Household Goods", "Education", "Gifts", "Rent"]
+_ALIASES = {
+    "Cafe": ["Cafe", "Кафе"],
+    "Food": ["Food", "Еда"],
+    "Transport": ["Transport", "Транспорт"],
+    "Healthcare": ["Healthcare", "Здоровье"],
+    "Household Goods": ["Household Goods", "Хозтовары"],
+    "Education": ["Education", "Образование"],
+    "Gifts": ["Gifts", "Подарки"],
+    "Rent": ["Rent", "Аренда"],
+}
+_WORDS = (
+    "Магнит", "Пятёрочка", "Перекрёсток", "Такси", "Яндекс", "Метро", "Автобус", "Аптека", "Кофе", "Капучино",
+    "Обед", "Ужин", "Квартплата", "Интернет", "Телефон", "Книги", "Курсы", "Подарок", "Цветы", "Хлеб", "Молоко",
+    "Coffee", "Lunch", "Taxi", "Pharmacy", "Groceries", "Books", "Rent", "Flowers", "Bakery", "Dentist",
+)  # fmt: skip
+
+
+def _history(count: int, seed: int = 3) -> list[tuple[str, str, int]]:
+    rng = random.Random(seed)  # noqa: S311
+    pairs = []
+    for number in range(count):
+        words = rng.sample(_WORDS, rng.choice((1, 1, 2, 3)))
+        suffix = f" {number}" if number % 3 == 0 else ""
+        pairs.append((" ".join(words) + suffix, rng.choice(_CATEGORIES), rng.randint(1, 30)))
+    return pairs
+
+
+def _queries(history: list[tuple[str, str, int]], count: int, seed: int = 5) -> list[str]:
+    """Prefixes of past descriptions while typing, with typos, extra words and some noise."""
+    rng = random.Random(seed)  # noqa: S311
+    queries = ["кофе", "кафе", "подарки", "такси яндекс", "квартпл", "tea", "zzzz"]
+    for _ in range(count):
+        text = rng.choice(history)[0].lower()
+        text = text[: rng.randint(3, len(text))]
+        edit = rng.randrange(4)
+        position = rng.randrange(len(text))
+        if edit == 0 and position + 1 < len(text):
+            text = text[:position] + text[position + 1] + text[position] + text[position + 2 :]
+        elif edit == 1:
+            text = text[:position] + rng.choice("бвгджзюя") + text[position + 1 :]
+        elif edit == 2:
+            text = f"{text} {rng.choice(_WORDS).lower()}"
+        queries.append(text)
+    return queries
+
+
+def test_index_suggests_the_same_categories_as_a_full_scan() -> None:
+    history = _history(500)
+    index = CategorySuggestIndex(history)
+
+    for query in _queries(history, 100):
+        expected = suggest_categories(query, history, _CATEGORIES, category_aliases=_ALIASES)
+        assert index.suggest(query, _CATEGORIES, category_aliases=_ALIASES) == expected, query
+
+
+def test_added_pairs_update_suggestions() -> None:
+    history = [("Магнит", "Household Goods", 1), ("Магнит", "Food", 20)]
+    index = CategorySuggestIndex(history[:1])
+    assert index.suggest("магнит", _CATEGORIES)[0] == "Household Goods"
+
+    index.add("Магнит", "Food", 20)
+    index.add("Стоматолог", "Healthcare")
+    assert len(index) == 2
+    for query in ("магнит", "стоматолг", "магнит стоматолог"):
+        history_now = [*history, ("Стоматолог", "Healthcare", 1)]
+        assert index.suggest(query, _CATEGORIES) == suggest_categories(query, history_now, _CATEGORIES)
+    assert index.suggest("стоматолг", ["Food"]) == []
+
+    # Replacing the pairs also drops the token pair scores of the old descriptions
+    assert index._pair_scores
+    index.set_pairs(history[:1])
+    assert index._pair_scores == {}
+    assert index.suggest("магнит", _CATEGORIES) == suggest_categories("магнит", history[:1], _CATEGORIES)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("pair_count", [10_000, 100_000])
+def test_index_is_faster_than_a_full_scan(pair_count: int) -> None:
+    history = _history(pair_count)
+    index = CategorySuggestIndex(history)
+    queries = _queries(history, 20, seed=11)
+
+    started = time.perf_counter()
+    suggested = [index.suggest(query, _CATEGORIES, category_aliases=_ALIASES) for query in queries]
+    index_seconds = (time.perf_counter() - started) / len(queries)
+    started = time.perf_counter()
+    expected = [suggest_categories(query, history, _CATEGORIES, category_aliases=_ALIASES) for query in queries[:3]]
+    scan_seconds = (time.perf_counter() - started) / 3
+
+    assert suggested[:3] == expected
+    assert index_seconds < scan_seconds / 5
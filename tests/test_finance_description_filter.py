@@ -1,12 +1,27 @@
-"""Tests for Unicode-aware transaction description filtering."""
+"""Tests for Unicode-aware transaction description filtering and its full-text index."""
 
 from __future__ import annotations
 
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from harrix_swiss_knife.apps.common.qt_sqlite_connection import close_shared_read_only_pool
+from harrix_swiss_knife.apps.common.synthetic_data import generate_database
 from harrix_swiss_knife.apps.finance.database_manager import (
+    DatabaseManager,
     _description_matches_filter,
     _filter_rows_by_description,
 )
 
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QApplication
+
+RECOVER_SQL = Path(__file__).resolve().parents[1] / "src" / "harrix_swiss_knife" / "apps" / "finance" / "recover.sql"
+
 
 def test_description_matches_filter_cyrillic_case_insensitive() -> None:
     assert _description_matches_filter("Ветчина Для тостов «Клинский» нарезка", "Ветчина")
@@ -37,3 +52,101 @@ def test_filter_rows_by_description() -> None:
     ]
     filtered = _filter_rows_by_description(rows, "Ветчина")
     assert [row[0] for row in filtered] == [1, 3]
+    assert _filter_rows_by_description([[*rows[1], "Ham"]], "ham") == [[*rows[1], "Ham"]]
+
+
+@pytest.fixture
+def finance_db(tmp_path: Path, qapp: QApplication) -> Iterator[DatabaseManager]:  # noqa: ARG001
+    db_path = tmp_path / "finance.db"
+    assert DatabaseManager.create_database_from_sql(str(db_path), str(RECOVER_SQL))
+    db = DatabaseManager(str(db_path))
+    for index, (description, description_en) in enumerate(
+        [
+            ("Ветчина Для тостов «Клинский» нарезка", "Ham for toast"),
+            ("ВЕТЧИНА варёная", ""),
+            ("Влажный корм для кошек Schesir Тунец и ветчина 85\u0433", "Wet cat food"),
+            ("Молоко 2.5%", "MILK"),
+            ("Ёлочная игрушка", ""),
+            ('Book "Dune"', ""),
+        ]
+    ):
+        assert db.add_transaction(10.0 + index, description, 2, 1, f"2026-01-{index + 1:02d}", "", description_en)
+    yield db
+    db.close()
+    close_shared_read_only_pool(str(db_path))
+
+
+def _ids(rows: list[list]) -> list[int]:
+    return sorted(row[0] for row in rows)
+
+
+def _python_filtered_ids(db: DatabaseManager, description_filter: str) -> list[int]:
+    return _ids(_filter_rows_by_description(db.get_filtered_transactions(), description_filter))
+
+
+def test_indexed_filter_matches_russian_and_english_case_insensitively(finance_db: DatabaseManager) -> None:
+    assert finance_db.table_exists("transactions_fts")
+    ham_ids = _ids(finance_db.get_filtered_transactions(description_filter="ветчина"))
+
+    assert len(ham_ids) == 3
+    assert _ids(finance_db.get_filtered_transactions(description_filter="ВеТчИнА")) == ham_ids
+    assert len(finance_db.get_filtered_transactions(description_filter="ёлочная")) == 1
+    assert len(finance_db.get_filtered_transactions(description_filter="ham FOR")) == 1
+    assert len(finance_db.get_filtered_transactions(description_filter="milk")) == 1
+    assert len(finance_db.get_filtered_transactions(description_filter='"dune"')) == 1
+    second_page = finance_db.get_filtered_transactions(description_filter="ветчина", limit=1, offset=1)
+    assert second_page == finance_db.get_filtered_transactions(description_filter="ветчина")[1:2]
+    for description_filter in ("ветчина", "ВЕТЧИНА", "Клинский", "MILK", "food", "Ёл", "ёл", "%", "\u0430"):
+        assert _ids(finance_db.get_filtered_transactions(description_filter=description_filter)) == (
+            _python_filtered_ids(finance_db, description_filter)
+        ), description_filter
+
+
+def test_index_follows_inserts_updates_and_deletes(finance_db: DatabaseManager) -> None:
+    milk_id = finance_db.get_filtered_transactions(description_filter="молоко")[0][0]
+
+    assert finance_db.update_transaction(milk_id, 1.0, "Кефир", 2, 1, "2026-01-04", "", "Kefir")
+    assert finance_db.get_filtered_transactions(description_filter="молоко") == []
+    assert finance_db.get_filtered_transactions(description_filter="milk") == []
+    assert _ids(finance_db.get_filtered_transactions(description_filter="КЕФИР")) == [milk_id]
+    assert finance_db.update_transaction_description_en_by_description("Ёлочная игрушка", "Christmas toy")
+    assert len(finance_db.get_filtered_transactions(description_filter="christmas")) == 1
+    assert finance_db.add_transaction(5.0, "Молоко ультрапастеризованное", 2, 1, "2026-02-01")
+    assert len(finance_db.get_filtered_transactions(description_filter="молоко")) == 1
+    assert finance_db.delete_transaction(milk_id)
+    assert finance_db.get_filtered_transactions(description_filter="кефир") == []
+
+
+@pytest.mark.slow
+def test_indexed_filter_latency_grows_sub_linearly(tmp_path: Path, qapp: QApplication) -> None:  # noqa: ARG001
+    timings: dict[int, tuple[float, float]] = {}
+    for years in (2, 8):
+        database = generate_database("finance", tmp_path / f"finance_{years}y.db", years=years)
+        db = DatabaseManager(str(database.path))
+        try:
+            for day in range(1, 6):
+                assert db.add_transaction(1.0, f"Ветчина {day}", 2, 1, f"2020-01-{day:02d}")
+
+            def first_page(db: DatabaseManager = db) -> list[list]:
+                return db.get_filtered_transactions(description_filter="ВЕТЧИНА", limit=100)
+
+            indexed_seconds = _best_time(first_page)
+            db._description_index_available = False
+            python_seconds = _best_time(first_page)
+            timings[years] = (indexed_seconds, python_seconds)
+        finally:
+            db.close()
+            close_shared_read_only_pool(str(database.path))
+
+    large_indexed, large_python = timings[8]
+    assert large_indexed < timings[2][0] * 2
+    assert large_indexed * 10 < large_python
+
+
+def _best_time(call: Callable[[], object], repeats: int = 7) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - started)
+    return best
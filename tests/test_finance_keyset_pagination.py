@@ -0,0 +1,113 @@
+"""Tests for keyset (seek) pagination of finance transactions and exchange rates."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+import pytest
+
+from harrix_swiss_knife.apps.common.scroll_pagination import KeysetCursor
+
+if TYPE_CHECKING:
+    from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager
+
+BENCHMARK_ROWS = 200_000
+PAGE_SIZE = 100
+SMALL_PAGE_SIZE = 10
+
+
+def _fill_transactions(db: DatabaseManager, count: int) -> None:
+    # Several rows share each date, so the `_id` tie-breaker matters
+    rows = [
+        {
+            "amount": 100 + index,
+            "description": f"Row {index}",
+            "category_id": 2,
+            "currency_id": 1,
+            "date": f"20{10 + index % 15:02d}-{index % 12 + 1:02d}-{index % 28 + 1:02d}",
+        }
+        for index in range(count)
+    ]
+    assert db.execute_many(
+        """INSERT INTO transactions (amount, description, _id_categories, _id_currencies, date)
+           VALUES (:amount, :description, :category_id, :currency_id, :date)""",
+        rows,
+    )
+
+
+def _keyset_pages(fetch_page: Callable[[int, KeysetCursor | None], list[list]], date_index: int) -> list[list]:
+    rows: list[list] = []
+    after: KeysetCursor | None = None
+    while True:
+        page = fetch_page(SMALL_PAGE_SIZE, after)
+        rows.extend(page)
+        if len(page) < SMALL_PAGE_SIZE:
+            return rows
+        after = KeysetCursor.from_row(page[-1], date_index=date_index)
+
+
+def test_transactions_keyset_pages_match_offset_order(empty_finance_db: DatabaseManager) -> None:
+    _fill_transactions(empty_finance_db, 95)
+
+    expected = empty_finance_db.get_all_transactions()
+    paged = _keyset_pages(lambda limit, after: empty_finance_db.get_all_transactions(limit=limit, after=after), 5)
+
+    assert paged == expected
+
+
+def test_filtered_transactions_keyset_pages_match(empty_finance_db: DatabaseManager) -> None:
+    _fill_transactions(empty_finance_db, 95)
+    filters = {"date_from": "2012-01-01", "date_to": "2020-12-31", "description_filter": "row 1"}
+
+    expected = empty_finance_db.get_filtered_transactions(**filters)
+    paged = _keyset_pages(
+        lambda limit, after: empty_finance_db.get_filtered_transactions(**filters, limit=limit, after=after), 5
+    )
+
+    assert expected
+    assert paged == expected
+
+
+def test_exchange_rates_keyset_pages_match(empty_finance_db: DatabaseManager) -> None:
+    rows = [
+        {"currency_id": 1 + index % 3, "rate": 1.0 + index, "date": f"2024-01-{index % 9 + 1:02d}"}
+        for index in range(40)
+    ]
+    assert empty_finance_db.execute_many(
+        "INSERT OR IGNORE INTO exchange_rates (_id_currency, rate, date) VALUES (:currency_id, :rate, :date)", rows
+    )
+
+    expected = empty_finance_db.get_all_exchange_rates()
+    paged = _keyset_pages(lambda limit, after: empty_finance_db.get_all_exchange_rates(limit=limit, after=after), 4)
+
+    assert paged == expected
+
+
+@pytest.mark.slow
+def test_keyset_page_latency_is_constant_at_deep_offsets(empty_finance_db: DatabaseManager) -> None:
+    """Compare per-page latency of OFFSET and keyset seeks near the start and deep in the table."""
+    _fill_transactions(empty_finance_db, BENCHMARK_ROWS)
+    deep_offset = BENCHMARK_ROWS - 10 * PAGE_SIZE
+    deep_row = empty_finance_db.get_all_transactions(limit=1, offset=deep_offset - 1)[0]
+    shallow_row = empty_finance_db.get_all_transactions(limit=1, offset=PAGE_SIZE - 1)[0]
+    repeats = 20
+
+    def timed(fetch: Callable[[], list[list]]) -> float:
+        started = time.perf_counter()
+        for _ in range(repeats):
+            fetch()
+        return (time.perf_counter() - started) / repeats
+
+    offset_deep = timed(lambda: empty_finance_db.get_all_transactions(limit=PAGE_SIZE, offset=deep_offset))
+    shallow_cursor = KeysetCursor.from_row(shallow_row, date_index=5)
+    deep_cursor = KeysetCursor.from_row(deep_row, date_index=5)
+    keyset_shallow = timed(lambda: empty_finance_db.get_all_transactions(limit=PAGE_SIZE, after=shallow_cursor))
+    keyset_deep = timed(lambda: empty_finance_db.get_all_transactions(limit=PAGE_SIZE, after=deep_cursor))
+
+    assert empty_finance_db.get_all_transactions(
+        limit=PAGE_SIZE, after=deep_cursor
+    ) == empty_finance_db.get_all_transactions(limit=PAGE_SIZE, offset=deep_offset)
+    assert keyset_deep < offset_deep
+    assert keyset_deep < keyset_shallow * 5
@@ -0,0 +1,166 @@
+"""Tests for the trigger-maintained `exchange_rate_intervals` table used by finance currency conversion."""
+
+from __future__ import annotations
+
+import random
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from harrix_swiss_knife.apps.common.synthetic_data import generate_database
+from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager
+
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QApplication
+
+RUB, USD, EUR = 1, 2, 3
+_INSERT_TRANSACTION = """INSERT INTO transactions (amount, description, _id_categories, _id_currencies, date)
+                         VALUES (:amount, 'Row', :category_id, :currency_id, :date)"""
+
+
+def _intervals(db: DatabaseManager) -> list[list[object]]:
+    return db.get_rows(
+        "SELECT _id_currency, valid_from, valid_to, rate FROM exchange_rate_intervals ORDER BY _id_currency, valid_from"
+    )
+
+
+def _legacy_totals(db: DatabaseManager, currency_id: int, *, use_transaction_date: bool = True) -> tuple[float, float]:
+    """Income and expenses computed with the correlated `MAX(date)` joins the interval table replaced."""
+    rate_date = "t.date" if use_transaction_date else "date('now')"
+    if currency_id == USD:
+        join_clause = f"""
+            LEFT JOIN exchange_rates er ON er._id_currency = t._id_currencies AND er.date = (
+                SELECT MAX(date) FROM exchange_rates er2
+                WHERE er2._id_currency = t._id_currencies AND er2.date <= {rate_date}
+            )"""
+        conversion = (
+            "CASE WHEN t._id_currencies = :currency_id THEN t.amount ELSE COALESCE(er.rate * t.amount, t.amount) END"
+        )
+    else:
+        join_clause = f"""
+            LEFT JOIN exchange_rates source_er ON source_er._id_currency = t._id_currencies AND source_er.date = (
+                SELECT MAX(date) FROM exchange_rates ser2
+                WHERE ser2._id_currency = t._id_currencies AND ser2.date <= {rate_date}
+            )
+            LEFT JOIN exchange_rates target_er ON target_er._id_currency = :currency_id AND target_er.date = (
+                SELECT MAX(date) FROM exchange_rates ter2
+                WHERE ter2._id_currency = :currency_id AND ter2.date <= {rate_date}
+            )"""
+        conversion = """CASE
+            WHEN t._id_currencies = :currency_id THEN t.amount
+            WHEN t._id_currencies = :usd_currency_id THEN COALESCE(t.amount / NULLIF(target_er.rate, 0), t.amount)
+            ELSE COALESCE(source_er.rate * t.amount / NULLIF(target_er.rate, 0), t.amount)
+        END"""
+    totals = []
+    for category_type in (1, 0):
+        rows = db.get_rows(
+            f"""SELECT SUM({conversion}) FROM transactions t
+                JOIN categories cat ON t._id_categories = cat._id
+                {join_clause}
+                WHERE cat.type = :category_type""",
+            {"currency_id": currency_id, "usd_currency_id": USD, "category_type": category_type},
+        )
+        totals.append(float(rows[0][0] or 0) / 100)
+    return totals[0], totals[1]
+
+
+def test_intervals_follow_every_rate_write_path(empty_finance_db: DatabaseManager) -> None:
+    rates = empty_finance_db.exchange_rates
+    assert rates.add_exchange_rate(RUB, 90.0, "2024-01-10")
+    assert rates.add_exchange_rate(RUB, 91.0, "2024-01-20")
+    assert rates.add_exchange_rate(RUB, 89.0, "2024-01-05")
+    assert rates.add_exchange_rate(EUR, 0.9, "2024-01-10")
+    assert _intervals(empty_finance_db) == [
+        [RUB, "2024-01-05", "2024-01-10", 89.0],
+        [RUB, "2024-01-10", "2024-01-20", 90.0],
+        [RUB, "2024-01-20", "9999-12-31", 91.0],
+        [EUR, "2024-01-10", "9999-12-31", 0.9],
+    ]
+
+    assert rates.update_exchange_rate(RUB, "2024-01-10", 95.0)
+    assert rates.update_exchange_rate(RUB, "2024-01-15", 96.0)
+    assert empty_finance_db.execute_many(
+        "INSERT INTO exchange_rates (_id_currency, rate, date) VALUES (:currency_id, :rate, :date)",
+        [{"currency_id": EUR, "rate": 0.8 + day / 100, "date": f"2024-02-{day:02d}"} for day in range(1, 11)],
+    )
+    assert empty_finance_db.execute_simple_query(
+        "UPDATE exchange_rates SET date = '2024-03-01' WHERE date = '2024-01-05'"
+    )
+    rate_id = empty_finance_db.get_rows(
+        "SELECT _id FROM exchange_rates WHERE _id_currency = :id AND date = '2024-01-20'", {"id": RUB}
+    )
+    assert rates.delete_exchange_rate(rate_id[0][0])
+    assert empty_finance_db.execute_simple_query("UPDATE exchange_rates SET rate = 0 WHERE date = '2024-02-05'")
+    assert rates.clean_invalid_exchange_rates() == 1
+
+    incremental = _intervals(empty_finance_db)
+    assert [RUB, "2024-01-15", "2024-03-01", 96.0] in incremental
+    assert [EUR, "2024-02-04", "2024-02-06"] in [row[:3] for row in incremental]
+    assert rates.rebuild_rate_intervals()
+    assert _intervals(empty_finance_db) == incremental
+
+
+@pytest.mark.parametrize("currency_id", [RUB, USD, EUR])
+def test_conversion_matches_legacy_correlated_sql(empty_finance_db: DatabaseManager, currency_id: int) -> None:
+    rng = random.Random(7)  # noqa: S311
+    assert empty_finance_db.execute_many(
+        "INSERT INTO exchange_rates (_id_currency, rate, date) VALUES (:currency_id, :rate, :date)",
+        [
+            {"currency_id": rate_currency, "rate": rng.uniform(0.5, 100), "date": f"2024-{month:02d}-{day:02d}"}
+            for rate_currency in (RUB, EUR)
+            for month in range(2, 13)
+            for day in (1, 9, 17)
+            if rng.random() < 0.8
+        ],
+    )
+    expense_category, income_category = (
+        1,
+        empty_finance_db.get_rows("SELECT MIN(_id) FROM categories WHERE type = 1")[0][0],
+    )
+    # Rows dated before the first rate, between rate dates and after the last one
+    assert empty_finance_db.execute_many(
+        _INSERT_TRANSACTION,
+        [
+            {
+                "amount": rng.randint(100, 100_000),
+                "category_id": rng.choice((expense_category, income_category)),
+                "currency_id": rng.choice((RUB, USD, EUR, 4)),
+                "date": f"{rng.choice((2023, 2024, 2024, 2025))}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            }
+            for _ in range(400)
+        ],
+    )
+
+    for use_transaction_date in (True, False):
+        expected = _legacy_totals(empty_finance_db, currency_id, use_transaction_date=use_transaction_date)
+        actual = empty_finance_db.get_income_vs_expenses_in_currency(
+            currency_id, use_latest_rates=not use_transaction_date
+        )
+        assert actual == pytest.approx(expected)
+    assert sum(
+        empty_finance_db.get_category_totals_in_currency(currency_id, "2000-01-01", "2100-01-01", 0).values()
+    ) == (pytest.approx(_legacy_totals(empty_finance_db, currency_id)[1]))
+
+
+@pytest.mark.slow
+def test_rate_intervals_speed_up_ten_year_totals(tmp_path: Path, qapp: QApplication) -> None:  # noqa: ARG001
+    """Compare income/expense totals over ten years of data with the legacy correlated joins."""
+    database = generate_database("finance", tmp_path / "finance_10y.db", years=10)
+    db = DatabaseManager(str(database.path))
+    try:
+
+        def timed(run: object) -> float:
+            started = time.perf_counter()
+            for _ in range(3):
+                run()  # type: ignore[operator]
+            return (time.perf_counter() - started) / 3
+
+        for currency_id in (RUB, USD, EUR):
+            legacy = timed(lambda currency_id=currency_id: _legacy_totals(db, currency_id))
+            current = timed(lambda currency_id=currency_id: db.get_income_vs_expenses_in_currency(currency_id))
+            assert db.get_income_vs_expenses_in_currency(currency_id) == pytest.approx(_legacy_totals(db, currency_id))
+            assert current < legacy
+    finally:
+        db.close()
@@ -0,0 +1,230 @@
+"""Tests for `observed` exchange rate storage: compaction of forward-filled rows and as-of coverage."""
+
+from __future__ import annotations
+
+import itertools
+import random
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from harrix_swiss_knife.apps.common.synthetic_data import generate_database
+from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager
+
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QApplication
+
+    from harrix_swiss_knife.apps.common.schema_migrations import SchemaMigration
+
+
+RUB, USD, EUR = 1, 2, 3
+_INSERT_TRANSACTION = """INSERT INTO transactions (amount, description, _id_categories, _id_currencies, date)
+                         VALUES (:amount, 'Row', :category_id, :currency_id, :date)"""
+
+
+class DailyStorageDatabaseManager(DatabaseManager):
+    """Finance database without the migration that switches to observed storage."""
+
+    def _schema_migrations(self) -> list[SchemaMigration]:
+        return [migration for migration in super()._schema_migrations() if migration.version != 9]
+
+
+def _rate_rows(db: DatabaseManager, currency_id: int) -> list[list[object]]:
+    return db.get_rows(
+        "SELECT date, rate FROM exchange_rates WHERE _id_currency = :id ORDER BY date, _id", {"id": currency_id}
+    )
+
+
+def _lookups(db: DatabaseManager, dates: list[str | None]) -> list[float]:
+    preloaded = db.exchange_rates.preload_all_rates()
+    values: list[float] = []
+    for from_id, to_id in ((RUB, USD), (USD, EUR), (EUR, RUB)):
+        for day in dates:
+            values.append(db.get_exchange_rate(from_id, to_id, day))
+            values.append(preloaded.get_exchange_rate(from_id, to_id, day))
+    for currency_id in (RUB, USD, EUR):
+        values.extend(db.get_income_vs_expenses_in_currency(currency_id))
+        values.extend(db.get_income_vs_expenses_in_currency(currency_id, use_latest_rates=True))
+    return values
+
+
+def test_compaction_keeps_every_lookup_identical(empty_finance_db: DatabaseManager) -> None:
+    rates = empty_finance_db.exchange_rates
+    assert rates.set_storage_mode("daily")
+    rng = random.Random(12)  # noqa: S311
+    start = date(2024, 1, 1)
+    days = [start + timedelta(days=offset) for offset in range(120)]
+    # Weekday quotes that often repeat, as published rates do over holidays
+    rate_rows = [
+        {"currency_id": currency_id, "rate": rng.choice((0.9, 1.1, 1.25, 90.5)), "date": day.isoformat()}
+        for currency_id in (RUB, EUR)
+        for day in days
+        if day.weekday() < 5 and rng.random() < 0.6
+    ]
+    assert empty_finance_db.execute_many(
+        "INSERT INTO exchange_rates (_id_currency, rate, date) VALUES (:currency_id, :rate, :date)", rate_rows
+    )
+    expense_category, income_category = (
+        1,
+        empty_finance_db.get_rows("SELECT MIN(_id) FROM categories WHERE type = 1")[0][0],
+    )
+    assert empty_finance_db.execute_many(
+        _INSERT_TRANSACTION,
+        [
+            {
+                "amount": rng.randint(100, 100_000),
+                "category_id": rng.choice((expense_category, income_category)),
+                "currency_id": rng.choice((RUB, USD, EUR)),
+                "date": rng.choice(days).isoformat(),
+            }
+            for _ in range(200)
+        ],
+    )
+    assert rates.fill_missing_exchange_rates() > 0
+    daily_rows = empty_finance_db.get_rows("SELECT COUNT(*) FROM exchange_rates")[0][0]
+    lookup_dates: list[str | None] = [None, "2023-12-31", *[day.isoformat() for day in days[::3]], "2030-01-01"]
+    expected = _lookups(empty_finance_db, lookup_dates)
+    expected_by_date = [rates.get_currency_exchange_rate_by_date(EUR, day.isoformat()) for day in days[10:]]
+
+    assert rates.set_storage_mode("observed")
+
+    compacted_rows = empty_finance_db.get_rows("SELECT COUNT(*) FROM exchange_rates")[0][0]
+    assert compacted_rows < daily_rows / 2
+    assert _lookups(empty_finance_db, lookup_dates) == expected
+    assert [rates.get_currency_exchange_rate_by_date(EUR, day.isoformat()) for day in days[10:]] == expected_by_date
+    for currency_id in (RUB, EUR):
+        rows = _rate_rows(empty_finance_db, currency_id)
+        assert all(previous[1] != row[1] for previous, row in itertools.pairwise(rows[:-1]))
+    assert rates.fill_missing_exchange_rates() == 0
+
+
+def test_observed_writes_keep_only_rate_changes(empty_finance_db: DatabaseManager) -> None:
+    rates = empty_finance_db.exchange_rates
+    assert rates.get_storage_mode() == "observed"
+    assert rates.add_exchange_rate(RUB, 90.0, "2024-03-01")
+    assert rates.add_exchange_rate(RUB, 90.0, "2024-03-02")
+    assert _rate_rows(empty_finance_db, RUB) == [["2024-03-01", 90.0], ["2024-03-02", 90.0]]
+
+    # The previous latest row stops being the marker and repeats its predecessor
+    assert rates.add_exchange_rate(RUB, 90.0, "2024-03-03")
+    assert rates.add_exchange_rate(RUB, 91.0, "2024-03-04")
+    assert _rate_rows(empty_finance_db, RUB) == [["2024-03-01", 90.0], ["2024-03-04", 91.0]]
+
+    assert rates.add_exchange_rate(RUB, 90.0, "2024-03-02")
+    assert rates.update_exchange_rate(RUB, "2024-03-04", 90.0)
+    assert rates.add_exchange_rate(RUB, 92.0, "2024-03-06")
+    assert _rate_rows(empty_finance_db, RUB) == [["2024-03-01", 90.0], ["2024-03-06", 92.0]]
+    assert rates.update_exchange_rate(RUB, "2024-03-05", 90.0)
+    assert _rate_rows(empty_finance_db, RUB) == [["2024-03-01", 90.0], ["2024-03-06", 92.0]]
+
+    assert [rates.check_exchange_rate_exists(RUB, day) for day in ("2024-02-29", "2024-03-03", "2024-03-06")] == [
+        False,
+        True,
+        True,
+    ]
+    assert not rates.check_exchange_rate_exists(RUB, "2024-03-07")
+    assert rates.get_currency_exchange_rate_by_date(RUB, "2024-03-04") == 90.0
+    assert rates.get_currency_exchange_rate_by_date(RUB, "2024-03-07") == 1.0
+    missing = rates.get_missing_exchange_rates_info("2024-02-28", "2024-03-08")
+    assert missing[RUB] == ["2024-02-28", "2024-02-29", "2024-03-07", "2024-03-08"]
+    assert len(missing[EUR]) == 10
+
+    intervals = empty_finance_db.get_rows("SELECT * FROM exchange_rate_intervals ORDER BY _id_currency, valid_from")
+    assert rates.rebuild_rate_intervals()
+    assert (
+        empty_finance_db.get_rows("SELECT * FROM exchange_rate_intervals ORDER BY _id_currency, valid_from")
+        == intervals
+    )
+    assert not rates.set_storage_mode("weekly")
+
+
+def test_observed_coverage_reports_unchecked_gaps(empty_finance_db: DatabaseManager) -> None:
+    rates = empty_finance_db.exchange_rates
+    march = {f"2024-03-0{day}": 90.0 for day in range(1, 6)}
+    april = {f"2024-04-0{day}": 91.0 for day in range(1, 6)}
+    assert rates.ingest_exchange_rates(RUB, march).ok
+    assert rates.ingest_exchange_rates(RUB, april).ok
+
+    # Rates on both sides of the gap do not make the never-fetched days covered
+    assert rates.check_exchange_rate_exists(RUB, "2024-03-05")
+    assert not rates.check_exchange_rate_exists(RUB, "2024-03-06")
+    assert not rates.check_exchange_rate_exists(RUB, "2024-03-31")
+    assert rates.check_exchange_rate_exists(RUB, "2024-04-01")
+    missing = rates.get_missing_exchange_rates_info("2024-03-04", "2024-04-02")
+    assert missing[RUB] == [f"2024-03-{day:02d}" for day in range(6, 32)]
+
+    # Fetching the gap adds no rate changes but records the days as checked
+    gap = {f"2024-03-{day:02d}": 90.0 for day in range(6, 32)}
+    assert rates.ingest_exchange_rates(RUB, gap).ok
+    assert _rate_rows(empty_finance_db, RUB) == [["2024-03-01", 90.0], ["2024-04-01", 91.0], ["2024-04-05", 91.0]]
+    assert RUB not in rates.get_missing_exchange_rates_info("2024-03-01", "2024-04-05")
+    assert empty_finance_db.get_rows(
+        "SELECT date_from, date_to FROM exchange_rate_coverage WHERE _id_currency = :id", {"id": RUB}
+    ) == [["2024-03-01", "2024-04-05"]]
+
+    rate_id = empty_finance_db.get_rows(
+        "SELECT _id FROM exchange_rates WHERE _id_currency = :id AND date = '2024-04-01'", {"id": RUB}
+    )[0][0]
+    assert rates.delete_exchange_rate(rate_id)
+    assert not rates.check_exchange_rate_exists(RUB, "2024-04-01")
+    assert rates.check_exchange_rate_exists(RUB, "2024-04-02")
+
+
+@pytest.mark.slow
+def test_observed_storage_shrinks_table_and_speeds_up_updates(tmp_path: Path, qapp: QApplication) -> None:  # noqa: ARG001
+    """Compare ten years of daily-stored rates with the same history after compaction."""
+    daily_path = generate_database("finance", tmp_path / "daily.db", years=10).path
+    observed_path = generate_database("finance", tmp_path / "observed.db", years=10).path
+    daily = DailyStorageDatabaseManager(str(daily_path))
+    started = time.perf_counter()
+    observed = DatabaseManager(str(observed_path))
+    migration_seconds = time.perf_counter() - started
+    try:
+        # Bring the daily layout up to today first so only the steady-state update is timed
+        daily.fill_missing_exchange_rates()
+        daily_rows = daily.get_rows("SELECT COUNT(*) FROM exchange_rates")[0][0]
+        observed_rows = observed.get_rows("SELECT COUNT(*) FROM exchange_rates")[0][0]
+
+        def weekly_update(db: DatabaseManager) -> float:
+            week_start = date.today() + timedelta(days=1)  # noqa: DTZ011
+            started = time.perf_counter()
+            for currency_id in (RUB, EUR):
+                previous = db.exchange_rates.get_usd_to_currency_rate(currency_id)
+                for offset in range(7):
+                    day = week_start + timedelta(days=offset)
+                    rate = previous if day.weekday() >= 5 else round(previous * 1.001, 6)
+                    db.add_exchange_rate(currency_id, rate, day.isoformat())
+                    previous = rate
+            db.fill_missing_exchange_rates()
+            return time.perf_counter() - started
+
+        daily_update, observed_update = weekly_update(daily), weekly_update(observed)
+
+        rng = random.Random(5)  # noqa: S311
+        lookup_dates: list[str | None] = [
+            (date(2016, 1, 1) + timedelta(days=rng.randint(0, 4000))).isoformat() for _ in range(300)
+        ]
+
+        def timed_lookups(db: DatabaseManager) -> tuple[float, list[float]]:
+            db.invalidate_result_cache()
+            db.exchange_rates.clear_cache()
+            started = time.perf_counter()
+            values = _lookups(db, lookup_dates)
+            return time.perf_counter() - started, values
+
+        daily_lookup, daily_values = timed_lookups(daily)
+        observed_lookup, observed_values = timed_lookups(observed)
+
+        assert observed_values == pytest.approx(daily_values)
+        assert observed_rows < daily_rows * 0.8
+        assert observed_update < daily_update
+        # As-of lookups seek the interval table, so fewer rows must not make them slower
+        assert observed_lookup < daily_lookup * 2
+        # Compacting ten years of history happens once, while the database opens
+        assert migration_seconds < 10
+    finally:
+        daily.close()
+        observed.close()
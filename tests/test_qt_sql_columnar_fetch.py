@@ -0,0 +1,105 @@
+"""Tests for the column-oriented fetch path of `QtSqliteDatabaseManagerBase`."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from harrix_swiss_knife.apps.common.qt_database_manager_base import QtSqliteDatabaseManagerBase
+
+BENCHMARK_ROWS = 200_000
+
+
+@pytest.fixture
+def qapp() -> QApplication:
+    """Ensure a QApplication exists for Qt SQL drivers."""
+    app = QApplication.instance()
+    if app is None:
+        return QApplication([])
+    if not isinstance(app, QApplication):
+        msg = "QApplication.instance() returned a non-QApplication object."
+        raise TypeError(msg)
+    return app
+
+
+@pytest.fixture
+def manager(tmp_path: Path, qapp: QApplication) -> Iterator[QtSqliteDatabaseManagerBase]:
+    del qapp
+    db = QtSqliteDatabaseManagerBase(prefix="test_columns", db_filename=str(tmp_path / "columns.db"))
+    assert db.execute_simple_query(
+        "CREATE TABLE transactions (_id INTEGER PRIMARY KEY, amount INTEGER, date TEXT, description TEXT)"
+    )
+    yield db
+    db.close()
+
+
+def _fill(manager: QtSqliteDatabaseManagerBase, count: int) -> None:
+    rows = [(index * 10, f"2024-01-{index % 28 + 1:02d}", f"row {index}") for index in range(count)]
+    assert manager.execute_many("INSERT INTO transactions (amount, date, description) VALUES (?, ?, ?)", rows)
+
+
+def test_get_columns_matches_get_rows(manager: QtSqliteDatabaseManagerBase) -> None:
+    _fill(manager, 50)
+    query = "SELECT _id, amount, date FROM transactions WHERE amount >= :min_amount ORDER BY _id"
+    rows = manager.get_rows(query, {"min_amount": 100})
+
+    columns = manager.get_columns(query, {"min_amount": 100})
+
+    assert len(columns) == 3
+    assert [list(row) for row in zip(*columns, strict=True)] == rows
+
+
+def test_get_columns_read_only_matches_qt_path(manager: QtSqliteDatabaseManagerBase) -> None:
+    _fill(manager, 30)
+    query = "SELECT _id, amount, date, description FROM transactions WHERE date >= :date_from ORDER BY date, _id"
+
+    qt_columns = manager.get_columns(query, {"date_from": "2024-01-10"})
+    ro_columns = manager.get_columns(query, {"date_from": "2024-01-10"}, read_only=True)
+
+    assert qt_columns == ro_columns
+
+
+def test_get_columns_dtypes_return_numpy_arrays(manager: QtSqliteDatabaseManagerBase) -> None:
+    _fill(manager, 5)
+
+    ids, amounts, dates = manager.get_columns(
+        "SELECT _id, amount, date FROM transactions ORDER BY _id", dtypes=["int64", "float64"]
+    )
+
+    assert isinstance(ids, np.ndarray)
+    assert ids.dtype == np.int64
+    assert isinstance(amounts, np.ndarray)
+    assert amounts.dtype == np.float64
+    assert amounts.tolist() == [0.0, 10.0, 20.0, 30.0, 40.0]
+    assert isinstance(dates, list)
+
+
+@pytest.mark.parametrize("read_only", [False, True])
+def test_get_columns_empty_result_keeps_column_count(manager: QtSqliteDatabaseManagerBase, *, read_only: bool) -> None:
+    columns = manager.get_columns("SELECT _id, amount FROM transactions", read_only=read_only)
+    assert columns == ([], [])
+
+
+@pytest.mark.slow
+def test_columnar_fetch_benchmark(manager: QtSqliteDatabaseManagerBase) -> None:
+    """Compare row-wise and column-wise fetch of a synthetic 200k-row table."""
+    _fill(manager, BENCHMARK_ROWS)
+    query = "SELECT _id, amount, date, description FROM transactions"
+
+    started = time.perf_counter()
+    rows = manager.get_rows(query)
+    rows_seconds = time.perf_counter() - started
+
+    qt_columns = manager.get_columns(query)
+
+    started = time.perf_counter()
+    ro_columns = manager.get_columns(query, dtypes=["int64", "int64"], read_only=True)
+    ro_columns_seconds = time.perf_counter() - started
+
+    assert len(rows) == len(qt_columns[0]) == len(ro_columns[0]) == BENCHMARK_ROWS
+    assert ro_columns_seconds < rows_seconds
@@ -0,0 +1,168 @@
+"""Tests for the opt-in SQL profiler hooked into `qt_sql_runner`."""
+
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from harrix_swiss_knife.apps.common.qt_database_manager_base import QtSqliteDatabaseManagerBase
+from harrix_swiss_knife.apps.common.qt_sql_profiler import (
+    QtSqlProfiler,
+    active_sql_profiler,
+    disable_sql_profiling,
+    enable_sql_profiling,
+    format_sql_profile_report,
+    load_slow_query_log,
+    slow_query_log_stats,
+    sql_fingerprint,
+    sql_profile_cycle,
+)
+
+
+@pytest.fixture(scope="module")
+def qapp() -> QApplication:
+    app = QApplication.instance()
+    if app is None:
+        return QApplication([])
+    if not isinstance(app, QApplication):
+        msg = "QApplication.instance() returned a non-QApplication object."
+        raise TypeError(msg)
+    return app
+
+
+@pytest.fixture
+def db(tmp_path: Path, qapp: QApplication) -> Iterator[QtSqliteDatabaseManagerBase]:  # noqa: ARG001
+    manager = QtSqliteDatabaseManagerBase(prefix="test_sql_profiler", db_filename=str(tmp_path / "profiler.db"))
+    assert manager.execute_simple_query("CREATE TABLE items (_id INTEGER PRIMARY KEY, name TEXT, amount INTEGER)")
+    assert manager.execute_many(
+        "INSERT INTO items (name, amount) VALUES (:name, :amount)",
+        [{"name": f"Item {index}", "amount": index} for index in range(50)],
+    )
+    yield manager
+    disable_sql_profiling()
+    manager.close()
+
+
+class _Screen:
+    """Stand-in for an app window whose refresh is profiled as one cycle."""
+
+    def __init__(self, db: QtSqliteDatabaseManagerBase) -> None:
+        self.db = db
+
+    @sql_profile_cycle("test.refresh")
+    def refresh(self) -> int:
+        self.db.get_rows("SELECT COUNT(*) FROM items")
+        return len(self.db.get_rows("SELECT name FROM items WHERE amount > :amount", {"amount": 10}))
+
+
+def test_sql_fingerprint_replaces_literals_and_collapses_whitespace() -> None:
+    query_text = """SELECT name FROM items -- recent first
+                    WHERE amount > 10 AND name = 'It''s' AND _id IN (?, ?, ?)
+                    AND date >= :date_from ORDER BY date DESC LIMIT 25"""
+
+    assert sql_fingerprint(query_text) == (
+        "SELECT name FROM items WHERE amount > ? AND name = ? AND _id IN (?, ...) "
+        "AND date >= :date_from ORDER BY date DESC LIMIT ?"
+    )
+    assert sql_fingerprint("SELECT * FROM t1 WHERE x = 1") == sql_fingerprint("SELECT  *  FROM t1 WHERE x = 22")
+
+
+def test_disabled_profiler_records_nothing(db: QtSqliteDatabaseManagerBase) -> None:
+    assert active_sql_profiler() is None
+    assert db.get_rows("SELECT COUNT(*) FROM items") == [[50]]
+    assert _Screen(db).refresh() == 39
+
+
+def test_profiler_aggregates_statements_per_fingerprint(db: QtSqliteDatabaseManagerBase) -> None:
+    profiler = enable_sql_profiling(QtSqlProfiler(slow_threshold_ms=10_000))
+
+    for amount in (5, 10, 20):
+        db.get_rows("SELECT name FROM items WHERE amount > :amount", {"amount": amount})
+    assert db.execute_simple_query("UPDATE items SET name = 'x' WHERE amount < 3")
+    assert db.get_columns("SELECT _id, amount FROM items WHERE amount < :amount", {"amount": 7})
+
+    stats = {item.fingerprint: item for item in profiler.fingerprint_stats()}
+    select = stats["SELECT name FROM items WHERE amount > :amount"]
+    assert select.calls == 3
+    assert select.binds == 3
+    assert select.rows == 44 + 39 + 29
+    assert select.total_ms > 0
+    assert select.callers.most_common(1)[0][0].endswith("test_profiler_aggregates_statements_per_fingerprint")
+    assert stats["UPDATE items SET name = ? WHERE amount < ?"].rows == 3
+    assert stats["SELECT _id, amount FROM items WHERE amount < :amount"].rows == 7
+    assert "SELECT name FROM items" in profiler.report(top=2)
+
+
+def test_profile_cycle_summarises_refresh(db: QtSqliteDatabaseManagerBase) -> None:
+    profiler = enable_sql_profiling(QtSqlProfiler(slow_threshold_ms=10_000))
+
+    assert _Screen(db).refresh() == 39
+    db.get_rows("SELECT 1")
+
+    assert len(profiler.cycles) == 1
+    summary = profiler.cycles[0]
+    assert summary.name == "test.refresh"
+    assert summary.statements == 2
+    assert 0 < summary.sql_ms <= summary.wall_ms
+    assert summary.slowest_fingerprint.startswith("SELECT")
+
+
+def test_slow_statements_are_logged_with_query_plan(db: QtSqliteDatabaseManagerBase, tmp_path: Path) -> None:
+    log_path = tmp_path / "logs" / "slow.jsonl"
+    profiler = enable_sql_profiling(QtSqlProfiler(slow_threshold_ms=0, slow_log_path=log_path))
+
+    with profiler.cycle("test.slow"):
+        db.get_rows("SELECT name FROM items WHERE amount = :amount", {"amount": 7})
+        db.get_rows("SELECT name FROM items WHERE _id = :id", {"id": 7})
+    disable_sql_profiling()
+
+    entries = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+    assert [entry["fingerprint"] for entry in entries] == [
+        "SELECT name FROM items WHERE amount = :amount",
+        "SELECT name FROM items WHERE _id = :id",
+    ]
+    assert entries[0]["cycle"] == "test.slow"
+    assert entries[0]["rows"] == 1
+    assert entries[0]["binds"] == 1
+    assert "7" not in json.dumps(entries[0]["sql"])
+    assert any(detail.startswith("SCAN") for detail in entries[0]["plan"])
+    assert any("INTEGER PRIMARY KEY" in detail for detail in entries[1]["plan"])
+
+
+def test_slow_query_log_rotates_and_reports_top_n(db: QtSqliteDatabaseManagerBase, tmp_path: Path) -> None:
+    log_path = tmp_path / "slow.jsonl"
+    enable_sql_profiling(QtSqlProfiler(slow_threshold_ms=0, slow_log_path=log_path, max_log_bytes=2_000))
+
+    for _ in range(20):
+        db.get_rows("SELECT COUNT(*) FROM items")
+        db.get_rows("SELECT name FROM items ORDER BY amount DESC")
+    disable_sql_profiling()
+
+    assert (tmp_path / "slow.jsonl.1").exists()
+    entries = load_slow_query_log(log_path)
+    assert 0 < len(entries) <= 40
+    report = format_sql_profile_report(slow_query_log_stats(entries), top=1, order_by="rows")
+    assert "ORDER BY amount DESC" in report
+    assert "COUNT(*)" not in report
+
+
+@pytest.mark.slow
+def test_disabled_profiler_overhead_is_negligible(db: QtSqliteDatabaseManagerBase) -> None:
+    """Compare the per-statement profiler check with the cost of a cached point query."""
+    repeats = 20_000
+
+    def timed(run: Callable[[], object]) -> float:
+        started = time.perf_counter()
+        for _ in range(repeats):
+            run()
+        return (time.perf_counter() - started) / repeats
+
+    statement = timed(lambda: db.get_rows("SELECT name FROM items WHERE _id = :id", {"id": 7}))
+    check = timed(active_sql_profiler)
+
+    assert 2 * check < statement * 0.02
@@ -0,0 +1,125 @@
+"""Tests for the prepared-statement cache and batch execution in the Qt SQL runner."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from harrix_swiss_knife.apps.common.qt_database_manager_base import QtSqliteDatabaseManagerBase
+
+
+@pytest.fixture
+def qapp() -> QApplication:
+    """Ensure a QApplication exists for Qt SQL drivers."""
+    app = QApplication.instance()
+    if app is None:
+        return QApplication([])
+    if not isinstance(app, QApplication):
+        msg = "QApplication.instance() returned a non-QApplication object."
+        raise TypeError(msg)
+    return app
+
+
+@pytest.fixture
+def manager(tmp_path: Path, qapp: QApplication) -> Iterator[QtSqliteDatabaseManagerBase]:
+    del qapp
+    db = QtSqliteDatabaseManagerBase(prefix="test_cache", db_filename=str(tmp_path / "cache.db"))
+    assert db.execute_simple_query("CREATE TABLE items (_id INTEGER PRIMARY KEY, name TEXT, value INTEGER)")
+    yield db
+    db.close()
+
+
+def test_repeated_reads_hit_statement_cache(manager: QtSqliteDatabaseManagerBase) -> None:
+    assert manager.execute_simple_query(
+        "INSERT INTO items (name, value) VALUES (:name, :value)", {"name": "a", "value": 1}
+    )
+    before = manager.statement_cache_stats()
+
+    for _ in range(5):
+        assert manager.get_rows("SELECT name, value FROM items WHERE value = :value", {"value": 1}) == [["a", 1]]
+
+    after = manager.statement_cache_stats()
+    assert after.misses - before.misses == 1
+    assert after.hits - before.hits == 4
+    assert after.hit_rate > 0
+
+
+def test_cached_statement_rebinds_new_params(manager: QtSqliteDatabaseManagerBase) -> None:
+    insert = "INSERT INTO items (name, value) VALUES (:name, :value)"
+    for index in range(3):
+        assert manager.execute_simple_query(insert, {"name": f"n{index}", "value": index})
+
+    select = "SELECT name FROM items WHERE value = :value"
+    assert manager.get_rows(select, {"value": 2}) == [["n2"]]
+    assert manager.get_rows(select, {"value": 0}) == [["n0"]]
+
+
+def test_statement_cache_evicts_least_recently_used(manager: QtSqliteDatabaseManagerBase) -> None:
+    manager._statement_cache.max_size = 2
+    manager._statement_cache.clear()
+    manager._statement_cache.reset_stats()
+
+    manager.get_rows("SELECT 1")
+    manager.get_rows("SELECT 2")
+    manager.get_rows("SELECT 1")
+    manager.get_rows("SELECT 3")
+    manager.get_rows("SELECT 1")
+
+    stats = manager.statement_cache_stats()
+    assert stats.size == 2
+    assert stats.evictions == 1
+    assert stats.hits == 2
+
+
+def test_execute_many_runs_in_one_transaction(manager: QtSqliteDatabaseManagerBase) -> None:
+    rows = [{"name": f"item{index}", "value": index} for index in range(100)]
+    assert manager.execute_many("INSERT INTO items (name, value) VALUES (:name, :value)", rows)
+    assert manager.get_rows("SELECT COUNT(*), SUM(value) FROM items") == [[100, sum(range(100))]]
+
+
+def test_execute_many_accepts_positional_tuples(manager: QtSqliteDatabaseManagerBase) -> None:
+    assert manager.execute_many("INSERT INTO items (name, value) VALUES (?, ?)", [("x", 1), ("y", 2)])
+    assert manager.get_rows("SELECT name, value FROM items ORDER BY value") == [["x", 1], ["y", 2]]
+
+
+def test_execute_many_rolls_back_on_failure(manager: QtSqliteDatabaseManagerBase) -> None:
+    assert manager.execute_simple_query("CREATE UNIQUE INDEX idx_items_name ON items(name)")
+    rows = [{"name": "dup", "value": 1}, {"name": "other", "value": 2}, {"name": "dup", "value": 3}]
+
+    assert not manager.execute_many("INSERT INTO items (name, value) VALUES (:name, :value)", rows)
+    assert manager.get_rows("SELECT COUNT(*) FROM items") == [[0]]
+
+
+def test_execute_many_joins_outer_transaction(manager: QtSqliteDatabaseManagerBase) -> None:
+    def insert_then_fail() -> None:
+        with manager.sql_transaction():
+            assert manager.execute_many("INSERT INTO items (name, value) VALUES (?, ?)", [("a", 1), ("b", 2)])
+            msg = "abort outer transaction"
+            raise RuntimeError(msg)
+
+    with pytest.raises(RuntimeError):
+        insert_then_fail()
+    assert manager.get_rows("SELECT COUNT(*) FROM items") == [[0]]
+
+
+def test_execute_many_failure_aborts_outer_transaction(manager: QtSqliteDatabaseManagerBase) -> None:
+    def insert_then_fail_batch() -> None:
+        with manager.sql_transaction():
+            assert manager.execute_simple_query("INSERT INTO items (name, value) VALUES ('a', 1)")
+            manager.execute_many("INSERT INTO missing_table (name) VALUES (?)", [("b",)])
+
+    with pytest.raises(RuntimeError):
+        insert_then_fail_batch()
+    assert manager.get_rows("SELECT COUNT(*) FROM items") == [[0]]
+
+
+def test_close_releases_cached_statements(manager: QtSqliteDatabaseManagerBase) -> None:
+    manager.get_rows("SELECT COUNT(*) FROM items")
+    assert manager.statement_cache_stats().size > 0
+
+    manager.close()
+
+    assert manager.statement_cache_stats().size == 0
@@ -0,0 +1,212 @@
+"""Tests for the pooled read-only Qt SQLite connections used by worker threads."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from PySide6.QtCore import QThread
+from PySide6.QtSql import QSqlQuery
+from PySide6.QtWidgets import QApplication
+
+from harrix_swiss_knife.apps.common.qt_sqlite_connection import close_shared_read_only_pool, shared_read_only_pool
+from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager
+
+if TYPE_CHECKING:
+    from harrix_swiss_knife.apps.common.qt_database_manager_base import QtSqliteDatabaseManagerBase
+
+RECOVER_SQL = Path(__file__).resolve().parents[1] / "src" / "harrix_swiss_knife" / "apps" / "finance" / "recover.sql"
+
+
+class _CallWorker(QThread):
+    """Run `func` in a worker thread and keep its result or exception."""
+
+    def __init__(self, func: Callable[[], Any]) -> None:
+        super().__init__()
+        self.func = func
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+    def run(self) -> None:
+        try:
+            self.result = self.func()
+        except BaseException as e:
+            self.error = e
+
+
+@pytest.fixture(scope="module")
+def qapp() -> QApplication:
+    app = QApplication.instance()
+    if app is None:
+        return QApplication([])
+    if not isinstance(app, QApplication):
+        msg = "QApplication.instance() returned a non-QApplication object."
+        raise TypeError(msg)
+    return app
+
+
+@pytest.fixture
+def db_path(tmp_path: Path, qapp: QApplication) -> Iterator[Path]:  # noqa: ARG001
+    path = tmp_path / "finance.db"
+    assert DatabaseManager.create_database_from_sql(str(path), str(RECOVER_SQL))
+    DatabaseManager(str(path)).close()
+    yield path
+    close_shared_read_only_pool(str(path))
+
+
+def _in_worker(func: Callable[[], Any]) -> Any:
+    worker = _CallWorker(func)
+    worker.start()
+    assert worker.wait(10_000)
+    if worker.error is not None:
+        raise worker.error
+    return worker.result
+
+
+def _pragma(db: QtSqliteDatabaseManagerBase, name: str) -> Any:
+    return db.get_rows(f"PRAGMA {name}")[0][0]
+
+
+def test_read_only_manager_applies_pragmas_and_rejects_writes(db_path: Path) -> None:
+    def read() -> tuple[Any, ...]:
+        db = DatabaseManager(str(db_path), read_only=True)
+        try:
+            return (
+                _pragma(db, "query_only"),
+                _pragma(db, "journal_mode"),
+                _pragma(db, "mmap_size"),
+                _pragma(db, "cache_size"),
+                db.execute_simple_query("INSERT INTO settings (key, value) VALUES ('x', 'y')"),
+                len(db.get_all_currencies()) > 0,
+            )
+        finally:
+            db.close()
+
+    query_only, journal_mode, mmap_size, cache_size, write_ok, has_currencies = _in_worker(read)
+
+    assert query_only == 1
+    assert str(journal_mode).lower() == "wal"
+    assert mmap_size > 0
+    assert cache_size < 0
+    assert not write_ok
+    assert has_currencies
+
+
+def test_pool_reuses_connection_across_worker_threads(db_path: Path) -> None:
+    pool = shared_read_only_pool(str(db_path))
+    names = [_in_worker(lambda: _open_and_close_name(db_path)) for _ in range(3)]
+
+    stats = pool.stats()
+    assert len(set(names)) == 1
+    assert stats.created == 1
+    assert stats.reused == 2
+    assert stats.idle == 1
+    assert stats.in_use == 0
+
+
+def test_pool_opens_separate_connections_for_concurrent_workers(db_path: Path) -> None:
+    pool = shared_read_only_pool(str(db_path))
+    first_name, first_db = pool.acquire()
+
+    second_name = _in_worker(lambda: _open_and_close_name(db_path))
+
+    assert second_name != first_name
+    assert pool.stats().in_use == 1
+    pool.release(first_name)
+    assert first_db.isOpen()
+    assert pool.stats().idle == 2
+
+
+def test_closed_pool_keeps_pooling_and_shutdown_drops_it(db_path: Path) -> None:
+    pool = shared_read_only_pool(str(db_path))
+    busy_name, busy_db = pool.acquire()
+    _in_worker(lambda: _open_and_close_name(db_path))
+    assert pool.stats().idle == 1
+
+    pool.close_all()
+    pool.release(busy_name)
+    assert not busy_db.isOpen()
+    assert pool.stats().idle == 0
+    _in_worker(lambda: _open_and_close_name(db_path))
+    assert pool.stats().idle == 1
+
+    manager = DatabaseManager(str(db_path))
+    manager.close_read_only_pool()
+    manager.close()
+    assert pool.stats().idle == 0
+    assert shared_read_only_pool(str(db_path)) is not pool
+
+
+def test_readers_see_committed_snapshot_while_writer_holds_transaction(db_path: Path) -> None:
+    writer = DatabaseManager(str(db_path))
+    insert = """INSERT INTO transactions (amount, description, _id_categories, _id_currencies, date)
+                VALUES (:amount, 'Row', 1, 1, '2024-01-01')"""
+
+    def count_transactions() -> int:
+        db = DatabaseManager(str(db_path), read_only=True)
+        try:
+            return int(db.get_rows("SELECT COUNT(*) FROM transactions")[0][0])
+        finally:
+            db.close()
+
+    try:
+        assert _in_worker(count_transactions) == 0
+        with writer.sql_transaction():
+            assert writer.execute_many(insert, [{"amount": amount} for amount in range(10)])
+            # WAL: the reader is not blocked by the open write transaction and sees the last commit
+            assert _in_worker(count_transactions) == 0
+        assert _in_worker(count_transactions) == 10
+    finally:
+        writer.close()
+
+
+def test_read_only_worker_skips_schema_migrations(db_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[str] = []
+    monkeypatch.setattr(DatabaseManager, "migrate_schema", lambda _self: calls.append("migrate") or 0)
+
+    _in_worker(lambda: DatabaseManager(str(db_path), read_only=True).close())
+    DatabaseManager(str(db_path)).close()
+
+    assert calls == ["migrate"]
+
+
+@pytest.mark.slow
+def test_read_only_worker_start_latency(db_path: Path) -> None:
+    """Compare worker start (open + first read) for a fresh manager and a pooled read-only one."""
+    repeats = 30
+
+    def start(*, read_only: bool) -> None:
+        db = DatabaseManager(str(db_path), read_only=read_only)
+        try:
+            db.get_default_currency_id()
+        finally:
+            db.close()
+
+    def timed(*, read_only: bool) -> float:
+        def run() -> float:
+            started = time.perf_counter()
+            for _ in range(repeats):
+                start(read_only=read_only)
+            return (time.perf_counter() - started) / repeats
+
+        return _in_worker(run)
+
+    timed(read_only=True)  # warm the pool
+    fresh = timed(read_only=False)
+    pooled = timed(read_only=True)
+
+    assert pooled < fresh
+
+
+def _open_and_close_name(db_path: Path) -> str:
+    db = DatabaseManager(str(db_path), read_only=True)
+    try:
+        query = QSqlQuery(db.db)
+        assert query.exec("SELECT 1")
+        query.finish()
+        return db.connection_name
+    finally:
+        db.close()
@@ -0,0 +1,312 @@
+"""Query-plan regression tests: hot `DatabaseManager` queries must not fall back to a full table `SCAN`.
+
+Each case calls a real manager method against a seeded database, captures the SQL it runs and
+checks `EXPLAIN QUERY PLAN` for every captured `SELECT`. A full scan of a small lookup table
+(exercises, categories, ...) is fine; a full scan of a growing log table is a regression.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+from collections.abc import Callable, Iterator
+from contextlib import closing
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from harrix_swiss_knife.apps.common.scroll_pagination import KeysetCursor
+from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager as FinanceDatabaseManager
+from harrix_swiss_knife.apps.fitness.database_manager import DatabaseManager as FitnessDatabaseManager
+from harrix_swiss_knife.apps.food.database_manager import DatabaseManager as FoodDatabaseManager
+from harrix_swiss_knife.apps.habits.database_manager import DatabaseManager as HabitsDatabaseManager
+
+if TYPE_CHECKING:
+    from harrix_swiss_knife.apps.common.qt_database_manager_base import QtSqliteDatabaseManagerBase
+
+APPS_DIR = Path(__file__).resolve().parents[1] / "src" / "harrix_swiss_knife" / "apps"
+
+LOG_TABLES = frozenset(
+    {"currency_exchanges", "exchange_rates", "food_log", "process", "process_habits", "transactions", "weight"}
+)
+SEED_ROWS = 500
+
+_FOOD_SCHEMA_SQL = """
+CREATE TABLE food_items (
+    _id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    name_en TEXT,
+    is_drink INTEGER NOT NULL DEFAULT 0,
+    calories_per_100g REAL,
+    default_portion_weight REAL,
+    default_portion_calories REAL
+);
+CREATE TABLE food_log (
+    _id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    weight REAL,
+    portion_calories REAL,
+    calories_per_100g REAL,
+    name TEXT NOT NULL,
+    name_en TEXT,
+    is_drink INTEGER NOT NULL DEFAULT 0
+);
+"""
+# SQLite may report an unindexed lookup as a bare `SEARCH t` (no `USING ...`); that is a full scan too
+_SCAN_RE = re.compile(r"^(?:SCAN|SEARCH) (?:TABLE )?(\w+)")
+_SOURCE_RE = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+_SQL_KEYWORDS = frozenset({"cross", "group", "inner", "join", "left", "limit", "on", "order", "using", "where"})
+
+
+@pytest.fixture(scope="module")
+def qapp() -> QApplication:
+    app = QApplication.instance()
+    if app is None:
+        return QApplication([])
+    if not isinstance(app, QApplication):
+        msg = "QApplication.instance() returned a non-QApplication object."
+        raise TypeError(msg)
+    return app
+
+
+@pytest.fixture
+def finance_db(tmp_path: Path, qapp: QApplication) -> Iterator[FinanceDatabaseManager]:  # noqa: ARG001
+    db_path = tmp_path / "finance.db"
+    assert FinanceDatabaseManager.create_database_from_sql(str(db_path), str(APPS_DIR / "finance" / "recover.sql"))
+    db = FinanceDatabaseManager(str(db_path))
+    assert db.execute_many(
+        """INSERT INTO transactions (amount, description, _id_categories, _id_currencies, date, tag)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        [
+            (100 + i, f"Item {i}", 1 + i % 5, 1 + i % 3, _date(i), "trip" if i % 7 == 0 else "")
+            for i in range(SEED_ROWS)
+        ],
+    )
+    assert db.execute_many(
+        # Rates are unique per currency and date; colliding seed rows are skipped
+        "INSERT OR IGNORE INTO exchange_rates (_id_currency, rate, date) VALUES (?, ?, ?)",
+        [(1 + i % 3, 1.0 + i, _date(i)) for i in range(SEED_ROWS)],
+    )
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def fitness_db(tmp_path: Path, qapp: QApplication) -> Iterator[FitnessDatabaseManager]:  # noqa: ARG001
+    db_path = tmp_path / "fitness.db"
+    assert FitnessDatabaseManager.create_database_from_sql(str(db_path), str(APPS_DIR / "fitness" / "recover.sql"))
+    db = FitnessDatabaseManager(str(db_path))
+    assert db.execute_many(
+        "INSERT INTO process (_id_exercises, _id_types, value, date) VALUES (?, ?, ?, ?)",
+        [(1 + i % 6, -1 if i % 2 else 1, str(10 + i % 20), _date(i)) for i in range(SEED_ROWS)],
+    )
+    assert db.execute_many(
+        "INSERT INTO weight (value, date) VALUES (?, ?)", [(80.0 + i % 5, _date(i)) for i in range(SEED_ROWS)]
+    )
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def food_db(tmp_path: Path, qapp: QApplication) -> Iterator[FoodDatabaseManager]:  # noqa: ARG001
+    sql_path = tmp_path / "food.sql"
+    sql_path.write_text(_FOOD_SCHEMA_SQL, encoding="utf-8")
+    db_path = tmp_path / "food.db"
+    assert FoodDatabaseManager.create_database_from_sql(str(db_path), str(sql_path))
+    db = FoodDatabaseManager(str(db_path))
+    assert db.execute_many(
+        """INSERT INTO food_log (date, weight, portion_calories, calories_per_100g, name, name_en, is_drink)
+           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        [(_date(i), 100.0, None, 50.0, f"Food {i % 40}", None, i % 4 == 0) for i in range(SEED_ROWS)],
+    )
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def habits_db(tmp_path: Path, qapp: QApplication) -> Iterator[HabitsDatabaseManager]:  # noqa: ARG001
+    db_path = tmp_path / "habits.db"
+    assert HabitsDatabaseManager.create_database_from_sql(str(db_path), str(APPS_DIR / "habits" / "recover.sql"))
+    db = HabitsDatabaseManager(str(db_path))
+    db.migrate_schema()
+    assert db.add_habit("Read", is_bool=True)
+    assert db.add_habit("Walk", is_bool=False)
+    assert db.execute_many(
+        "INSERT INTO process_habits (_id_habit, value, date) VALUES (?, ?, ?)",
+        [(1 + i % 2, i % 3, _date(i)) for i in range(SEED_ROWS)],
+    )
+    yield db
+    db.close()
+
+
+FINANCE_CASES: list[tuple[str, Callable[[FinanceDatabaseManager], object]]] = [
+    ("transactions first page", lambda db: db.get_all_transactions(limit=100)),
+    (
+        "transactions keyset page",
+        lambda db: db.get_all_transactions(limit=100, after=KeysetCursor("2024-06-01", 250)),
+    ),
+    (
+        "transactions by date range",
+        lambda db: db.get_filtered_transactions(date_from="2024-01-01", date_to="2024-03-31"),
+    ),
+    ("transactions by category", lambda db: db.get_filtered_transactions(category_name="Food", limit=100)),
+    ("transactions for tag", lambda db: db.get_transactions_for_tag("trip")),
+    ("tag totals", lambda db: db.get_tag_amount_totals_by_currency("trip")),
+    ("exchange rates first page", lambda db: db.get_all_exchange_rates(limit=100)),
+    ("exchange rate on date", lambda db: db.get_currency_exchange_rate_by_date(2, "2024-03-01")),
+    ("last exchange rate date", lambda db: db.get_last_exchange_rate_date(2)),
+    ("revision on date", lambda db: db.get_revision_transactions_for_currency_on_date(1, "2024-03-01")),
+    ("earliest transaction", lambda db: db.get_earliest_transaction_date()),
+    ("earliest currency exchange", lambda db: db.get_earliest_currency_exchange_date()),
+]
+
+FITNESS_CASES: list[tuple[str, Callable[[FitnessDatabaseManager], object]]] = [
+    ("max values by type", lambda db: db.get_exercise_max_values(1, 1, "2024-01-01")),
+    ("max values without type", lambda db: db.get_exercise_max_values(2, -1, "2024-01-01")),
+    ("exercise chart", lambda db: db.get_exercise_chart_data("Pull-ups", None, "2024-01-01", "2024-06-30")),
+    ("kcal chart", lambda db: db.get_kcal_chart_data("2024-01-01", "2024-06-30")),
+    ("kcal today", lambda db: db.get_kcal_today()),
+    ("sets chart", lambda db: db.get_sets_chart_data("2024-01-01", "2024-06-30")),
+    ("sets today", lambda db: db.get_sets_count_today()),
+    ("exercise total today", lambda db: db.get_exercise_total_today(1)),
+    ("steps records", lambda db: db.get_exercise_steps_records(3)),
+    ("last exercise date", lambda db: db.get_last_exercise_date(1)),
+    ("last exercise record", lambda db: db.get_last_exercise_record(1)),
+    ("last executed exercise", lambda db: db.get_last_executed_exercise()),
+    ("last exercise dates", lambda db: db.get_last_exercise_dates()),
+    ("process first page", lambda db: db.get_limited_process_records(limit=100)),
+    (
+        "process filtered page",
+        lambda db: db.get_filtered_process_records(
+            exercise_name="Squats", date_from="2024-01-01", date_to="2024-06-30", limit=100
+        ),
+    ),
+    ("weight chart", lambda db: db.get_weight_chart_data("2024-01-01", "2024-06-30")),
+    ("last weight", lambda db: db.get_last_weight()),
+    ("earliest process date", lambda db: db.get_earliest_process_date()),
+]
+
+FOOD_CASES: list[tuple[str, Callable[[FoodDatabaseManager], object]]] = [
+    ("calories per day", lambda db: db.get_calories_per_day()),
+    ("calories today", lambda db: db.get_food_calories_today()),
+    ("drinks today", lambda db: db.get_drinks_weight_today()),
+    ("log item by name", lambda db: db.get_food_log_item_by_name("Food 3")),
+    ("recent records page", lambda db: db.get_recent_food_log_records(limit=100)),
+    (
+        "recent records keyset",
+        lambda db: db.get_recent_food_log_records(limit=100, after=KeysetCursor("2024-06-01", 9)),
+    ),
+    ("recent autocomplete names", lambda db: db.get_recent_food_names_for_autocomplete(limit=200)),
+    ("popular items", lambda db: db.get_popular_food_items_with_calories(limit=200)),
+    ("earliest date", lambda db: db.get_earliest_food_log_date()),
+]
+
+HABITS_CASES: list[tuple[str, Callable[[HabitsDatabaseManager], object]]] = [
+    ("streak", lambda db: db.get_habit_streak(1)),
+    ("total check-ins", lambda db: db.get_habit_total_checkins(1)),
+    ("value on date", lambda db: db.get_habit_value_on_date(1, "2024-03-01")),
+    ("done on date", lambda db: db.is_habit_done_on_date(1, "2024-03-01")),
+    ("values between", lambda db: db.get_habit_values_between(1, "2024-01-01", "2024-03-31")),
+    ("done dates between", lambda db: db.get_habit_done_dates_between(1, "2024-01-01", "2024-03-31")),
+    ("count between", lambda db: db.count_habit_checkins_between(1, "2024-01-01", "2024-03-31")),
+    ("years", lambda db: db.get_habit_years(1)),
+    ("calendar", lambda db: db.get_habit_calendar_data("Read", "2024-01-01", "2024-12-31")),
+    (
+        "filtered records",
+        lambda db: db.get_filtered_process_habits_records(date_from="2024-01-01", date_to="2024-03-31"),
+    ),
+    ("limited records", lambda db: db.get_limited_process_habits_records(limit=100)),
+]
+
+
+@pytest.mark.parametrize(("name", "call"), FINANCE_CASES, ids=[case[0] for case in FINANCE_CASES])
+def test_finance_hot_queries_use_indexes(
+    finance_db: FinanceDatabaseManager, name: str, call: Callable[[FinanceDatabaseManager], object]
+) -> None:
+    _assert_no_full_scans(finance_db, name, call)
+
+
+@pytest.mark.parametrize(("name", "call"), FITNESS_CASES, ids=[case[0] for case in FITNESS_CASES])
+def test_fitness_hot_queries_use_indexes(
+    fitness_db: FitnessDatabaseManager, name: str, call: Callable[[FitnessDatabaseManager], object]
+) -> None:
+    _assert_no_full_scans(fitness_db, name, call)
+
+
+@pytest.mark.parametrize(("name", "call"), FOOD_CASES, ids=[case[0] for case in FOOD_CASES])
+def test_food_hot_queries_use_indexes(
+    food_db: FoodDatabaseManager, name: str, call: Callable[[FoodDatabaseManager], object]
+) -> None:
+    _assert_no_full_scans(food_db, name, call)
+
+
+@pytest.mark.parametrize(("name", "call"), HABITS_CASES, ids=[case[0] for case in HABITS_CASES])
+def test_habits_hot_queries_use_indexes(
+    habits_db: HabitsDatabaseManager, name: str, call: Callable[[HabitsDatabaseManager], object]
+) -> None:
+    _assert_no_full_scans(habits_db, name, call)
+
+
+def test_full_scan_detection_flags_unindexed_filter(fitness_db: FitnessDatabaseManager) -> None:
+    queries = [("SELECT COUNT(*) FROM process p WHERE CAST(p.value AS REAL) > :v", {"v": 10})]
+    plans = _query_plans(fitness_db.db.databaseName(), queries)
+    assert _full_scans(queries[0][0], plans[0]) == ["p"]
+
+
+def _assert_no_full_scans(db: QtSqliteDatabaseManagerBase, name: str, call: Callable[[Any], object]) -> None:
+    queries = _capture_selects(db, call)
+    assert queries, f"{name}: no SELECT was captured"
+    for (query, _params), plan in zip(queries, _query_plans(db.db.databaseName(), queries), strict=True):
+        assert not _full_scans(query, plan), f"{name}: full scan in plan {plan} for query:\n{query}"
+
+
+def _capture_selects(
+    db: QtSqliteDatabaseManagerBase, call: Callable[[Any], object]
+) -> list[tuple[str, dict[str, Any] | None]]:
+    """Run `call(db)` and return every `SELECT` it sent through `get_rows` / `execute_query`."""
+    captured: list[tuple[str, dict[str, Any] | None]] = []
+    get_rows, execute_query = db.get_rows, db.execute_query
+
+    def recording_get_rows(query_text: str, params: dict[str, Any] | None = None) -> list[list[Any]]:
+        captured.append((query_text, params))
+        return get_rows(query_text, params)
+
+    def recording_execute_query(query_text: str, params: dict[str, Any] | None = None) -> Any:
+        captured.append((query_text, params))
+        return execute_query(query_text, params)
+
+    db.get_rows = recording_get_rows  # type: ignore[method-assign]
+    db.execute_query = recording_execute_query  # type: ignore[method-assign]
+    try:
+        call(db)
+    finally:
+        del db.get_rows, db.execute_query
+    return [(query, params) for query, params in captured if query.lstrip().upper().startswith(("SELECT", "WITH"))]
+
+
+def _date(index: int) -> str:
+    return f"2024-{index % 12 + 1:02d}-{index % 28 + 1:02d}"
+
+
+def _full_scans(query: str, plan: list[str]) -> list[str]:
+    """Return the plan sources that scan a log table without an index."""
+    log_sources = set(LOG_TABLES)
+    for table, alias in _SOURCE_RE.findall(query):
+        if table.lower() in LOG_TABLES and alias and alias.lower() not in _SQL_KEYWORDS:
+            log_sources.add(alias)
+    scans = []
+    for detail in plan:
+        match = _SCAN_RE.match(detail)
+        if match and " USING " not in detail and match.group(1) in log_sources:
+            scans.append(match.group(1))
+    return scans
+
+
+def _query_plans(db_path: str, queries: list[tuple[str, dict[str, Any] | None]]) -> list[list[str]]:
+    with closing(sqlite3.connect(db_path)) as connection:
+        return [
+            [str(row[3]) for row in connection.execute(f"EXPLAIN QUERY PLAN {query}", params or {})]
+            for query, params in queries
+        ]
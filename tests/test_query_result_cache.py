@@ -0,0 +1,135 @@
+"""Tests for the table-generation result cache on `QtSqliteDatabaseManagerBase` read methods."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from harrix_swiss_knife.apps.common.query_result_cache import tables_written_by
+from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager
+
+_INSERT_TRANSACTION = """INSERT INTO transactions (amount, description, _id_categories, _id_currencies, date)
+                         VALUES (:amount, :description, 1, 1, '2024-01-01')"""
+
+
+@pytest.mark.parametrize(
+    ("query_text", "expected"),
+    [
+        ("SELECT * FROM transactions", frozenset()),
+        ("  PRAGMA user_version = 3", frozenset()),
+        ("CREATE INDEX IF NOT EXISTS idx_t ON transactions(date)", frozenset()),
+        ("INSERT INTO transactions (amount) VALUES (1)", frozenset({"transactions"})),
+        ("INSERT OR REPLACE INTO \"Settings\" (key) VALUES ('a')", frozenset({"settings"})),
+        ("update currencies SET name = 'x'", frozenset({"currencies"})),
+        ("DELETE FROM exchange_rates WHERE rate = 0", frozenset({"exchange_rates"})),
+        ("WITH old AS (SELECT 1) DELETE FROM transactions WHERE _id IN old", frozenset({"transactions"})),
+        ("WITH x AS (SELECT 1) SELECT * FROM x", frozenset()),
+        ("ALTER TABLE categories RENAME COLUMN a TO b", None),
+        ("DROP TABLE standard_items", None),
+    ],
+)
+def test_tables_written_by(query_text: str, expected: frozenset[str] | None) -> None:
+    assert tables_written_by(query_text) == expected
+
+
+def test_cached_reads_are_invalidated_per_table(empty_finance_db: DatabaseManager) -> None:
+    empty_finance_db.get_all_currencies()
+    empty_finance_db.get_all_categories()
+    empty_finance_db.get_currency_by_code("USD")
+    empty_finance_db.get_all_currencies()
+    empty_finance_db.get_all_categories()
+    empty_finance_db.get_currency_by_code("USD")
+    stats = empty_finance_db.result_cache_stats()
+    assert (stats.hits, stats.misses) == (3, 3)
+
+    assert empty_finance_db.execute_simple_query("UPDATE currencies SET name = 'Dollar' WHERE code = 'USD'")
+
+    assert empty_finance_db.get_currency_by_code("USD")[1] == "Dollar"
+    assert "Dollar" in {row[2] for row in empty_finance_db.get_all_currencies()}
+    empty_finance_db.get_all_categories()
+    stats = empty_finance_db.result_cache_stats()
+    assert (stats.hits, stats.misses, stats.stale) == (4, 5, 2)
+    assert stats.hit_rate == pytest.approx(4 / 9)
+
+
+def test_cached_results_are_copies(empty_finance_db: DatabaseManager) -> None:
+    first = empty_finance_db.get_all_currencies()
+    first[0][1] = "CHANGED"
+    first.clear()
+
+    second = empty_finance_db.get_all_currencies()
+
+    assert second
+    assert "CHANGED" not in {row[1] for row in second}
+    assert empty_finance_db.result_cache_stats().hits == 1
+
+
+def test_transaction_writes_expire_results_for_other_connections(
+    empty_finance_db_path: Path, empty_finance_db: DatabaseManager
+) -> None:
+    reader = DatabaseManager(str(empty_finance_db_path), read_only=True)
+    try:
+        assert reader.get_all_transactions() == []
+        with empty_finance_db.sql_transaction():
+            assert empty_finance_db.execute_simple_query(_INSERT_TRANSACTION, {"amount": 100, "description": "Rent"})
+            # Our own connection sees the uncommitted row; the reader still sees the last commit
+            assert len(empty_finance_db.get_all_transactions()) == 1
+            assert reader.get_all_transactions() == []
+        assert [row[2] for row in reader.get_all_transactions()] == ["Rent"]
+    finally:
+        reader.close()
+
+
+def test_rolled_back_rows_are_not_served_from_cache(empty_finance_db: DatabaseManager) -> None:
+    def insert_then_fail() -> None:
+        with empty_finance_db.sql_transaction():
+            assert empty_finance_db.execute_simple_query(_INSERT_TRANSACTION, {"amount": 100, "description": "Rent"})
+            assert len(empty_finance_db.get_all_transactions()) == 1
+            msg = "abort"
+            raise RuntimeError(msg)
+
+    with pytest.raises(RuntimeError, match="abort"):
+        insert_then_fail()
+
+    assert empty_finance_db.get_all_transactions() == []
+
+
+def test_schema_changes_and_manual_invalidation_expire_everything(empty_finance_db: DatabaseManager) -> None:
+    empty_finance_db.get_all_categories()
+    assert empty_finance_db.execute_simple_query("ALTER TABLE categories ADD COLUMN extra TEXT")
+    empty_finance_db.get_all_categories()
+    empty_finance_db.invalidate_result_cache()
+    empty_finance_db.get_all_categories()
+
+    stats = empty_finance_db.result_cache_stats()
+    assert (stats.hits, stats.misses, stats.stale) == (0, 3, 2)
+
+
+@pytest.mark.slow
+def test_result_cache_speeds_up_repeated_refresh_reads(empty_finance_db: DatabaseManager) -> None:
+    """Compare a refresh's read burst with the cache warm and after a write expired it."""
+    assert empty_finance_db.execute_many(
+        _INSERT_TRANSACTION, [{"amount": index, "description": f"Row {index}"} for index in range(20_000)]
+    )
+
+    def refresh() -> None:
+        empty_finance_db.get_all_currencies()
+        empty_finance_db.get_all_categories()
+        empty_finance_db.get_all_transactions()
+        empty_finance_db.get_all_currency_exchanges()
+        empty_finance_db.get_currency_by_code("USD")
+
+    def timed(*, expire: bool) -> float:
+        started = time.perf_counter()
+        for _ in range(10):
+            if expire:
+                empty_finance_db.invalidate_result_cache()
+            refresh()
+        return (time.perf_counter() - started) / 10
+
+    uncached = timed(expire=True)
+    cached = timed(expire=False)
+
+    assert cached < uncached
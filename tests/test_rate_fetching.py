@@ -0,0 +1,225 @@
+"""Tests for concurrent, retried and cached exchange rate history fetching."""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import date, timedelta
+from typing import TYPE_CHECKING
+
+import pytest
+
+from harrix_swiss_knife.apps.finance.services.rate_fetching import (
+    RateFetchRequest,
+    RateFetchScheduler,
+    RateHistoryCache,
+    TickerCandidate,
+    TickerHistory,
+    candidate_tickers,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_EPOCH = date(2024, 1, 1)
+
+
+class FakeRateProvider:
+    """Serves a close derived from each date after `latency` seconds, failing the first `failures` calls."""
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        failures: int = 0,
+        tickers: set[str] | None = None,
+        barrier: threading.Barrier | None = None,
+    ) -> None:
+        """Serve closes for `tickers` (all when `None`); calls wait on `barrier` so they overlap."""
+        self.latency = latency
+        self.barrier = barrier
+        self.failures = failures
+        self.tickers = tickers
+        self.calls: list[tuple[str, date, date]] = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def fetch_history(self, ticker: str, start: date, end: date) -> dict[str, float]:
+        """Return one close per day, or raise while failures remain."""
+        with self._lock:
+            self.calls.append((ticker, start, end))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            failing = self.failures > 0
+            self.failures -= 1
+        try:
+            if self.barrier is not None:
+                self.barrier.wait(timeout=10)
+            time.sleep(self.latency)
+            if failing:
+                msg = "429 Too Many Requests"
+                raise ConnectionError(msg)
+            if self.tickers is not None and ticker not in self.tickers:
+                return {}
+            days = (start + timedelta(days=offset) for offset in range((end - start).days + 1))
+            return {day.isoformat(): 2.0 + (day - _EPOCH).days / 100 for day in days}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _requests(count: int, days: int = 5) -> list[RateFetchRequest]:
+    dates = [(date(2024, 1, 1) + timedelta(days=offset)).isoformat() for offset in range(days)]
+    return [RateFetchRequest(f"C{index:02d}", dates, [TickerCandidate(f"C{index:02d}USD=X")]) for index in range(count)]
+
+
+def test_bounded_parallel_fetch_matches_sequential() -> None:
+    sequential_provider = FakeRateProvider()
+    # Every call waits until four are in flight, so the pool must run four at once
+    parallel_provider = FakeRateProvider(barrier=threading.Barrier(4))
+
+    sequential = RateFetchScheduler(sequential_provider, max_workers=1).fetch(_requests(8))
+    parallel = RateFetchScheduler(parallel_provider, max_workers=4).fetch(_requests(8))
+
+    assert parallel == sequential
+    assert parallel["C03"].rates["2024-01-02"] == 2.01
+    assert parallel["C03"].ticker == "C03USD=X"
+    assert sequential_provider.max_active == 1
+    assert parallel_provider.max_active == 4
+
+
+@pytest.mark.slow
+def test_bounded_parallel_fetch_is_faster_than_sequential() -> None:
+    started = time.perf_counter()
+    RateFetchScheduler(FakeRateProvider(latency=0.05), max_workers=1).fetch(_requests(8))
+    sequential_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    RateFetchScheduler(FakeRateProvider(latency=0.05), max_workers=4).fetch(_requests(8))
+    parallel_seconds = time.perf_counter() - started
+
+    assert parallel_seconds < sequential_seconds / 2
+
+
+def test_transient_errors_are_retried_with_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    provider = FakeRateProvider(failures=2)
+    messages: list[str] = []
+    scheduler = RateFetchScheduler(provider, retries=2, backoff_seconds=0.01, on_progress=messages.append)
+    waits: list[float] = []
+    monkeypatch.setattr(scheduler, "_wait", lambda seconds: waits.append(seconds) is None)
+
+    result = scheduler.fetch(_requests(1))["C00"]
+
+    assert len(result.rates) == 5
+    assert len(provider.calls) == 3
+    assert waits == [0.01, 0.02]
+
+    exhausted = FakeRateProvider(failures=10)
+    result = RateFetchScheduler(exhausted, retries=1, backoff_seconds=0.0, on_progress=messages.append).fetch(
+        _requests(1)
+    )["C00"]
+    assert (result.rates, result.ticker, len(exhausted.calls)) == ({}, None, 2)
+    assert any(message.startswith("⚠️ Error with C00USD=X") for message in messages)
+
+
+def test_should_stop_cancels_pending_requests_and_backoff() -> None:
+    stop = threading.Event()
+    provider = FakeRateProvider(latency=0.05)
+    scheduler = RateFetchScheduler(provider, max_workers=2, should_stop=stop.is_set, on_progress=lambda _: stop.set())
+
+    results = scheduler.fetch(_requests(6))
+
+    assert all(result.cancelled and not result.rates for result in results.values())
+    assert len(results) == 6
+    assert len(provider.calls) < 6
+
+    # Stopping during a 10 s backoff cancels the retry instead of waiting it out
+    failing = FakeRateProvider(failures=10)
+    polls_after_failure: list[int] = []
+
+    def stop_after_first_failure() -> bool:
+        if failing.calls:
+            polls_after_failure.append(len(failing.calls))
+        return bool(failing.calls)
+
+    result = RateFetchScheduler(failing, retries=5, backoff_seconds=10, should_stop=stop_after_first_failure).fetch(
+        _requests(1)
+    )
+    assert result["C00"].cancelled
+    assert len(failing.calls) == 1
+    assert polls_after_failure
+
+
+def test_inverse_tickers_are_tried_after_primary_ones() -> None:
+    provider = FakeRateProvider(tickers={"USDRUB=X"})
+
+    result = RateFetchScheduler(provider).fetch(
+        [RateFetchRequest("RUB", ["2024-01-01", "2024-01-02"], candidate_tickers("RUB"))]
+    )["RUB"]
+
+    assert [call[0] for call in provider.calls] == ["RUBUSD=X", "RUB=X", "USDRUB=X"]
+    assert result.ticker == "USDRUB=X"
+    assert result.rates == {"2024-01-01": pytest.approx(0.5), "2024-01-02": pytest.approx(1 / 2.01)}
+    assert candidate_tickers("RUB", "MY=X") == [TickerCandidate("MY=X")]
+    assert candidate_tickers("GEL")[3] == TickerCandidate("USDGEL=X", inverse=True)
+
+
+def test_cache_limits_reruns_to_new_days_and_the_recent_tail(tmp_path: Path) -> None:
+    cache = RateHistoryCache(tmp_path, tail_refresh_days=2)
+    provider = FakeRateProvider()
+    scheduler = RateFetchScheduler(provider, cache=cache)
+    request = _requests(1, days=10)[0]
+
+    first = scheduler.fetch([request])["C00"]
+    rerun = scheduler.fetch([request])["C00"]
+    extended = RateFetchRequest("C00", [*request.dates, "2024-01-12"], request.tickers)
+    scheduler.fetch([extended])
+
+    assert rerun.rates == first.rates
+    assert provider.calls == [
+        ("C00USD=X", date(2024, 1, 1), date(2024, 1, 10)),
+        ("C00USD=X", date(2024, 1, 9), date(2024, 1, 10)),
+        ("C00USD=X", date(2024, 1, 9), date(2024, 1, 12)),
+    ]
+    history = cache.load("C00USD=X")
+    assert (history.fetched_from, history.fetched_to, len(history.closes)) == ("2024-01-01", "2024-01-12", 12)
+
+    # A failed fetch is not recorded as covered
+    RateFetchScheduler(FakeRateProvider(failures=10), cache=cache, retries=0).fetch(
+        [RateFetchRequest("C00", ["2023-12-01"], request.tickers)]
+    )
+    assert cache.load("C00USD=X").fetched_from == "2024-01-01"
+    (tmp_path / "C00USD=X.json").write_text("{broken", encoding="utf-8")
+    assert cache.load("C00USD=X") == TickerHistory("C00USD=X")
+
+
+def test_ticker_history_ranges_stay_contiguous() -> None:
+    history = TickerHistory("X", "2024-02-01", "2024-02-10")
+
+    assert history.missing_ranges(date(2024, 2, 3), date(2024, 2, 5)) == []
+    assert history.missing_ranges(date(2024, 1, 20), date(2024, 2, 12), tail_refresh_days=3) == [
+        (date(2024, 1, 20), date(2024, 1, 31)),
+        (date(2024, 2, 8), date(2024, 2, 12)),
+    ]
+    assert history.missing_ranges(date(2024, 3, 1), date(2024, 3, 2)) == [(date(2024, 2, 11), date(2024, 3, 2))]
+
+    history.merge(date(2024, 5, 1), date(2024, 5, 2), {"2024-05-01": 1.0})
+    assert (history.fetched_from, history.fetched_to) == ("2024-02-01", "2024-02-10")
+    history.merge(date(2024, 2, 11), date(2024, 2, 20), {})
+    assert (history.fetched_from, history.fetched_to) == ("2024-02-01", "2024-02-10")
+    history.merge(date(2024, 2, 11), date(2024, 2, 20), {"2024-02-12": 1.0, "2024-02-16": 1.0})
+    assert (history.fetched_from, history.fetched_to) == ("2024-02-01", "2024-02-16")
+
+
+def test_empty_answers_are_not_recorded_as_fetched(tmp_path: Path) -> None:
+    cache = RateHistoryCache(tmp_path, tail_refresh_days=2)
+    request = _requests(1, days=9)[0]
+
+    throttled = FakeRateProvider(tickers=set())
+    assert RateFetchScheduler(throttled, cache=cache).fetch([request])["C00"].rates == {}
+    provider = FakeRateProvider()
+    rerun = RateFetchScheduler(provider, cache=cache).fetch([request])["C00"]
+
+    assert provider.calls == [("C00USD=X", date(2024, 1, 1), date(2024, 1, 9))]
+    assert len(rerun.rates) == 9
+    assert (cache.load("C00USD=X").fetched_from, cache.load("C00USD=X").fetched_to) == ("2024-01-01", "2024-01-09")
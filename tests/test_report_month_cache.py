@@ -0,0 +1,219 @@
+"""Tests for the per-month Monthly Summary cache against a full report rebuild."""
+
+from __future__ import annotations
+
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from harrix_swiss_knife.apps.common.qt_sqlite_connection import close_shared_read_only_pool
+from harrix_swiss_knife.apps.common.synthetic_data import SyntheticDatabase, generate_database
+from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager
+from harrix_swiss_knife.apps.finance.report_build_context import ReportBuildContext
+from harrix_swiss_knife.apps.finance.report_build_worker import ReportBuildResult, ReportBuildWorker
+from harrix_swiss_knife.apps.finance.report_generators import get_monthly_summary_report_data
+from harrix_swiss_knife.apps.finance.services.report_month_cache import (
+    ReportMonthCacheService,
+    ReportMonthCacheStore,
+)
+
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QApplication
+
+
+@pytest.fixture
+def finance_years() -> int:
+    return 3
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> ReportMonthCacheStore:
+    return ReportMonthCacheStore(tmp_path / "report_months")
+
+
+def _context(db: DatabaseManager, currency_id: int | None = None) -> ReportBuildContext:
+    currencies_by_code, currencies_by_id = db.get_all_currencies_map()
+    return ReportBuildContext(
+        db_manager=db,
+        currency_id=db.get_default_currency_id() if currency_id is None else currency_id,
+        rates=db.exchange_rates.preload_all_rates(),
+        currencies_by_code=currencies_by_code,
+        currencies_by_id=currencies_by_id,
+    )
+
+
+def _assert_cached_report_is_identical(
+    db: DatabaseManager, store: ReportMonthCacheStore, currency_id: int | None = None
+) -> list[str]:
+    """Build the report with and without the cache, compare the `repr` of both and return the months read."""
+    db_filename = str(db._db_filename)
+    snapshot = ReportMonthCacheStore(store.directory / "snapshot")
+    snapshot.save(db_filename, store.load(db_filename))
+    ctx = _context(db, currency_id)
+
+    expected = repr(get_monthly_summary_report_data(ctx))
+    assert repr(get_monthly_summary_report_data(ctx, store)) == expected
+    assert repr(get_monthly_summary_report_data(ctx, store)) == expected
+    service = ReportMonthCacheService(db, snapshot)
+    return service.monthly_expense_totals(ctx.currency_id, _current_month()).months_read
+
+
+def _current_month() -> str:
+    return datetime.now(UTC).astimezone().strftime("%Y-%m")
+
+
+def _expense_transaction_id(db: DatabaseManager, month: str) -> int:
+    rows = db.get_rows(
+        """
+        SELECT MIN(t._id) FROM transactions t JOIN categories cat ON t._id_categories = cat._id
+        WHERE cat.type = 0 AND substr(t.date, 1, 7) = :month
+        """,
+        {"month": month},
+    )
+    return int(rows[0][0])
+
+
+def test_warm_cache_reads_only_the_current_month(finance_db: DatabaseManager, store: ReportMonthCacheStore) -> None:
+    today = datetime.now(UTC).astimezone().strftime("%Y-%m-%d")
+    assert finance_db.add_transaction(123.0, "Lunch today", 2, 1, today)
+
+    ctx = _context(finance_db)
+    cold = ReportMonthCacheService(finance_db, store).monthly_expense_totals(ctx.currency_id, _current_month())
+    warm = ReportMonthCacheService(finance_db, store).monthly_expense_totals(ctx.currency_id, _current_month())
+
+    full = finance_db.get_monthly_expense_totals_by_category(ctx.currency_id)
+    assert repr(cold.totals) == repr(warm.totals) == repr(full)
+    assert cold.months_read == sorted(full)
+    assert warm.months_read == [_current_month()]
+    assert _current_month() not in store.load(str(finance_db._db_filename)).fragments
+    assert _assert_cached_report_is_identical(finance_db, store) == [_current_month()]
+
+    # Today's rates only move the end of the interval carried over from the last closed month
+    currency_id = finance_db.get_rows("SELECT MIN(_id_currency) FROM exchange_rates")[0][0]
+    assert finance_db.add_exchange_rate(currency_id, 123.0, today)
+    assert _assert_cached_report_is_identical(finance_db, store) == [_current_month()]
+
+
+def test_edits_invalidate_only_the_months_they_touch(finance_db: DatabaseManager, store: ReportMonthCacheStore) -> None:
+    _assert_cached_report_is_identical(finance_db, store)
+    assert _assert_cached_report_is_identical(finance_db, store) == []
+    month = "2024-05"
+    transaction_id = _expense_transaction_id(finance_db, month)
+    currency_id = finance_db.get_rows("SELECT MIN(_id_currency) FROM exchange_rates")[0][0]
+
+    edits = [
+        lambda: finance_db.execute_simple_query(
+            "UPDATE transactions SET amount = amount + 1 WHERE _id = :id", {"id": transaction_id}
+        ),
+        lambda: finance_db.execute_simple_query(
+            "UPDATE transactions SET date = :date WHERE _id = :id", {"date": f"{month}-28", "id": transaction_id}
+        ),
+        lambda: finance_db.execute_simple_query(
+            "UPDATE exchange_rates SET rate = rate * 1.01 WHERE _id_currency = :currency AND date = :date",
+            {"currency": currency_id, "date": f"{month}-15"},
+        ),
+        lambda: finance_db.delete_transaction(transaction_id),
+    ]
+    for edit in edits:
+        assert edit()
+        assert _assert_cached_report_is_identical(finance_db, store) == [month]
+
+    # Flipping a category's type or switching the target currency changes every month
+    category_id = finance_db.get_rows(
+        "SELECT _id_categories FROM transactions WHERE substr(date, 1, 7) = :month LIMIT 1", {"month": month}
+    )[0][0]
+    assert finance_db.execute_simple_query("UPDATE categories SET type = 1 - type WHERE _id = :id", {"id": category_id})
+    months_read = _assert_cached_report_is_identical(finance_db, store)
+    assert months_read == sorted(store.load(str(finance_db._db_filename)).fragments)
+
+    other_currency = finance_db.get_currency_by_code("USD")[0]
+    months_read = _assert_cached_report_is_identical(finance_db, store, other_currency)
+    assert months_read == sorted(store.load(str(finance_db._db_filename)).fragments)
+
+
+def test_swapping_categories_between_rows_of_a_closed_month_invalidates_it(
+    finance_db: DatabaseManager, store: ReportMonthCacheStore
+) -> None:
+    month = "2024-05"
+    first_id = _expense_transaction_id(finance_db, month)
+    second_id = finance_db.get_rows(
+        """
+        SELECT MIN(t._id) FROM transactions t JOIN categories cat ON t._id_categories = cat._id
+        WHERE cat.type = 0 AND substr(t.date, 1, 7) = :month
+          AND t._id_categories != (SELECT _id_categories FROM transactions WHERE _id = :id)
+          AND t.amount != (SELECT amount FROM transactions WHERE _id = :id)
+        """,
+        {"month": month, "id": first_id},
+    )[0][0]
+    _assert_cached_report_is_identical(finance_db, store)
+
+    assert finance_db.execute_simple_query(
+        """
+        UPDATE transactions
+        SET _id_categories = (SELECT SUM(_id_categories) FROM transactions WHERE _id IN (:first, :second))
+            - _id_categories
+        WHERE _id IN (:first, :second)
+        """,
+        {"first": first_id, "second": second_id},
+    )
+    assert _assert_cached_report_is_identical(finance_db, store) == [month]
+
+
+def test_unreadable_cache_falls_back_to_a_full_rebuild(
+    finance_db: DatabaseManager, store: ReportMonthCacheStore
+) -> None:
+    db_filename = str(finance_db._db_filename)
+    _assert_cached_report_is_identical(finance_db, store)
+    saved = store.load(db_filename)
+    store._database_path(db_filename).write_text("{not json", encoding="utf-8")
+
+    ctx = _context(finance_db)
+    months_read = ReportMonthCacheService(finance_db, store).monthly_expense_totals(ctx.currency_id, _current_month())
+
+    assert months_read.months_read == sorted(saved.fragments)
+    assert store.load(db_filename) == saved
+    assert _assert_cached_report_is_identical(finance_db, store) == []
+
+
+def test_report_worker_matches_a_full_rebuild(
+    finance_database: SyntheticDatabase, finance_db: DatabaseManager, store: ReportMonthCacheStore
+) -> None:
+    expected = get_monthly_summary_report_data(_context(finance_db))
+    results: list[ReportBuildResult] = []
+    for _ in range(2):
+        worker = ReportBuildWorker(str(finance_database.path), "Monthly Summary", month_cache_store=store)
+        worker.report_completed.connect(results.append)
+        worker.report_failed.connect(pytest.fail)
+        worker.run()
+
+    assert [repr((result.headers, result.monthly_rows)) for result in results] == [repr(expected[:2])] * 2
+    assert store.load(str(finance_database.path)).fragments
+
+
+@pytest.mark.slow
+def test_cached_monthly_summary_is_faster_than_a_full_rebuild(
+    tmp_path: Path,
+    store: ReportMonthCacheStore,
+    qapp: QApplication,  # noqa: ARG001
+) -> None:
+    database = generate_database("finance", tmp_path / "finance_8y.db", years=8)
+    db = DatabaseManager(str(database.path))
+    try:
+        ctx = _context(db)
+        get_monthly_summary_report_data(ctx, store)
+
+        started = time.perf_counter()
+        expected = get_monthly_summary_report_data(ctx)
+        full_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        actual = get_monthly_summary_report_data(ctx, store)
+        cached_seconds = time.perf_counter() - started
+
+        assert repr(actual) == repr(expected)
+        assert cached_seconds < full_seconds
+    finally:
+        db.close()
+        close_shared_read_only_pool(str(database.path))
@@ -0,0 +1,244 @@
+"""Tests for `PRAGMA user_version` schema migrations of tracker databases."""
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from harrix_swiss_knife.apps.common.qt_database_manager_base import QtSqliteDatabaseManagerBase
+from harrix_swiss_knife.apps.common.schema_migrations import (
+    SchemaMigration,
+    apply_schema_migrations,
+    latest_schema_version,
+)
+from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager as FinanceDatabaseManager
+from harrix_swiss_knife.apps.fitness.database_manager import DatabaseManager as FitnessDatabaseManager
+from harrix_swiss_knife.apps.habits.database_manager import DatabaseManager as HabitsDatabaseManager
+
+APPS_DIR = Path(__file__).resolve().parents[1] / "src" / "harrix_swiss_knife" / "apps"
+FINANCE_RECOVER_SQL = APPS_DIR / "finance" / "recover.sql"
+FITNESS_RECOVER_SQL = APPS_DIR / "fitness" / "recover.sql"
+
+_OLD_HABITS_SCHEMA = """
+CREATE TABLE "habits" (
+    "_id" INTEGER NOT NULL,
+    "name" TEXT NOT NULL,
+    "is_bool" INTEGER,
+    PRIMARY KEY("_id" AUTOINCREMENT)
+);
+CREATE TABLE "process_habits" (
+    "_id" INTEGER NOT NULL,
+    "_id_habit" INTEGER NOT NULL,
+    "value" INTEGER NOT NULL,
+    "date" TEXT NOT NULL,
+    PRIMARY KEY("_id" AUTOINCREMENT)
+);
+INSERT INTO habits (name, is_bool) VALUES ('Read', 1);
+"""
+
+
+@pytest.fixture(scope="module")
+def qapp() -> QApplication:
+    app = QApplication.instance()
+    if app is None:
+        return QApplication([])
+    if not isinstance(app, QApplication):
+        msg = "QApplication.instance() returned a non-QApplication object."
+        raise TypeError(msg)
+    return app
+
+
+@pytest.fixture
+def base_db(tmp_path: Path, qapp: QApplication) -> Iterator[QtSqliteDatabaseManagerBase]:  # noqa: ARG001
+    db = QtSqliteDatabaseManagerBase(prefix="test_migrations", db_filename=str(tmp_path / "base.db"))
+    yield db
+    db.close()
+
+
+def test_apply_schema_migrations_runs_pending_steps_once(base_db: QtSqliteDatabaseManagerBase) -> None:
+    calls: list[int] = []
+
+    def step(version: int, sql: str) -> SchemaMigration:
+        def apply() -> bool:
+            calls.append(version)
+            return base_db.execute_simple_query(sql)
+
+        return SchemaMigration(version, f"step {version}", apply)
+
+    migrations = [step(1, "CREATE TABLE a (x INTEGER)"), step(2, "CREATE TABLE b (y INTEGER)")]
+
+    assert apply_schema_migrations(base_db, migrations) == 2
+    assert apply_schema_migrations(base_db, migrations) == 2
+    assert calls == [1, 2]
+    assert base_db.get_user_version() == latest_schema_version(migrations) == 2
+
+    migrations.append(step(3, "CREATE TABLE c (z INTEGER)"))
+    assert apply_schema_migrations(base_db, migrations) == 3
+    assert calls == [1, 2, 3]
+
+
+def test_failed_migration_is_rolled_back_and_retried(base_db: QtSqliteDatabaseManagerBase) -> None:
+    fail = True
+
+    def create_then_maybe_fail() -> bool:
+        return base_db.execute_simple_query("CREATE TABLE partial (x INTEGER)") and not fail
+
+    migrations = [
+        SchemaMigration(1, "first", lambda: base_db.execute_simple_query("CREATE TABLE first (x INTEGER)")),
+        SchemaMigration(2, "second", create_then_maybe_fail),
+    ]
+
+    assert apply_schema_migrations(base_db, migrations) == 1
+    assert base_db.get_user_version() == 1
+    assert base_db.table_exists("first")
+    assert not base_db.table_exists("partial")
+
+    fail = False
+    assert apply_schema_migrations(base_db, migrations) == 2
+    assert base_db.table_exists("partial")
+
+
+def test_migration_versions_must_ascend(base_db: QtSqliteDatabaseManagerBase) -> None:
+    migrations = [SchemaMigration(2, "b", lambda: True), SchemaMigration(1, "a", lambda: True)]
+    with pytest.raises(ValueError, match="strictly ascending"):
+        apply_schema_migrations(base_db, migrations)
+
+
+def _create_legacy_finance_db(db_path: Path) -> None:
+    """Create a finance database shaped like one from before schema versioning."""
+    assert QtSqliteDatabaseManagerBase.create_database_from_sql(str(db_path), str(FINANCE_RECOVER_SQL))
+    with sqlite3.connect(db_path) as connection:
+        connection.executescript(
+            """
+            ALTER TABLE categories RENAME COLUMN name_local TO name_ru;
+            ALTER TABLE transactions DROP COLUMN description_en;
+            DROP INDEX IF EXISTS idx_standard_items_name;
+            DROP TABLE standard_items;
+            DELETE FROM categories WHERE name = 'Revision Expense';
+            DELETE FROM settings WHERE key = 'default_currency';
+            INSERT INTO categories (name, type, icon) VALUES ('Balance Correction', 0, '');
+            INSERT INTO transactions (amount, description, _id_categories, _id_currencies, date)
+            VALUES (100, 'Fix', (SELECT _id FROM categories WHERE name = 'Balance Correction'), 1, '2024-01-01');
+            INSERT INTO exchange_rates (_id_currency, rate, date) VALUES (1, 90, '2024-01-01'), (1, 91, '2024-01-01');
+            PRAGMA user_version = 0;
+            """
+        )
+    connection.close()
+
+
+def _columns(db: QtSqliteDatabaseManagerBase, table_name: str) -> set[str]:
+    return {str(row[1]) for row in db.get_rows(f"PRAGMA table_info({table_name})")}
+
+
+@pytest.mark.parametrize("start_version", range(12))
+def test_finance_upgrades_from_every_historical_version(
+    tmp_path: Path,
+    qapp: QApplication,  # noqa: ARG001
+    start_version: int,
+) -> None:
+    db_path = tmp_path / "finance.db"
+    _create_legacy_finance_db(db_path)
+
+    class FinanceAtVersion(FinanceDatabaseManager):
+        def _schema_migrations(self) -> list[SchemaMigration]:
+            return [migration for migration in super()._schema_migrations() if migration.version <= start_version]
+
+    old = FinanceAtVersion(str(db_path))
+    assert old.get_user_version() == start_version
+    old.close()
+
+    db = FinanceDatabaseManager(str(db_path))
+    try:
+        assert db.get_user_version() == latest_schema_version(db._schema_migrations()) == 12
+        assert "name_local" in _columns(db, "categories")
+        assert "name_ru" not in _columns(db, "categories")
+        assert "description_en" in _columns(db, "transactions")
+        assert db.table_exists("standard_items")
+        assert db.table_exists("exchange_rate_intervals")
+        assert db.table_exists("exchange_rate_coverage")
+        assert db.get_rows("SELECT rowid FROM transactions_fts WHERE transactions_fts MATCH 'fix'") == db.get_rows(
+            "SELECT _id FROM transactions"
+        )
+        indexes = {row[0] for row in db.get_rows("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"idx_exchange_rates_currency_date", "idx_transactions_date"} <= indexes
+        assert "idx_transactions_date_currency" not in indexes
+        assert db.get_rows("SELECT value FROM settings WHERE key = 'default_currency'") == [["1"]]
+        assert db.exchange_rates.get_storage_mode() == "observed"
+        assert db.get_rows("SELECT rate FROM exchange_rates") == [[91.0]]
+        assert db.get_rows("SELECT COUNT(*) FROM categories WHERE name = 'Balance Correction'") == [[0]]
+        assert db.get_rows(
+            """SELECT c.name FROM transactions t JOIN categories c ON t._id_categories = c._id
+               WHERE t.description = 'Fix'"""
+        ) == [["Revision Expense"]]
+    finally:
+        db.close()
+
+
+def test_finance_warm_open_skips_migration_steps(tmp_path: Path, qapp: QApplication) -> None:  # noqa: ARG001
+    db_path = tmp_path / "finance.db"
+    assert FinanceDatabaseManager.create_database_from_sql(str(db_path), str(FINANCE_RECOVER_SQL))
+    FinanceDatabaseManager(str(db_path)).close()
+    calls: list[str] = []
+
+    class CountingFinance(FinanceDatabaseManager):
+        def _schema_migrations(self) -> list[SchemaMigration]:
+            return [
+                SchemaMigration(m.version, m.description, lambda m=m: calls.append(m.description) or m.apply())
+                for m in super()._schema_migrations()
+            ]
+
+    db = CountingFinance(str(db_path))
+    try:
+        assert db.get_user_version() == 12
+        assert calls == []
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("start_version", range(3))
+def test_fitness_upgrades_from_every_historical_version(
+    tmp_path: Path,
+    qapp: QApplication,  # noqa: ARG001
+    start_version: int,
+) -> None:
+    db_path = tmp_path / "fitness.db"
+    assert QtSqliteDatabaseManagerBase.create_database_from_sql(str(db_path), str(FITNESS_RECOVER_SQL))
+    with sqlite3.connect(db_path) as connection:
+        connection.executescript(
+            "ALTER TABLE exercises DROP COLUMN name_local; ALTER TABLE types DROP COLUMN name_local;"
+        )
+    connection.close()
+
+    class FitnessAtVersion(FitnessDatabaseManager):
+        def _schema_migrations(self) -> list[SchemaMigration]:
+            return [migration for migration in super()._schema_migrations() if migration.version <= start_version]
+
+    FitnessAtVersion(str(db_path)).close()
+
+    db = FitnessDatabaseManager(str(db_path))
+    try:
+        assert db.get_user_version() == 2
+        assert "name_local" in _columns(db, "exercises")
+        assert "name_local" in _columns(db, "types")
+    finally:
+        db.close()
+
+
+def test_habits_migrate_schema_upgrades_legacy_database(tmp_path: Path, qapp: QApplication) -> None:  # noqa: ARG001
+    sql_path = tmp_path / "old_habits.sql"
+    sql_path.write_text(_OLD_HABITS_SCHEMA, encoding="utf-8")
+    db_path = tmp_path / "habits.db"
+    assert HabitsDatabaseManager.create_database_from_sql(str(db_path), str(sql_path))
+
+    db = HabitsDatabaseManager(str(db_path))
+    try:
+        assert db.get_user_version() == 0
+        assert db.migrate_schema() == 2
+        assert {"is_archived", "emoji", "sort_order"} <= _columns(db, "habits")
+        assert db.migrate_schema() == 2
+    finally:
+        db.close()
@@ -1,6 +1,7 @@
 """Tests for scroll pagination helpers."""
 
 from harrix_swiss_knife.apps.common.scroll_pagination import (
+    KeysetCursor,
     ScrollPagination,
     is_scroll_near_bottom,
     on_scroll_load_more,
@@ -58,7 +59,7 @@ def test_scroll_pagination_first_page_and_load_more() -> None:
 
 def test_scroll_pagination_reset() -> None:
     pagination = ScrollPagination()
-    pagination.record_first_page(10, limit=10)
+    pagination.record_first_page(10, limit=10, cursor=KeysetCursor("2024-01-01", 1))
     pagination.loading = True
 
     pagination.reset()
@@ -66,3 +67,42 @@ def test_scroll_pagination_reset() -> None:
     assert pagination.loaded_count == 0
     assert pagination.has_more is False
     assert pagination.loading is False
+    assert pagination.cursor is None
+
+
+def test_keyset_cursor_from_row_and_sql() -> None:
+    cursor = KeysetCursor.from_row([7, "Coffee", "2024-03-01"], date_index=2)
+
+    assert cursor == KeysetCursor("2024-03-01", 7)
+    assert cursor.where_clause("t.date", "t._id") == "(t.date, t._id) < (:cursor_date, :cursor_id)"
+    assert cursor.params() == {"cursor_date": "2024-03-01", "cursor_id": 7}
+
+
+def test_scroll_pagination_load_more_after_seeks_from_last_row() -> None:
+    rows = [[row_id, f"2024-01-{row_id // 2 + 1:02d}"] for row_id in range(5, 0, -1)]
+    rows.sort(key=lambda row: (row[1], row[0]), reverse=True)
+    cursors: list[KeysetCursor | None] = []
+
+    def fetch_rows(limit: int, after: KeysetCursor | None) -> list[list]:
+        cursors.append(after)
+        return [row for row in rows if after is None or (row[1], row[0]) < (after.date, after.row_id)][:limit]
+
+    def cursor_of(row: list) -> KeysetCursor:
+        return KeysetCursor.from_row(row, date_index=1)
+
+    pagination: ScrollPagination[list] = ScrollPagination()
+    first_page = fetch_rows(2, None)
+    pagination.record_first_page(len(first_page), limit=2, cursor=cursor_of(first_page[-1]))
+    appended: list[list] = list(first_page)
+
+    while pagination.has_more:
+        pagination.load_more_after(
+            load_more_count=2,
+            fetch_rows=fetch_rows,
+            append_rows=appended.extend,
+            cursor_of=cursor_of,
+        )
+
+    assert appended == rows
+    assert pagination.loaded_count == 5
+    assert cursors[1:] == [cursor_of(rows[1]), cursor_of(rows[3])]
@@ -8,9 +8,12 @@ from PySide6.QtGui import QColor, QIcon
 from PySide6.QtWidgets import QApplication, QTableView
 
 from harrix_swiss_knife.apps.common.table_models import (
+    LazyTableModel,
     create_colored_table_proxy_model,
+    create_table_proxy_model,
     next_table_sort_order,
     sort_table_by_header_click,
+    source_row_id,
 )
 
 
@@ -72,3 +75,71 @@ def test_sort_table_by_header_click_skips_image_and_toggles(qapp: QApplication)
     assert sort_table_by_header_click(table, 0, skip_section=0) is None
     assert header.sortIndicatorSection() == 1
     assert header.sortIndicatorOrder() == Qt.SortOrder.DescendingOrder
+
+
+def test_lazy_colored_model_matches_standard_model(qapp: QApplication) -> None:
+    """`lazy=True` exposes the same display text, background and row IDs."""
+    assert qapp is not None
+    rows = [
+        ["Coffee", "-3.50", None, 11, QColor("#ffe0e0")],
+        ["Salary", "1000", "work", 12, QColor("#e0ffe0")],
+    ]
+    standard = create_colored_table_proxy_model(rows, ["Description", "Amount", "Tag"])
+    lazy = create_colored_table_proxy_model(rows, ["Description", "Amount", "Tag"], lazy=True)
+
+    assert isinstance(lazy.sourceModel(), LazyTableModel)
+    assert lazy.columnCount() == standard.columnCount() == 3
+    for row in range(2):
+        for column in range(3):
+            assert lazy.index(row, column).data() == standard.index(row, column).data()
+            lazy_brush = lazy.index(row, column).data(Qt.ItemDataRole.BackgroundRole)
+            standard_brush = standard.index(row, column).data(Qt.ItemDataRole.BackgroundRole)
+            assert lazy_brush.color() == standard_brush.color()
+        assert source_row_id(lazy.sourceModel(), row) == source_row_id(standard.sourceModel(), row)
+    assert source_row_id(lazy.sourceModel(), 0) == "11"
+
+
+def test_lazy_model_sorts_through_proxy(qapp: QApplication) -> None:
+    """Proxy sorting works on lazily formatted cells."""
+    assert qapp is not None
+    proxy = create_table_proxy_model([[3, "Zulu"], [1, "Alpha"], [2, "Mike"]], ["Name"], lazy=True)
+
+    proxy.sort(0, Qt.SortOrder.AscendingOrder)
+
+    assert [proxy.index(row, 0).data() for row in range(3)] == ["Alpha", "Mike", "Zulu"]
+    source = proxy.sourceModel()
+    assert [source_row_id(source, proxy.mapToSource(proxy.index(row, 0)).row()) for row in range(3)] == ["1", "2", "3"]
+
+
+def test_lazy_model_user_role_and_read_only_columns(qapp: QApplication) -> None:
+    """Derived UserRole data and read-only columns follow the constructor options."""
+    assert qapp is not None
+    model = LazyTableModel(
+        ["Description", "Amount", "Total"],
+        id_column=-2,
+        color_column=-1,
+        read_only_columns={2},
+        user_role_columns={1: lambda value: str(value).lstrip("-")},
+    )
+    model.append_rows([["Coffee", "-3.50", "-3.50", 7, QColor("white")]])
+
+    assert model.index(0, 1).data(Qt.ItemDataRole.UserRole) == "3.50"
+    assert model.index(0, 0).data(Qt.ItemDataRole.UserRole) is None
+    assert model.flags(model.index(0, 1)) & Qt.ItemFlag.ItemIsEditable
+    assert not model.flags(model.index(0, 2)) & Qt.ItemFlag.ItemIsEditable
+
+
+def test_lazy_model_set_data_emits_data_changed(qapp: QApplication) -> None:
+    """Edits are stored and reported through `dataChanged` for auto-save."""
+    assert qapp is not None
+    model = LazyTableModel(["Name"], id_column=0)
+    model.append_rows([[5, "Old"]])
+    changed: list[tuple[int, int]] = []
+    model.dataChanged.connect(
+        lambda top_left, _bottom_right, _roles: changed.append((top_left.row(), top_left.column()))
+    )
+
+    assert model.setData(model.index(0, 0), "New")
+
+    assert model.index(0, 0).data() == "New"
+    assert changed == [(0, 0)]
@@ -0,0 +1,145 @@
+"""Tests for `TransactionPageFormatter` against per-row database lookups."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from harrix_swiss_knife.apps.common.scroll_pagination import KeysetCursor
+from harrix_swiss_knife.apps.finance.transaction_helpers import calculate_daily_expenses, transform_transaction_data
+from harrix_swiss_knife.apps.finance.transaction_page_formatter import (
+    FormattedTransactionPage,
+    TransactionPageFormatter,
+)
+
+if TYPE_CHECKING:
+    from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager
+
+DATE_COLORS = ["red", "green", "blue", "cyan", "magenta"]
+PAGE_SIZE = 200
+
+
+class _CountingQueries:
+    """Count `get_rows` calls of a manager, optionally adding a fixed latency to each one."""
+
+    def __init__(self, db: DatabaseManager, latency_seconds: float = 0.0) -> None:
+        self.calls = 0
+        self._get_rows = db.get_rows
+        self._latency_seconds = latency_seconds
+
+    def __call__(self, *args: Any, **kwargs: Any) -> list[list[Any]]:
+        self.calls += 1
+        if self._latency_seconds:
+            time.sleep(self._latency_seconds)
+        return self._get_rows(*args, **kwargs)
+
+
+def _expected_page(
+    db: DatabaseManager, rows: list[list[Any]], previous: FormattedTransactionPage | None = None
+) -> FormattedTransactionPage:
+    """Format rows the way the transactions table did before, with per-row database lookups."""
+    result = transform_transaction_data(
+        rows,
+        calculate_daily_expenses(rows, db),
+        DATE_COLORS,
+        db,
+        dates_with_totals=previous.dates_with_totals if previous is not None else None,
+        date_to_color_index=previous.date_to_color_index if previous is not None else None,
+        color_index=previous.color_index if previous is not None else 0,
+    )
+    return FormattedTransactionPage(
+        0, result.rows, result.dates_with_totals, result.date_to_color_index, result.color_index
+    )
+
+
+def _pages(db: DatabaseManager, count: int) -> list[list[list[Any]]]:
+    pages = [db.get_all_transactions(PAGE_SIZE)]
+    for _ in range(count - 1):
+        cursor = KeysetCursor.from_row(pages[-1][-1], date_index=5)
+        pages.append(db.get_all_transactions(PAGE_SIZE, after=cursor))
+    return pages
+
+
+def _same_display(actual: FormattedTransactionPage, expected: FormattedTransactionPage) -> bool:
+    return repr((actual.rows, actual.dates_with_totals, actual.date_to_color_index, actual.color_index)) == repr(
+        (expected.rows, expected.dates_with_totals, expected.date_to_color_index, expected.color_index)
+    )
+
+
+def test_pages_match_per_row_lookups(finance_db: DatabaseManager) -> None:
+    formatter = TransactionPageFormatter(DATE_COLORS)
+    filtered = finance_db.get_filtered_transactions(category_type=0, limit=PAGE_SIZE)
+
+    previous = expected = None
+    for rows in [*_pages(finance_db, 4), filtered]:
+        previous = formatter.format_page(finance_db, rows, previous)
+        expected = _expected_page(finance_db, rows, expected)
+        assert _same_display(previous, expected)
+
+    # Another target currency and conversions that fall back to the latest rate go through the context too
+    usd_id = finance_db.get_currency_by_code("USD")[0]
+    ctx = formatter._reference_context(finance_db)
+    assert repr(calculate_daily_expenses(filtered, finance_db, usd_id, ctx=ctx)) == repr(
+        calculate_daily_expenses(filtered, finance_db, usd_id)
+    )
+    assert formatter.reference_loads == 1
+
+
+def test_cached_pages_are_reused_until_the_data_generation_changes(
+    finance_db: DatabaseManager, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    formatter = TransactionPageFormatter(DATE_COLORS)
+    first_rows, second_rows = _pages(finance_db, 2)
+    first = formatter.format_page(finance_db, first_rows)
+
+    queries = _CountingQueries(finance_db)
+    monkeypatch.setattr(finance_db, "get_rows", queries)
+    second = formatter.format_page(finance_db, second_rows, first)
+    assert queries.calls == 0
+    assert formatter.format_page(finance_db, first_rows) is first
+    assert formatter.format_page(finance_db, second_rows, first) is second
+    # The same rows after a different page continue another color/total state
+    assert formatter.format_page(finance_db, second_rows) is not second
+    assert (formatter.hits, formatter.misses, len(formatter)) == (2, 3, 3)
+    monkeypatch.undo()
+
+    transaction = first_rows[0]
+    category_id = finance_db.get_id("categories", "name", transaction[3])
+    currency_id = finance_db.get_currency_by_code(transaction[4])[0]
+    assert finance_db.add_transaction(999.5, transaction[2], category_id, currency_id, transaction[5])
+    fresh_rows = finance_db.get_all_transactions(PAGE_SIZE)
+    page = formatter.format_page(finance_db, fresh_rows)
+    assert formatter.reference_loads == 2
+    assert _same_display(page, _expected_page(finance_db, fresh_rows))
+
+
+@pytest.mark.slow
+def test_per_row_cost_does_not_depend_on_database_latency(
+    finance_db: DatabaseManager, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    rows = [row for page in _pages(finance_db, 5) for row in page]
+    sample = rows[:50]
+    timings: dict[str, float] = {}
+    for latency_seconds in (0.0, 0.0005):
+        queries = _CountingQueries(finance_db, latency_seconds)
+        monkeypatch.setattr(finance_db, "get_rows", queries)
+        formatter = TransactionPageFormatter(DATE_COLORS)
+        formatter.format_page(finance_db, rows[:1])  # Loads the reference maps once
+
+        calls_before = queries.calls
+        started = time.perf_counter()
+        formatter.format_page(finance_db, rows)
+        timings[f"formatter {latency_seconds * 1000:.1f} ms"] = (time.perf_counter() - started) / len(rows)
+        page = formatter.format_page(finance_db, sample)
+        assert queries.calls == calls_before
+
+        started = time.perf_counter()
+        expected = _expected_page(finance_db, sample)
+        timings[f"per-row lookups {latency_seconds * 1000:.1f} ms"] = (time.perf_counter() - started) / len(sample)
+        assert _same_display(page, expected)
+        monkeypatch.undo()
+
+    assert timings["formatter 0.5 ms"] < timings["per-row lookups 0.0 ms"]
+    assert timings["formatter 0.5 ms"] < timings["per-row lookups 0.5 ms"] / 20
@@ -0,0 +1,129 @@
+"""Tests for the SQL-aggregated Quick Summary figures of `TransactionSummaryService`."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from harrix_swiss_knife.apps.finance.database_manager import DatabaseManager
+from harrix_swiss_knife.apps.finance.transaction_helpers import (
+    MIN_TRANSACTION_ROW_LENGTH,
+    get_natural_cumulative_income_expense_minor_by_currency,
+)
+
+if TYPE_CHECKING:
+    from harrix_swiss_knife.apps.common.synthetic_data import SyntheticDatabase
+
+
+def _legacy_lines(db: DatabaseManager, minor_by_currency: dict[int, int]) -> list[tuple[str, str, float]]:
+    """Format per-currency sums the way the Quick Summary labels did before the summary service."""
+    lines = []
+    for currency_id, minor in minor_by_currency.items():
+        if minor == 0:
+            continue
+        code, _name, symbol = db.get_currency_by_id(currency_id) or (str(currency_id), "", "")
+        lines.append((code, symbol, db.convert_from_minor_units(minor, currency_id)))
+    return sorted(lines)
+
+
+def _legacy_summary(db: DatabaseManager, dates: tuple[str, ...]) -> tuple[list, list, dict[str, list]]:
+    rows = db.get_all_transactions()
+    income, expenses = get_natural_cumulative_income_expense_minor_by_currency(rows, db)
+    day_expenses = {}
+    for date in dates:
+        minor_by_currency: dict[int, int] = {}
+        for row in rows:
+            if len(row) < MIN_TRANSACTION_ROW_LENGTH or row[5] != date or int(row[7]) != 0:
+                continue
+            currency_info = db.get_currency_by_code(row[4])
+            currency_id = currency_info[0] if currency_info else 1
+            minor_by_currency[currency_id] = minor_by_currency.get(currency_id, 0) + int(row[1])
+        day_expenses[date] = _legacy_lines(db, minor_by_currency)
+    return _legacy_lines(db, income), _legacy_lines(db, expenses), day_expenses
+
+
+def _summary(db: DatabaseManager, dates: tuple[str, ...]) -> tuple[list, list, dict[str, list]]:
+    summary = db.summary.summary(dates)
+
+    def lines(amounts: list) -> list[tuple[str, str, float]]:
+        return [(amount.code, amount.symbol, amount.amount) for amount in amounts]
+
+    return (
+        lines(summary.income),
+        lines(summary.expenses),
+        {date: lines(amounts) for date, amounts in summary.day_expenses.items()},
+    )
+
+
+def _busiest_dates(db: DatabaseManager, count: int) -> tuple[str, ...]:
+    rows = db.get_rows(
+        """
+        SELECT t.date FROM transactions t JOIN categories cat ON t._id_categories = cat._id
+        WHERE cat.type = 0 GROUP BY t.date ORDER BY COUNT(*) DESC, t.date LIMIT :count
+        """,
+        {"count": count},
+    )
+    return tuple(str(row[0]) for row in rows)
+
+
+def test_summary_matches_the_per_row_label_computation(finance_db: DatabaseManager) -> None:
+    dates = (*_busiest_dates(finance_db, 2), "1999-01-01")
+
+    assert _summary(finance_db, dates) == _legacy_summary(finance_db, dates)
+    assert _summary(finance_db, dates)[2]["1999-01-01"] == []
+    assert finance_db.summary.full_loads == 1
+    assert finance_db.summary.partial_loads == 0
+
+
+def test_edits_recompute_only_the_touched_days(finance_db: DatabaseManager) -> None:
+    first_date, second_date = _busiest_dates(finance_db, 2)
+    dates = (first_date, second_date)
+    expense_category_id = finance_db.get_rows("SELECT MIN(_id) FROM categories WHERE type = 0")[0][0]
+    currency_id = finance_db.get_rows("SELECT MIN(_id) FROM currencies")[0][0]
+    _summary(finance_db, dates)
+
+    def transaction_ids_on(date: str) -> list[int]:
+        return [row[0] for row in finance_db.get_rows("SELECT _id FROM transactions WHERE date = :d", {"d": date})]
+
+    edits = [
+        lambda: finance_db.add_transaction(123.45, "Lunch", expense_category_id, currency_id, first_date),
+        lambda: finance_db.update_transaction(
+            transaction_ids_on(first_date)[0], 10.0, "Moved", expense_category_id, currency_id, second_date
+        ),
+        lambda: finance_db.delete_transaction(transaction_ids_on(second_date)[-1]),
+        lambda: finance_db.update_transactions_date(transaction_ids_on(first_date)[:2], second_date),
+        lambda: finance_db.clear_transaction_tag(transaction_ids_on(second_date)[0]),
+    ]
+    for edit in edits:
+        assert edit()
+        assert _summary(finance_db, dates) == _legacy_summary(finance_db, dates)
+
+    assert finance_db.summary.full_loads == 1
+    assert finance_db.summary.partial_loads == 4
+
+
+def test_untracked_writes_trigger_a_full_reload(
+    finance_db: DatabaseManager, finance_database: SyntheticDatabase
+) -> None:
+    dates = _busiest_dates(finance_db, 1)
+    _summary(finance_db, dates)
+
+    assert finance_db.execute_simple_query(
+        "UPDATE transactions SET amount = amount * 2 WHERE date = :d", {"d": dates[0]}
+    )
+    assert _summary(finance_db, dates) == _legacy_summary(finance_db, dates)
+    assert finance_db.execute_simple_query(
+        "UPDATE categories SET type = 1 - type WHERE _id = (SELECT MIN(_id) FROM categories)"
+    )
+    assert _summary(finance_db, dates) == _legacy_summary(finance_db, dates)
+    assert finance_db.summary.full_loads == 3
+
+    # A write committed by another manager on the same file is seen through the shared generations
+    other = DatabaseManager(str(finance_database.path))
+    try:
+        category_id = other.get_rows("SELECT MIN(_id) FROM categories WHERE type = 0")[0][0]
+        assert other.add_transaction(50.0, "Taxi", category_id, 1, dates[0])
+    finally:
+        other.close()
+    assert _summary(finance_db, dates) == _legacy_summary(finance_db, dates)
+    assert finance_db.summary.full_loads == 4
+    assert finance_db.summary.partial_loads == 0